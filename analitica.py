@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analítica de abandono y permanencia para el Monitor de Instagram
+Mantiene agregados acumulados por cuenta (altas y bajas por día, permanencia de
+los seguidores) que se actualizan con cada reporte de cambios, de modo que
+añadir un monitoreo cuesta lo mismo que el número de cambios y no el tamaño de
+la cuenta
+"""
+
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from identidades import ConjuntoUsuarios, comparar_usuarios, usuarios_de_snapshot
+from indice_membresia import carpeta_indices, listar_snapshots, timestamp_de_archivo
+from utils import escribir_json_atomico
+
+FORMATO_TIMESTAMP = "%Y-%m-%d_%H-%M-%S"
+ARCHIVO_ANALITICA = "analitica.json"
+
+
+def _fecha(timestamp: str) -> datetime:
+    return datetime.strptime(timestamp, FORMATO_TIMESTAMP)
+
+
+def _dias_entre(inicio: str, fin: str) -> int:
+    """Días completos entre dos timestamps de snapshot"""
+    return max(0, (_fecha(fin) - _fecha(inicio)).days)
+
+
+def _mediana_histograma(histograma: Dict[int, int]) -> Optional[float]:
+    """Mediana de un histograma valor → frecuencia"""
+    total = sum(histograma.values())
+    if not total:
+        return None
+    mitades = ((total - 1) // 2, total // 2)
+    valores = []
+    acumulado = 0
+    for valor in sorted(histograma):
+        acumulado += histograma[valor]
+        while len(valores) < 2 and acumulado > mitades[len(valores)]:
+            valores.append(valor)
+    return sum(valores) / 2
+
+
+class AnaliticaCuenta:
+    """Agregados de altas, bajas y permanencia de los seguidores de una cuenta"""
+
+    def __init__(self, directorio_datos: str, cuenta: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+            cuenta: Cuenta monitoreada
+        """
+        self.directorio_datos = directorio_datos
+        self.cuenta = cuenta
+        self.ruta = os.path.join(carpeta_indices(directorio_datos, cuenta), ARCHIVO_ANALITICA)
+        self.estado = self._estado_vacio()
+        if os.path.exists(self.ruta):
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                self.estado = json.load(f)
+
+    def _estado_vacio(self) -> Dict:
+        return {
+            "cuenta": self.cuenta,
+            "primer_timestamp": None,
+            "ultimo_timestamp": None,
+            "seguidores": 0,
+            # día → {"base", "nuevos", "perdidos", "seguidores"}
+            "dias": {},
+            # día de alta → seguidores actuales que empezaron a seguir ese día
+            "altas_activas": {},
+            # días de permanencia → bajas (solo seguidores con alta observada)
+            "permanencia_bajas": {},
+            "total_adquiridos": 0
+        }
+
+    @property
+    def existe(self) -> bool:
+        """True si ya hay agregados para la cuenta"""
+        return self.estado.get("primer_timestamp") is not None
+
+    def _dia(self, timestamp: str) -> Dict:
+        """Devuelve (creando si hace falta) el agregado de un día"""
+        dia = timestamp[:10]
+        if dia not in self.estado["dias"]:
+            self.estado["dias"][dia] = {"base": self.estado["seguidores"], "nuevos": 0,
+                                        "perdidos": 0, "seguidores": self.estado["seguidores"]}
+        return self.estado["dias"][dia]
+
+    def inicializar(self, timestamp: str, total_seguidores: int) -> None:
+        """
+        Arranca los agregados con el primer snapshot de la cuenta
+        Los seguidores iniciales no tienen fecha de alta conocida y no cuentan para
+        la permanencia de las bajas
+
+        Args:
+            timestamp: Timestamp del primer snapshot
+            total_seguidores: Seguidores en ese snapshot
+        """
+        self.estado = self._estado_vacio()
+        self.estado["primer_timestamp"] = self.estado["ultimo_timestamp"] = timestamp
+        self.estado["seguidores"] = total_seguidores
+        self.estado["altas_activas"][timestamp[:10]] = total_seguidores
+        self._dia(timestamp)
+
+    def aplicar(self, timestamp: str, nuevos: int, inicios_perdidos: Iterable[Optional[str]]) -> None:
+        """
+        Suma un monitoreo a los agregados
+
+        Args:
+            timestamp: Timestamp del monitoreo
+            nuevos: Número de seguidores nuevos
+            inicios_perdidos: Timestamp de alta de cada seguidor perdido (None si se desconoce)
+        """
+        inicios_perdidos = list(inicios_perdidos)
+        dia = self._dia(timestamp)
+        dia["nuevos"] += nuevos
+        dia["perdidos"] += len(inicios_perdidos)
+
+        altas = self.estado["altas_activas"]
+        altas[timestamp[:10]] = altas.get(timestamp[:10], 0) + nuevos
+        primero = self.estado["primer_timestamp"]
+        for inicio in inicios_perdidos:
+            if inicio is None:
+                continue
+            # Una fecha anterior al primer snapshot (importada de la descarga de datos) no tiene
+            # cohorte propia: el seguidor se contó en la del primer snapshot
+            dia_alta = inicio[:10] if inicio > primero else primero[:10]
+            if altas.get(dia_alta):
+                altas[dia_alta] -= 1
+                if not altas[dia_alta]:
+                    del altas[dia_alta]
+            if inicio > primero:
+                clave = str(_dias_entre(inicio, timestamp))
+                self.estado["permanencia_bajas"][clave] = self.estado["permanencia_bajas"].get(clave, 0) + 1
+
+        self.estado["total_adquiridos"] += nuevos
+        self.estado["seguidores"] += nuevos - len(inicios_perdidos)
+        self.estado["ultimo_timestamp"] = timestamp
+        dia["seguidores"] = self.estado["seguidores"]
+
+    def aplicar_reporte(self, reporte: Dict, inicios: Dict[str, Dict[str, str]]) -> None:
+        """
+        Suma un reporte de generar_reporte_cambios a los agregados
+
+        Args:
+            reporte: Reporte de cambios
+            inicios: Resultado de IndiceMembresia.actualizar_desde_reporte
+        """
+        inicios_seguidores = inicios.get("seguidores", {})
+        perdidos = reporte["cambios_seguidores"]["perdidos"]
+        self.aplicar(reporte["timestamp"], reporte["cambios_seguidores"]["total_nuevos"],
+                     (inicios_seguidores.get(username) for username in perdidos))
+
+    def guardar(self) -> None:
+        """Escribe los agregados en disco"""
+        carpeta = os.path.dirname(self.ruta)
+        if not os.path.exists(carpeta):
+            os.makedirs(carpeta)
+        escribir_json_atomico(self.ruta, self.estado, indent=2)
+
+    def resumen(self, dias_baja: int = 30) -> Dict:
+        """
+        Resume el estado actual de la cuenta
+
+        Args:
+            dias_baja: Ventana para la proporción de bajas tempranas
+
+        Returns:
+            Dict: Permanencia mediana, bajas tempranas y totales
+        """
+        ultimo = self.estado["ultimo_timestamp"]
+        permanencia_actual = {}
+        for dia, cantidad in self.estado["altas_activas"].items():
+            dias = _dias_entre(f"{dia}_00-00-00", ultimo)
+            permanencia_actual[dias] = permanencia_actual.get(dias, 0) + cantidad
+        bajas = {int(dias): cantidad for dias, cantidad in self.estado["permanencia_bajas"].items()}
+        bajas_tempranas = sum(cantidad for dias, cantidad in bajas.items() if dias <= dias_baja)
+        adquiridos = self.estado["total_adquiridos"]
+        return {
+            "cuenta": self.cuenta,
+            "desde": self.estado["primer_timestamp"],
+            "hasta": ultimo,
+            "seguidores": self.estado["seguidores"],
+            "permanencia_mediana_dias": _mediana_histograma(permanencia_actual),
+            "permanencia_mediana_bajas_dias": _mediana_histograma(bajas),
+            "total_adquiridos": adquiridos,
+            "bajas_tempranas": bajas_tempranas,
+            "proporcion_bajas_tempranas": bajas_tempranas / adquiridos if adquiridos else None,
+            "dias_baja": dias_baja
+        }
+
+    def serie(self, periodo: str = "diaria") -> List[Dict]:
+        """
+        Serie temporal de altas, bajas y tasa de abandono
+
+        Args:
+            periodo: 'diaria' o 'semanal' (semanas ISO)
+
+        Returns:
+            List[Dict]: Un registro por periodo, en orden cronológico
+        """
+        filas: Dict[str, Dict] = {}
+        for dia in sorted(self.estado["dias"]):
+            datos = self.estado["dias"][dia]
+            if periodo == "semanal":
+                anio, semana, _ = datetime.strptime(dia, "%Y-%m-%d").isocalendar()
+                clave = f"{anio}-W{semana:02d}"
+            else:
+                clave = dia
+            fila = filas.setdefault(clave, {"periodo": clave, "base": datos["base"],
+                                            "nuevos": 0, "perdidos": 0})
+            fila["nuevos"] += datos["nuevos"]
+            fila["perdidos"] += datos["perdidos"]
+            fila["seguidores"] = datos["seguidores"]
+        for fila in filas.values():
+            fila["tasa_abandono"] = round(fila["perdidos"] / fila["base"], 6) if fila["base"] else None
+        return list(filas.values())
+
+
+def exportar_serie(filas: List[Dict], ruta: str) -> None:
+    """
+    Exporta una serie a CSV o JSONL según la extensión del archivo
+
+    Args:
+        filas: Resultado de AnaliticaCuenta.serie
+        ruta: Archivo de salida (.csv o .jsonl)
+    """
+    campos = ["periodo", "base", "nuevos", "perdidos", "seguidores", "tasa_abandono"]
+    if ruta.endswith(".csv"):
+        with open(ruta, 'w', encoding='utf-8', newline='') as f:
+            escritor = csv.DictWriter(f, fieldnames=campos)
+            escritor.writeheader()
+            escritor.writerows(filas)
+    else:
+        with open(ruta, 'w', encoding='utf-8') as f:
+            for fila in filas:
+                f.write(json.dumps(fila, ensure_ascii=False) + "\n")
+
+
+def reconstruir_analitica(directorio_datos: str, cuenta: str) -> AnaliticaCuenta:
+    """
+    Recalcula los agregados de una cuenta recorriendo todos sus snapshots de seguidores
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuenta: Cuenta monitoreada
+
+    Returns:
+        AnaliticaCuenta: Agregados recalculados y guardados
+    """
+    analitica = AnaliticaCuenta(directorio_datos, cuenta)
+    analitica.estado = analitica._estado_vacio()
+    inicios: Dict[str, str] = {}
+    anteriores = ConjuntoUsuarios()
+    for ruta in listar_snapshots(directorio_datos, cuenta, "seguidores"):
+        with open(ruta, 'r', encoding='utf-8') as f:
+            actuales = usuarios_de_snapshot(json.load(f), "seguidores")
+        timestamp = timestamp_de_archivo(ruta)
+        if not analitica.existe:
+            analitica.inicializar(timestamp, len(actuales))
+            inicios = {username: timestamp for username in actuales}
+            anteriores = actuales
+            continue
+        nuevos, perdidos, renombres = comparar_usuarios(anteriores, actuales)
+        for renombre in renombres:
+            if renombre["anterior"] in inicios:
+                inicios[renombre["actual"]] = inicios.pop(renombre["anterior"])
+        analitica.aplicar(timestamp, len(nuevos), (inicios.pop(username, None) for username in perdidos))
+        inicios.update((username, timestamp) for username in nuevos)
+        anteriores = actuales
+    analitica.guardar()
+    return analitica
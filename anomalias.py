@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Detección de anomalías en los cambios de seguidores
+Mantiene por cuenta y métrica una media y una varianza exponenciales (EWMA) que
+se actualizan en O(1) con cada monitoreo o muestra de contadores, y marca como
+anómalas las observaciones que se alejan más de ANOMALIA_UMBRAL_Z desviaciones
+"""
+
+import json
+import math
+import os
+from typing import Dict, List
+
+import config
+from indice_membresia import carpeta_indices
+from utils import escribir_json_atomico
+
+ARCHIVO_EVENTOS = "eventos_anomalias.jsonl"
+
+# Desviación mínima para que una cuenta muy estable no dispare alarmas por un único cambio
+DESVIACION_MINIMA = 1.0
+
+
+class DetectorAnomalias:
+    """Estado EWMA persistente de las métricas de una cuenta"""
+
+    def __init__(self, directorio_datos: str, cuenta: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+            cuenta: Cuenta monitoreada
+        """
+        self.directorio_datos = directorio_datos
+        self.cuenta = cuenta
+        self.ruta = os.path.join(carpeta_indices(directorio_datos, cuenta), "anomalias.json")
+        self.estado: Dict[str, Dict[str, float]] = {}
+        if os.path.exists(self.ruta):
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                self.estado = json.load(f)
+
+    def observar(self, metricas: Dict[str, float], timestamp: str, origen: str) -> List[Dict]:
+        """
+        Evalúa unas observaciones y actualiza el estado de cada métrica
+
+        Args:
+            metricas: Nombre de la métrica → valor observado
+            timestamp: Momento de la observación
+            origen: 'reporte' o 'contadores'
+
+        Returns:
+            List[Dict]: Anomalías detectadas (vacía si ninguna)
+        """
+        alfa = config.ANOMALIA_ALFA
+        anomalias = []
+        for metrica, valor in metricas.items():
+            datos = self.estado.get(metrica)
+            if datos is None:
+                self.estado[metrica] = {"media": float(valor), "varianza": 0.0, "n": 1}
+                continue
+
+            desviacion = max(math.sqrt(datos["varianza"]), DESVIACION_MINIMA)
+            z = (valor - datos["media"]) / desviacion
+            if datos["n"] >= config.ANOMALIA_MIN_OBSERVACIONES and abs(z) >= config.ANOMALIA_UMBRAL_Z:
+                anomalias.append({
+                    "cuenta": self.cuenta,
+                    "timestamp": timestamp,
+                    "origen": origen,
+                    "metrica": metrica,
+                    "valor": valor,
+                    "media": round(datos["media"], 3),
+                    "desviacion": round(desviacion, 3),
+                    "z": round(z, 2)
+                })
+
+            diferencia = valor - datos["media"]
+            incremento = alfa * diferencia
+            datos["media"] += incremento
+            datos["varianza"] = (1 - alfa) * (datos["varianza"] + diferencia * incremento)
+            datos["n"] += 1
+        return anomalias
+
+    def guardar(self) -> None:
+        """Escribe el estado en disco"""
+        carpeta = os.path.dirname(self.ruta)
+        if not os.path.exists(carpeta):
+            os.makedirs(carpeta)
+        escribir_json_atomico(self.ruta, self.estado, indent=2)
+
+
+def metricas_de_reporte(reporte: Dict) -> Dict[str, float]:
+    """Métricas que se vigilan en cada reporte de cambios"""
+    return {
+        "cambio_neto_seguidores": reporte["estadisticas"]["cambio_neto_seguidores"],
+        "nuevos_seguidores": reporte["cambios_seguidores"]["total_nuevos"],
+        "seguidores_perdidos": reporte["cambios_seguidores"]["total_perdidos"],
+    }
+
+
+def metricas_de_contadores(previa, actual) -> Dict[str, float]:
+    """
+    Ritmo por hora de los contadores entre dos muestras consecutivas
+
+    Args:
+        previa: Muestra anterior (momento, seguidores, seguidos, publicaciones)
+        actual: Muestra nueva
+
+    Returns:
+        Dict[str, float]: Métricas (vacío si las muestras no permiten calcular ritmo)
+    """
+    horas = (actual[0] - previa[0]) / 3600
+    if horas <= 0:
+        return {}
+    return {
+        "seguidores_por_hora": (actual[1] - previa[1]) / horas,
+        "seguidos_por_hora": (actual[2] - previa[2]) / horas,
+    }
+
+
+def registrar_eventos(directorio_datos: str, anomalias: List[Dict]) -> None:
+    """
+    Añade anomalías al registro de eventos común (una línea JSON por evento)
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        anomalias: Anomalías detectadas
+    """
+    if not anomalias:
+        return
+    if not os.path.exists(directorio_datos):
+        os.makedirs(directorio_datos)
+    with open(os.path.join(directorio_datos, ARCHIVO_EVENTOS), 'a', encoding='utf-8') as f:
+        for anomalia in anomalias:
+            f.write(json.dumps(anomalia, ensure_ascii=False) + "\n")
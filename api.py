@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API de biblioteca del Monitor de Instagram
+Permite usar el monitor desde otros programas sin consola: las operaciones
+devuelven objetos de resultados.py, las confirmaciones se resuelven con una
+política o un callback en lugar de input() y el progreso llega a un callback.
+Cada operación tiene además una variante async que se ejecuta en un hilo
+
+Ejemplo:
+    monitor = Monitor(al_progreso=lambda op, actual, total: ...)
+    monitor.cargar_sesion("mi_usuario")
+    resultado = monitor.monitorear("cuenta")
+    print(resultado.nuevos_seguidores)
+
+La salida informativa sigue yendo al logger "seeyouinstagram" (ver registro.py);
+quien integre el monitor puede ajustar su nivel o sus manejadores
+"""
+
+import asyncio
+import functools
+import threading
+from typing import Callable, Dict, Optional, Union
+
+from historial import cargar_snapshot, diferencia_entre
+from identidades import usuarios_de_snapshot
+from instagram_monitor import InstagramMonitor
+from resultados import ResultadoConexiones, ResultadoMonitoreo, ResultadoMutuos, Snapshot
+from utils import limpiar_username
+
+# Decisiones que puede pedir el monitor (clave → respuesta de la política por defecto)
+DECISIONES = {
+    "esperar_limite": True,      # Instagram limitó las peticiones: esperar RATE_LIMIT_WAIT_TIME y seguir
+    "continuar_parcial": True,   # Hay un guardado parcial: continuar desde él en vez de empezar de cero
+    "modo_publico": True,        # Activar el modo público pese a sus limitaciones
+    "lista_grande": True,        # La lista tiene más de 10.000 usuarios: descargarla igualmente
+    "continuar_rastreo": True,   # Cada 500 usuarios descargados: seguir descargando
+    "recorrer_grande": True,     # Seguidores mutuos: recorrer un perfil de más de 10.000 seguidores
+}
+
+Decision = Callable[[str, str, bool], bool]
+Progreso = Callable[[str, int, int], None]
+
+
+def politica(respuestas: Optional[Dict[str, bool]] = None) -> Decision:
+    """
+    Crea un callback de decisión que responde sin preguntar
+
+    Args:
+        respuestas: Respuestas que sustituyen a las de DECISIONES
+
+    Returns:
+        Decision: Función (clave, mensaje, por_defecto) → bool
+    """
+    tabla = dict(DECISIONES, **(respuestas or {}))
+
+    def decidir(clave: str, mensaje: str, defecto: bool) -> bool:
+        return tabla.get(clave, defecto)
+    return decidir
+
+
+class Monitor:
+    """Fachada sin consola sobre InstagramMonitor"""
+
+    def __init__(self, directorio_datos: str = "datos_monitoreo",
+                 decidir: Union[Decision, Dict[str, bool], None] = None,
+                 al_progreso: Optional[Progreso] = None,
+                 monitor: Optional[InstagramMonitor] = None):
+        """
+        Args:
+            directorio_datos: Carpeta de datos (se ignora si se pasa monitor)
+            decidir: Callback (clave, mensaje, por_defecto) → bool o diccionario de respuestas
+                     para politica(); por defecto, DECISIONES
+            al_progreso: Callback (operacion, actual, total); en las variantes async se
+                         llama desde el hilo de trabajo
+            monitor: InstagramMonitor existente (p. ej. con la sesión ya cargada)
+        """
+        self.monitor = monitor or InstagramMonitor(directorio_datos)
+        self.monitor.decidir = decidir if callable(decidir) else politica(decidir)
+        self.monitor.al_progreso = al_progreso
+        # InstagramMonitor no es seguro entre hilos: las operaciones de una instancia van de una en una
+        self._cerrojo = threading.Lock()
+
+    def _ejecutar(self, funcion, *args, **kwargs):
+        with self._cerrojo:
+            return funcion(*args, **kwargs)
+
+    async def _en_hilo(self, funcion, *args, **kwargs):
+        bucle = asyncio.get_event_loop()
+        return await bucle.run_in_executor(None, functools.partial(self._ejecutar, funcion, *args, **kwargs))
+
+    # ----- Sesión -----
+
+    def iniciar_sesion(self, usuario: str, contrasena: str) -> bool:
+        """Inicia sesión con usuario y contraseña"""
+        return self._ejecutar(self.monitor.iniciar_sesion, usuario, contrasena)
+
+    def cargar_sesion(self, usuario: Optional[str] = None) -> bool:
+        """Carga una sesión guardada"""
+        return self._ejecutar(self.monitor.cargar_sesion, usuario)
+
+    def activar_modo_publico(self) -> bool:
+        """Trabaja sin sesión (solo perfiles públicos)"""
+        return self._ejecutar(self.monitor.activar_modo_publico)
+
+    # ----- Operaciones con red -----
+
+    def monitorear(self, cuenta: str, forzar: bool = False) -> ResultadoMonitoreo:
+        """
+        Monitorea una cuenta: descarga sus listas, guarda el snapshot y calcula los cambios
+
+        Args:
+            cuenta: Cuenta a monitorear
+            forzar: Descargar aunque la puerta de conteo no detecte cambios
+
+        Returns:
+            ResultadoMonitoreo: Estado, snapshot, reporte y estadísticas de las descargas
+        """
+        return self._ejecutar(self.monitor.monitorear_perfil, cuenta, forzar)
+
+    def seguidores_mutuos(self, cuenta_a: str, cuenta_b: str) -> Optional[ResultadoMutuos]:
+        """Seguidores que tienen en común dos cuentas (None si no se pudo empezar)"""
+        return self._ejecutar(self.monitor.encontrar_seguidores_mutuos, cuenta_a, cuenta_b)
+
+    def conexiones(self, cuenta: str, actualizar: bool = False) -> Optional[ResultadoConexiones]:
+        """Seguidores a los que la cuenta sigue de vuelta (usa las vistas guardadas si las hay)"""
+        return self._ejecutar(self.monitor.analizar_conexiones_seguidores, cuenta, actualizar)
+
+    def trabajar(self, nombre: Optional[str] = None, maximo: Optional[int] = None,
+                 esperar: bool = False) -> Dict[str, int]:
+        """
+        Procesa trabajos de la cola compartida (cola_trabajo.py) con esta sesión
+
+        Args:
+            nombre: Identificador del trabajador (por defecto, máquina:pid)
+            maximo: Trabajos a procesar como máximo
+            esperar: Con la cola vacía, seguir esperando trabajos nuevos
+
+        Returns:
+            Dict[str, int]: Trabajos procesados, terminados y fallidos
+        """
+        return self._ejecutar(self.monitor.trabajar_cola, nombre, maximo, esperar)
+
+    async def monitorear_async(self, cuenta: str, forzar: bool = False) -> ResultadoMonitoreo:
+        return await self._en_hilo(self.monitor.monitorear_perfil, cuenta, forzar)
+
+    async def seguidores_mutuos_async(self, cuenta_a: str, cuenta_b: str) -> Optional[ResultadoMutuos]:
+        return await self._en_hilo(self.monitor.encontrar_seguidores_mutuos, cuenta_a, cuenta_b)
+
+    async def conexiones_async(self, cuenta: str, actualizar: bool = False) -> Optional[ResultadoConexiones]:
+        return await self._en_hilo(self.monitor.analizar_conexiones_seguidores, cuenta, actualizar)
+
+    # ----- Consultas sin red -----
+
+    def snapshot(self, cuenta: str, momento: Optional[str] = None) -> Optional[Snapshot]:
+        """
+        Snapshot guardado de una cuenta
+
+        Args:
+            cuenta: Cuenta monitoreada
+            momento: Fecha u hora (por defecto, el último)
+
+        Returns:
+            Optional[Snapshot]: None si no hay datos guardados (anteriores a ese momento)
+        """
+        cuenta = limpiar_username(cuenta)
+        if momento is None:
+            datos = self.monitor.cargar_datos_anteriores(cuenta)
+        else:
+            try:
+                datos = cargar_snapshot(self.monitor.directorio_datos, cuenta, momento)
+            except ValueError:
+                datos = {}
+        if not datos:
+            return None
+        return Snapshot(cuenta, datos.get("timestamp"), usuarios_de_snapshot(datos, "seguidores"),
+                        usuarios_de_snapshot(datos, "seguidos"))
+
+    def diferencia(self, cuenta: str, desde: str, hasta: str, solo: Optional[str] = None) -> Dict:
+        """
+        Cambios entre dos momentos guardados (misma estructura que los reportes)
+
+        Raises:
+            ValueError: Si las fechas o el filtro no son válidos o no hay datos
+        """
+        return diferencia_entre(self.monitor.directorio_datos, limpiar_username(cuenta), desde, hasta, solo)
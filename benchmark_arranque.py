@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de arranque de SeeYouInstagram
+Mide cuánto tarda en ejecutarse un comando sin red de main.py y comprueba que
+no se carga la pila de red (instaloader/requests)
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Comprueba en el mismo proceso qué módulos pesados quedan cargados
+SCRIPT_MODULOS = (
+    "import sys, main; main.ejecutar_comando({argv!r}); "
+    "print('MODULOS_RED=' + ','.join(m for m in ('instaloader', 'requests') if m in sys.modules))"
+)
+
+
+def medir_comando(argv, repeticiones: int = 10) -> list:
+    """
+    Ejecuta `python main.py <argv>` varias veces y mide el tiempo de pared
+
+    Args:
+        argv: Argumentos del comando
+        repeticiones: Número de ejecuciones
+
+    Returns:
+        list: Tiempos en milisegundos
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", *argv], cwd=DIRECTORIO,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def medir_referencia(repeticiones: int = 10) -> list:
+    """Mide el arranque de un intérprete vacío, como referencia"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=False)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def modulos_de_red_cargados(argv) -> list:
+    """
+    Ejecuta el comando en un proceso y devuelve los módulos de red que se importaron
+
+    Args:
+        argv: Argumentos del comando
+
+    Returns:
+        list: Nombres de módulos de red cargados (vacía si ninguno)
+    """
+    salida = subprocess.run([sys.executable, "-c", SCRIPT_MODULOS.format(argv=list(argv))],
+                            cwd=DIRECTORIO, capture_output=True, text=True, check=False).stdout
+    for linea in salida.splitlines():
+        if linea.startswith("MODULOS_RED="):
+            return [m for m in linea.split("=", 1)[1].split(",") if m]
+    return []
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Mide el tiempo de arranque de los comandos sin red")
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("comando", nargs="*", default=["estructura"],
+                        help="Comando de main.py a medir (por defecto: estructura)")
+    args = parser.parse_args()
+
+    referencia = medir_referencia(args.repeticiones)
+    tiempos = medir_comando(args.comando, args.repeticiones)
+    modulos = modulos_de_red_cargados(args.comando)
+
+    print(f"Comando: python main.py {' '.join(args.comando)}")
+    print(f"  Intérprete vacío: mediana {statistics.median(referencia):.1f} ms")
+    print(f"  Comando:          mediana {statistics.median(tiempos):.1f} ms "
+          f"(mín {min(tiempos):.1f} ms, máx {max(tiempos):.1f} ms)")
+    print(f"  Módulos de red cargados: {', '.join(modulos) if modulos else 'ninguno'}")
+    return 1 if modulos else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bloqueos entre procesos para el Monitor de Instagram
+Varios procesos (en una o varias máquinas que comparten datos_monitoreo) no deben
+escribir a la vez en la carpeta de una cuenta. Cada bloqueo combina:
+
+- un bloqueo fcntl sobre <recurso>.lock, que el sistema suelta solo si el proceso muere
+- un archivo de concesión (lease) con propietario y caducidad, que funciona también
+  en almacenamiento compartido donde fcntl no llega a otras máquinas
+
+El propietario renueva la concesión en segundo plano; si un proceso muere sin
+soltarla, otro la toma cuando caduca (o enseguida si el proceso era de la misma máquina)
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: solo archivo de concesión
+    fcntl = None
+
+import config
+from utils import escribir_json_atomico
+
+ARCHIVO_BLOQUEO = ".bloqueo"
+
+
+class ErrorBloqueo(Exception):
+    """No se pudo obtener un bloqueo o se perdió mientras se usaba"""
+
+
+class Bloqueo:
+    """Concesión exclusiva y renovable sobre un recurso"""
+
+    def __init__(self, ruta: str, duracion: Optional[float] = None, espera: Optional[float] = None):
+        """
+        Args:
+            ruta: Archivo de concesión (junto a él se crea <ruta>.lock)
+            duracion: Segundos que dura la concesión sin renovar (por defecto: BLOQUEO_DURACION)
+            espera: Segundos que se espera a que quede libre (por defecto: BLOQUEO_ESPERA)
+        """
+        self.ruta = ruta
+        self.duracion = config.BLOQUEO_DURACION if duracion is None else duracion
+        self.espera = config.BLOQUEO_ESPERA if espera is None else espera
+        self.host = socket.gethostname()
+        self.token = f"{self.host}:{os.getpid()}:{uuid.uuid4().hex[:12]}"
+        self.adquirido = False
+        self.perdido = False
+        self._fd: Optional[int] = None
+        self._parar = threading.Event()
+        self._latido: Optional[threading.Thread] = None
+
+    # ----- Concesión -----
+
+    def _leer(self) -> Optional[Dict]:
+        """Concesión actual o None; una ilegible (a medio crear) caduca según su fecha de modificación"""
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            try:
+                return {"propietario": None, "expira": os.path.getmtime(self.ruta) + self.duracion}
+            except OSError:
+                return None
+
+    def _caducada(self, concesion: Dict) -> bool:
+        """
+        True si la concesión ha caducado o su proceso (de esta máquina) ya no existe
+        En Windows os.kill(pid, 0) no comprueba nada (envía CTRL_C_EVENT): allí solo cuenta la caducidad
+        """
+        if concesion.get("expira", 0) < time.time():
+            return True
+        if concesion.get("host") == self.host and concesion.get("pid") and os.name != "nt":
+            try:
+                os.kill(concesion["pid"], 0)
+            except ProcessLookupError:
+                return True
+            except PermissionError:
+                pass
+        return False
+
+    def _datos(self) -> Dict:
+        ahora = time.time()
+        return {"propietario": self.token, "host": self.host, "pid": os.getpid(),
+                "adquirido": ahora, "expira": ahora + self.duracion}
+
+    def _crear(self) -> bool:
+        """Crea la concesión solo si no existe (O_EXCL es atómico también en almacenamiento compartido)"""
+        try:
+            fd = os.open(self.ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._datos(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        return True
+
+    def _tomar_caducada(self, concesion: Dict) -> bool:
+        """
+        Aparta una concesión caducada renombrándola; si otro proceso lo hace a la vez
+        solo uno de los dos renombres encuentra el archivo
+        """
+        apartada = f"{self.ruta}.{self.token.replace(':', '_')}.caducada"
+        try:
+            os.rename(self.ruta, apartada)
+        except FileNotFoundError:
+            return False
+        try:
+            with open(apartada, 'r', encoding='utf-8') as f:
+                movida = json.load(f)
+        except (OSError, ValueError):
+            movida = concesion
+        if movida.get("propietario") != concesion.get("propietario") and not self._caducada(movida):
+            # Entre la lectura y el renombre alguien creó una concesión nueva: se devuelve
+            try:
+                os.link(apartada, self.ruta)
+            except OSError:
+                pass
+            os.remove(apartada)
+            return False
+        os.remove(apartada)
+        return True
+
+    def _intentar(self) -> bool:
+        """Un intento de adquirir sin esperar"""
+        if fcntl is not None and self._fd is None:
+            fd = os.open(self.ruta + ".lock", os.O_CREAT | os.O_RDWR, 0o644)
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            self._fd = fd
+        concesion = self._leer()
+        if concesion is not None:
+            if not self._caducada(concesion) or not self._tomar_caducada(concesion):
+                return False
+        return self._crear()
+
+    def _soltar_fcntl(self) -> None:
+        if self._fd is not None:
+            if fcntl is not None:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+    # ----- Uso -----
+
+    def propietario(self) -> Optional[str]:
+        """Quién tiene la concesión ahora mismo (None si nadie)"""
+        concesion = self._leer()
+        if concesion is None or self._caducada(concesion):
+            return None
+        return concesion.get("propietario") or "desconocido"
+
+    def adquirir(self) -> bool:
+        """
+        Intenta adquirir el bloqueo, esperando hasta self.espera segundos
+
+        Returns:
+            bool: True si se adquirió
+        """
+        carpeta = os.path.dirname(self.ruta)
+        if carpeta and not os.path.exists(carpeta):
+            os.makedirs(carpeta, exist_ok=True)
+        limite = time.monotonic() + self.espera
+        while not self._intentar():
+            self._soltar_fcntl()
+            if time.monotonic() >= limite:
+                return False
+            time.sleep(min(config.BLOQUEO_REINTENTO, max(0.0, limite - time.monotonic())))
+        self.adquirido = True
+        self.perdido = False
+        self._parar.clear()
+        self._latido = threading.Thread(target=self._renovar_periodicamente, daemon=True)
+        self._latido.start()
+        return True
+
+    def renovar(self) -> bool:
+        """
+        Alarga la concesión si sigue siendo propia
+
+        Returns:
+            bool: False si otro proceso la ha tomado (self.perdido pasa a True)
+        """
+        concesion = self._leer()
+        if concesion is None or concesion.get("propietario") != self.token:
+            self.perdido = True
+            return False
+        concesion["expira"] = time.time() + self.duracion
+        # Sobrescribir sin más podría pisar la concesión de otro proceso que la tomó tras la
+        # lectura (caducó entretanto). Se aparta la actual renombrándola, se comprueba que es
+        # propia y la nueva se enlaza en su lugar: os.link no sustituye un archivo existente
+        base = f"{self.ruta}.{self.token.replace(':', '_')}"
+        nueva, apartada = f"{base}.nueva", f"{base}.renovada"
+        escribir_json_atomico(nueva, concesion)
+        try:
+            try:
+                os.rename(self.ruta, apartada)
+            except FileNotFoundError:
+                self.perdido = True
+                return False
+            try:
+                with open(apartada, 'r', encoding='utf-8') as f:
+                    propia = json.load(f).get("propietario") == self.token
+            except (OSError, ValueError):
+                propia = False
+            if not propia:
+                # Era de otro proceso: se le devuelve
+                try:
+                    os.link(apartada, self.ruta)
+                except OSError:
+                    pass
+                self.perdido = True
+                return False
+            try:
+                os.link(nueva, self.ruta)
+            except FileExistsError:
+                # Otro proceso creó una concesión mientras no había ninguna: ahora es suya
+                self.perdido = True
+                return False
+            except OSError:
+                # Sistema de archivos sin enlaces duros
+                os.replace(nueva, self.ruta)
+            return True
+        finally:
+            for ruta in (nueva, apartada):
+                try:
+                    os.remove(ruta)
+                except FileNotFoundError:
+                    pass
+
+    def _renovar_periodicamente(self) -> None:
+        while not self._parar.wait(self.duracion / 3):
+            try:
+                if not self.renovar():
+                    return
+            except OSError:
+                # Un fallo puntual del almacenamiento compartido no pierde la concesión hasta que caduque
+                continue
+
+    def vigente(self) -> bool:
+        """True si la concesión sigue siendo propia (comprobar antes de escribir resultados)"""
+        if not self.adquirido or self.perdido:
+            return False
+        concesion = self._leer()
+        return concesion is not None and concesion.get("propietario") == self.token
+
+    def liberar(self) -> None:
+        """Suelta el bloqueo (solo borra la concesión si sigue siendo propia)"""
+        if not self.adquirido:
+            return
+        self._parar.set()
+        if self._latido is not None:
+            self._latido.join()
+            self._latido = None
+        concesion = self._leer()
+        if concesion is not None and concesion.get("propietario") == self.token:
+            try:
+                os.remove(self.ruta)
+            except FileNotFoundError:
+                pass
+        self._soltar_fcntl()
+        self.adquirido = False
+
+    def __enter__(self) -> "Bloqueo":
+        if not self.adquirir():
+            raise ErrorBloqueo(f"{self.ruta} está en uso por {self.propietario() or 'otro proceso'}")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.liberar()
+
+
+def bloqueo_cuenta(directorio_datos: str, cuenta: str, **opciones) -> Bloqueo:
+    """Bloqueo de la carpeta de una cuenta (snapshots, reportes e índices)"""
+    return Bloqueo(os.path.join(directorio_datos, cuenta, ARCHIVO_BLOQUEO), **opciones)
+
+
+def bloqueo_compartido(directorio_datos: str, recurso: str, **opciones) -> Bloqueo:
+    """
+    Bloqueo breve de un archivo común a todas las cuentas (feed, índice invertido, enriquecimiento)
+    Por defecto espera BLOQUEO_ESPERA_COMPARTIDO segundos, ya que quien lo tiene lo suelta enseguida
+    """
+    opciones.setdefault("espera", config.BLOQUEO_ESPERA_COMPARTIDO)
+    return Bloqueo(os.path.join(directorio_datos, f"{ARCHIVO_BLOQUEO}_{recurso}"), **opciones)
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cola de trabajo compartida del Monitor de Instagram
+Reparte el monitoreo de una lista de cuentas entre varios procesos o máquinas,
+cada uno con su sesión y su limitador. Los trabajos viven en una base SQLite
+(datos_monitoreo/cola_trabajo.db) y cada trabajador los toma en concesión:
+
+- un trabajo tomado queda oculto COLA_VISIBILIDAD segundos; el trabajador alarga
+  la concesión mientras trabaja y, si muere, el trabajo vuelve a la cola al caducar
+- un fallo se reintenta con espera creciente hasta COLA_MAX_INTENTOS
+- se toma primero la prioridad más alta y, a igualdad, el trabajo más antiguo
+- cada intento queda registrado en la tabla ejecuciones con su resultado
+
+Para varias máquinas, la base debe estar en un almacenamiento con bloqueos de
+archivo fiables (SQLite no es seguro sobre algunos montajes de red)
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional
+
+import config
+from utils import ModuloDiferido
+
+# main.py importa los estados para construir el parser: sqlite3 y el resto se cargan al usar la cola
+sqlite3 = ModuloDiferido("sqlite3")
+socket = ModuloDiferido("socket")
+uuid = ModuloDiferido("uuid")
+resultados = ModuloDiferido("resultados")
+
+ARCHIVO_COLA = "cola_trabajo.db"
+
+# Estados de un trabajo
+PENDIENTE = "pendiente"
+EN_CURSO = "en_curso"
+TERMINADO = "terminado"
+DESCARTADO = "descartado"  # Agotó los intentos o falló sin remedio
+
+# Motivos de ResultadoMonitoreo que no se arreglan reintentando
+MOTIVOS_DEFINITIVOS = {"usuario_invalido"}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS trabajos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cuenta TEXT NOT NULL,
+    forzar INTEGER NOT NULL DEFAULT 0,
+    prioridad INTEGER NOT NULL DEFAULT 0,
+    estado TEXT NOT NULL,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    max_intentos INTEGER NOT NULL,
+    disponible REAL NOT NULL,
+    trabajador TEXT,
+    concesion TEXT,
+    creado REAL NOT NULL,
+    actualizado REAL NOT NULL,
+    resultado TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS trabajos_siguiente ON trabajos (estado, prioridad DESC, id);
+CREATE TABLE IF NOT EXISTS ejecuciones (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    trabajo INTEGER NOT NULL REFERENCES trabajos (id),
+    trabajador TEXT NOT NULL,
+    inicio REAL NOT NULL,
+    fin REAL,
+    estado TEXT,
+    resultado TEXT
+);
+"""
+
+
+def nombre_trabajador() -> str:
+    """Identificador por defecto de un trabajador (máquina y proceso)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def resumen_resultado(resultado: "resultados.ResultadoMonitoreo") -> Dict:
+    """
+    Datos de un ResultadoMonitoreo que se guardan en la cola (sin las listas completas)
+
+    Args:
+        resultado: Resultado de monitorear_perfil
+
+    Returns:
+        Dict: Estado, motivo, timestamp, número de cambios y estadísticas de cada descarga
+    """
+    resumen = {
+        "estado": resultado.estado,
+        "motivo": resultado.motivo,
+        "timestamp": resultado.snapshot.timestamp if resultado.snapshot else None,
+        "rastreos": [{"tipo": r.tipo, "obtenidos": r.obtenidos, "completo": r.completo,
+                      "segundos": round(r.segundos, 1)} for r in resultado.rastreos],
+    }
+    if resultado.snapshot:
+        resumen["seguidores"] = len(resultado.snapshot.seguidores)
+        resumen["seguidos"] = len(resultado.snapshot.seguidos)
+        resumen["nuevos_seguidores"] = len(resultado.nuevos_seguidores)
+        resumen["seguidores_perdidos"] = len(resultado.seguidores_perdidos)
+        resumen["nuevos_seguidos"] = len(resultado.nuevos_seguidos)
+        resumen["seguidos_eliminados"] = len(resultado.seguidos_eliminados)
+    return resumen
+
+
+class ColaTrabajo:
+    """Trabajos de monitoreo compartidos entre trabajadores"""
+
+    def __init__(self, directorio_datos: str, visibilidad: Optional[float] = None):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+            visibilidad: Segundos que un trabajo tomado queda oculto sin renovar (por defecto: COLA_VISIBILIDAD)
+        """
+        self.ruta = os.path.join(directorio_datos, ARCHIVO_COLA)
+        self.visibilidad = config.COLA_VISIBILIDAD if visibilidad is None else visibilidad
+        if not os.path.exists(directorio_datos):
+            os.makedirs(directorio_datos, exist_ok=True)
+        with closing(self._conectar()) as conexion:
+            conexion.executescript(ESQUEMA)
+
+    def _conectar(self) -> "sqlite3.Connection":
+        """
+        Conexión nueva para cada operación (así cada hilo usa la suya); con
+        isolation_level None las transacciones se abren a mano con BEGIN IMMEDIATE
+        """
+        conexion = sqlite3.connect(self.ruta, timeout=30, isolation_level=None)
+        conexion.row_factory = sqlite3.Row
+        return conexion
+
+    def _transaccion(self, operacion):
+        """Ejecuta operacion(conexion) en una transacción de escritura y devuelve su resultado"""
+        conexion = self._conectar()
+        try:
+            conexion.execute("BEGIN IMMEDIATE")
+            try:
+                valor = operacion(conexion)
+            except BaseException:
+                conexion.execute("ROLLBACK")
+                raise
+            conexion.execute("COMMIT")
+            return valor
+        finally:
+            conexion.close()
+
+    # ----- Productores -----
+
+    def encolar(self, cuentas: Iterable[str], prioridad: int = 0, forzar: bool = False,
+                max_intentos: Optional[int] = None) -> int:
+        """
+        Añade un trabajo por cuenta; una cuenta que ya tiene un trabajo pendiente o
+        en curso no se repite (solo se sube su prioridad si la nueva es mayor)
+
+        Args:
+            cuentas: Cuentas a monitorear
+            prioridad: Los trabajos de mayor prioridad se toman antes
+            forzar: Descargar aunque la puerta de conteo no detecte cambios
+            max_intentos: Intentos antes de descartar el trabajo (por defecto: COLA_MAX_INTENTOS)
+
+        Returns:
+            int: Trabajos nuevos
+        """
+        max_intentos = max_intentos or config.COLA_MAX_INTENTOS
+
+        def operacion(conexion):
+            ahora = time.time()
+            nuevos = 0
+            for cuenta in cuentas:
+                activo = conexion.execute("SELECT id, prioridad FROM trabajos WHERE cuenta = ? AND estado IN (?, ?)",
+                                          (cuenta, PENDIENTE, EN_CURSO)).fetchone()
+                if activo is not None:
+                    if prioridad > activo["prioridad"]:
+                        conexion.execute("UPDATE trabajos SET prioridad = ?, actualizado = ? WHERE id = ?",
+                                         (prioridad, ahora, activo["id"]))
+                    continue
+                conexion.execute(
+                    "INSERT INTO trabajos (cuenta, forzar, prioridad, estado, max_intentos, disponible, creado, actualizado) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (cuenta, int(forzar), prioridad, PENDIENTE, max_intentos, ahora, ahora, ahora))
+                nuevos += 1
+            return nuevos
+        return self._transaccion(operacion)
+
+    def reintentar_descartados(self) -> int:
+        """Devuelve a la cola los trabajos descartados, con los intentos a cero"""
+        def operacion(conexion):
+            ahora = time.time()
+            return conexion.execute(
+                "UPDATE trabajos SET estado = ?, intentos = 0, disponible = ?, actualizado = ?, error = NULL "
+                "WHERE estado = ?", (PENDIENTE, ahora, ahora, DESCARTADO)).rowcount
+        return self._transaccion(operacion)
+
+    # ----- Trabajadores -----
+
+    def tomar(self, trabajador: str) -> Optional[Dict]:
+        """
+        Toma en concesión el siguiente trabajo disponible: uno pendiente cuya espera
+        terminó o uno en curso cuya concesión caducó (su trabajador murió)
+
+        Args:
+            trabajador: Identificador del trabajador
+
+        Returns:
+            Optional[Dict]: Trabajo (con la clave "concesion", necesaria para cerrarlo) o None si no hay
+        """
+        def operacion(conexion):
+            ahora = time.time()
+            while True:
+                fila = conexion.execute(
+                    "SELECT * FROM trabajos WHERE estado IN (?, ?) AND disponible <= ? "
+                    "ORDER BY prioridad DESC, id LIMIT 1", (PENDIENTE, EN_CURSO, ahora)).fetchone()
+                if fila is None:
+                    return None
+                if fila["intentos"] >= fila["max_intentos"]:
+                    # Concesión caducada en el último intento: el trabajador murió cada vez
+                    conexion.execute("UPDATE trabajos SET estado = ?, actualizado = ?, error = ? WHERE id = ?",
+                                     (DESCARTADO, ahora, "concesión caducada", fila["id"]))
+                    continue
+                concesion = uuid.uuid4().hex
+                conexion.execute(
+                    "UPDATE trabajos SET estado = ?, intentos = intentos + 1, disponible = ?, trabajador = ?, "
+                    "concesion = ?, actualizado = ? WHERE id = ?",
+                    (EN_CURSO, ahora + self.visibilidad, trabajador, concesion, ahora, fila["id"]))
+                conexion.execute("INSERT INTO ejecuciones (trabajo, trabajador, inicio) VALUES (?, ?, ?)",
+                                 (fila["id"], trabajador, ahora))
+                return dict(fila, estado=EN_CURSO, intentos=fila["intentos"] + 1,
+                            trabajador=trabajador, concesion=concesion)
+        return self._transaccion(operacion)
+
+    def renovar(self, trabajo: Dict) -> bool:
+        """
+        Alarga la concesión de un trabajo tomado
+
+        Returns:
+            bool: False si la concesión ya no es propia (caducó y otro trabajador lo tomó)
+        """
+        def operacion(conexion):
+            ahora = time.time()
+            return conexion.execute(
+                "UPDATE trabajos SET disponible = ?, actualizado = ? WHERE id = ? AND concesion = ? AND estado = ?",
+                (ahora + self.visibilidad, ahora, trabajo["id"], trabajo["concesion"], EN_CURSO)).rowcount == 1
+        return self._transaccion(operacion)
+
+    def terminar(self, trabajo: Dict, resultado: "resultados.ResultadoMonitoreo") -> Optional[str]:
+        """
+        Cierra un trabajo con el resultado del monitoreo; los fallos vuelven a la cola
+        con espera creciente (COLA_REINTENTO_BASE · 2^(intentos-1)) mientras queden intentos
+
+        Args:
+            trabajo: Trabajo devuelto por tomar
+            resultado: Resultado de monitorear_perfil
+
+        Returns:
+            Optional[str]: Nuevo estado del trabajo o None si la concesión ya no era propia
+        """
+        resumen = resumen_resultado(resultado)
+        error = resultado.motivo if resultado.estado == resultados.FALLIDO else None
+        return self._cerrar(trabajo, resumen, error, resultado.motivo in MOTIVOS_DEFINITIVOS)
+
+    def fallar(self, trabajo: Dict, error: str) -> Optional[str]:
+        """Cierra un trabajo cuyo monitoreo lanzó una excepción (se reintenta como un fallo)"""
+        return self._cerrar(trabajo, {"estado": resultados.FALLIDO, "motivo": "excepcion"}, error, False)
+
+    def _cerrar(self, trabajo: Dict, resumen: Dict, error: Optional[str], definitivo: bool) -> Optional[str]:
+        def operacion(conexion):
+            ahora = time.time()
+            fila = conexion.execute("SELECT concesion, estado FROM trabajos WHERE id = ?", (trabajo["id"],)).fetchone()
+            propia = fila is not None and fila["concesion"] == trabajo["concesion"] and fila["estado"] == EN_CURSO
+            conexion.execute(
+                "UPDATE ejecuciones SET fin = ?, estado = ?, resultado = ? "
+                "WHERE id = (SELECT MAX(id) FROM ejecuciones WHERE trabajo = ? AND trabajador = ?)",
+                (ahora, resumen["estado"], json.dumps(resumen, ensure_ascii=False), trabajo["id"], trabajo["trabajador"]))
+            if not propia:
+                return None
+            if error is None:
+                estado, disponible = TERMINADO, ahora
+            elif definitivo or trabajo["intentos"] >= trabajo["max_intentos"]:
+                estado, disponible = DESCARTADO, ahora
+            else:
+                estado = PENDIENTE
+                disponible = ahora + config.COLA_REINTENTO_BASE * 2 ** (trabajo["intentos"] - 1)
+            conexion.execute(
+                "UPDATE trabajos SET estado = ?, disponible = ?, concesion = NULL, actualizado = ?, "
+                "resultado = ?, error = ? WHERE id = ?",
+                (estado, disponible, ahora, json.dumps(resumen, ensure_ascii=False), error, trabajo["id"]))
+            return estado
+        return self._transaccion(operacion)
+
+    # ----- Consultas -----
+
+    def estado(self) -> Dict[str, int]:
+        """Número de trabajos en cada estado"""
+        with closing(self._conectar()) as conexion:
+            filas = conexion.execute("SELECT estado, COUNT(*) AS n FROM trabajos GROUP BY estado").fetchall()
+        conteos = {PENDIENTE: 0, EN_CURSO: 0, TERMINADO: 0, DESCARTADO: 0}
+        conteos.update({fila["estado"]: fila["n"] for fila in filas})
+        return conteos
+
+    def trabajos(self, estado: Optional[str] = None, limite: int = 50) -> List[Dict]:
+        """
+        Trabajos más recientes, con su último resultado
+
+        Args:
+            estado: Solo los de este estado (por defecto, todos)
+            limite: Número máximo de trabajos
+
+        Returns:
+            List[Dict]: Trabajos del más reciente al más antiguo
+        """
+        consulta = "SELECT * FROM trabajos"
+        parametros: tuple = ()
+        if estado:
+            consulta += " WHERE estado = ?"
+            parametros = (estado,)
+        consulta += " ORDER BY actualizado DESC LIMIT ?"
+        with closing(self._conectar()) as conexion:
+            filas = conexion.execute(consulta, parametros + (limite,)).fetchall()
+        trabajos = []
+        for fila in filas:
+            trabajo = dict(fila)
+            trabajo["resultado"] = json.loads(trabajo["resultado"]) if trabajo["resultado"] else None
+            trabajos.append(trabajo)
+        return trabajos
+
+    def ejecuciones(self, trabajo: int) -> List[Dict]:
+        """Intentos de un trabajo, en orden"""
+        with closing(self._conectar()) as conexion:
+            filas = conexion.execute("SELECT * FROM ejecuciones WHERE trabajo = ? ORDER BY id", (trabajo,)).fetchall()
+        return [dict(fila, resultado=json.loads(fila["resultado"]) if fila["resultado"] else None) for fila in filas]
+
+
+class LatidoTrabajo:
+    """Hilo que renueva la concesión de un trabajo mientras se procesa"""
+
+    def __init__(self, cola: ColaTrabajo, trabajo: Dict):
+        self.cola = cola
+        self.trabajo = trabajo
+        self.perdido = False
+        self._parar = threading.Event()
+        self._hilo = threading.Thread(target=self._renovar, daemon=True)
+
+    def _renovar(self) -> None:
+        while not self._parar.wait(self.cola.visibilidad / 3):
+            try:
+                if not self.cola.renovar(self.trabajo):
+                    self.perdido = True
+                    return
+            except sqlite3.Error:
+                # Base ocupada o inaccesible un momento: se reintenta en el siguiente latido
+                continue
+
+    def __enter__(self) -> "LatidoTrabajo":
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._parar.set()
+        self._hilo.join()
@@ -10,15 +10,56 @@ DIRECTORIO_DATOS = "datos_monitoreo"
 EXTENSION_DATOS = "_datos.json"
 EXTENSION_REPORTES = "_reportes.json"
 EXTENSION_SESION = "_session"
+DIRECTORIO_GRABACIONES = "grabaciones"  # Respuestas grabadas para pruebas de rendimiento
 
 # Configuración de la interfaz
 USAR_COLORES = True
 MOSTRAR_ICONOS = True
+INTERVALO_BARRA_PROGRESO = 0.5  # Segundos mínimos entre repintados de la barra de progreso
 
 # Configuración de monitoreo
 MAX_REPORTES_GUARDADOS = 50
 MAX_USUARIOS_MOSTRAR = 10  # Máximo de usuarios a mostrar en listas largas
 
+# Puerta de conteo: antes de descargar las listas se comparan los contadores del perfil con el último snapshot
+PUERTA_CONTEO = "desactivada"  # "desactivada", "omitir" (sin cambios en contadores → no descargar) o "parcial"
+PUERTA_MUESTRA_PARCIAL = 24  # Modo "parcial": seguidores/seguidos más recientes que se comprueban
+PUERTA_MAX_HORAS_SIN_RASTREO = 7 * 24  # Pasado este tiempo desde el último snapshot se descarga siempre
+
+# Detección de anomalías (media y varianza exponenciales de los cambios de cada cuenta)
+ANOMALIA_ALFA = 0.2  # Peso de la observación más reciente (0-1)
+ANOMALIA_UMBRAL_Z = 3.5  # Desviaciones a partir de las que un cambio se marca como anómalo
+ANOMALIA_MIN_OBSERVACIONES = 5  # Observaciones necesarias antes de marcar anomalías
+# Enriquecimiento de usuarios nuevos (datos de perfil de los nuevos seguidores y seguidos)
+ENRIQUECIMIENTO_PRESUPUESTO = 20  # Perfiles consultados como máximo en cada monitoreo (0 = solo encolar)
+ENRIQUECIMIENTO_LOTE = 5  # Perfiles por lote; entre lotes se guarda el progreso y se hace una pausa
+ENRIQUECIMIENTO_PAUSA_LOTE = 20  # Segundos de pausa entre lotes
+ENRIQUECIMIENTO_TTL_DIAS = 30  # Días que se reutilizan los datos de un perfil antes de volver a consultarlo
+ENRIQUECIMIENTO_MAX_INTENTOS = 3  # Consultas fallidas tras las que un usuario sale de la cola
+# Exploración del vecindario (seguidores de seguidores) con frontera persistente
+GRAFO_PROFUNDIDAD = 2  # Niveles que se expanden: 1 = solo la cuenta, 2 = también sus seguidores
+GRAFO_PRESUPUESTO = 200  # Peticiones (perfil + páginas de seguidores) por ejecución
+GRAFO_MAX_SEGUIDORES_NODO = 2000  # Seguidores que se descargan como máximo de cada cuenta expandida
+FEED_TAMANO_SEGMENTO = 8 * 1024 * 1024  # Bytes a partir de los cuales el registro de cambios abre un segmento nuevo
+API_HOST = "127.0.0.1"  # Dirección del servidor de la API de solo lectura (comando servidor)
+API_PUERTO = 8765  # Puerto del servidor de la API
+API_POR_PAGINA = 500  # Usuarios por página cuando no se indica por_pagina
+API_MAX_POR_PAGINA = 5000  # Máximo de elementos por página
+API_CACHE_SNAPSHOTS = 8  # Snapshots y reportes interpretados que se mantienen en memoria
+API_CACHE_RESPUESTAS = 256  # Respuestas ya serializadas que se mantienen en memoria
+BLOQUEO_DURACION = 120  # Segundos que dura una concesión de bloqueo sin renovar (se renueva cada tercio)
+BLOQUEO_ESPERA = 0  # Segundos que se espera a que otro proceso suelte una cuenta (0: no esperar)
+BLOQUEO_ESPERA_COMPARTIDO = 30  # Segundos que se espera por archivos comunes (feed, índice invertido, enriquecimiento)
+BLOQUEO_REINTENTO = 1  # Segundos entre intentos de adquirir un bloqueo ocupado
+COLA_VISIBILIDAD = 1800  # Segundos que un trabajo tomado de la cola queda oculto sin renovar (se renueva cada tercio)
+COLA_MAX_INTENTOS = 3  # Intentos de un trabajo de la cola antes de descartarlo
+COLA_REINTENTO_BASE = 300  # Segundos de espera tras el primer fallo (se duplica en cada reintento)
+COLA_ESPERA_VACIA = 30  # Segundos entre consultas de un trabajador que espera trabajos nuevos
+ESCRITOR_CAPACIDAD = 4  # Archivos distintos pendientes en el escritor en segundo plano antes de que la descarga espere
+ESCRITOR_ESPERA_SALIDA = 30  # Segundos que se espera a los guardados pendientes al terminar el proceso
+UMBRAL_SOLAPAMIENTO_EXACTO = 20000  # Por encima de estos seguidores el solapamiento se estima con bosquejos
+TAMANO_BOSQUEJO = 1024  # Hashes guardados por snapshot para estimar solapamientos (más hashes, más precisión)
+
 # Configuración de timeouts
 TIMEOUT_CONEXION = 30  # segundos
 REINTENTOS_CONEXION = 3
@@ -26,12 +67,13 @@ REINTENTOS_CONEXION = 3
 # Configuración de seguridad
 GUARDAR_SESIONES = True  # Cambiar a False para no guardar sesiones
 LIMPIAR_SESIONES_AL_SALIR = False  # Cambiar a True para limpiar sesiones automáticamente
+VENTANA_FRESCURA_SESION = 6 * 3600  # Segundos en que una sesión validada se reutiliza sin comprobarla
 
 # Mensajes personalizados
 MENSAJE_BIENVENIDA = "Bienvenido al Monitor de Instagram SeeYouInstagram"
 MENSAJE_DESPEDIDA = "¡Gracias por usar SeeYouInstagram! 👋"
 
-# Configuración de logs (para futuras versiones)
-HABILITAR_LOGS = False
-NIVEL_LOG = "INFO"  # DEBUG, INFO, WARNING, ERROR
+# Configuración de logs
+HABILITAR_LOGS = False  # True para copiar toda la salida (sin colores) en ARCHIVO_LOG
+NIVEL_LOG = "INFO"  # DEBUG, INFO, WARNING, ERROR (se aplica a consola y archivo)
 ARCHIVO_LOG = "seeyouinstagram.log"
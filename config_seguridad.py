@@ -16,6 +16,9 @@ MAX_REQUESTS_PER_MINUTE = 15
 MIN_DELAY_BETWEEN_REQUESTS = 2.0
 MAX_DELAY_BETWEEN_REQUESTS = 5.0
 
+# Cada cuántos elementos procesados se aplica el delay entre requests
+ELEMENTS_BETWEEN_DELAYS = 10
+
 # Delay extra cada ciertos elementos procesados
 ELEMENTS_BEFORE_LONG_PAUSE = 100
 LONG_PAUSE_MIN = 3.0
@@ -89,6 +92,22 @@ ASK_USER_CONTINUE_INTERVAL = 120
 # Pausa de seguridad cada N elementos
 SECURITY_PAUSE_INTERVAL = 180
 
+# ========================================
+# SIMULACIÓN DE LÍMITES (simulador_limites.py)
+# ========================================
+
+# Cuota supuesta del servidor: lista de (ventana en segundos, máximo de requests)
+SIMULATED_SERVER_WINDOWS = [(60, 20), (3600, 200)]
+
+# Segundos que el servidor bloquea al cliente tras superar la cuota
+SIMULATED_PENALTY_TIME = 900
+
+# Elementos que devuelve cada página de seguidores/seguidos
+SIMULATED_PAGE_SIZE = 50
+
+# Latencia media de una respuesta del servidor (en segundos)
+SIMULATED_RESPONSE_LATENCY = 0.8
+
 # ========================================
 # MENSAJES DE SEGURIDAD
 # ========================================
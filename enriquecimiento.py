@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Enriquecimiento de usuarios nuevos para el Monitor de Instagram
+Los reportes solo traen nombres de usuario. Los nuevos seguidores y seguidos de
+cada reporte se ponen en una cola común; la cola se consulta por lotes con un
+presupuesto de peticiones por ejecución y los datos de perfil se guardan en una
+caché con caducidad, de modo que ningún usuario se consulta dos veces
+"""
+
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import config
+from utils import ModuloDiferido, escribir_json_atomico, formatear_numero
+
+# Los bloqueos entre procesos solo hacen falta al guardar; no se cargan al importar
+bloqueos = ModuloDiferido("bloqueos")
+
+CARPETA_ENRIQUECIMIENTO = "enriquecimiento"
+
+
+def datos_de_perfil(profile) -> Dict:
+    """
+    Extrae los datos que interesan para clasificar a un usuario (sin peticiones extra)
+
+    Args:
+        profile: instaloader.Profile
+
+    Returns:
+        Dict: ID, privacidad, verificación, tipo de cuenta y contadores
+    """
+    return {
+        "id": profile.userid,
+        "nombre": profile.full_name,
+        "privado": profile.is_private,
+        "verificado": profile.is_verified,
+        "empresa": profile.is_business_account,
+        "categoria": profile.business_category_name,
+        "seguidores": profile.followers,
+        "seguidos": profile.followees,
+        "publicaciones": profile.mediacount
+    }
+
+
+def etiquetas(datos: Dict) -> str:
+    """Resumen corto de unos datos de perfil para mostrar junto al nombre"""
+    if datos.get("no_existe"):
+        return "(ya no existe)"
+    partes = [f"{formatear_numero(datos['seguidores'])} seguidores"]
+    if datos.get("privado"):
+        partes.append("🔒")
+    if datos.get("verificado"):
+        partes.append("✔️")
+    if datos.get("empresa"):
+        partes.append(f"💼 {datos['categoria']}" if datos.get("categoria") else "💼")
+    return "(" + " · ".join(partes) + ")"
+
+
+class CacheEnriquecimiento:
+    """Datos de perfil ya consultados, con la fecha de consulta"""
+
+    def __init__(self, directorio_datos: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+        """
+        self.directorio_datos = directorio_datos
+        self.ruta = os.path.join(directorio_datos, CARPETA_ENRIQUECIMIENTO, "cache.json")
+        self.entradas: Dict[str, Dict] = _leer(self.ruta, {})
+        # Cambios propios desde la última lectura, para combinarlos con los de otros procesos
+        self._actualizados: Set[str] = set()
+        self._purgados: Set[str] = set()
+
+    def vigente(self, username: str, ahora: Optional[float] = None) -> Optional[Dict]:
+        """
+        Devuelve los datos de un usuario si se consultaron hace menos de ENRIQUECIMIENTO_TTL_DIAS
+
+        Args:
+            username: Nombre de usuario
+            ahora: Epoch de referencia (por defecto, ahora)
+
+        Returns:
+            Optional[Dict]: Datos del perfil o None si no hay o han caducado
+        """
+        entrada = self.entradas.get(username)
+        if entrada is None:
+            return None
+        if (ahora or time.time()) - entrada["obtenido"] > config.ENRIQUECIMIENTO_TTL_DIAS * 86400:
+            return None
+        return entrada
+
+    def guardar_datos(self, username: str, datos: Dict) -> None:
+        """Guarda los datos de un usuario con la fecha actual"""
+        self.entradas[username] = dict(datos, obtenido=time.time())
+        self._actualizados.add(username)
+        self._purgados.discard(username)
+
+    def purgar(self, ahora: Optional[float] = None) -> int:
+        """Elimina las entradas caducadas y devuelve cuántas había"""
+        caducadas = [u for u in self.entradas if self.vigente(u, ahora) is None]
+        for username in caducadas:
+            del self.entradas[username]
+            self._purgados.add(username)
+            self._actualizados.discard(username)
+        return len(caducadas)
+
+    def guardar(self) -> None:
+        """
+        Escribe la caché en disco, combinando los cambios propios con los que otros
+        procesos hayan guardado desde que se leyó
+
+        Raises:
+            ErrorBloqueo: Si otro proceso retiene la caché más de BLOQUEO_ESPERA_COMPARTIDO
+        """
+        with bloqueos.bloqueo_compartido(self.directorio_datos, "enriquecimiento"):
+            entradas = _leer(self.ruta, {})
+            for username in self._purgados:
+                entradas.pop(username, None)
+            for username in self._actualizados:
+                entradas[username] = self.entradas[username]
+            escribir_json_atomico(self.ruta, entradas)
+        self.entradas = entradas
+        self._actualizados.clear()
+        self._purgados.clear()
+
+
+class ColaEnriquecimiento:
+    """Usuarios pendientes de consultar, en orden de llegada y sin repetidos"""
+
+    def __init__(self, directorio_datos: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+        """
+        self.directorio_datos = directorio_datos
+        self.ruta = os.path.join(directorio_datos, CARPETA_ENRIQUECIMIENTO, "cola.json")
+        self.pendientes: List[Dict] = _leer(self.ruta, [])
+        self._encolados = {entrada["username"] for entrada in self.pendientes}
+        # Usuarios añadidos o modificados y usuarios que salieron de la cola desde la última lectura
+        self._tocados: Set[str] = set()
+        self._retirados: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.pendientes)
+
+    def encolar(self, usuarios: Iterable[str], cuenta: str, cache: CacheEnriquecimiento) -> int:
+        """
+        Añade usuarios que no estén ya en la cola ni en la caché vigente
+
+        Args:
+            usuarios: Nombres de usuario
+            cuenta: Cuenta monitoreada en cuyo reporte aparecieron
+            cache: Caché de datos ya consultados
+
+        Returns:
+            int: Usuarios agregados
+        """
+        agregados = 0
+        for username in usuarios:
+            if username in self._encolados or cache.vigente(username):
+                continue
+            self.pendientes.append({"username": username, "cuenta": cuenta, "encolado": time.time(), "intentos": 0})
+            self._encolados.add(username)
+            self._tocados.add(username)
+            self._retirados.discard(username)
+            agregados += 1
+        return agregados
+
+    def siguientes(self, cantidad: int) -> List[Dict]:
+        """Primeras entradas de la cola (sin quitarlas)"""
+        return self.pendientes[:cantidad]
+
+    def completar(self, username: str) -> None:
+        """Quita un usuario ya consultado"""
+        self.pendientes = [e for e in self.pendientes if e["username"] != username]
+        self._encolados.discard(username)
+        self._retirados.add(username)
+        self._tocados.discard(username)
+
+    def fallo(self, username: str) -> None:
+        """Cuenta un intento fallido; tras ENRIQUECIMIENTO_MAX_INTENTOS el usuario sale de la cola"""
+        for entrada in self.pendientes:
+            if entrada["username"] == username:
+                entrada["intentos"] += 1
+                self._tocados.add(username)
+                if entrada["intentos"] >= config.ENRIQUECIMIENTO_MAX_INTENTOS:
+                    self.completar(username)
+                else:
+                    # Al final de la cola para no bloquear al resto
+                    self.pendientes.remove(entrada)
+                    self.pendientes.append(entrada)
+                return
+
+    def cuentas(self) -> List[str]:
+        """Cuentas con usuarios pendientes"""
+        return sorted({entrada["cuenta"] for entrada in self.pendientes})
+
+    def guardar(self) -> None:
+        """
+        Escribe la cola en disco, combinando los cambios propios con los que otros
+        procesos hayan guardado desde que se leyó: los usuarios tocados aquí van al
+        final con su estado propio y los retirados aquí desaparecen
+
+        Raises:
+            ErrorBloqueo: Si otro proceso retiene la cola más de BLOQUEO_ESPERA_COMPARTIDO
+        """
+        with bloqueos.bloqueo_compartido(self.directorio_datos, "enriquecimiento"):
+            excluidos = self._tocados | self._retirados
+            pendientes = [e for e in _leer(self.ruta, []) if e["username"] not in excluidos]
+            pendientes.extend(e for e in self.pendientes if e["username"] in self._tocados)
+            escribir_json_atomico(self.ruta, pendientes)
+        self.pendientes = pendientes
+        self._encolados = {entrada["username"] for entrada in self.pendientes}
+        self._tocados.clear()
+        self._retirados.clear()
+
+
+def _leer(ruta: str, vacio):
+    """Contenido JSON de un archivo o el valor vacío si no existe"""
+    if not os.path.exists(ruta):
+        return vacio
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def usuarios_nuevos(reporte: Dict) -> List[str]:
+    """Nuevos seguidores y nuevos seguidos de un reporte, sin repetir"""
+    if reporte.get("es_primer_monitoreo"):
+        return []
+    nuevos = reporte["cambios_seguidores"]["nuevos"] + reporte["cambios_seguidos"]["nuevos"]
+    return list(dict.fromkeys(nuevos))
+
+
+def anotar_reporte(reporte: Dict, cache: CacheEnriquecimiento) -> int:
+    """
+    Añade al reporte los datos en caché de sus usuarios nuevos (reporte['enriquecimiento'])
+
+    Args:
+        reporte: Reporte de cambios
+        cache: Caché de datos consultados
+
+    Returns:
+        int: Usuarios anotados
+    """
+    anotaciones = {}
+    for username in usuarios_nuevos(reporte):
+        datos = cache.vigente(username)
+        if datos is not None:
+            anotaciones[username] = {clave: valor for clave, valor in datos.items() if clave != "obtenido"}
+    if anotaciones:
+        reporte["enriquecimiento"] = anotaciones
+    return len(anotaciones)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Escritura en segundo plano para el Monitor de Instagram
+Los guardados parciales se piden desde el bucle de descarga; serializarlos y
+sincronizarlos con el disco ahí retrasaría la siguiente petición. EscritorFondo
+recibe los datos ya copiados y los escribe desde un hilo propio:
+
+- si llegan varios guardados de la misma ruta antes de escribirse, solo se escribe
+  el último (cada guardado parcial sustituye al anterior)
+- la cola admite ESCRITOR_CAPACIDAD rutas distintas; si se llena, quien encola espera
+- cada archivo se escribe con escribir_json_atomico y el resultado (o el error)
+  se comunica al callback al_terminar
+- al salir del proceso (atexit o SIGTERM) se vacían todas las colas pendientes
+"""
+
+import atexit
+import signal
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import config
+from utils import escribir_json_atomico
+
+Terminado = Callable[[str, Any, Optional[Exception]], None]
+
+_escritores: "weakref.WeakSet[EscritorFondo]" = weakref.WeakSet()
+_manejadores_instalados = False
+
+
+class EscritorFondo:
+    """Cola acotada de escrituras JSON atendida por un hilo"""
+
+    def __init__(self, al_terminar: Optional[Terminado] = None, capacidad: Optional[int] = None):
+        """
+        Args:
+            al_terminar: Callback (ruta, contexto, error) tras cada escritura; error es None si
+                         fue bien. Se llama desde el hilo escritor
+            capacidad: Rutas distintas pendientes como máximo (por defecto: ESCRITOR_CAPACIDAD)
+        """
+        self.al_terminar = al_terminar
+        self.capacidad = capacidad or config.ESCRITOR_CAPACIDAD
+        self._pendientes: "OrderedDict[str, Tuple[Any, Dict, Any]]" = OrderedDict()
+        self._escribiendo: Optional[str] = None
+        self._errores: List[Tuple[str, Exception]] = []
+        self._condicion = threading.Condition()
+        self._hilo: Optional[threading.Thread] = None
+        _escritores.add(self)
+        _instalar_manejadores()
+
+    def encolar(self, ruta: str, datos: Any, contexto: Any = None, **opciones) -> None:
+        """
+        Pide escribir datos como JSON en ruta; sustituye a otra petición pendiente de la misma ruta
+
+        Args:
+            ruta: Archivo de destino
+            datos: Objeto serializable; no debe modificarse después (pasar una copia)
+            contexto: Valor que se devuelve tal cual a al_terminar
+            **opciones: Opciones de json.dump (p. ej. indent)
+        """
+        with self._condicion:
+            while ruta not in self._pendientes and len(self._pendientes) >= self.capacidad:
+                self._condicion.wait()
+            self._pendientes[ruta] = (datos, opciones, contexto)
+            self._pendientes.move_to_end(ruta)
+            if self._hilo is None or not self._hilo.is_alive():
+                # El hilo se crea con la primera escritura: los comandos sin descargas no lo arrancan
+                self._hilo = threading.Thread(target=self._trabajar, name="escritor_fondo", daemon=True)
+                self._hilo.start()
+            self._condicion.notify_all()
+
+    def descartar(self, ruta: str) -> bool:
+        """
+        Anula una escritura pendiente (no la que ya está en curso)
+
+        Returns:
+            bool: True si había una pendiente
+        """
+        with self._condicion:
+            descartada = self._pendientes.pop(ruta, None) is not None
+            self._condicion.notify_all()
+            return descartada
+
+    def vaciar(self, espera: Optional[float] = None) -> List[Tuple[str, Exception]]:
+        """
+        Espera a que se escriba todo lo pendiente
+
+        Args:
+            espera: Segundos como máximo (por defecto, sin límite)
+
+        Returns:
+            List[Tuple[str, Exception]]: Escrituras fallidas desde la última llamada
+        """
+        with self._condicion:
+            self._condicion.wait_for(lambda: not self._pendientes and self._escribiendo is None, espera)
+            errores, self._errores = self._errores, []
+            return errores
+
+    def pendientes(self) -> int:
+        """Escrituras encoladas o en curso"""
+        with self._condicion:
+            return len(self._pendientes) + (self._escribiendo is not None)
+
+    def _trabajar(self) -> None:
+        while True:
+            with self._condicion:
+                self._condicion.wait_for(lambda: self._pendientes)
+                ruta, (datos, opciones, contexto) = self._pendientes.popitem(last=False)
+                self._escribiendo = ruta
+                self._condicion.notify_all()
+            error = None
+            try:
+                escribir_json_atomico(ruta, datos, **opciones)
+            except Exception as e:
+                error = e
+            if self.al_terminar is not None:
+                try:
+                    self.al_terminar(ruta, contexto, error)
+                except Exception:
+                    pass
+            with self._condicion:
+                if error is not None:
+                    self._errores.append((ruta, error))
+                self._escribiendo = None
+                self._condicion.notify_all()
+
+
+def vaciar_todos(espera: Optional[float] = None) -> None:
+    """Vacía las colas de todos los escritores vivos (al salir del proceso)"""
+    for escritor in list(_escritores):
+        escritor.vaciar(espera)
+
+
+def _al_recibir_sigterm(anterior):
+    def manejador(senal, marco):
+        vaciar_todos(config.ESCRITOR_ESPERA_SALIDA)
+        if callable(anterior):
+            anterior(senal, marco)
+        elif anterior != signal.SIG_IGN:
+            raise SystemExit(128 + senal)
+    return manejador
+
+
+def _instalar_manejadores() -> None:
+    """Registra el vaciado al salir y con SIGTERM (una vez por proceso, desde el hilo principal)"""
+    global _manejadores_instalados
+    if _manejadores_instalados:
+        return
+    _manejadores_instalados = True
+    atexit.register(vaciar_todos, config.ESCRITOR_ESPERA_SALIDA)
+    if threading.current_thread() is threading.main_thread() and hasattr(signal, "SIGTERM"):
+        anterior = signal.getsignal(signal.SIGTERM)
+        signal.signal(signal.SIGTERM, _al_recibir_sigterm(anterior))
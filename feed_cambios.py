@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro de cambios (feed) del Monitor de Instagram
+Cada monitoreo añade sus altas, bajas y cambios de nombre como eventos JSONL a
+un registro común que solo crece. Cada evento tiene un offset consecutivo; el
+registro se divide en segmentos con el nombre de su primer offset, y cada
+consumidor guarda el offset por el que va, de modo que otros procesos pueden
+leer solo lo nuevo o seguir el registro en vivo sin releer los reportes
+"""
+
+import bisect
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+
+import config
+from utils import ModuloDiferido, escribir_json_atomico
+
+# Los bloqueos entre procesos solo hacen falta al guardar; no se cargan al importar
+bloqueos = ModuloDiferido("bloqueos")
+
+CARPETA_FEED = "feed"
+DIGITOS_SEGMENTO = 20
+
+# Listas del reporte → (relación, tipo de evento)
+SECCIONES_EVENTOS = (
+    ("cambios_seguidores", "nuevos", "seguidores", "alta"),
+    ("cambios_seguidores", "perdidos", "seguidores", "baja"),
+    ("cambios_seguidos", "nuevos", "seguidos", "alta"),
+    ("cambios_seguidos", "eliminados", "seguidos", "baja"),
+)
+
+
+def eventos_de_reporte(reporte: Dict) -> List[Dict]:
+    """
+    Normaliza un reporte de generar_reporte_cambios en eventos (sin offset)
+
+    Args:
+        reporte: Reporte de cambios
+
+    Returns:
+        List[Dict]: Eventos {cuenta, relacion, usuario, tipo, timestamp[, anterior, id]}
+    """
+    if reporte.get("es_primer_monitoreo"):
+        return []
+    base = {"cuenta": reporte["username"], "timestamp": reporte["timestamp"]}
+    eventos = []
+    for seccion, lista, relacion, tipo in SECCIONES_EVENTOS:
+        for username in sorted(reporte[seccion][lista]):
+            eventos.append(dict(base, relacion=relacion, usuario=username, tipo=tipo))
+    for relacion, renombres in reporte.get("renombres", {}).items():
+        for renombre in renombres:
+            eventos.append(dict(base, relacion=relacion, usuario=renombre["actual"], tipo="renombre",
+                                anterior=renombre["anterior"], id=renombre["id"]))
+    return eventos
+
+
+class FeedCambios:
+    """Registro de eventos segmentado y offsets de sus consumidores"""
+
+    def __init__(self, directorio_datos: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+        """
+        self.directorio_datos = directorio_datos
+        self.carpeta = os.path.join(directorio_datos, CARPETA_FEED)
+        self.carpeta_consumidores = os.path.join(self.carpeta, "consumidores")
+        self.ruta_publicados = os.path.join(self.carpeta, "publicados.json")
+        self.publicados: Dict[str, str] = {}
+
+    def _cargar_publicados(self) -> None:
+        if os.path.exists(self.ruta_publicados):
+            with open(self.ruta_publicados, 'r', encoding='utf-8') as f:
+                self.publicados = json.load(f)
+
+    # ----- Segmentos -----
+
+    def segmentos(self) -> List[int]:
+        """Primer offset de cada segmento, en orden"""
+        if not os.path.exists(self.carpeta):
+            return []
+        return sorted(int(f[:-6]) for f in os.listdir(self.carpeta)
+                      if f.endswith(".jsonl") and f[:-6].isdigit())
+
+    def _ruta_segmento(self, inicio: int) -> str:
+        return os.path.join(self.carpeta, f"{inicio:0{DIGITOS_SEGMENTO}d}.jsonl")
+
+    def _ultimo_evento(self, inicio: int) -> Optional[Dict]:
+        """
+        Último evento completo de un segmento; descarta una línea a medias
+        de una escritura interrumpida
+        """
+        ruta = self._ruta_segmento(inicio)
+        with open(ruta, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            tamano = f.tell()
+            f.seek(max(0, tamano - 64 * 1024))
+            cola = f.read()
+            if cola and not cola.endswith(b"\n"):
+                corte = cola.rfind(b"\n") + 1
+                f.truncate(tamano - len(cola) + corte)
+                cola = cola[:corte]
+        lineas = cola.splitlines()
+        return json.loads(lineas[-1]) if lineas else None
+
+    def siguiente_offset(self) -> int:
+        """Offset que recibirá el próximo evento"""
+        for inicio in reversed(self.segmentos()):
+            ultimo = self._ultimo_evento(inicio)
+            if ultimo is not None:
+                return ultimo["offset"] + 1
+            if inicio == 0 or os.path.getsize(self._ruta_segmento(inicio)) == 0:
+                return inicio
+        return 0
+
+    # ----- Publicación -----
+
+    def publicar(self, reporte: Dict) -> int:
+        """
+        Añade los eventos de un reporte al registro
+        Un reporte ya publicado (misma cuenta y timestamp o anterior) no se repite.
+        Varios procesos pueden publicar a la vez: la asignación de offsets va bajo un bloqueo común
+
+        Args:
+            reporte: Reporte de generar_reporte_cambios
+
+        Returns:
+            int: Eventos añadidos
+
+        Raises:
+            ErrorBloqueo: Si otro proceso retiene el registro más de BLOQUEO_ESPERA_COMPARTIDO
+        """
+        if reporte.get("es_primer_monitoreo"):
+            return 0
+        cuenta, timestamp = reporte["username"], reporte["timestamp"]
+        with bloqueos.bloqueo_compartido(self.directorio_datos, CARPETA_FEED):
+            self._cargar_publicados()
+            if self.publicados.get(cuenta, "") >= timestamp:
+                return 0
+            eventos = eventos_de_reporte(reporte)
+            if eventos:
+                self._escribir(eventos)
+            self.publicados[cuenta] = timestamp
+            escribir_json_atomico(self.ruta_publicados, self.publicados, indent=2)
+        return len(eventos)
+
+    def _escribir(self, eventos: List[Dict]) -> None:
+        """Escribe eventos con offsets consecutivos, abriendo segmento nuevo si toca"""
+        if not os.path.exists(self.carpeta):
+            os.makedirs(self.carpeta)
+        offset = self.siguiente_offset()
+        segmentos = self.segmentos()
+        inicio = segmentos[-1] if segmentos else 0
+        if segmentos and os.path.getsize(self._ruta_segmento(inicio)) >= config.FEED_TAMANO_SEGMENTO:
+            inicio = offset
+        lineas = []
+        for evento in eventos:
+            lineas.append(json.dumps(dict(evento, offset=offset), ensure_ascii=False) + "\n")
+            offset += 1
+        # Una sola escritura por reporte: un corte deja como mucho una línea a medias
+        with open(self._ruta_segmento(inicio), 'a', encoding='utf-8') as f:
+            f.write("".join(lineas))
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ----- Lectura -----
+
+    def leer(self, desde: int = 0, maximo: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Recorre los eventos a partir de un offset
+
+        Args:
+            desde: Primer offset a devolver
+            maximo: Número máximo de eventos (por defecto, todos)
+
+        Returns:
+            Iterator[Dict]: Eventos en orden de offset
+        """
+        segmentos = self.segmentos()
+        posicion = max(bisect.bisect_right(segmentos, desde) - 1, 0)
+        entregados = 0
+        for inicio in segmentos[posicion:]:
+            with open(self._ruta_segmento(inicio), 'r', encoding='utf-8') as f:
+                for linea in f:
+                    if not linea.endswith("\n"):
+                        break
+                    evento = json.loads(linea)
+                    if evento["offset"] < desde:
+                        continue
+                    yield evento
+                    entregados += 1
+                    if maximo is not None and entregados >= maximo:
+                        return
+
+    def seguir(self, desde: int, intervalo: float = 2.0) -> Iterator[Dict]:
+        """
+        Como leer, pero espera eventos nuevos indefinidamente (similar a tail -f)
+
+        Args:
+            desde: Primer offset a devolver
+            intervalo: Segundos entre comprobaciones cuando no hay eventos nuevos
+        """
+        siguiente = desde
+        while True:
+            hubo = False
+            for evento in self.leer(siguiente):
+                siguiente = evento["offset"] + 1
+                hubo = True
+                yield evento
+            if not hubo:
+                time.sleep(intervalo)
+
+    # ----- Consumidores -----
+
+    def _ruta_consumidor(self, nombre: str) -> str:
+        return os.path.join(self.carpeta_consumidores, f"{nombre}.json")
+
+    def offset_consumidor(self, nombre: str) -> int:
+        """Siguiente offset que debe leer un consumidor (0 si es nuevo)"""
+        ruta = self._ruta_consumidor(nombre)
+        if not os.path.exists(ruta):
+            return 0
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f)["offset"]
+
+    def confirmar(self, nombre: str, offset: int) -> None:
+        """
+        Guarda el progreso de un consumidor
+
+        Args:
+            nombre: Nombre del consumidor
+            offset: Siguiente offset que debe leer (último procesado + 1)
+        """
+        if not os.path.exists(self.carpeta_consumidores):
+            os.makedirs(self.carpeta_consumidores)
+        escribir_json_atomico(self._ruta_consumidor(nombre), {"offset": offset, "actualizado": time.time()})
+
+    def consumidores(self) -> Dict[str, int]:
+        """Offset de cada consumidor registrado"""
+        if not os.path.exists(self.carpeta_consumidores):
+            return {}
+        return {f[:-5]: self.offset_consumidor(f[:-5])
+                for f in sorted(os.listdir(self.carpeta_consumidores)) if f.endswith(".json")}
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Grabación y reproducción de respuestas de Instagram
+Permite capturar las respuestas que obtiene instaloader durante una ejecución
+real y reproducirlas después sin acceder a la red
+"""
+
+import gzip
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import config
+from utils import escribir_json_atomico
+
+# Claves cuyo valor nunca debe quedar escrito en una grabación. Solo se ocultan los
+# valores simples: la estructura se conserva para que instaloader pueda leer la respuesta
+CLAVES_SENSIBLES = {
+    'csrf_token', 'csrftoken', 'sessionid', 'ds_user_id', 'rollout_hash',
+    'nonce', 'device_id', 'ig_did', 'mid', 'rur', 'shbid', 'shbts',
+    'enc_password', 'password', 'viewer_id', 'viewerId',
+    'fbid', 'fb_profile_biolink', 'email', 'phone_number'
+}
+VALOR_OCULTO = "[oculto]"
+
+ARCHIVO_RESPUESTAS = "respuestas.jsonl.gz"
+ARCHIVO_META = "meta.json"
+
+
+def sanitizar(valor: Any) -> Any:
+    """
+    Oculta recursivamente los valores de las claves sensibles de una respuesta
+    Las claves se mantienen; un texto pasa a VALOR_OCULTO y un número a 0. Si una clave
+    sensible contiene un objeto o una lista, se recorre como cualquier otro
+
+    Args:
+        valor: Estructura JSON (dict, list o valor simple)
+
+    Returns:
+        Any: Copia de la estructura con los valores sensibles ocultos
+    """
+    if isinstance(valor, dict):
+        return {k: _ocultar(v) if k in CLAVES_SENSIBLES else sanitizar(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [sanitizar(v) for v in valor]
+    return valor
+
+
+def _ocultar(valor: Any) -> Any:
+    if isinstance(valor, (dict, list)):
+        return sanitizar(valor)
+    if isinstance(valor, bool) or valor is None:
+        return valor
+    return VALOR_OCULTO if isinstance(valor, str) else 0
+
+
+def generar_clave(path: str, params: Optional[Dict[str, Any]], host: str) -> str:
+    """
+    Genera la clave con la que se identifica una petición
+
+    Args:
+        path: Ruta de la petición
+        params: Parámetros de la petición
+        host: Dominio de la petición
+
+    Returns:
+        str: Clave estable de la petición
+    """
+    # Los tokens no distinguen una petición de otra: se quitan de la clave
+    parametros = {k: v for k, v in (params or {}).items() if k not in CLAVES_SENSIBLES}
+    parametros = json.dumps(sanitizar(parametros), sort_keys=True, ensure_ascii=False)
+    return f"{host}/{path.strip('/')}?{parametros}"
+
+
+def ruta_grabacion(nombre: str) -> str:
+    """
+    Devuelve la carpeta donde se guarda una grabación
+
+    Args:
+        nombre: Nombre de la grabación
+
+    Returns:
+        str: Ruta de la carpeta
+    """
+    return os.path.join(config.DIRECTORIO_GRABACIONES, nombre)
+
+
+def listar_grabaciones() -> list:
+    """
+    Lista las grabaciones disponibles
+
+    Returns:
+        list: Nombres de las grabaciones encontradas
+    """
+    if not os.path.exists(config.DIRECTORIO_GRABACIONES):
+        return []
+    return sorted(
+        d for d in os.listdir(config.DIRECTORIO_GRABACIONES)
+        if os.path.exists(os.path.join(config.DIRECTORIO_GRABACIONES, d, ARCHIVO_RESPUESTAS))
+    )
+
+
+def cargar_entradas(nombre: str) -> list:
+    """
+    Carga todas las entradas de una grabación en orden
+
+    Args:
+        nombre: Nombre de la grabación
+
+    Returns:
+        list: Entradas grabadas
+    """
+    ruta = os.path.join(ruta_grabacion(nombre), ARCHIVO_RESPUESTAS)
+    entradas = []
+    with gzip.open(ruta, 'rt', encoding='utf-8') as f:
+        for linea in f:
+            if linea.strip():
+                entradas.append(json.loads(linea))
+    return entradas
+
+
+class GrabadorRespuestas:
+    """Captura cada respuesta JSON que obtiene instaloader en un almacén local"""
+
+    def __init__(self, nombre: str):
+        """
+        Args:
+            nombre: Nombre de la grabación (carpeta dentro de DIRECTORIO_GRABACIONES)
+        """
+        self.nombre = nombre
+        self.carpeta = ruta_grabacion(nombre)
+        self.total = 0
+        self._archivo = None
+        self._contexto = None
+        self._get_json_original = None
+        self._inicio = None
+
+    def instalar(self, contexto) -> None:
+        """
+        Envuelve el método get_json del contexto de instaloader para grabar
+
+        Args:
+            contexto: InstaloaderContext del monitor
+        """
+        if not os.path.exists(self.carpeta):
+            os.makedirs(self.carpeta)
+
+        self._contexto = contexto
+        self._get_json_original = contexto.get_json
+        self._archivo = gzip.open(os.path.join(self.carpeta, ARCHIVO_RESPUESTAS), 'at', encoding='utf-8')
+        self._inicio = time.time()
+
+        meta = {
+            "nombre": self.nombre,
+            "fecha_inicio": datetime.now().isoformat(),
+            "usuario_sesion": contexto.username,
+        }
+        escribir_json_atomico(os.path.join(self.carpeta, ARCHIVO_META), meta, indent=2)
+
+        contexto.get_json = self._get_json_grabado
+
+    def _get_json_grabado(self, path, params, host='www.instagram.com', session=None,
+                          _attempt=1, response_headers=None, use_post=False):
+        """Sustituto de get_json que graba la respuesta (o el error) obtenido"""
+        # Los reintentos internos de instaloader vuelven a pasar por aquí; solo
+        # se graba la llamada externa, que es la que ve el monitor
+        if _attempt > 1:
+            return self._get_json_original(path, params, host, session, _attempt,
+                                           response_headers, use_post)
+
+        inicio = time.time()
+        entrada = {
+            "clave": generar_clave(path, params, host),
+            "inicio": round(inicio - self._inicio, 3),
+            "respuesta": None,
+            "error": None
+        }
+        try:
+            respuesta = self._get_json_original(path, params, host, session, _attempt,
+                                                response_headers, use_post)
+            entrada["respuesta"] = sanitizar(respuesta)
+            return respuesta
+        except Exception as e:
+            entrada["error"] = {"tipo": type(e).__name__, "mensaje": str(e)}
+            raise
+        finally:
+            entrada["duracion"] = round(time.time() - inicio, 3)
+            self._archivo.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            self._archivo.flush()
+            self.total += 1
+
+    def detener(self) -> None:
+        """Restaura el contexto original y cierra el archivo de grabación"""
+        if self._contexto is not None:
+            self._contexto.get_json = self._get_json_original
+            self._contexto = None
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+class ReproductorRespuestas:
+    """Sirve las peticiones de instaloader exclusivamente desde una grabación"""
+
+    def __init__(self, nombre: str, escala: float = 1.0):
+        """
+        Args:
+            nombre: Nombre de la grabación a reproducir
+            escala: Factor aplicado a los tiempos originales (0 = sin esperas)
+        """
+        self.nombre = nombre
+        self.escala = escala
+        self.servidas = 0
+        self.faltantes = 0
+        self.respuestas: Dict[str, deque] = {}
+        self.ultima: Dict[str, dict] = {}
+
+        for entrada in cargar_entradas(nombre):
+            self.respuestas.setdefault(entrada["clave"], deque()).append(entrada)
+
+        ruta_meta = os.path.join(ruta_grabacion(nombre), ARCHIVO_META)
+        self.meta = {}
+        if os.path.exists(ruta_meta):
+            with open(ruta_meta, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+
+    def instalar(self, contexto) -> None:
+        """
+        Sustituye get_json del contexto para responder desde la grabación
+
+        Args:
+            contexto: InstaloaderContext del monitor
+        """
+        # instaloader elige endpoints distintos según haya sesión o no
+        contexto.username = self.meta.get("usuario_sesion")
+        contexto.get_json = self._get_json_reproducido
+
+        # doc_id_graphql_query pide la portada con la sesión si no tiene cookie csrftoken;
+        # con una ficticia no lo hace, y cualquier otra petición directa falla sin salir a la red
+        sesion = contexto._session
+        sesion.cookies.set('csrftoken', 'reproduccion', domain='.instagram.com')
+        sesion.request = self._peticion_bloqueada
+
+    def _peticion_bloqueada(self, metodo, url, *args, **kwargs):
+        """Sustituto de Session.request: en una reproducción nada puede salir a la red"""
+        import instaloader
+
+        self.faltantes += 1
+        raise instaloader.exceptions.ConnectionException(
+            f"Petición fuera de la grabación '{self.nombre}': {metodo} {url}")
+
+    def _get_json_reproducido(self, path, params, host='www.instagram.com', session=None,
+                              _attempt=1, response_headers=None, use_post=False):
+        """Sustituto de get_json que devuelve la siguiente respuesta grabada"""
+        import instaloader
+
+        clave = generar_clave(path, params, host)
+        cola = self.respuestas.get(clave)
+        if cola:
+            entrada = cola.popleft()
+            self.ultima[clave] = entrada
+        elif clave in self.ultima:
+            # Peticiones repetidas más veces que en la grabación reciben la última respuesta
+            entrada = self.ultima[clave]
+        else:
+            self.faltantes += 1
+            raise instaloader.exceptions.QueryReturnedNotFoundException(
+                f"Petición no grabada en '{self.nombre}': {clave}")
+
+        if self.escala > 0:
+            time.sleep(entrada.get("duracion", 0) * self.escala)
+        self.servidas += 1
+
+        error = entrada.get("error")
+        if error:
+            tipo = getattr(instaloader.exceptions, error["tipo"], instaloader.exceptions.ConnectionException)
+            raise tipo(error["mensaje"])
+        return entrada["respuesta"]
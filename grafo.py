@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Grafo del vecindario de una cuenta para el Monitor de Instagram
+Guarda el recorrido en anchura (BFS) de seguidores de seguidores de una cuenta:
+la frontera pendiente, el nodo en curso y las aristas descubiertas, de modo que
+cada ejecución continúa donde se quedó la anterior. Los usuarios se numeran con
+enteros; las aristas se añaden a un registro binario de pares y se compactan en
+formato CSR (desplazamientos + destinos en arrays) para consultar grados y
+solapamientos sin cargar millones de tuplas de Python
+"""
+
+import json
+import os
+import shutil
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from utils import escribir_atomico, escribir_json_atomico
+
+CARPETA_GRAFO = "grafo"
+
+# Enteros sin signo de 32 bits para los ID de nodo y de 64 bits para los desplazamientos
+TIPO_NODO = 'I'
+TIPO_DESPLAZAMIENTO = 'Q'
+
+
+def construir_csr(origenes: array, destinos: array, total_nodos: int) -> Tuple[array, array]:
+    """
+    Ordena unas aristas por origen (ordenación por recuento) y elimina duplicadas
+
+    Args:
+        origenes: ID de origen de cada arista
+        destinos: ID de destino de cada arista
+        total_nodos: Número de nodos
+
+    Returns:
+        Tuple[array, array]: (desplazamientos, destinos); los vecinos del nodo i son
+        destinos[desplazamientos[i]:desplazamientos[i + 1]], ordenados y sin repetir
+    """
+    conteos = array(TIPO_DESPLAZAMIENTO, bytes(8 * (total_nodos + 1)))
+    for origen in origenes:
+        conteos[origen + 1] += 1
+    for i in range(total_nodos):
+        conteos[i + 1] += conteos[i]
+
+    colocados = array(TIPO_NODO, bytes(4 * len(destinos)))
+    posicion = array(TIPO_DESPLAZAMIENTO, conteos)
+    for origen, destino in zip(origenes, destinos):
+        colocados[posicion[origen]] = destino
+        posicion[origen] += 1
+
+    desplazamientos = array(TIPO_DESPLAZAMIENTO, [0])
+    resultado = array(TIPO_NODO)
+    for i in range(total_nodos):
+        fila = colocados[conteos[i]:conteos[i + 1]]
+        if len(fila) > 1:
+            fila = array(TIPO_NODO, sorted(set(fila)))
+        resultado.extend(fila)
+        desplazamientos.append(len(resultado))
+    return desplazamientos, resultado
+
+
+class Grafo:
+    """Recorrido persistente del vecindario de una cuenta y sus aristas"""
+
+    def __init__(self, directorio_datos: str, raiz: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+            raiz: Cuenta desde la que se explora
+        """
+        self.directorio_datos = directorio_datos
+        self.raiz = raiz
+        self.carpeta = os.path.join(directorio_datos, raiz, CARPETA_GRAFO)
+        self.ruta_estado = os.path.join(self.carpeta, "estado.json")
+        self.ruta_nodos = os.path.join(self.carpeta, "nodos.txt")
+        self.ruta_aristas = os.path.join(self.carpeta, "aristas.bin")
+        self.estado = self._estado_vacio()
+        self.nombres: List[str] = []
+        self._nombres_pendientes: List[str] = []
+        self._aristas_pendientes = array(TIPO_NODO)
+        self._csr: Dict[str, Tuple[array, array]] = {}
+
+        if os.path.exists(self.ruta_estado):
+            with open(self.ruta_estado, 'r', encoding='utf-8') as f:
+                self.estado = json.load(f)
+        self._recuperar_confirmado()
+        self.ids = {nombre: i for i, nombre in enumerate(self.nombres)}
+
+    @staticmethod
+    def _estado_vacio() -> Dict:
+        return {
+            "profundidad": 0,
+            "cola": [],
+            "actual": None,
+            "expandidos": 0,
+            "omitidos": 0,
+            "peticiones": 0,
+            "nodos": 0,
+            "aristas": 0,
+            "aristas_compactadas": 0
+        }
+
+    def _recuperar_confirmado(self) -> None:
+        """
+        Carga los nodos y descarta lo escrito después del último estado guardado
+        (nodos y aristas de una ejecución interrumpida que la frontera no recoge)
+        """
+        if os.path.exists(self.ruta_nodos):
+            with open(self.ruta_nodos, 'r', encoding='utf-8') as f:
+                lineas = f.read().splitlines()
+            self.nombres = lineas[:self.estado["nodos"]]
+            if len(lineas) > len(self.nombres):
+                escribir_atomico(self.ruta_nodos, "".join(f"{nombre}\n" for nombre in self.nombres))
+        tamano = self.estado["aristas"] * 2 * 4
+        if os.path.exists(self.ruta_aristas) and os.path.getsize(self.ruta_aristas) > tamano:
+            with open(self.ruta_aristas, 'r+b') as f:
+                f.truncate(tamano)
+
+    @property
+    def iniciado(self) -> bool:
+        """True si ya se ha empezado a explorar"""
+        return bool(self.nombres)
+
+    @property
+    def terminado(self) -> bool:
+        """True si la frontera está vacía y no hay ningún nodo a medias"""
+        return self.iniciado and not self.estado["cola"] and self.estado["actual"] is None
+
+    @property
+    def total_aristas(self) -> int:
+        return self.estado["aristas"] + len(self._aristas_pendientes) // 2
+
+    def iniciar(self, profundidad: int) -> None:
+        """
+        Empieza una exploración nueva desde la cuenta raíz
+
+        Args:
+            profundidad: Niveles que se expanden (1 = solo la raíz, 2 = también sus seguidores)
+        """
+        self.estado["profundidad"] = profundidad
+        raiz, _ = self.id_de(self.raiz)
+        self.encolar(raiz, 0)
+
+    def id_de(self, username: str) -> Tuple[int, bool]:
+        """
+        Devuelve el ID entero de un usuario, asignándole uno si es nuevo
+
+        Returns:
+            Tuple[int, bool]: (ID, True si se acaba de descubrir)
+        """
+        nodo = self.ids.get(username)
+        if nodo is not None:
+            return nodo, False
+        nodo = len(self.nombres)
+        self.nombres.append(username)
+        self.ids[username] = nodo
+        self._nombres_pendientes.append(username)
+        return nodo, True
+
+    def encolar(self, nodo: int, profundidad: int) -> None:
+        """Añade un nodo a la frontera si su nivel aún se expande"""
+        if profundidad < self.estado["profundidad"]:
+            self.estado["cola"].append([nodo, profundidad])
+
+    def agregar_arista(self, origen: int, destino: int) -> None:
+        """Registra que origen sigue a destino"""
+        self._aristas_pendientes.append(origen)
+        self._aristas_pendientes.append(destino)
+
+    def guardar(self) -> None:
+        """
+        Añade los nodos y aristas nuevos a sus registros y guarda la frontera
+        El estado se escribe al final y hace de punto de confirmación
+        """
+        if not os.path.exists(self.carpeta):
+            os.makedirs(self.carpeta)
+        if self._nombres_pendientes:
+            with open(self.ruta_nodos, 'a', encoding='utf-8') as f:
+                f.write("".join(f"{nombre}\n" for nombre in self._nombres_pendientes))
+            self._nombres_pendientes = []
+        if self._aristas_pendientes:
+            with open(self.ruta_aristas, 'ab') as f:
+                self._aristas_pendientes.tofile(f)
+            self.estado["aristas"] += len(self._aristas_pendientes) // 2
+            self._aristas_pendientes = array(TIPO_NODO)
+        self.estado["nodos"] = len(self.nombres)
+        escribir_json_atomico(self.ruta_estado, self.estado)
+
+    def reiniciar(self) -> None:
+        """Borra la exploración guardada"""
+        if os.path.exists(self.carpeta):
+            shutil.rmtree(self.carpeta)
+        self.__init__(self.directorio_datos, self.raiz)
+
+    # ----- Formato compacto -----
+
+    def _rutas_csr(self, direccion: str) -> Tuple[str, str]:
+        return (os.path.join(self.carpeta, f"{direccion}_desplazamientos.bin"),
+                os.path.join(self.carpeta, f"{direccion}_destinos.bin"))
+
+    def compactar(self) -> None:
+        """
+        Reconstruye las dos tablas CSR (a quién sigue cada nodo y quién le sigue)
+        a partir del registro de aristas
+        """
+        self.guardar()
+        aristas = array(TIPO_NODO)
+        if os.path.exists(self.ruta_aristas):
+            with open(self.ruta_aristas, 'rb') as f:
+                aristas.fromfile(f, self.estado["aristas"] * 2)
+        origenes, destinos = aristas[0::2], aristas[1::2]
+        del aristas
+        for direccion, (desde, hacia) in (("sigue", (origenes, destinos)), ("seguidores", (destinos, origenes))):
+            desplazamientos, vecinos = construir_csr(desde, hacia, len(self.nombres))
+            ruta_desplazamientos, ruta_destinos = self._rutas_csr(direccion)
+            escribir_atomico(ruta_desplazamientos, desplazamientos.tobytes())
+            escribir_atomico(ruta_destinos, vecinos.tobytes())
+            self._csr[direccion] = (desplazamientos, vecinos)
+        self.estado["aristas_compactadas"] = self.estado["aristas"]
+        self.guardar()
+
+    def _tabla(self, direccion: str) -> Tuple[array, array]:
+        """Carga (y si hace falta rehace) la tabla CSR de una dirección"""
+        if self.estado["aristas_compactadas"] != self.total_aristas:
+            self.compactar()
+        if direccion not in self._csr:
+            ruta_desplazamientos, ruta_destinos = self._rutas_csr(direccion)
+            desplazamientos, vecinos = array(TIPO_DESPLAZAMIENTO), array(TIPO_NODO)
+            with open(ruta_desplazamientos, 'rb') as f:
+                desplazamientos.frombytes(f.read())
+            with open(ruta_destinos, 'rb') as f:
+                vecinos.frombytes(f.read())
+            self._csr[direccion] = (desplazamientos, vecinos)
+        return self._csr[direccion]
+
+    def _vecinos(self, nodo: int, direccion: str) -> array:
+        desplazamientos, vecinos = self._tabla(direccion)
+        if nodo + 1 >= len(desplazamientos):
+            return array(TIPO_NODO)
+        return vecinos[desplazamientos[nodo]:desplazamientos[nodo + 1]]
+
+    # ----- Consultas -----
+
+    def seguidores_de(self, username: str) -> List[str]:
+        """Seguidores conocidos de un usuario dentro del grafo"""
+        nodo = self.ids.get(username)
+        return [] if nodo is None else [self.nombres[i] for i in self._vecinos(nodo, "seguidores")]
+
+    def seguidos_de(self, username: str) -> List[str]:
+        """Usuarios del grafo a los que sigue un usuario"""
+        nodo = self.ids.get(username)
+        return [] if nodo is None else [self.nombres[i] for i in self._vecinos(nodo, "sigue")]
+
+    def grado(self, username: str) -> Optional[Dict[str, int]]:
+        """
+        Grado de entrada y salida de un usuario dentro del grafo
+
+        Returns:
+            Optional[Dict[str, int]]: {"seguidores", "sigue"} o None si no está en el grafo
+        """
+        nodo = self.ids.get(username)
+        if nodo is None:
+            return None
+        return {direccion: len(self._vecinos(nodo, direccion)) for direccion in ("seguidores", "sigue")}
+
+    def solapamiento(self, usuario_a: str, usuario_b: str) -> Dict:
+        """
+        Seguidores comunes de dos usuarios del grafo
+
+        Returns:
+            Dict: {"comunes", "a", "b", "jaccard", "muestra"}
+        """
+        a = set(self._vecinos(self.ids[usuario_a], "seguidores")) if usuario_a in self.ids else set()
+        b = set(self._vecinos(self.ids[usuario_b], "seguidores")) if usuario_b in self.ids else set()
+        comunes = a & b
+        union = len(a) + len(b) - len(comunes)
+        return {
+            "comunes": len(comunes),
+            "a": len(a),
+            "b": len(b),
+            "jaccard": len(comunes) / union if union else 0.0,
+            "muestra": sorted(self.nombres[i] for i in comunes)[:20]
+        }
+
+    def top(self, limite: int = 10, direccion: str = "sigue") -> List[Tuple[str, int]]:
+        """
+        Usuarios con mayor grado en una dirección
+
+        Args:
+            limite: Número de usuarios
+            direccion: 'sigue' (siguen a más cuentas exploradas) o 'seguidores'
+
+        Returns:
+            List[Tuple[str, int]]: (usuario, grado) de mayor a menor
+        """
+        desplazamientos, _ = self._tabla(direccion)
+        grados = ((desplazamientos[i + 1] - desplazamientos[i], i) for i in range(len(desplazamientos) - 1))
+        mejores = sorted((g for g in grados if g[0] > 0 and g[1] != self.ids.get(self.raiz)), reverse=True)[:limite]
+        return [(self.nombres[i], grado) for grado, i in mejores]
+
+    def resumen(self) -> Dict:
+        """Estado de la exploración"""
+        return {
+            "nodos": len(self.nombres),
+            "aristas": self.total_aristas,
+            "profundidad": self.estado["profundidad"],
+            "expandidos": self.estado["expandidos"],
+            "omitidos": self.estado["omitidos"],
+            "pendientes": len(self.estado["cola"]) + (1 if self.estado["actual"] else 0),
+            "peticiones": self.estado["peticiones"]
+        }
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Consultas sobre el historial guardado del Monitor de Instagram
+Permite comparar dos momentos cualesquiera de una cuenta sin acceso a la red,
+con la misma estructura de reporte que genera cada monitoreo
+"""
+
+import bisect
+import json
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+from identidades import ConjuntoUsuarios, comparar_usuarios, usuarios_de_snapshot
+from indice_membresia import listar_snapshots, timestamp_de_archivo
+
+FORMATO_TIMESTAMP = "%Y-%m-%d_%H-%M-%S"
+
+# Formatos aceptados para indicar un momento; una fecha sola se toma como el final de ese día
+FORMATOS_MOMENTO = (
+    ("%Y-%m-%d_%H-%M-%S", False),
+    ("%Y-%m-%dT%H:%M:%S", False),
+    ("%Y-%m-%d %H:%M:%S", False),
+    ("%Y-%m-%dT%H:%M", False),
+    ("%Y-%m-%d %H:%M", False),
+    ("%Y-%m-%d", True),
+)
+
+# Filtros de diferencia_entre: nombre → (sección del reporte, lista que se conserva)
+FILTROS = {
+    "nuevos_seguidores": ("cambios_seguidores", "nuevos"),
+    "seguidores_perdidos": ("cambios_seguidores", "perdidos"),
+    "nuevos_seguidos": ("cambios_seguidos", "nuevos"),
+    "seguidos_eliminados": ("cambios_seguidos", "eliminados"),
+}
+
+
+def construir_reporte_cambios(username: str, datos_anteriores: Dict, seguidores_actuales: Iterable[str],
+                              seguidos_actuales: Iterable[str], timestamp: str,
+                              fecha_actual: Optional[str] = None) -> Dict:
+    """
+    Construye un reporte de cambios entre unos datos anteriores y unos actuales
+
+    Args:
+        username: Nombre de usuario
+        datos_anteriores: Datos del snapshot anterior (vacío si no hay)
+        seguidores_actuales: Seguidores actuales (ConjuntoUsuarios para comparar por ID)
+        seguidos_actuales: Seguidos actuales (ConjuntoUsuarios para comparar por ID)
+        timestamp: Timestamp del momento actual
+        fecha_actual: Fecha ISO del momento actual (por defecto, ahora)
+
+    Returns:
+        Dict: Reporte de cambios
+    """
+    if not datos_anteriores:
+        return {
+            "es_primer_monitoreo": True,
+            "mensaje": "Primer monitoreo realizado. Los datos han sido guardados para futuras comparaciones."
+        }
+
+    if not isinstance(seguidores_actuales, ConjuntoUsuarios):
+        seguidores_actuales = ConjuntoUsuarios(seguidores_actuales)
+    if not isinstance(seguidos_actuales, ConjuntoUsuarios):
+        seguidos_actuales = ConjuntoUsuarios(seguidos_actuales)
+    seguidores_anteriores = usuarios_de_snapshot(datos_anteriores, "seguidores")
+    seguidos_anteriores = usuarios_de_snapshot(datos_anteriores, "seguidos")
+
+    # Calcular cambios (por ID cuando ambos lados lo tienen)
+    nuevos_seguidores, seguidores_perdidos, renombres_seguidores = comparar_usuarios(
+        seguidores_anteriores, seguidores_actuales)
+    nuevos_seguidos, seguidos_eliminados, renombres_seguidos = comparar_usuarios(
+        seguidos_anteriores, seguidos_actuales)
+
+    return {
+        "es_primer_monitoreo": False,
+        "username": username,
+        "fecha_anterior": datos_anteriores.get("fecha_actualizacion", "Desconocida"),
+        "fecha_actual": fecha_actual or datetime.now().isoformat(),
+        "timestamp": timestamp,
+        "timestamp_anterior": datos_anteriores.get("timestamp"),
+        "cambios_seguidores": {
+            "nuevos": list(nuevos_seguidores),
+            "perdidos": list(seguidores_perdidos),
+            "total_nuevos": len(nuevos_seguidores),
+            "total_perdidos": len(seguidores_perdidos)
+        },
+        "cambios_seguidos": {
+            "nuevos": list(nuevos_seguidos),
+            "eliminados": list(seguidos_eliminados),
+            "total_nuevos": len(nuevos_seguidos),
+            "total_eliminados": len(seguidos_eliminados)
+        },
+        "renombres": {
+            "seguidores": renombres_seguidores,
+            "seguidos": renombres_seguidos
+        },
+        "estadisticas": {
+            "seguidores_anteriores": len(seguidores_anteriores),
+            "seguidores_actuales": len(seguidores_actuales),
+            "seguidos_anteriores": len(seguidos_anteriores),
+            "seguidos_actuales": len(seguidos_actuales),
+            "cambio_neto_seguidores": len(seguidores_actuales) - len(seguidores_anteriores),
+            "cambio_neto_seguidos": len(seguidos_actuales) - len(seguidos_anteriores)
+        }
+    }
+
+
+def normalizar_momento(momento: str) -> str:
+    """
+    Convierte una fecha u hora escrita por el usuario al formato de los snapshots
+
+    Args:
+        momento: 'YYYY-MM-DD', 'YYYY-MM-DD HH:MM[:SS]' o 'YYYY-MM-DD_HH-MM-SS'
+
+    Returns:
+        str: Timestamp YYYY-MM-DD_HH-MM-SS (una fecha sola equivale al final del día)
+
+    Raises:
+        ValueError: Si el formato no es válido
+    """
+    for formato, solo_fecha in FORMATOS_MOMENTO:
+        try:
+            fecha = datetime.strptime(momento.strip(), formato)
+        except ValueError:
+            continue
+        if solo_fecha:
+            fecha = fecha.replace(hour=23, minute=59, second=59)
+        return fecha.strftime(FORMATO_TIMESTAMP)
+    raise ValueError(f"Fecha no válida: {momento} (usa YYYY-MM-DD o YYYY-MM-DD HH:MM)")
+
+
+def buscar_snapshot(directorio_datos: str, cuenta: str, tipo: str, momento: str) -> Optional[str]:
+    """
+    Busca el último snapshot guardado en o antes de un momento
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuenta: Cuenta monitoreada
+        tipo: 'seguidores' o 'seguidos'
+        momento: Fecha u hora en cualquiera de los formatos de normalizar_momento
+
+    Returns:
+        Optional[str]: Ruta del snapshot o None si no hay ninguno anterior
+    """
+    rutas = listar_snapshots(directorio_datos, cuenta, tipo)
+    timestamps = [timestamp_de_archivo(ruta) for ruta in rutas]
+    posicion = bisect.bisect_right(timestamps, normalizar_momento(momento))
+    return rutas[posicion - 1] if posicion else None
+
+
+def _leer_json(ruta: str) -> Dict:
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def cargar_snapshot(directorio_datos: str, cuenta: str, momento: str,
+                    leer: Optional[Callable[[str], Dict]] = None) -> Dict:
+    """
+    Reconstruye los seguidores y seguidos de una cuenta en un momento dado
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuenta: Cuenta monitoreada
+        momento: Fecha u hora a consultar
+        leer: Función que carga un archivo JSON (p. ej. una caché); por defecto se lee del disco
+
+    Returns:
+        Dict: Misma forma que cargar_datos_anteriores (seguidores, seguidos, timestamp...)
+
+    Raises:
+        ValueError: Si no hay ningún snapshot anterior a ese momento
+    """
+    datos = {}
+    for tipo in ("seguidores", "seguidos"):
+        ruta = buscar_snapshot(directorio_datos, cuenta, tipo, momento)
+        if ruta is None:
+            raise ValueError(f"No hay snapshots de {tipo} de @{cuenta} anteriores a {momento}")
+        snapshot = (leer or _leer_json)(ruta)
+        if not datos:
+            datos.update(snapshot)
+        datos[tipo] = snapshot.get(tipo, [])
+        datos[f"ids_{tipo}"] = snapshot.get(f"ids_{tipo}")
+        datos[f"total_{tipo}"] = snapshot.get(f"total_{tipo}", len(datos[tipo]))
+    return datos
+
+
+def diferencia_entre(directorio_datos: str, cuenta: str, desde: str, hasta: str,
+                     solo: Optional[str] = None, leer: Optional[Callable[[str], Dict]] = None) -> Dict:
+    """
+    Compara dos momentos del historial de una cuenta sin acceso a la red
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuenta: Cuenta monitoreada
+        desde: Momento inicial (fecha u hora)
+        hasta: Momento final (fecha u hora)
+        solo: Conservar solo un tipo de cambio (clave de FILTROS)
+        leer: Función que carga un archivo JSON (ver cargar_snapshot)
+
+    Returns:
+        Dict: Reporte con la estructura de generar_reporte_cambios
+
+    Raises:
+        ValueError: Si alguna fecha o el filtro no son válidos o no hay datos
+    """
+    if solo is not None and solo not in FILTROS:
+        raise ValueError(f"Filtro no válido: {solo} (opciones: {', '.join(FILTROS)})")
+
+    anteriores = cargar_snapshot(directorio_datos, cuenta, desde, leer)
+    actuales = cargar_snapshot(directorio_datos, cuenta, hasta, leer)
+    reporte = construir_reporte_cambios(cuenta, anteriores, usuarios_de_snapshot(actuales, "seguidores"),
+                                        usuarios_de_snapshot(actuales, "seguidos"),
+                                        actuales.get("timestamp"), actuales.get("fecha_actualizacion"))
+
+    if solo is not None:
+        seccion_filtro, lista_filtro = FILTROS[solo]
+        for seccion, lista in FILTROS.values():
+            if (seccion, lista) != (seccion_filtro, lista_filtro):
+                reporte[seccion][lista] = []
+                reporte[seccion][f"total_{lista}"] = 0
+    return reporte
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Identidad estable de usuarios para el Monitor de Instagram
+Los nombres de usuario se pueden cambiar; el ID numérico de Instagram no. Los
+snapshots guardan el ID de cada usuario junto a su nombre y las comparaciones se
+hacen por ID, de modo que un cambio de nombre no cuenta como una baja y un alta
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+ARCHIVO_RENOMBRES = "renombres.jsonl"
+
+
+class ConjuntoUsuarios(set):
+    """Conjunto de nombres de usuario que recuerda el ID numérico de cada uno"""
+
+    def __init__(self, usuarios: Iterable[str] = (), ids: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            usuarios: Nombres de usuario
+            ids: Nombre de usuario → ID numérico (puede cubrir solo una parte)
+        """
+        super().__init__(usuarios)
+        self.ids: Dict[str, int] = dict(ids or {})
+
+    def agregar(self, username: str, userid: Optional[int] = None) -> None:
+        """Añade un usuario y, si se conoce, su ID"""
+        self.add(username)
+        if userid is not None:
+            self.ids[username] = int(userid)
+
+    def ids_alineados(self, usuarios: List[str]) -> List[Optional[int]]:
+        """IDs en el mismo orden que una lista de nombres (None si se desconoce)"""
+        return [self.ids.get(username) for username in usuarios]
+
+    def por_id(self) -> Optional[Dict[int, str]]:
+        """
+        Índice ID → nombre de usuario
+
+        Returns:
+            Optional[Dict[int, str]]: None si algún usuario no tiene ID o dos nombres comparten ID
+        """
+        por_id = {userid: username for username, userid in self.ids.items() if username in self}
+        return por_id if len(por_id) == len(self) else None
+
+
+def usuarios_de_snapshot(datos: Dict, tipo: str) -> ConjuntoUsuarios:
+    """
+    Lee los usuarios de un snapshot y sus IDs si el archivo los incluye
+
+    Args:
+        datos: Contenido del snapshot (o de cargar_datos_anteriores)
+        tipo: 'seguidores' o 'seguidos'
+
+    Returns:
+        ConjuntoUsuarios: Usuarios del snapshot (sin IDs en archivos antiguos)
+    """
+    usuarios = datos.get(tipo, [])
+    ids = datos.get(f"ids_{tipo}") or []
+    if len(ids) != len(usuarios):
+        return ConjuntoUsuarios(usuarios)
+    return ConjuntoUsuarios(usuarios, {u: i for u, i in zip(usuarios, ids) if i is not None})
+
+
+def comparar_usuarios(anteriores: Set[str], actuales: Set[str]) -> Tuple[Set[str], Set[str], List[Dict]]:
+    """
+    Compara dos conjuntos de usuarios reconociendo los cambios de nombre
+
+    Si ambos lados tienen el ID de todos sus usuarios, la diferencia se calcula
+    sobre enteros; si no (snapshots antiguos o datos parciales), se compara por
+    nombre y se corrigen los cambios de nombre de los usuarios con ID conocido.
+
+    Args:
+        anteriores: Usuarios del snapshot anterior (ConjuntoUsuarios o set)
+        actuales: Usuarios actuales (ConjuntoUsuarios o set)
+
+    Returns:
+        Tuple: (nuevos, perdidos, renombres) con renombres = [{"id", "anterior", "actual"}]
+    """
+    ids_anteriores = getattr(anteriores, "ids", {})
+    ids_actuales = getattr(actuales, "ids", {})
+    por_id_anterior = anteriores.por_id() if ids_anteriores else None
+    por_id_actual = actuales.por_id() if ids_actuales else None
+
+    if por_id_anterior is not None and por_id_actual is not None:
+        nuevos = {por_id_actual[i] for i in por_id_actual.keys() - por_id_anterior.keys()}
+        perdidos = {por_id_anterior[i] for i in por_id_anterior.keys() - por_id_actual.keys()}
+        renombres = [{"id": i, "anterior": por_id_anterior[i], "actual": por_id_actual[i]}
+                     for i in por_id_actual.keys() & por_id_anterior.keys()
+                     if por_id_actual[i] != por_id_anterior[i]]
+        return nuevos, perdidos, renombres
+
+    nuevos = set(actuales) - set(anteriores)
+    perdidos = set(anteriores) - set(actuales)
+    renombres = []
+    perdidos_por_id = {ids_anteriores[u]: u for u in perdidos if u in ids_anteriores}
+    if perdidos_por_id:
+        for username in list(nuevos):
+            userid = ids_actuales.get(username)
+            if userid in perdidos_por_id:
+                anterior = perdidos_por_id.pop(userid)
+                renombres.append({"id": userid, "anterior": anterior, "actual": username})
+                nuevos.discard(username)
+                perdidos.discard(anterior)
+    return nuevos, perdidos, renombres
+
+
+def registrar_renombres(directorio_datos: str, cuenta: str, reporte: Dict) -> int:
+    """
+    Añade los cambios de nombre de un reporte al registro de la cuenta
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuenta: Cuenta monitoreada
+        reporte: Reporte de cambios con la sección 'renombres'
+
+    Returns:
+        int: Número de entradas escritas
+    """
+    entradas = [dict(renombre, relacion=relacion, timestamp=reporte.get("timestamp"))
+                for relacion, lista in reporte.get("renombres", {}).items() for renombre in lista]
+    if not entradas:
+        return 0
+    carpeta = os.path.join(directorio_datos, cuenta)
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+    with open(os.path.join(carpeta, ARCHIVO_RENOMBRES), 'a', encoding='utf-8') as f:
+        for entrada in entradas:
+            f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+    return len(entradas)
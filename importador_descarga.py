@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Importación de la descarga de datos de Instagram ("Descargar tu información")
+Lee las listas de seguidores y seguidos de la exportación (carpeta o .zip, en
+formato JSON o HTML) sin ninguna petición a Instagram, con la fecha en que
+empezó cada relación, para usarlas como snapshot de partida de la cuenta
+"""
+
+import io
+import json
+import os
+import re
+import zipfile
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Archivos de la exportación con cada relación (followers_1.json, followers_2.html, following.json...)
+PATRONES_RELACION = {
+    "seguidores": re.compile(r"(^|/)followers(_\d+)?\.(json|html)$"),
+    "seguidos": re.compile(r"(^|/)following\.(json|html)$"),
+}
+PATRON_PERFIL = re.compile(r"instagram\.com/(?:_u/)?([A-Za-z0-9._]+)/?$")
+
+# Formatos de fecha de las exportaciones en HTML ("Jan 05, 2024 3:14 pm", "Jan 05, 2024, 3:14 PM")
+FORMATOS_FECHA_HTML = ("%b %d, %Y %I:%M %p", "%b %d, %Y, %I:%M %p", "%b %d, %Y %H:%M")
+
+TAMANO_BLOQUE = 64 * 1024
+
+Entrada = Tuple[str, Optional[float]]
+
+
+def _usuario_de_enlace(enlace: str) -> Optional[str]:
+    """Extrae el nombre de usuario de un enlace a un perfil"""
+    coincidencia = PATRON_PERFIL.search(enlace or "")
+    return coincidencia.group(1) if coincidencia else None
+
+
+def leer_json(flujo) -> Iterator[Entrada]:
+    """
+    Lee un archivo JSON de la exportación
+
+    Args:
+        flujo: Archivo binario abierto
+
+    Returns:
+        Iterator[Entrada]: (usuario, epoch de inicio o None)
+    """
+    datos = json.load(io.TextIOWrapper(flujo, encoding='utf-8'))
+    if isinstance(datos, dict):
+        # following.json: {"relationships_following": [...]}; followers_N.json es una lista
+        datos = next((valor for valor in datos.values() if isinstance(valor, list)), [])
+    for elemento in datos:
+        for cadena in elemento.get("string_list_data", []):
+            username = (cadena.get("value") or elemento.get("title") or
+                        _usuario_de_enlace(cadena.get("href")))
+            if username:
+                yield username, cadena.get("timestamp")
+
+
+class _LectorHTML(HTMLParser):
+    """Recoge los enlaces a perfiles y la fecha que aparece después de cada uno"""
+
+    def __init__(self):
+        super().__init__()
+        self.entradas: List[List] = []
+        self._en_enlace = False
+        self._texto: List[str] = []
+
+    def _procesar_texto(self):
+        """Interpreta el texto acumulado desde la última etiqueta (puede llegar en varios trozos)"""
+        texto = "".join(self._texto).strip()
+        self._texto = []
+        if self._en_enlace or not texto or not self.entradas or self.entradas[-1][1] is not None:
+            return
+        for formato in FORMATOS_FECHA_HTML:
+            try:
+                self.entradas[-1][1] = datetime.strptime(texto, formato).timestamp()
+                return
+            except ValueError:
+                continue
+
+    def handle_starttag(self, tag, attrs):
+        self._procesar_texto()
+        if tag == "a":
+            username = _usuario_de_enlace(dict(attrs).get("href"))
+            if username:
+                self.entradas.append([username, None])
+                self._en_enlace = True
+
+    def handle_endtag(self, tag):
+        self._procesar_texto()
+        if tag == "a":
+            self._en_enlace = False
+
+    def handle_data(self, data):
+        self._texto.append(data)
+
+
+def leer_html(flujo) -> Iterator[Entrada]:
+    """
+    Lee un archivo HTML de la exportación por bloques
+
+    Args:
+        flujo: Archivo binario abierto
+
+    Returns:
+        Iterator[Entrada]: (usuario, epoch de inicio o None)
+    """
+    lector = _LectorHTML()
+    texto = io.TextIOWrapper(flujo, encoding='utf-8')
+    while True:
+        bloque = texto.read(TAMANO_BLOQUE)
+        if not bloque:
+            break
+        lector.feed(bloque)
+        # Entrega todo menos la última entrada, cuya fecha puede llegar en el bloque siguiente
+        listas, lector.entradas = lector.entradas[:-1], lector.entradas[-1:]
+        for username, momento in listas:
+            yield username, momento
+    lector.close()
+    lector._procesar_texto()
+    for username, momento in lector.entradas:
+        yield username, momento
+
+
+def _cuenta_de_perfil(flujo) -> Optional[str]:
+    """Nombre de usuario del titular según personal_information.json"""
+    datos = json.load(io.TextIOWrapper(flujo, encoding='utf-8'))
+    for perfil in datos.get("profile_user", []):
+        valor = perfil.get("string_map_data", {}).get("Username", {}).get("value")
+        if valor:
+            return valor
+    return None
+
+
+class _Origen:
+    """Acceso uniforme a una exportación en carpeta o en .zip"""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.zip = zipfile.ZipFile(ruta) if zipfile.is_zipfile(ruta) else None
+
+    def nombres(self) -> List[str]:
+        if self.zip:
+            return sorted(self.zip.namelist())
+        nombres = []
+        for carpeta, _, archivos in os.walk(self.ruta):
+            relativa = os.path.relpath(carpeta, self.ruta)
+            nombres.extend(os.path.normpath(os.path.join(relativa, a)).replace(os.sep, "/") for a in archivos)
+        return sorted(nombres)
+
+    def abrir(self, nombre: str):
+        if self.zip:
+            return self.zip.open(nombre)
+        return open(os.path.join(self.ruta, nombre), 'rb')
+
+    def fecha(self) -> float:
+        """Momento de la exportación: el archivo más reciente que contiene"""
+        if self.zip:
+            return max(datetime(*info.date_time).timestamp() for info in self.zip.infolist())
+        return max(os.path.getmtime(os.path.join(self.ruta, n)) for n in self.nombres())
+
+    def cerrar(self):
+        if self.zip:
+            self.zip.close()
+
+
+def leer_descarga(ruta: str) -> Dict:
+    """
+    Lee las listas de seguidores y seguidos de una exportación de Instagram
+
+    Args:
+        ruta: Carpeta descomprimida o archivo .zip de la exportación
+
+    Returns:
+        Dict: {"cuenta", "fecha" (epoch de la exportación), "archivos",
+               "seguidores": {usuario: epoch|None}, "seguidos": {usuario: epoch|None}}
+
+    Raises:
+        ValueError: Si la ruta no existe o no contiene listas de seguidores ni seguidos
+    """
+    if not os.path.exists(ruta):
+        raise ValueError(f"No existe: {ruta}")
+
+    origen = _Origen(ruta)
+    try:
+        nombres = origen.nombres()
+        resultado = {"cuenta": None, "fecha": origen.fecha(), "archivos": [],
+                     "seguidores": {}, "seguidos": {}}
+        for nombre in nombres:
+            if nombre.endswith("personal_information.json"):
+                with origen.abrir(nombre) as flujo:
+                    resultado["cuenta"] = _cuenta_de_perfil(flujo)
+            for relacion, patron in PATRONES_RELACION.items():
+                if not patron.search(nombre):
+                    continue
+                lector = leer_json if nombre.endswith(".json") else leer_html
+                usuarios = resultado[relacion]
+                with origen.abrir(nombre) as flujo:
+                    for username, momento in lector(flujo):
+                        # Si un usuario aparece varias veces se conserva la fecha más antigua
+                        anterior = usuarios.get(username)
+                        if username not in usuarios or (momento and (anterior is None or momento < anterior)):
+                            usuarios[username] = momento
+                resultado["archivos"].append(nombre)
+    finally:
+        origen.cerrar()
+
+    if not resultado["archivos"]:
+        raise ValueError(f"No se encontraron listas de seguidores ni seguidos en {ruta} "
+                         "(se buscan followers_N.json/html y following.json/html)")
+    return resultado
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice invertido de audiencias para el Monitor de Instagram
+Asigna un número a cada usuario visto y guarda, por cada cuenta monitoreada, un
+mapa de bits con sus seguidores. Las consultas (seguidores de todas o alguna de
+varias cuentas, usuarios que siguen a k o más cuentas) se resuelven con
+operaciones de bits sobre enteros de Python, sin recorrer listas de usuarios
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from indice_membresia import listar_snapshots, timestamp_de_archivo
+from utils import escribir_atomico, escribir_json_atomico
+
+CARPETA_INDICE_INVERTIDO = "indice_invertido"
+
+
+def bits_a_ids(bits: int) -> List[int]:
+    """
+    Devuelve las posiciones de los bits activos de un entero
+
+    Args:
+        bits: Mapa de bits
+
+    Returns:
+        List[int]: Posiciones activas en orden creciente
+    """
+    ids = []
+    binario = bin(bits)[:1:-1]
+    posicion = binario.find('1')
+    while posicion != -1:
+        ids.append(posicion)
+        posicion = binario.find('1', posicion + 1)
+    return ids
+
+
+class IndiceInvertido:
+    """Usuario → cuentas monitoreadas que sigue, guardado como un mapa de bits por cuenta"""
+
+    def __init__(self, directorio_datos: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+        """
+        self.directorio_datos = directorio_datos
+        self.carpeta = os.path.join(directorio_datos, CARPETA_INDICE_INVERTIDO)
+        self.ruta_usuarios = os.path.join(self.carpeta, "usuarios.txt")
+        self.ruta_cuentas = os.path.join(self.carpeta, "cuentas.json")
+        self.cuentas: Dict[str, str] = {}
+        if os.path.exists(self.ruta_cuentas):
+            with open(self.ruta_cuentas, 'r', encoding='utf-8') as f:
+                self.cuentas = json.load(f)
+        self._usuarios: Optional[List[str]] = None
+        self._ids: Optional[Dict[str, int]] = None
+        self._nuevos_usuarios: List[str] = []
+        self._recortar: Optional[int] = None
+        self._bits: Dict[str, int] = {}
+        self._modificadas: Set[str] = set()
+
+    # Diccionario de usuarios
+
+    @property
+    def usuarios(self) -> List[str]:
+        """Lista id → username, cargada en el primer acceso"""
+        if self._usuarios is None:
+            self._usuarios = []
+            if os.path.exists(self.ruta_usuarios):
+                with open(self.ruta_usuarios, 'rb') as f:
+                    contenido = f.read()
+                # Cada guardado termina en salto de línea: lo que sigue al último es de una
+                # escritura interrumpida. Se ignora (y se recorta en el disco al guardar) para
+                # que el siguiente usuario no se pegue a él y desplace todos los ids
+                corte = contenido.rfind(b"\n") + 1
+                if corte < len(contenido):
+                    self._recortar = corte
+                self._usuarios = contenido[:corte].decode('utf-8').splitlines()
+        return self._usuarios
+
+    def _id(self, username: str) -> int:
+        """Devuelve el id de un usuario, asignándole uno nuevo si no lo tenía"""
+        if self._ids is None:
+            self._ids = {u: i for i, u in enumerate(self.usuarios)}
+        if username not in self._ids:
+            self._ids[username] = len(self.usuarios)
+            self.usuarios.append(username)
+            self._nuevos_usuarios.append(username)
+        return self._ids[username]
+
+    # Mapas de bits
+
+    def _ruta_bits(self, cuenta: str) -> str:
+        return os.path.join(self.carpeta, f"{cuenta}.bits")
+
+    def bits(self, cuenta: str) -> int:
+        """
+        Devuelve el mapa de bits de los seguidores de una cuenta
+
+        Args:
+            cuenta: Cuenta monitoreada
+
+        Returns:
+            int: Bit i activo si el usuario con id i sigue a la cuenta
+
+        Raises:
+            ValueError: Si la cuenta no está en el índice
+        """
+        if cuenta not in self._bits:
+            if cuenta not in self.cuentas:
+                raise ValueError(f"@{cuenta} no está en el índice invertido")
+            with open(self._ruta_bits(cuenta), 'rb') as f:
+                self._bits[cuenta] = int.from_bytes(f.read(), 'little')
+        return self._bits[cuenta]
+
+    def establecer(self, cuenta: str, seguidores: Iterable[str], timestamp: str) -> None:
+        """
+        Sustituye los seguidores de una cuenta en el índice
+
+        Args:
+            cuenta: Cuenta monitoreada
+            seguidores: Seguidores actuales
+            timestamp: Timestamp del snapshot
+        """
+        ids = [self._id(username) for username in seguidores]
+        mapa = bytearray((len(self.usuarios) + 7) // 8)
+        for i in ids:
+            mapa[i >> 3] |= 1 << (i & 7)
+        self._bits[cuenta] = int.from_bytes(mapa, 'little')
+        self.cuentas[cuenta] = timestamp
+        self._modificadas.add(cuenta)
+
+    def aplicar_cambios(self, cuenta: str, nuevos: Iterable[str], perdidos: Iterable[str],
+                        timestamp: str) -> None:
+        """
+        Aplica los cambios de un reporte a una cuenta ya indexada
+
+        Args:
+            cuenta: Cuenta monitoreada
+            nuevos: Seguidores nuevos
+            perdidos: Seguidores perdidos
+            timestamp: Timestamp del reporte
+        """
+        mapa = bytearray(self.bits(cuenta).to_bytes((len(self.usuarios) + 7) // 8, 'little'))
+        for username in perdidos:
+            i = self._id(username)
+            if (i >> 3) < len(mapa):
+                mapa[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+        ids_nuevos = [self._id(username) for username in nuevos]
+        mapa.extend(bytes((len(self.usuarios) + 7) // 8 - len(mapa)))
+        for i in ids_nuevos:
+            mapa[i >> 3] |= 1 << (i & 7)
+        self._bits[cuenta] = int.from_bytes(mapa, 'little')
+        self.cuentas[cuenta] = timestamp
+        self._modificadas.add(cuenta)
+
+    def guardar(self) -> None:
+        """Escribe en disco los usuarios nuevos, los mapas modificados y la lista de cuentas"""
+        if not os.path.exists(self.carpeta):
+            os.makedirs(self.carpeta)
+        if self._nuevos_usuarios:
+            if self._recortar is not None:
+                with open(self.ruta_usuarios, 'r+b') as f:
+                    f.truncate(self._recortar)
+                self._recortar = None
+            with open(self.ruta_usuarios, 'a', encoding='utf-8') as f:
+                f.write("".join(f"{u}\n" for u in self._nuevos_usuarios))
+                f.flush()
+                os.fsync(f.fileno())
+            self._nuevos_usuarios = []
+        for cuenta in sorted(self._modificadas):
+            bits = self._bits[cuenta]
+            escribir_atomico(self._ruta_bits(cuenta), bits.to_bytes((bits.bit_length() + 7) // 8, 'little'))
+        self._modificadas.clear()
+        escribir_json_atomico(self.ruta_cuentas, self.cuentas, indent=2)
+
+    # Consultas
+
+    def nombres(self, bits: int) -> List[str]:
+        """Convierte un mapa de bits en la lista de usernames correspondiente"""
+        return [self.usuarios[i] for i in bits_a_ids(bits)]
+
+    def interseccion(self, cuentas: List[str]) -> int:
+        """Usuarios que siguen a todas las cuentas indicadas"""
+        resultado = self.bits(cuentas[0])
+        for cuenta in cuentas[1:]:
+            resultado &= self.bits(cuenta)
+        return resultado
+
+    def union(self, cuentas: List[str]) -> int:
+        """Usuarios que siguen al menos a una de las cuentas indicadas"""
+        resultado = 0
+        for cuenta in cuentas:
+            resultado |= self.bits(cuenta)
+        return resultado
+
+    def contadores(self, cuentas: Optional[List[str]] = None) -> List[int]:
+        """
+        Suma los mapas de bits en contadores por rebanadas de bits
+
+        Args:
+            cuentas: Cuentas a contar (por defecto, todas)
+
+        Returns:
+            List[int]: Rebanada i = bit i del número de cuentas que sigue cada usuario
+        """
+        rebanadas: List[int] = []
+        for cuenta in cuentas or sorted(self.cuentas):
+            acarreo = self.bits(cuenta)
+            for i, rebanada in enumerate(rebanadas):
+                if not acarreo:
+                    break
+                rebanadas[i] = rebanada ^ acarreo
+                acarreo &= rebanada
+            if acarreo:
+                rebanadas.append(acarreo)
+        return rebanadas
+
+    @staticmethod
+    def _comparar(rebanadas: List[int], k: int) -> Tuple[int, int]:
+        """Devuelve los mapas (contador > k, contador == k) comparando rebanada a rebanada"""
+        universo = 0
+        for rebanada in rebanadas:
+            universo |= rebanada
+        mayor, igual = 0, universo
+        if k >> len(rebanadas):
+            return 0, 0
+        for i in reversed(range(len(rebanadas))):
+            if (k >> i) & 1:
+                igual &= rebanadas[i]
+            else:
+                mayor |= igual & rebanadas[i]
+                igual &= ~rebanadas[i]
+        return mayor, igual
+
+    def con_al_menos(self, k: int, cuentas: Optional[List[str]] = None) -> int:
+        """
+        Usuarios que siguen a k o más de las cuentas indicadas
+
+        Args:
+            k: Mínimo de cuentas seguidas (k >= 1)
+            cuentas: Cuentas a considerar (por defecto, todas)
+
+        Returns:
+            int: Mapa de bits de los usuarios
+        """
+        mayor, igual = self._comparar(self.contadores(cuentas), max(1, k))
+        return mayor | igual
+
+    def top(self, limite: int, cuentas: Optional[List[str]] = None) -> List[Tuple[str, int]]:
+        """
+        Usuarios que siguen a más cuentas monitoreadas
+
+        Args:
+            limite: Número máximo de usuarios a devolver
+            cuentas: Cuentas a considerar (por defecto, todas)
+
+        Returns:
+            List[Tuple[str, int]]: Pares (username, cuentas seguidas), de más a menos
+        """
+        rebanadas = self.contadores(cuentas)
+        resultado = []
+        for k in range((1 << len(rebanadas)) - 1, 0, -1):
+            _, igual = self._comparar(rebanadas, k)
+            for username in self.nombres(igual):
+                resultado.append((username, k))
+                if len(resultado) >= limite:
+                    return resultado
+        return resultado
+
+    def cuentas_de(self, username: str) -> List[str]:
+        """Cuentas monitoreadas a las que sigue un usuario"""
+        if self._ids is None:
+            self._ids = {u: i for i, u in enumerate(self.usuarios)}
+        i = self._ids.get(username)
+        if i is None:
+            return []
+        return [cuenta for cuenta in sorted(self.cuentas) if (self.bits(cuenta) >> i) & 1]
+
+
+def reconstruir_indice_invertido(directorio_datos: str) -> IndiceInvertido:
+    """
+    Reconstruye el índice invertido con el último snapshot de cada cuenta
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+
+    Returns:
+        IndiceInvertido: Índice reconstruido y guardado
+    """
+    import shutil
+
+    carpeta = os.path.join(directorio_datos, CARPETA_INDICE_INVERTIDO)
+    if os.path.exists(carpeta):
+        shutil.rmtree(carpeta)
+
+    indice = IndiceInvertido(directorio_datos)
+    if os.path.exists(directorio_datos):
+        for cuenta in sorted(os.listdir(directorio_datos)):
+            snapshots = listar_snapshots(directorio_datos, cuenta, "seguidores")
+            if not snapshots:
+                continue
+            with open(snapshots[-1], 'r', encoding='utf-8') as f:
+                seguidores = json.load(f).get("seguidores", [])
+            indice.establecer(cuenta, seguidores, timestamp_de_archivo(snapshots[-1]))
+    indice.guardar()
+    return indice
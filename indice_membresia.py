@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice de membresía por usuario para el Monitor de Instagram
+Guarda, para cada cuenta monitoreada, los intervalos [primera_vez, última_vez]
+en que cada usuario aparece como seguidor o seguido. Se actualiza con cada
+reporte de cambios y se divide en fragmentos para que una consulta solo lea
+un archivo pequeño. Un cambio de nombre traslada los intervalos al nombre nuevo
+"""
+
+import json
+import os
+import zlib
+from typing import Dict, Iterable, List, Optional, Set
+
+from identidades import ConjuntoUsuarios, comparar_usuarios, usuarios_de_snapshot
+from utils import escribir_json_atomico
+
+RELACIONES = ("seguidores", "seguidos")
+NUM_FRAGMENTOS = 64
+
+# Fechas de inicio anteriores al primer snapshot (p. ej. de la descarga de datos de Instagram)
+ARCHIVO_INICIOS_CONOCIDOS = "inicios_conocidos.json"
+
+
+def carpeta_indices(directorio_datos: str, cuenta: str) -> str:
+    """
+    Devuelve la carpeta de índices de una cuenta
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuenta: Cuenta monitoreada
+
+    Returns:
+        str: Ruta de datos_monitoreo/<cuenta>/indices
+    """
+    return os.path.join(directorio_datos, cuenta, "indices")
+
+
+def listar_snapshots(directorio_datos: str, cuenta: str, tipo: str) -> List[str]:
+    """
+    Lista los snapshots completos de una cuenta ordenados por timestamp
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuenta: Cuenta monitoreada
+        tipo: 'seguidores' o 'seguidos'
+
+    Returns:
+        List[str]: Rutas de los archivos, del más antiguo al más reciente
+    """
+    carpeta = os.path.join(directorio_datos, cuenta, tipo)
+    if not os.path.exists(carpeta):
+        return []
+    return [os.path.join(carpeta, f) for f in sorted(os.listdir(carpeta)) if f.endswith(f"_{tipo}.json")]
+
+
+def timestamp_de_archivo(ruta: str) -> str:
+    """Extrae el timestamp YYYY-MM-DD_HH-MM-SS del nombre de un snapshot"""
+    return os.path.basename(ruta)[:19]
+
+
+class IndiceMembresia:
+    """Intervalos de membresía de cada usuario en las listas de una cuenta"""
+
+    def __init__(self, directorio_datos: str, cuenta: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+            cuenta: Cuenta monitoreada
+        """
+        self.cuenta = cuenta
+        self.carpeta = os.path.join(carpeta_indices(directorio_datos, cuenta), "membresia")
+        self.ruta_meta = os.path.join(self.carpeta, "meta.json")
+        self._fragmentos: Dict[int, Dict[str, Dict[str, List]]] = {}
+        self._modificados: Set[int] = set()
+        self.meta = {"cuenta": cuenta, "ultima_observacion": {}}
+        if os.path.exists(self.ruta_meta):
+            with open(self.ruta_meta, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+
+    @property
+    def existe(self) -> bool:
+        """True si el índice ya tiene datos"""
+        return bool(self.meta.get("ultima_observacion"))
+
+    def _numero_fragmento(self, username: str) -> int:
+        return zlib.crc32(username.encode('utf-8')) % NUM_FRAGMENTOS
+
+    def _fragmento(self, numero: int) -> Dict[str, Dict[str, List]]:
+        """Carga un fragmento del disco la primera vez que se necesita"""
+        if numero not in self._fragmentos:
+            ruta = os.path.join(self.carpeta, f"{numero:02d}.json")
+            if os.path.exists(ruta):
+                with open(ruta, 'r', encoding='utf-8') as f:
+                    self._fragmentos[numero] = json.load(f)
+            else:
+                self._fragmentos[numero] = {}
+        return self._fragmentos[numero]
+
+    def _intervalos(self, username: str, relacion: str, crear: bool = False) -> Optional[List]:
+        numero = self._numero_fragmento(username)
+        fragmento = self._fragmento(numero)
+        if crear:
+            self._modificados.add(numero)
+            return fragmento.setdefault(username, {}).setdefault(relacion, [])
+        return fragmento.get(username, {}).get(relacion)
+
+    def agregar(self, relacion: str, usuarios: Iterable[str], timestamp: str) -> None:
+        """
+        Abre un intervalo para usuarios que aparecen en una relación
+
+        Args:
+            relacion: 'seguidores' o 'seguidos'
+            usuarios: Usuarios que aparecen
+            timestamp: Timestamp del snapshot donde aparecen
+        """
+        for username in usuarios:
+            intervalos = self._intervalos(username, relacion, crear=True)
+            if not intervalos or intervalos[-1][1] is not None:
+                intervalos.append([timestamp, None])
+
+    def quitar(self, relacion: str, usuarios: Iterable[str], ultima_vez: str) -> Dict[str, str]:
+        """
+        Cierra el intervalo abierto de usuarios que desaparecen de una relación
+
+        Args:
+            relacion: 'seguidores' o 'seguidos'
+            usuarios: Usuarios que desaparecen
+            ultima_vez: Timestamp del último snapshot donde aparecían
+
+        Returns:
+            Dict[str, str]: Usuario → inicio del intervalo cerrado (si se conocía)
+        """
+        inicios = {}
+        for username in usuarios:
+            intervalos = self._intervalos(username, relacion)
+            if intervalos and intervalos[-1][1] is None:
+                self._modificados.add(self._numero_fragmento(username))
+                intervalos[-1][1] = ultima_vez
+                inicios[username] = intervalos[-1][0]
+        return inicios
+
+    def renombrar(self, relacion: str, renombres: Iterable[Dict]) -> None:
+        """
+        Traslada los intervalos de usuarios que han cambiado de nombre
+
+        Args:
+            relacion: 'seguidores' o 'seguidos'
+            renombres: Entradas {"anterior", "actual"} de un reporte
+        """
+        for renombre in renombres:
+            anterior, actual = renombre["anterior"], renombre["actual"]
+            intervalos = self._intervalos(anterior, relacion)
+            if not intervalos:
+                continue
+            numero = self._numero_fragmento(anterior)
+            fragmento = self._fragmento(numero)
+            del fragmento[anterior][relacion]
+            if not fragmento[anterior]:
+                del fragmento[anterior]
+            self._modificados.add(numero)
+            destino = self._intervalos(actual, relacion, crear=True)
+            destino.extend(intervalos)
+            destino.sort(key=lambda intervalo: intervalo[0])
+
+    def adelantar_inicios(self, relacion: str, inicios: Dict[str, str]) -> int:
+        """
+        Adelanta el inicio del primer intervalo de usuarios cuya fecha real se conoce
+
+        Args:
+            relacion: 'seguidores' o 'seguidos'
+            inicios: Usuario → timestamp en que empezó la relación
+
+        Returns:
+            int: Intervalos modificados
+        """
+        modificados = 0
+        for username, inicio in inicios.items():
+            intervalos = self._intervalos(username, relacion)
+            if intervalos and inicio < intervalos[0][0]:
+                intervalos[0][0] = inicio
+                self._modificados.add(self._numero_fragmento(username))
+                modificados += 1
+        return modificados
+
+    def observar(self, relacion: str, timestamp: str) -> None:
+        """Registra el timestamp del último snapshot aplicado a una relación"""
+        self.meta.setdefault("ultima_observacion", {})[relacion] = timestamp
+
+    def inicializar(self, timestamp: str, seguidores: Iterable[str], seguidos: Iterable[str]) -> None:
+        """
+        Crea el índice a partir del primer snapshot de la cuenta
+
+        Args:
+            timestamp: Timestamp del snapshot
+            seguidores: Seguidores actuales
+            seguidos: Seguidos actuales
+        """
+        for relacion, usuarios in (("seguidores", seguidores), ("seguidos", seguidos)):
+            self.agregar(relacion, usuarios, timestamp)
+            self.observar(relacion, timestamp)
+
+    def actualizar_desde_reporte(self, reporte: Dict) -> Dict[str, Dict[str, str]]:
+        """
+        Aplica un reporte de generar_reporte_cambios al índice
+
+        Args:
+            reporte: Reporte de cambios (no de primer monitoreo)
+
+        Returns:
+            Dict: Por relación, usuario eliminado → inicio de su intervalo
+        """
+        timestamp = reporte["timestamp"]
+        inicios = {}
+        cambios = {
+            "seguidores": (reporte["cambios_seguidores"]["nuevos"], reporte["cambios_seguidores"]["perdidos"]),
+            "seguidos": (reporte["cambios_seguidos"]["nuevos"], reporte["cambios_seguidos"]["eliminados"]),
+        }
+        renombres = reporte.get("renombres", {})
+        for relacion, (nuevos, eliminados) in cambios.items():
+            self.renombrar(relacion, renombres.get(relacion, []))
+            ultima_vez = (reporte.get("timestamp_anterior") or
+                          self.meta.get("ultima_observacion", {}).get(relacion) or timestamp)
+            inicios[relacion] = self.quitar(relacion, eliminados, ultima_vez)
+            self.agregar(relacion, nuevos, timestamp)
+            self.observar(relacion, timestamp)
+        return inicios
+
+    def consultar(self, username: str) -> Dict[str, List[Dict]]:
+        """
+        Devuelve los intervalos de un usuario en cada relación
+
+        Args:
+            username: Usuario a consultar
+
+        Returns:
+            Dict: Por relación, lista de {"primera_vez", "ultima_vez", "actual"}
+        """
+        resultado = {}
+        for relacion in RELACIONES:
+            intervalos = self._intervalos(username, relacion) or []
+            ultima = self.meta.get("ultima_observacion", {}).get(relacion)
+            resultado[relacion] = [
+                {"primera_vez": inicio, "ultima_vez": fin or ultima, "actual": fin is None}
+                for inicio, fin in intervalos
+            ]
+        return resultado
+
+    def inicio_actual(self, username: str, relacion: str) -> Optional[str]:
+        """Devuelve desde cuándo está un usuario en una relación, si sigue en ella"""
+        intervalos = self._intervalos(username, relacion)
+        if intervalos and intervalos[-1][1] is None:
+            return intervalos[-1][0]
+        return None
+
+    def inicios_eliminados(self, reporte: Dict) -> Dict[str, Dict[str, str]]:
+        """
+        Fechas de alta de los usuarios que un reporte ya aplicado dio de baja
+        (lo que devolvió actualizar_desde_reporte, p. ej. tras reconstruir el índice)
+
+        Args:
+            reporte: Reporte de cambios ya incluido en el índice
+
+        Returns:
+            Dict: Por relación, usuario eliminado → inicio de su último intervalo
+        """
+        eliminados = {
+            "seguidores": reporte["cambios_seguidores"]["perdidos"],
+            "seguidos": reporte["cambios_seguidos"]["eliminados"],
+        }
+        inicios = {}
+        for relacion, usuarios in eliminados.items():
+            inicios[relacion] = {}
+            for username in usuarios:
+                intervalos = self._intervalos(username, relacion)
+                if intervalos and intervalos[-1][1] is not None:
+                    inicios[relacion][username] = intervalos[-1][0]
+        return inicios
+
+    def guardar(self) -> None:
+        """Escribe en disco los fragmentos modificados y los metadatos"""
+        if not os.path.exists(self.carpeta):
+            os.makedirs(self.carpeta)
+        for numero in sorted(self._modificados):
+            ruta = os.path.join(self.carpeta, f"{numero:02d}.json")
+            escribir_json_atomico(ruta, self._fragmentos[numero], separators=(',', ':'))
+        self._modificados.clear()
+        escribir_json_atomico(self.ruta_meta, self.meta, indent=2)
+
+
+def reconstruir_indice(directorio_datos: str, cuenta: str) -> IndiceMembresia:
+    """
+    Reconstruye el índice de una cuenta recorriendo todo su historial de snapshots
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuenta: Cuenta monitoreada
+
+    Returns:
+        IndiceMembresia: Índice reconstruido y guardado
+    """
+    import shutil
+
+    carpeta = os.path.join(carpeta_indices(directorio_datos, cuenta), "membresia")
+    if os.path.exists(carpeta):
+        shutil.rmtree(carpeta)
+
+    indice = IndiceMembresia(directorio_datos, cuenta)
+    inicios_conocidos = cargar_inicios_conocidos(directorio_datos, cuenta)
+    for relacion in RELACIONES:
+        anterior = ConjuntoUsuarios()
+        timestamp_anterior = None
+        for ruta in listar_snapshots(directorio_datos, cuenta, relacion):
+            with open(ruta, 'r', encoding='utf-8') as f:
+                actual = usuarios_de_snapshot(json.load(f), relacion)
+            timestamp = timestamp_de_archivo(ruta)
+            nuevos, perdidos, renombres = comparar_usuarios(anterior, actual)
+            indice.renombrar(relacion, renombres)
+            if timestamp_anterior is not None:
+                indice.quitar(relacion, perdidos, timestamp_anterior)
+            indice.agregar(relacion, nuevos, timestamp)
+            indice.observar(relacion, timestamp)
+            anterior, timestamp_anterior = actual, timestamp
+        indice.adelantar_inicios(relacion, inicios_conocidos.get(relacion, {}))
+    indice.guardar()
+    return indice
+
+
+def cargar_inicios_conocidos(directorio_datos: str, cuenta: str) -> Dict[str, Dict[str, str]]:
+    """Fechas de inicio conocidas de una cuenta: relación → usuario → timestamp"""
+    ruta = os.path.join(carpeta_indices(directorio_datos, cuenta), ARCHIVO_INICIOS_CONOCIDOS)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def guardar_inicios_conocidos(directorio_datos: str, cuenta: str, inicios: Dict[str, Dict[str, str]]) -> None:
+    """
+    Añade fechas de inicio conocidas (se conserva la más antigua de cada usuario)
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuenta: Cuenta monitoreada
+        inicios: Relación → usuario → timestamp
+    """
+    conocidos = cargar_inicios_conocidos(directorio_datos, cuenta)
+    for relacion, fechas in inicios.items():
+        destino = conocidos.setdefault(relacion, {})
+        for username, inicio in fechas.items():
+            if username not in destino or inicio < destino[username]:
+                destino[username] = inicio
+    carpeta = carpeta_indices(directorio_datos, cuenta)
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+    escribir_json_atomico(os.path.join(carpeta, ARCHIVO_INICIOS_CONOCIDOS), conocidos)
@@ -7,38 +7,63 @@ Contiene la clase InstagramMonitor con todas las funcionalidades
 
 import json
 import os
+import sys
+from itertools import islice
 import pickle
 import time
 import random
 from datetime import datetime
-from typing import Set, Dict, List, Optional
-import instaloader
+from typing import Callable, Set, Dict, List, Optional
 from colorama import Fore, Style
+import config_seguridad
+import config
+from grabacion import GrabadorRespuestas, ReproductorRespuestas
+from registro import obtener_registro, escribir_en_linea, terminar_linea
+from sesiones import GestorSesiones
+from indice_membresia import IndiceMembresia, guardar_inicios_conocidos, listar_snapshots, reconstruir_indice
+from historial import construir_reporte_cambios, diferencia_entre, normalizar_momento
+from analitica import AnaliticaCuenta, exportar_serie, reconstruir_analitica
+from indice_invertido import CARPETA_INDICE_INVERTIDO, IndiceInvertido, reconstruir_indice_invertido
+from identidades import ConjuntoUsuarios, registrar_renombres, usuarios_de_snapshot
+from enriquecimiento import (CARPETA_ENRIQUECIMIENTO, CacheEnriquecimiento, ColaEnriquecimiento,
+                              anotar_reporte, datos_de_perfil, etiquetas, usuarios_nuevos)
+from feed_cambios import CARPETA_FEED, FeedCambios
+from reciprocidad import DESCRIPCION_VISTAS, VISTAS, VistasReciprocidad
+import puerta_conteo
+from series_contadores import (SerieContadores, agregar_muestras, agrupar_muestras,
+                               formatear_momento)
+from anomalias import DetectorAnomalias, metricas_de_contadores, metricas_de_reporte, registrar_eventos
 from utils import (
-    formatear_fecha, validar_username, limpiar_username, 
+    validar_username, limpiar_username, 
     mostrar_barra_progreso, confirmar_accion, formatear_numero,
-    truncar_lista, obtener_emoji_cambio
+    truncar_lista, obtener_emoji_cambio, ModuloDiferido, escribir_atomico, escribir_json_atomico
 )
 
+# instaloader (y con él requests) solo se importa cuando se usa de verdad,
+# para que los comandos sin red arranquen rápido
+instaloader = ModuloDiferido("instaloader")
+
+# Lo mismo para los módulos que solo usan algunas operaciones (bloqueos entre procesos,
+# resultados tipados, solapamiento); el servidor, la cola de trabajo, el grafo, el
+# escritor en segundo plano y el importador se importan dentro de los métodos que los usan
+bloqueos = ModuloDiferido("bloqueos")
+resultados = ModuloDiferido("resultados")
+solapamiento = ModuloDiferido("solapamiento")
+
+registro = obtener_registro()
+
 class InstagramMonitor:
     """Clase principal para el monitoreo de Instagram"""
     
-    def __init__(self):
-        """Inicializa el monitor de Instagram con configuración conservadora"""
-        # Configurar instaloader con delays para evitar detección
-        self.loader = instaloader.Instaloader(
-            download_pictures=False,
-            download_videos=False,
-            download_video_thumbnails=False,
-            download_geotags=False,
-            download_comments=False,
-            save_metadata=False,
-            compress_json=False,
-            post_metadata_txt_pattern="",
-            storyitem_metadata_txt_pattern="",
-            max_connection_attempts=3,
-            request_timeout=300
-        )
+    def __init__(self, directorio_datos: str = "datos_monitoreo"):
+        """
+        Inicializa el monitor de Instagram con configuración conservadora
+        
+        Args:
+            directorio_datos: Carpeta donde se guardan snapshots, reportes e índices
+        """
+        # El loader de instaloader se crea al primer uso (ver propiedad loader)
+        self._loader = None
         
         self.sesion_activa = False
         self.username_actual = None
@@ -47,12 +72,112 @@ class InstagramMonitor:
         # Contadores para manejo conservador de requests
         self.requests_count = 0
         self.last_request_time = time.time()
-        self.MAX_REQUESTS_PER_MINUTE = 15  # Muy conservador
+        self.MAX_REQUESTS_PER_MINUTE = config_seguridad.MAX_REQUESTS_PER_MINUTE
+        
+        # Grabación/reproducción de respuestas para pruebas de rendimiento
+        self.grabador = None
+        self.reproductor = None
+        self.escala_tiempo = 1.0  # Factor aplicado a todas las pausas del monitor
+        
+        # Sin callbacks se pregunta y se pinta en la consola (ver _confirmar y _progreso)
+        self.decidir: Optional[Callable[[str, str, bool], bool]] = None
+        self.al_progreso: Optional[Callable[[str, int, int], None]] = None
         
         # Crear directorio de datos si no existe
-        self.directorio_datos = "datos_monitoreo"
+        self.directorio_datos = directorio_datos
         if not os.path.exists(self.directorio_datos):
             os.makedirs(self.directorio_datos)
+        
+        # Índice de sesiones guardadas (se lee del disco al primer uso)
+        self.sesiones = GestorSesiones(self.directorio_datos)
+        
+        # Perfiles ya consultados por la puerta de conteo, para no repetir la consulta al rastrear
+        self._perfiles = {}
+        
+        # Contadores del perfil vistos al rastrear (se guardan con el snapshot para la puerta de conteo)
+        self._contadores = {}
+        
+        # Escritor de guardados parciales en segundo plano (se crea en la primera descarga)
+        self._escritor = None
+    
+    @property
+    def escritor(self):
+        """Escritor en segundo plano de los guardados parciales, para no frenar la descarga"""
+        if self._escritor is None:
+            from escritor_fondo import EscritorFondo
+            self._escritor = EscritorFondo(self._al_escribir_parcial)
+        return self._escritor
+    
+    def _vaciar_escritor(self) -> None:
+        """Espera a que se escriban los guardados parciales pendientes (si se llegó a crear el escritor)"""
+        if self._escritor is not None:
+            self._escritor.vaciar()
+    
+    @property
+    def loader(self):
+        """Instancia de instaloader, creada (e importada) la primera vez que se necesita"""
+        if self._loader is None:
+            # Configurar instaloader con delays para evitar detección
+            self._loader = instaloader.Instaloader(
+                download_pictures=False,
+                download_videos=False,
+                download_video_thumbnails=False,
+                download_geotags=False,
+                download_comments=False,
+                save_metadata=False,
+                compress_json=False,
+                post_metadata_txt_pattern="",
+                storyitem_metadata_txt_pattern="",
+                max_connection_attempts=3,
+                request_timeout=300
+            )
+        return self._loader
+    
+    @loader.setter
+    def loader(self, valor):
+        self._loader = valor
+    
+    def _dormir(self, segundos: float):
+        """
+        Pausa la ejecución aplicando la escala de tiempo configurada
+        
+        Args:
+            segundos: Duración nominal de la pausa
+        """
+        if segundos > 0 and self.escala_tiempo > 0:
+            time.sleep(segundos * self.escala_tiempo)
+    
+    def _confirmar(self, clave: str, mensaje: str, defecto: bool = False) -> bool:
+        """
+        Decide si seguir en un punto en el que el monitor necesita confirmación
+        Con el callback decidir la respuesta la da el programa que usa el monitor;
+        si no, se pregunta en la consola
+        
+        Args:
+            clave: Identificador estable de la decisión (ver api.DECISIONES)
+            mensaje: Pregunta para mostrar al usuario
+            defecto: Respuesta si el usuario no escribe nada
+            
+        Returns:
+            bool: True para continuar
+        """
+        if self.decidir is not None:
+            return bool(self.decidir(clave, mensaje, defecto))
+        return confirmar_accion(mensaje, defecto)
+    
+    def _progreso(self, operacion: str, actual: int, total: int) -> None:
+        """
+        Informa del avance de una descarga al callback al_progreso o con la barra de la consola
+        
+        Args:
+            operacion: 'seguidores', 'seguidos' o 'mutuos'
+            actual: Elementos procesados
+            total: Total estimado
+        """
+        if self.al_progreso is not None:
+            self.al_progreso(operacion, actual, total)
+        else:
+            mostrar_barra_progreso(actual, total)
     
     def _wait_if_needed(self):
         """
@@ -69,13 +194,14 @@ class InstagramMonitor:
         if self.requests_count >= self.MAX_REQUESTS_PER_MINUTE:
             wait_time = 60 - time_since_last
             if wait_time > 0:
-                print(f"{Fore.YELLOW}⏳ Esperando {int(wait_time)} segundos para respetar límites de Instagram...{Style.RESET_ALL}")
-                time.sleep(wait_time)
+                registro.info(f"{Fore.YELLOW}⏳ Esperando {int(wait_time)} segundos para respetar límites de Instagram...{Style.RESET_ALL}")
+                self._dormir(wait_time)
                 self.requests_count = 0
         
-        # Delay aleatorio entre requests (2-5 segundos)
-        delay = random.uniform(2.0, 5.0)
-        time.sleep(delay)
+        # Delay aleatorio entre requests
+        delay = random.uniform(config_seguridad.MIN_DELAY_BETWEEN_REQUESTS,
+                               config_seguridad.MAX_DELAY_BETWEEN_REQUESTS)
+        self._dormir(delay)
         
         self.requests_count += 1
         self.last_request_time = time.time()
@@ -91,19 +217,21 @@ class InstagramMonitor:
             bool: True si se debe reintentar, False si es un error permanente
         """
         if "Please wait" in error_msg or "Try again later" in error_msg or "rate limit" in error_msg.lower():
-            print(f"{Fore.YELLOW}⚠️ Instagram ha detectado actividad automatizada{Style.RESET_ALL}")
-            print(f"{Fore.YELLOW}💡 Esto es normal al usar herramientas de monitoreo{Style.RESET_ALL}")
+            registro.warning(f"{Fore.YELLOW}⚠️ Instagram ha detectado actividad automatizada{Style.RESET_ALL}")
+            registro.info(f"{Fore.YELLOW}💡 Esto es normal al usar herramientas de monitoreo{Style.RESET_ALL}")
             
-            if confirmar_accion("¿Esperar 10 minutos y continuar? (recomendado)"):
-                print(f"{Fore.CYAN}⏳ Esperando 10 minutos para respetar los límites de Instagram...{Style.RESET_ALL}")
-                for i in range(600, 0, -30):  # 10 minutos en bloques de 30 segundos
+            minutos_espera = config_seguridad.RATE_LIMIT_WAIT_TIME // 60
+            if self._confirmar("esperar_limite", f"¿Esperar {minutos_espera} minutos y continuar? (recomendado)"):
+                registro.info(f"{Fore.CYAN}⏳ Esperando {minutos_espera} minutos para respetar los límites de Instagram...{Style.RESET_ALL}")
+                for i in range(config_seguridad.RATE_LIMIT_WAIT_TIME, 0, -30):  # Bloques de 30 segundos
                     mins, secs = divmod(i, 60)
-                    print(f"\r{Fore.CYAN}⏳ Tiempo restante: {mins:02d}:{secs:02d}{Style.RESET_ALL}", end="", flush=True)
-                    time.sleep(30)
-                print(f"\n{Fore.GREEN}✅ Listo para continuar{Style.RESET_ALL}")
+                    escribir_en_linea(f"{Fore.CYAN}⏳ Tiempo restante: {mins:02d}:{secs:02d}{Style.RESET_ALL}")
+                    self._dormir(30)
+                terminar_linea()
+                registro.info(f"{Fore.GREEN}✅ Listo para continuar{Style.RESET_ALL}")
                 return True
             else:
-                print(f"{Fore.YELLOW}⚠️ Operación cancelada por el usuario{Style.RESET_ALL}")
+                registro.warning(f"{Fore.YELLOW}⚠️ Operación cancelada por el usuario{Style.RESET_ALL}")
                 return False
         
         return False
@@ -111,6 +239,7 @@ class InstagramMonitor:
     def _guardar_datos_parciales(self, username: str, datos: Set[str], tipo: str, timestamp: str):
         """
         Guarda datos parciales durante el proceso de obtención para evitar pérdidas
+        Aquí solo se copian los datos; la escritura la hace self.escritor en segundo plano
         
         Args:
             username: Nombre de usuario
@@ -126,27 +255,35 @@ class InstagramMonitor:
             nombre_archivo = f"{timestamp}_{tipo}_parcial.json"
             ruta_archivo = os.path.join(carpeta_tipo, nombre_archivo)
             
+            lista = list(datos)
             datos_json = {
                 "usuario": username,
                 "tipo": tipo,
                 "timestamp": timestamp,
-                "fecha_obtencion": formatear_fecha(datetime.now()),
+                "fecha_obtencion": datetime.now().isoformat(),
                 "total_obtenidos": len(datos),
                 "status": "parcial",
-                "datos": list(datos)
+                "datos": lista
             }
+            if getattr(datos, "ids", None):
+                datos_json["ids_datos"] = datos.ids_alineados(lista)
             
-            with open(ruta_archivo, 'w', encoding='utf-8') as f:
-                json.dump(datos_json, f, indent=2, ensure_ascii=False)
-            
-            print(f"{Fore.CYAN}💾 Guardado parcial: {len(datos)} {tipo} en {nombre_archivo}{Style.RESET_ALL}")
+            self.escritor.encolar(ruta_archivo, datos_json, f"{len(datos)} {tipo} en {nombre_archivo}", indent=2)
             
         except Exception as e:
-            print(f"{Fore.YELLOW}⚠️ No se pudo guardar datos parciales: {str(e)}{Style.RESET_ALL}")
+            registro.warning(f"{Fore.YELLOW}⚠️ No se pudo guardar datos parciales: {str(e)}{Style.RESET_ALL}")
+    
+    def _al_escribir_parcial(self, ruta: str, descripcion: str, error: Optional[Exception]) -> None:
+        """Informa del resultado de un guardado parcial (se llama desde el hilo escritor)"""
+        if error is None:
+            registro.info(f"{Fore.CYAN}💾 Guardado parcial: {descripcion}{Style.RESET_ALL}")
+        else:
+            registro.warning(f"{Fore.YELLOW}⚠️ No se pudo guardar datos parciales: {error}{Style.RESET_ALL}")
     
     def _finalizar_archivo_parcial(self, username: str, datos: Set[str], tipo: str, timestamp: str):
         """
-        Convierte un archivo parcial en el archivo final y elimina el parcial
+        Elimina el archivo parcial una vez completada la obtención
+        (el snapshot definitivo lo escribe guardar_datos_actuales)
         
         Args:
             username: Nombre de usuario
@@ -156,37 +293,18 @@ class InstagramMonitor:
         """
         try:
             carpetas = self.crear_estructura_usuario(username)
-            carpeta_tipo = carpetas[tipo]
-            
-            # Nombres de archivos
-            archivo_parcial = f"{timestamp}_{tipo}_parcial.json"
-            archivo_final = f"{timestamp}_{tipo}.json"
-            ruta_parcial = os.path.join(carpeta_tipo, archivo_parcial)
-            ruta_final = os.path.join(carpeta_tipo, archivo_final)
-            
-            # Crear archivo final
-            datos_json = {
-                "usuario": username,
-                "tipo": tipo,
-                "timestamp": timestamp,
-                "fecha_obtencion": formatear_fecha(datetime.now()),
-                "total": len(datos),
-                "status": "completo",
-                "datos": list(datos)
-            }
-            
-            with open(ruta_final, 'w', encoding='utf-8') as f:
-                json.dump(datos_json, f, indent=2, ensure_ascii=False)
+            ruta_parcial = os.path.join(carpetas[tipo], f"{timestamp}_{tipo}_parcial.json")
             
-            # Eliminar archivo parcial si existe
+            # Un guardado pendiente volvería a crear el parcial después de borrarlo
+            if self._escritor is not None:
+                self._escritor.descartar(ruta_parcial)
+            self._vaciar_escritor()
             if os.path.exists(ruta_parcial):
                 os.remove(ruta_parcial)
-                print(f"{Fore.GREEN}✅ Archivo final guardado: {archivo_final} (parcial eliminado){Style.RESET_ALL}")
-            else:
-                print(f"{Fore.GREEN}✅ Archivo final guardado: {archivo_final}{Style.RESET_ALL}")
+                registro.info(f"{Fore.GREEN}✅ Obtención completa: {len(datos)} {tipo} (parcial eliminado){Style.RESET_ALL}")
             
         except Exception as e:
-            print(f"{Fore.YELLOW}⚠️ Error al finalizar archivo: {str(e)}{Style.RESET_ALL}")
+            registro.warning(f"{Fore.YELLOW}⚠️ Error al eliminar archivo parcial: {str(e)}{Style.RESET_ALL}")
     
     def _recuperar_datos_parciales(self, username: str, tipo: str) -> Optional[tuple]:
         """
@@ -199,6 +317,7 @@ class InstagramMonitor:
         Returns:
             Tuple (datos_recuperados, timestamp) o None si no hay archivo parcial
         """
+        self._vaciar_escritor()
         try:
             carpetas = self.crear_estructura_usuario(username)
             carpeta_tipo = carpetas[tipo]
@@ -219,24 +338,24 @@ class InstagramMonitor:
             with open(ruta_archivo, 'r', encoding='utf-8') as f:
                 datos_json = json.load(f)
             
-            datos_recuperados = set(datos_json.get('datos', []))
+            datos_recuperados = usuarios_de_snapshot(datos_json, 'datos')
             timestamp = datos_json.get('timestamp', '')
             total_recuperados = len(datos_recuperados)
             
             if total_recuperados > 0:
-                print(f"{Fore.YELLOW}🔄 Encontrados datos parciales: {total_recuperados} {tipo}{Style.RESET_ALL}")
-                if confirmar_accion(f"¿Continuar desde donde se quedó? (tienes {total_recuperados} {tipo} guardados)"):
-                    print(f"{Fore.GREEN}✅ Continuando desde datos parciales...{Style.RESET_ALL}")
+                registro.info(f"{Fore.YELLOW}🔄 Encontrados datos parciales: {total_recuperados} {tipo}{Style.RESET_ALL}")
+                if self._confirmar("continuar_parcial", f"¿Continuar desde donde se quedó? (tienes {total_recuperados} {tipo} guardados)"):
+                    registro.info(f"{Fore.GREEN}✅ Continuando desde datos parciales...{Style.RESET_ALL}")
                     return (datos_recuperados, timestamp)
                 else:
                     # Eliminar archivo parcial si no se quiere continuar
                     os.remove(ruta_archivo)
-                    print(f"{Fore.YELLOW}🗑️ Archivo parcial eliminado, empezando desde cero{Style.RESET_ALL}")
+                    registro.info(f"{Fore.YELLOW}🗑️ Archivo parcial eliminado, empezando desde cero{Style.RESET_ALL}")
             
             return None
             
         except Exception as e:
-            print(f"{Fore.YELLOW}⚠️ Error al recuperar datos parciales: {str(e)}{Style.RESET_ALL}")
+            registro.warning(f"{Fore.YELLOW}⚠️ Error al recuperar datos parciales: {str(e)}{Style.RESET_ALL}")
             return None
     
     def activar_modo_publico(self) -> bool:
@@ -247,37 +366,97 @@ class InstagramMonitor:
             bool: True si se activó correctamente
         """
         try:
-            print(f"{Fore.CYAN}🌐 Activando modo solo perfiles públicos...{Style.RESET_ALL}")
+            registro.info(f"{Fore.CYAN}🌐 Activando modo solo perfiles públicos...{Style.RESET_ALL}")
             
             # Mostrar advertencia sobre limitaciones
-            print(f"{Fore.YELLOW}⚠️ MODO SOLO PERFILES PÚBLICOS{Style.RESET_ALL}")
-            print(f"{Fore.GREEN}✅ Ventajas:{Style.RESET_ALL}")
-            print(f"  • No requiere iniciar sesión")
-            print(f"  • Menor riesgo de detección")
-            print(f"  • No afecta tu cuenta personal")
-            print(f"  • Ideal para perfiles públicos")
-            
-            print(f"\n{Fore.YELLOW}⚠️ Limitaciones:{Style.RESET_ALL}")
-            print(f"  • Solo funciona con perfiles públicos")
-            print(f"  • No puede acceder a perfiles privados")
-            print(f"  • No puede obtener listas de seguidores/seguidos")
-            print(f"  • Solo puede ver información básica del perfil")
-            print(f"  • Funcionalidad limitada por restricciones de Instagram")
-            
-            if confirmar_accion("¿Continuar en modo público?"):
+            registro.warning(f"{Fore.YELLOW}⚠️ MODO SOLO PERFILES PÚBLICOS{Style.RESET_ALL}")
+            registro.info(f"{Fore.GREEN}✅ Ventajas:{Style.RESET_ALL}")
+            registro.info(f"  • No requiere iniciar sesión")
+            registro.info(f"  • Menor riesgo de detección")
+            registro.info(f"  • No afecta tu cuenta personal")
+            registro.info(f"  • Ideal para perfiles públicos")
+            
+            registro.warning(f"\n{Fore.YELLOW}⚠️ Limitaciones:{Style.RESET_ALL}")
+            registro.info(f"  • Solo funciona con perfiles públicos")
+            registro.info(f"  • No puede acceder a perfiles privados")
+            registro.info(f"  • No puede obtener listas de seguidores/seguidos")
+            registro.info(f"  • Solo puede ver información básica del perfil")
+            registro.info(f"  • Funcionalidad limitada por restricciones de Instagram")
+            
+            if self._confirmar("modo_publico", "¿Continuar en modo público?"):
                 self.modo_publico = True
                 self.sesion_activa = False  # No hay sesión real
                 self.username_actual = "modo_publico"
                 
-                print(f"{Fore.GREEN}✅ Modo público activado correctamente{Style.RESET_ALL}")
-                print(f"{Fore.CYAN}💡 Ahora puedes monitorear perfiles públicos sin iniciar sesión{Style.RESET_ALL}")
+                registro.info(f"{Fore.GREEN}✅ Modo público activado correctamente{Style.RESET_ALL}")
+                registro.info(f"{Fore.CYAN}💡 Ahora puedes monitorear perfiles públicos sin iniciar sesión{Style.RESET_ALL}")
                 return True
             else:
-                print(f"{Fore.YELLOW}⚠️ Modo público cancelado{Style.RESET_ALL}")
+                registro.warning(f"{Fore.YELLOW}⚠️ Modo público cancelado{Style.RESET_ALL}")
                 return False
                 
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al activar modo público: {str(e)}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al activar modo público: {str(e)}{Style.RESET_ALL}")
+            return False
+    
+    def activar_grabacion(self, nombre: str) -> bool:
+        """
+        Empieza a grabar todas las respuestas que obtiene instaloader
+        
+        Args:
+            nombre: Nombre de la grabación
+            
+        Returns:
+            bool: True si se activó la grabación
+        """
+        if self.reproductor:
+            registro.error(f"{Fore.RED}❌ No se puede grabar mientras se reproduce una grabación{Style.RESET_ALL}")
+            return False
+        
+        try:
+            self.detener_grabacion()
+            self.grabador = GrabadorRespuestas(nombre)
+            self.grabador.instalar(self.loader.context)
+            registro.info(f"{Fore.GREEN}⏺️ Grabando respuestas en: {self.grabador.carpeta}{Style.RESET_ALL}")
+            return True
+        except Exception as e:
+            self.grabador = None
+            registro.error(f"{Fore.RED}❌ Error al activar la grabación: {str(e)}{Style.RESET_ALL}")
+            return False
+    
+    def detener_grabacion(self) -> None:
+        """Detiene la grabación en curso, si la hay"""
+        if self.grabador:
+            self.grabador.detener()
+            registro.info(f"{Fore.GREEN}⏹️ Grabación detenida: {self.grabador.total} respuestas guardadas{Style.RESET_ALL}")
+            self.grabador = None
+    
+    def activar_reproduccion(self, nombre: str, escala: float = 1.0) -> bool:
+        """
+        Sirve todas las peticiones desde una grabación, sin acceder a la red
+        
+        Args:
+            nombre: Nombre de la grabación
+            escala: Factor de tiempo (1.0 = tiempos originales, 0 = sin esperas)
+            
+        Returns:
+            bool: True si se activó la reproducción
+        """
+        try:
+            self.detener_grabacion()
+            self.reproductor = ReproductorRespuestas(nombre, escala)
+            self.reproductor.instalar(self.loader.context)
+            self.escala_tiempo = escala
+            self.sesion_activa = True
+            self.modo_publico = False
+            self.username_actual = self.reproductor.meta.get("usuario_sesion") or "reproduccion"
+            registro.info(f"{Fore.GREEN}▶️ Reproduciendo '{nombre}' con escala de tiempo {escala}{Style.RESET_ALL}")
+            return True
+        except FileNotFoundError:
+            registro.error(f"{Fore.RED}❌ No existe la grabación '{nombre}'{Style.RESET_ALL}")
+            return False
+        except Exception as e:
+            registro.error(f"{Fore.RED}❌ Error al activar la reproducción: {str(e)}{Style.RESET_ALL}")
             return False
     
     def esta_en_modo_publico(self) -> bool:
@@ -304,8 +483,8 @@ class InstagramMonitor:
                 # En modo público, verificar que el perfil sea público
                 profile = instaloader.Profile.from_username(self.loader.context, username)
                 if profile.is_private:
-                    print(f"{Fore.RED}❌ El perfil '{username}' es privado y estás en modo público{Style.RESET_ALL}")
-                    print(f"{Fore.YELLOW}💡 Para acceder a perfiles privados necesitas iniciar sesión{Style.RESET_ALL}")
+                    registro.error(f"{Fore.RED}❌ El perfil '{username}' es privado y estás en modo público{Style.RESET_ALL}")
+                    registro.info(f"{Fore.YELLOW}💡 Para acceder a perfiles privados necesitas iniciar sesión{Style.RESET_ALL}")
                     return False
                 return True
             else:
@@ -313,10 +492,10 @@ class InstagramMonitor:
                 return self.sesion_activa
                 
         except instaloader.exceptions.ProfileNotExistsException:
-            print(f"{Fore.RED}❌ El perfil '{username}' no existe{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ El perfil '{username}' no existe{Style.RESET_ALL}")
             return False
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al verificar perfil: {str(e)}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al verificar perfil: {str(e)}{Style.RESET_ALL}")
             return False
 
     def obtener_info_perfil_publico(self, username: str) -> None:
@@ -329,55 +508,59 @@ class InstagramMonitor:
         try:
             username = limpiar_username(username)
             if not validar_username(username):
-                print(f"{Fore.RED}❌ Nombre de usuario inválido: {username}{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Nombre de usuario inválido: {username}{Style.RESET_ALL}")
                 return
                 
-            print(f"{Fore.CYAN}📋 Obteniendo información de @{username}...{Style.RESET_ALL}")
+            registro.info(f"{Fore.CYAN}📋 Obteniendo información de @{username}...{Style.RESET_ALL}")
             
             # Obtener el perfil sin autenticación
             profile = instaloader.Profile.from_username(self.loader.context, username)
             
-            print(f"\n{Fore.CYAN}{'='*50}")
-            print(f"📊 INFORMACIÓN DEL PERFIL: @{username}")
-            print(f"{'='*50}{Style.RESET_ALL}")
+            registro.info(f"\n{Fore.CYAN}{'='*50}")
+            registro.info(f"📊 INFORMACIÓN DEL PERFIL: @{username}")
+            registro.info(f"{'='*50}{Style.RESET_ALL}")
+            
+            registro.info(f"\n{Fore.GREEN}👤 Información básica:{Style.RESET_ALL}")
+            registro.info(f"  • Nombre completo: {profile.full_name}")
+            registro.info(f"  • Nombre de usuario: @{profile.username}")
+            registro.info(f"  • Es privado: {'Sí' if profile.is_private else 'No'}")
+            registro.info(f"  • Es verificado: {'Sí' if profile.is_verified else 'No'}")
+            registro.info(f"  • Es cuenta de negocio: {'Sí' if profile.is_business_account else 'No'}")
             
-            print(f"\n{Fore.GREEN}👤 Información básica:{Style.RESET_ALL}")
-            print(f"  • Nombre completo: {profile.full_name}")
-            print(f"  • Nombre de usuario: @{profile.username}")
-            print(f"  • Es privado: {'Sí' if profile.is_private else 'No'}")
-            print(f"  • Es verificado: {'Sí' if profile.is_verified else 'No'}")
-            print(f"  • Es cuenta de negocio: {'Sí' if profile.is_business_account else 'No'}")
+            registro.info(f"\n{Fore.BLUE}📊 Estadísticas:{Style.RESET_ALL}")
+            registro.info(f"  • Publicaciones: {formatear_numero(profile.mediacount)}")
+            registro.info(f"  • Seguidores: {formatear_numero(profile.followers)}")
+            registro.info(f"  • Seguidos: {formatear_numero(profile.followees)}")
             
-            print(f"\n{Fore.BLUE}📊 Estadísticas:{Style.RESET_ALL}")
-            print(f"  • Publicaciones: {formatear_numero(profile.mediacount)}")
-            print(f"  • Seguidores: {formatear_numero(profile.followers)}")
-            print(f"  • Seguidos: {formatear_numero(profile.followees)}")
+            # Aprovechar la consulta para la serie de contadores si la cuenta ya se monitorea
+            if os.path.isdir(os.path.join(self.directorio_datos, username)):
+                self.registrar_muestra_contadores(username, profile)
             
             if profile.biography:
-                print(f"\n{Fore.MAGENTA}📝 Biografía:{Style.RESET_ALL}")
-                print(f"  {profile.biography}")
+                registro.info(f"\n{Fore.MAGENTA}📝 Biografía:{Style.RESET_ALL}")
+                registro.info(f"  {profile.biography}")
             
             if profile.external_url:
-                print(f"\n{Fore.CYAN}🔗 URL externa:{Style.RESET_ALL}")
-                print(f"  {profile.external_url}")
+                registro.info(f"\n{Fore.CYAN}🔗 URL externa:{Style.RESET_ALL}")
+                registro.info(f"  {profile.external_url}")
                 
             if profile.is_private:
-                print(f"\n{Fore.YELLOW}🔒 Este perfil es privado - información limitada disponible{Style.RESET_ALL}")
+                registro.info(f"\n{Fore.YELLOW}🔒 Este perfil es privado - información limitada disponible{Style.RESET_ALL}")
                 if self.modo_publico:
-                    print(f"{Fore.YELLOW}💡 Para acceder a más información, inicia sesión desde el menú principal{Style.RESET_ALL}")
+                    registro.info(f"{Fore.YELLOW}💡 Para acceder a más información, inicia sesión desde el menú principal{Style.RESET_ALL}")
             else:
-                print(f"\n{Fore.GREEN}🔓 Este perfil es público - información completa disponible{Style.RESET_ALL}")
+                registro.info(f"\n{Fore.GREEN}🔓 Este perfil es público - información completa disponible{Style.RESET_ALL}")
                 if self.modo_publico:
-                    print(f"{Fore.YELLOW}💡 Para obtener listas de seguidores/seguidos, inicia sesión desde el menú principal{Style.RESET_ALL}")
+                    registro.info(f"{Fore.YELLOW}💡 Para obtener listas de seguidores/seguidos, inicia sesión desde el menú principal{Style.RESET_ALL}")
             
-            print(f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
+            registro.info(f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
             
         except instaloader.exceptions.ProfileNotExistsException:
-            print(f"{Fore.RED}❌ El perfil '@{username}' no existe{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ El perfil '@{username}' no existe{Style.RESET_ALL}")
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al obtener información del perfil: {str(e)}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al obtener información del perfil: {str(e)}{Style.RESET_ALL}")
             if "login" in str(e).lower():
-                print(f"{Fore.YELLOW}💡 Este perfil requiere autenticación. Inicia sesión desde el menú principal.{Style.RESET_ALL}")
+                registro.info(f"{Fore.YELLOW}💡 Este perfil requiere autenticación. Inicia sesión desde el menú principal.{Style.RESET_ALL}")
     
     def crear_estructura_usuario(self, username: str) -> Dict[str, str]:
         """
@@ -436,15 +619,8 @@ class InstagramMonitor:
         if not archivos:
             return None
         
-        # Ordenar por fecha de modificación (más reciente primero)
-        archivos_con_tiempo = []
-        for archivo in archivos:
-            ruta_archivo = os.path.join(carpeta, archivo)
-            tiempo_mod = os.path.getmtime(ruta_archivo)
-            archivos_con_tiempo.append((tiempo_mod, ruta_archivo))
-        
-        archivos_con_tiempo.sort(reverse=True)
-        return archivos_con_tiempo[0][1]
+        # El nombre empieza por el timestamp del dato, que no cambia al importar o copiar archivos
+        return os.path.join(carpeta, max(archivos))
     
     def iniciar_sesion(self, username: str, password: str) -> bool:
         """
@@ -458,28 +634,25 @@ class InstagramMonitor:
             bool: True si la sesión fue exitosa
         """
         try:
-            print(f"{Fore.YELLOW}🔐 Iniciando sesión...{Style.RESET_ALL}")
+            registro.info(f"{Fore.YELLOW}🔐 Iniciando sesión...{Style.RESET_ALL}")
             
             # Intentar cargar sesión existente primero
-            carpetas = self.crear_estructura_usuario(username)
-            archivo_sesion = os.path.join(carpetas["sesiones"], f"{username}_session")
+            archivo_sesion = self.sesiones.archivo(username)
+            if not archivo_sesion:
+                carpetas = self.crear_estructura_usuario(username)
+                archivo_sesion = os.path.join(carpetas["sesiones"], f"{username}_session")
             
             if os.path.exists(archivo_sesion):
                 try:
-                    print(f"{Fore.CYAN}📁 Intentando cargar sesión guardada...{Style.RESET_ALL}")
-                    self.loader.load_session_from_file(username, archivo_sesion)
-                    
-                    # Verificar si la sesión sigue siendo válida
-                    if hasattr(self.loader.context, '_session') and self.loader.context._session:
-                        print(f"{Fore.GREEN}✅ Sesión guardada cargada correctamente para {username}{Style.RESET_ALL}")
-                        self.sesion_activa = True
-                        self.username_actual = username
+                    registro.info(f"{Fore.CYAN}📁 Intentando cargar sesión guardada...{Style.RESET_ALL}")
+                    if self._cargar_sesion_guardada(username, archivo_sesion):
+                        registro.info(f"{Fore.GREEN}✅ Sesión guardada cargada correctamente para {username}{Style.RESET_ALL}")
                         return True
                     else:
-                        print(f"{Fore.YELLOW}⚠️ La sesión guardada no es válida{Style.RESET_ALL}")
+                        registro.warning(f"{Fore.YELLOW}⚠️ La sesión guardada no es válida{Style.RESET_ALL}")
                 except Exception as e:
-                    print(f"{Fore.YELLOW}⚠️ Error al cargar sesión guardada: {str(e)}{Style.RESET_ALL}")
-                    print(f"{Fore.CYAN}🔄 Procediendo con login manual...{Style.RESET_ALL}")
+                    registro.warning(f"{Fore.YELLOW}⚠️ Error al cargar sesión guardada: {str(e)}{Style.RESET_ALL}")
+                    registro.info(f"{Fore.CYAN}🔄 Procediendo con login manual...{Style.RESET_ALL}")
             
             # Intentar iniciar sesión manual
             try:
@@ -487,57 +660,59 @@ class InstagramMonitor:
                 
                 # Verificar que la sesión se estableció correctamente
                 if hasattr(self.loader.context, '_session') and self.loader.context._session:
-                    print(f"{Fore.GREEN}✅ Sesión iniciada correctamente para {username}{Style.RESET_ALL}")
+                    registro.info(f"{Fore.GREEN}✅ Sesión iniciada correctamente para {username}{Style.RESET_ALL}")
                     self.sesion_activa = True
                     self.username_actual = username
                     
                     # Guardar la sesión nueva
                     try:
                         self.loader.save_session_to_file(archivo_sesion)
-                        print(f"{Fore.GREEN}💾 Sesión guardada en: {archivo_sesion}{Style.RESET_ALL}")
+                        self.sesiones.registrar(username, archivo_sesion, validada=True)
+                        registro.info(f"{Fore.GREEN}💾 Sesión guardada en: {archivo_sesion}{Style.RESET_ALL}")
                     except Exception as e:
-                        print(f"{Fore.YELLOW}⚠️ No se pudo guardar la sesión: {str(e)}{Style.RESET_ALL}")
+                        registro.warning(f"{Fore.YELLOW}⚠️ No se pudo guardar la sesión: {str(e)}{Style.RESET_ALL}")
                     
                     return True
                 else:
-                    print(f"{Fore.RED}❌ No se pudo establecer la sesión correctamente{Style.RESET_ALL}")
+                    registro.error(f"{Fore.RED}❌ No se pudo establecer la sesión correctamente{Style.RESET_ALL}")
                     return False
                     
             except instaloader.TwoFactorAuthRequiredException:
-                print(f"{Fore.YELLOW}🔒 Se requiere autenticación de dos factores{Style.RESET_ALL}")
+                registro.info(f"{Fore.YELLOW}🔒 Se requiere autenticación de dos factores{Style.RESET_ALL}")
                 codigo_2fa = input(f"{Fore.CYAN}Ingresa el código 2FA: {Style.RESET_ALL}")
                 
                 try:
                     self.loader.two_factor_login(codigo_2fa)
-                    print(f"{Fore.GREEN}✅ Autenticación 2FA exitosa para {username}{Style.RESET_ALL}")
+                    registro.info(f"{Fore.GREEN}✅ Autenticación 2FA exitosa para {username}{Style.RESET_ALL}")
                     self.sesion_activa = True
                     self.username_actual = username
                     
                     # Guardar la sesión
                     try:
                         self.loader.save_session_to_file(archivo_sesion)
-                        print(f"{Fore.GREEN}💾 Sesión guardada{Style.RESET_ALL}")
+                        self.sesiones.registrar(username, archivo_sesion, validada=True)
+                        registro.info(f"{Fore.GREEN}💾 Sesión guardada{Style.RESET_ALL}")
                     except Exception as e:
-                        print(f"{Fore.YELLOW}⚠️ No se pudo guardar la sesión: {str(e)}{Style.RESET_ALL}")
+                        registro.warning(f"{Fore.YELLOW}⚠️ No se pudo guardar la sesión: {str(e)}{Style.RESET_ALL}")
                     
                     return True
                 except Exception as e:
-                    print(f"{Fore.RED}❌ Error en autenticación 2FA: {str(e)}{Style.RESET_ALL}")
+                    registro.error(f"{Fore.RED}❌ Error en autenticación 2FA: {str(e)}{Style.RESET_ALL}")
                     return False
                     
             except instaloader.BadCredentialsException:
-                print(f"{Fore.RED}❌ Credenciales incorrectas para {username}{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Credenciales incorrectas para {username}{Style.RESET_ALL}")
                 return False
             except instaloader.exceptions.ConnectionException as e:
-                print(f"{Fore.RED}❌ Error de conexión: {str(e)}{Style.RESET_ALL}")
-                print(f"{Fore.YELLOW}💡 Verifica tu conexión a internet{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Error de conexión: {str(e)}{Style.RESET_ALL}")
+                registro.info(f"{Fore.YELLOW}💡 Verifica tu conexión a internet{Style.RESET_ALL}")
                 return False
             except Exception as e:
-                print(f"{Fore.RED}❌ Error inesperado al iniciar sesión: {str(e)}{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Error inesperado al iniciar sesión: {str(e)}{Style.RESET_ALL}")
                 return False
                 
         except Exception as e:
-            print(f"{Fore.RED}❌ Error crítico en iniciar_sesion: {str(e)}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error crítico en iniciar_sesion: {str(e)}{Style.RESET_ALL}")
             return False
     
     def guardar_sesion(self) -> bool:
@@ -548,7 +723,7 @@ class InstagramMonitor:
             bool: True si se guardó correctamente
         """
         if not self.sesion_activa:
-            print(f"{Fore.RED}❌ No hay sesión activa para guardar{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ No hay sesión activa para guardar{Style.RESET_ALL}")
             return False
         
         try:
@@ -556,35 +731,88 @@ class InstagramMonitor:
             carpetas = self.crear_estructura_usuario(self.username_actual)
             archivo_sesion = os.path.join(carpetas["sesiones"], f"{self.username_actual}_session")
             self.loader.save_session_to_file(archivo_sesion)
-            print(f"{Fore.GREEN}✅ Sesión guardada correctamente{Style.RESET_ALL}")
+            self.sesiones.registrar(self.username_actual, archivo_sesion)
+            registro.info(f"{Fore.GREEN}✅ Sesión guardada correctamente{Style.RESET_ALL}")
             return True
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al guardar sesión: {e}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al guardar sesión: {e}{Style.RESET_ALL}")
             return False
     
-    def cargar_sesion(self) -> bool:
+    def _cargar_sesion_guardada(self, username: str, archivo_sesion: str) -> bool:
+        """
+        Carga una sesión de archivo y la valida contra Instagram solo si hace falta
+        
+        Si la sesión se validó dentro de VENTANA_FRESCURA_SESION se reutiliza sin
+        ninguna petición; si no, se comprueba con test_login.
+        
+        Args:
+            username: Nombre de usuario
+            archivo_sesion: Ruta del archivo de sesión
+            
+        Returns:
+            bool: True si la sesión quedó activa
+        """
+        self.loader.load_session_from_file(username, archivo_sesion)
+        
+        if self.sesiones.archivo(username) != archivo_sesion:
+            self.sesiones.registrar(username, archivo_sesion)
+        
+        if self.sesiones.esta_fresca(username):
+            registro.debug(f"{Fore.CYAN}⚡ Sesión validada recientemente, se omite la comprobación{Style.RESET_ALL}")
+        else:
+            registro.info(f"{Fore.CYAN}🔎 Comprobando que la sesión sigue siendo válida...{Style.RESET_ALL}")
+            if self.loader.test_login() != username:
+                self.sesiones.invalidar(username)
+                return False
+            self.sesiones.marcar_validada(username)
+        
+        self.sesion_activa = True
+        self.modo_publico = False
+        self.username_actual = username
+        return True
+    
+    def _revisar_error_autenticacion(self, error) -> None:
+        """
+        Marca la sesión actual para revalidar si el error indica un problema de autenticación
+        
+        Args:
+            error: Excepción o mensaje de error recibido
+        """
+        mensaje = str(error).lower()
+        es_error_sesion = (
+            isinstance(error, instaloader.exceptions.LoginRequiredException) or
+            "login" in mensaje or "401" in mensaje or "unauthorized" in mensaje
+        )
+        if es_error_sesion and self.sesion_activa and self.username_actual:
+            self.sesiones.invalidar(self.username_actual)
+    
+    def cargar_sesion(self, username: Optional[str] = None) -> bool:
         """
         Carga una sesión desde archivo
         
+        Args:
+            username: Usuario cuya sesión cargar; si no se indica se pregunta
+        
         Returns:
             bool: True si se cargó correctamente
         """
         try:
-            # Buscar usuarios con sesiones guardadas
-            usuarios_con_sesiones = []
-            
-            if os.path.exists(self.directorio_datos):
-                for usuario in os.listdir(self.directorio_datos):
-                    carpeta_usuario = os.path.join(self.directorio_datos, usuario)
-                    if os.path.isdir(carpeta_usuario):
-                        carpeta_sesiones = os.path.join(carpeta_usuario, "sesiones")
-                        if os.path.exists(carpeta_sesiones):
-                            archivos_sesion = [f for f in os.listdir(carpeta_sesiones) if f.endswith('_session')]
-                            if archivos_sesion:
-                                usuarios_con_sesiones.append((usuario, os.path.join(carpeta_sesiones, archivos_sesion[0])))
+            # Sesiones guardadas según el índice (sin recorrer datos_monitoreo)
+            usuarios_con_sesiones = self.sesiones.listar()
             
             if not usuarios_con_sesiones:
-                print(f"{Fore.RED}❌ No se encontraron sesiones guardadas{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ No se encontraron sesiones guardadas{Style.RESET_ALL}")
+                return False
+            
+            if username:
+                archivo_sesion = self.sesiones.archivo(limpiar_username(username))
+                if not archivo_sesion:
+                    registro.error(f"{Fore.RED}❌ No hay sesión guardada para {username}{Style.RESET_ALL}")
+                    return False
+                if self._cargar_sesion_guardada(limpiar_username(username), archivo_sesion):
+                    registro.info(f"{Fore.GREEN}✅ Sesión cargada para {username}{Style.RESET_ALL}")
+                    return True
+                registro.warning(f"{Fore.YELLOW}⚠️ La sesión guardada de {username} ya no es válida, inicia sesión de nuevo{Style.RESET_ALL}")
                 return False
             
             print(f"{Fore.YELLOW}Sesiones disponibles:{Style.RESET_ALL}")
@@ -597,53 +825,61 @@ class InstagramMonitor:
                 indice = int(seleccion) - 1
                 if 0 <= indice < len(usuarios_con_sesiones):
                     username, archivo_sesion = usuarios_con_sesiones[indice]
-                    self.loader.load_session_from_file(username, archivo_sesion)
-                    
-                    self.username_actual = username
-                    self.sesion_activa = True
+                    if not self._cargar_sesion_guardada(username, archivo_sesion):
+                        registro.warning(f"{Fore.YELLOW}⚠️ La sesión guardada de {username} ya no es válida, inicia sesión de nuevo{Style.RESET_ALL}")
+                        return False
                     
-                    print(f"{Fore.GREEN}✅ Sesión cargada para {username}{Style.RESET_ALL}")
+                    registro.info(f"{Fore.GREEN}✅ Sesión cargada para {username}{Style.RESET_ALL}")
                     return True
                 else:
-                    print(f"{Fore.RED}❌ Selección inválida{Style.RESET_ALL}")
+                    registro.error(f"{Fore.RED}❌ Selección inválida{Style.RESET_ALL}")
                     return False
             except ValueError:
-                print(f"{Fore.RED}❌ Entrada inválida{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Entrada inválida{Style.RESET_ALL}")
                 return False
                 
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al cargar sesión: {e}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al cargar sesión: {e}{Style.RESET_ALL}")
             return False
     
     def cerrar_sesion(self) -> None:
         """Cierra la sesión actual"""
         if self.sesion_activa:
+            self.detener_grabacion()
+            self.reproductor = None
+            self.escala_tiempo = 1.0
             self.sesion_activa = False
             self.username_actual = None
             self.loader = instaloader.Instaloader()  # Reiniciar loader
-            print(f"{Fore.GREEN}✅ Sesión cerrada correctamente{Style.RESET_ALL}")
+            registro.info(f"{Fore.GREEN}✅ Sesión cerrada correctamente{Style.RESET_ALL}")
         else:
-            print(f"{Fore.YELLOW}⚠️ No hay sesión activa{Style.RESET_ALL}")
+            registro.warning(f"{Fore.YELLOW}⚠️ No hay sesión activa{Style.RESET_ALL}")
     
     def mostrar_estado_sesion(self) -> None:
         """Muestra el estado actual de la sesión"""
-        print(f"\n{Fore.YELLOW}📊 Estado del Sistema:{Style.RESET_ALL}")
+        registro.info(f"\n{Fore.YELLOW}📊 Estado del Sistema:{Style.RESET_ALL}")
         
         if self.modo_publico:
-            print(f"{Fore.CYAN}🌐 Modo: Solo perfiles públicos")
-            print(f"🔓 Autenticación: No requerida")
-            print(f"👁️ Acceso: Solo perfiles públicos")
-            print(f"🛡️ Riesgo: Muy bajo{Style.RESET_ALL}")
+            registro.info(f"{Fore.CYAN}🌐 Modo: Solo perfiles públicos")
+            registro.info(f"🔓 Autenticación: No requerida")
+            registro.info(f"👁️ Acceso: Solo perfiles públicos")
+            registro.info(f"🛡️ Riesgo: Muy bajo{Style.RESET_ALL}")
         elif self.sesion_activa:
-            print(f"{Fore.GREEN}✅ Sesión activa")
-            print(f"👤 Usuario: {self.username_actual}")
-            print(f"🔐 Autenticación: Con sesión")
-            print(f"👁️ Acceso: Perfiles públicos y privados{Style.RESET_ALL}")
+            registro.info(f"{Fore.GREEN}✅ Sesión activa")
+            registro.info(f"👤 Usuario: {self.username_actual}")
+            registro.info(f"🔐 Autenticación: Con sesión")
+            registro.info(f"👁️ Acceso: Perfiles públicos y privados{Style.RESET_ALL}")
         else:
-            print(f"{Fore.RED}❌ No hay sesión activa ni modo público")
-            print(f"💡 Opciones disponibles:")
-            print(f"  • Iniciar sesión (acceso completo)")
-            print(f"  • Activar modo público (solo perfiles públicos){Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ No hay sesión activa ni modo público")
+            registro.info(f"💡 Opciones disponibles:")
+            registro.info(f"  • Iniciar sesión (acceso completo)")
+            registro.info(f"  • Activar modo público (solo perfiles públicos){Style.RESET_ALL}")
+        
+        if self.grabador:
+            registro.info(f"{Fore.MAGENTA}⏺️ Grabando respuestas: {self.grabador.nombre} ({self.grabador.total} hasta ahora){Style.RESET_ALL}")
+        if self.reproductor:
+            registro.info(f"{Fore.MAGENTA}▶️ Reproduciendo grabación: {self.reproductor.nombre} "
+                  f"({self.reproductor.servidas} servidas, {self.reproductor.faltantes} sin grabar){Style.RESET_ALL}")
     
     def obtener_seguidores(self, username: str) -> Set[str]:
         """
@@ -653,93 +889,95 @@ class InstagramMonitor:
             username: Nombre de usuario
             
         Returns:
-            Set[str]: Conjunto de nombres de usuarios seguidores
+            Set[str]: Conjunto de nombres de usuarios seguidores (ConjuntoUsuarios, con el ID de cada uno)
         """
         try:
             # Validar que hay sesión activa O modo público
             if not self.sesion_activa and not self.modo_publico:
-                print(f"{Fore.RED}❌ Necesitas iniciar sesión o activar modo público primero.{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Necesitas iniciar sesión o activar modo público primero.{Style.RESET_ALL}")
                 return set()
             
             # Validar y limpiar el nombre de usuario
             username = limpiar_username(username)
             if not validar_username(username):
-                print(f"{Fore.RED}❌ Nombre de usuario inválido: {username}{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Nombre de usuario inválido: {username}{Style.RESET_ALL}")
                 return set()
             
             # En lugar de verificar acceso general, verificamos directamente al intentar obtener seguidores
             # La nueva lógica de perfiles privados se maneja más abajo
             
-            print(f"{Fore.YELLOW}📥 Obteniendo seguidores de {username}...{Style.RESET_ALL}")
+            registro.info(f"{Fore.YELLOW}📥 Obteniendo seguidores de {username}...{Style.RESET_ALL}")
             if self.modo_publico:
-                print(f"{Fore.CYAN}🌐 Modo público: solo perfiles públicos{Style.RESET_ALL}")
-                print(f"{Fore.YELLOW}⚠️ Advertencia: Instagram requiere autenticación para obtener listas de seguidores{Style.RESET_ALL}")
-                print(f"{Fore.YELLOW}💡 Para obtener seguidores necesitas iniciar sesión (opción 1 del menú principal){Style.RESET_ALL}")
+                registro.info(f"{Fore.CYAN}🌐 Modo público: solo perfiles públicos{Style.RESET_ALL}")
+                registro.warning(f"{Fore.YELLOW}⚠️ Advertencia: Instagram requiere autenticación para obtener listas de seguidores{Style.RESET_ALL}")
+                registro.info(f"{Fore.YELLOW}💡 Para obtener seguidores necesitas iniciar sesión (opción 1 del menú principal){Style.RESET_ALL}")
                 return set()
             
             # Verificar si hay datos parciales para continuar
             datos_parciales = self._recuperar_datos_parciales(username, 'seguidores')
             if datos_parciales:
                 seguidores, timestamp = datos_parciales
-                print(f"{Fore.CYAN}🔄 Continuando desde {len(seguidores)} seguidores guardados...{Style.RESET_ALL}")
+                registro.info(f"{Fore.CYAN}🔄 Continuando desde {len(seguidores)} seguidores guardados...{Style.RESET_ALL}")
             else:
-                seguidores = set()
+                seguidores = ConjuntoUsuarios()
                 timestamp = self.generar_timestamp()
             
             # Obtener perfil con manejo de errores específicos
             try:
-                profile = instaloader.Profile.from_username(self.loader.context, username)
+                profile = self._perfiles.get(username) or instaloader.Profile.from_username(self.loader.context, username)
             except instaloader.exceptions.ProfileNotExistsException:
-                print(f"{Fore.RED}❌ El perfil '{username}' no existe{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ El perfil '{username}' no existe{Style.RESET_ALL}")
                 return set()
-            except instaloader.exceptions.LoginRequiredException:
-                print(f"{Fore.RED}❌ Se requiere iniciar sesión para acceder a este perfil{Style.RESET_ALL}")
+            except instaloader.exceptions.LoginRequiredException as e:
+                self._revisar_error_autenticacion(e)
+                registro.error(f"{Fore.RED}❌ Se requiere iniciar sesión para acceder a este perfil{Style.RESET_ALL}")
                 return set()
             except instaloader.exceptions.PrivateProfileNotFollowedException:
-                print(f"{Fore.RED}❌ El perfil '{username}' es privado y no lo sigues{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ El perfil '{username}' es privado y no lo sigues{Style.RESET_ALL}")
                 return set()
             except Exception as e:
-                print(f"{Fore.RED}❌ Error al obtener el perfil: {str(e)}{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Error al obtener el perfil: {str(e)}{Style.RESET_ALL}")
                 return set()
             
             # Verificar si el perfil es privado
             if profile.is_private:
                 if self.modo_publico:
-                    print(f"{Fore.RED}❌ El perfil '{username}' es privado y estás en modo público{Style.RESET_ALL}")
-                    print(f"{Fore.YELLOW}💡 Cambia a modo con sesión para acceder a perfiles privados{Style.RESET_ALL}")
+                    registro.error(f"{Fore.RED}❌ El perfil '{username}' es privado y estás en modo público{Style.RESET_ALL}")
+                    registro.info(f"{Fore.YELLOW}💡 Cambia a modo con sesión para acceder a perfiles privados{Style.RESET_ALL}")
                     return set()
                 else:
                     # Para perfiles privados, intentar acceder a los seguidores directamente
                     # Instagram permite esto si tienes acceso al perfil
-                    print(f"{Fore.YELLOW}🔒 Perfil privado detectado - verificando acceso...{Style.RESET_ALL}")
+                    registro.info(f"{Fore.YELLOW}🔒 Perfil privado detectado - verificando acceso...{Style.RESET_ALL}")
                     try:
                         # Intentar obtener al menos un seguidor para verificar acceso
                         test_followers = list(profile.get_followers())
-                        print(f"{Fore.GREEN}✅ Acceso confirmado al perfil privado{Style.RESET_ALL}")
+                        registro.info(f"{Fore.GREEN}✅ Acceso confirmado al perfil privado{Style.RESET_ALL}")
                     except instaloader.exceptions.PrivateProfileNotFollowedException:
-                        print(f"{Fore.RED}❌ El perfil '{username}' es privado y no tienes acceso{Style.RESET_ALL}")
-                        print(f"{Fore.YELLOW}💡 Debes seguir al perfil para acceder a sus seguidores{Style.RESET_ALL}")
+                        registro.error(f"{Fore.RED}❌ El perfil '{username}' es privado y no tienes acceso{Style.RESET_ALL}")
+                        registro.info(f"{Fore.YELLOW}💡 Debes seguir al perfil para acceder a sus seguidores{Style.RESET_ALL}")
                         return set()
                     except Exception as e:
                         if "private" in str(e).lower() or "follow" in str(e).lower():
-                            print(f"{Fore.RED}❌ No tienes acceso al perfil privado '{username}'{Style.RESET_ALL}")
-                            print(f"{Fore.YELLOW}💡 Debes seguir al perfil para acceder a sus seguidores{Style.RESET_ALL}")
+                            registro.error(f"{Fore.RED}❌ No tienes acceso al perfil privado '{username}'{Style.RESET_ALL}")
+                            registro.info(f"{Fore.YELLOW}💡 Debes seguir al perfil para acceder a sus seguidores{Style.RESET_ALL}")
                             return set()
                         else:
-                            print(f"{Fore.YELLOW}⚠️ Error al verificar acceso: {str(e)}{Style.RESET_ALL}")
-                            print(f"{Fore.CYAN}🔄 Continuando con la obtención...{Style.RESET_ALL}")
+                            registro.warning(f"{Fore.YELLOW}⚠️ Error al verificar acceso: {str(e)}{Style.RESET_ALL}")
+                            registro.info(f"{Fore.CYAN}🔄 Continuando con la obtención...{Style.RESET_ALL}")
             
             total_estimado = profile.followers
+            self._contadores.setdefault(username, {})["seguidores"] = profile.followers
             
-            print(f"  Total estimado: {formatear_numero(total_estimado)}")
+            registro.info(f"  Total estimado: {formatear_numero(total_estimado)}")
             if len(seguidores) > 0:
-                print(f"  Ya obtenidos: {formatear_numero(len(seguidores))}")
-                print(f"  Restantes: {formatear_numero(total_estimado - len(seguidores))}")
+                registro.info(f"  Ya obtenidos: {formatear_numero(len(seguidores))}")
+                registro.info(f"  Restantes: {formatear_numero(total_estimado - len(seguidores))}")
             
             # Verificar si la cuenta tiene demasiados seguidores
             if total_estimado > 10000:
-                if not confirmar_accion(f"El perfil tiene {formatear_numero(total_estimado)} seguidores. Esto puede tardar mucho tiempo. ¿Continuar?"):
-                    print(f"{Fore.YELLOW}⚠️ Operación cancelada por el usuario{Style.RESET_ALL}")
+                if not self._confirmar("lista_grande", f"El perfil tiene {formatear_numero(total_estimado)} seguidores. Esto puede tardar mucho tiempo. ¿Continuar?"):
+                    registro.warning(f"{Fore.YELLOW}⚠️ Operación cancelada por el usuario{Style.RESET_ALL}")
                     return set()
             
             try:
@@ -751,7 +989,7 @@ class InstagramMonitor:
                     if follower.username in seguidores:
                         continue
                         
-                    seguidores.add(follower.username)
+                    seguidores.agregar(follower.username, follower.userid)
                     contador += 1
                     
                     # Guardado parcial cada 250 elementos nuevos
@@ -760,40 +998,41 @@ class InstagramMonitor:
                         self._guardar_datos_parciales(username, seguidores, 'seguidores', timestamp)
                     
                     # Delay inteligente cada pocos elementos
-                    if elementos_nuevos % 10 == 0:
+                    if elementos_nuevos % config_seguridad.ELEMENTS_BETWEEN_DELAYS == 0:
                         self._wait_if_needed()
                     
                     # Mostrar progreso cada 25 elementos o cada 1% si es más de 2500
                     intervalo = min(25, max(1, total_estimado // 100))
                     if elementos_nuevos % intervalo == 0:
-                        mostrar_barra_progreso(contador, total_estimado)
+                        self._progreso('seguidores', contador, total_estimado)
                     
-                    # Pausa más larga cada 100 elementos
-                    if elementos_nuevos % 100 == 0:
-                        print(f"\n{Fore.CYAN}  📊 Procesados {formatear_numero(contador)} seguidores - Pausa de seguridad...{Style.RESET_ALL}")
-                        time.sleep(random.uniform(3.0, 7.0))
+                    # Pausa más larga cada N elementos
+                    if elementos_nuevos % config_seguridad.ELEMENTS_BEFORE_LONG_PAUSE == 0:
+                        registro.debug(f"{Fore.CYAN}  📊 Procesados {formatear_numero(contador)} seguidores - Pausa de seguridad...{Style.RESET_ALL}")
+                        self._dormir(random.uniform(config_seguridad.LONG_PAUSE_MIN, config_seguridad.LONG_PAUSE_MAX))
                     
                     # Si llevamos mucho tiempo, preguntar si continuar
                     if elementos_nuevos % 500 == 0 and elementos_nuevos > 0:
-                        if not confirmar_accion(f"Se han procesado {contador} seguidores. ¿Continuar? (Instagram puede detectar actividad automatizada)"):
-                            print(f"{Fore.YELLOW}⚠️ Operación detenida por el usuario en {contador} seguidores{Style.RESET_ALL}")
+                        if not self._confirmar("continuar_rastreo", f"Se han procesado {contador} seguidores. ¿Continuar? (Instagram puede detectar actividad automatizada)"):
+                            registro.warning(f"{Fore.YELLOW}⚠️ Operación detenida por el usuario en {contador} seguidores{Style.RESET_ALL}")
                             # Guardar progreso antes de salir
                             self._guardar_datos_parciales(username, seguidores, 'seguidores', timestamp)
                             return seguidores
                 
                 # Completar la barra de progreso
-                mostrar_barra_progreso(len(seguidores), len(seguidores))
-                print()  # Nueva línea después de la barra
+                self._progreso('seguidores', len(seguidores), len(seguidores))
+                terminar_linea()  # Nueva línea después de la barra
                 
                 # Guardar archivo final y eliminar parcial
                 self._finalizar_archivo_parcial(username, seguidores, 'seguidores', timestamp)
                 
-                print(f"{Fore.GREEN}✅ Total de seguidores obtenidos: {formatear_numero(len(seguidores))}{Style.RESET_ALL}")
+                registro.info(f"{Fore.GREEN}✅ Total de seguidores obtenidos: {formatear_numero(len(seguidores))}{Style.RESET_ALL}")
                 return seguidores
                 
             except instaloader.exceptions.ConnectionException as e:
                 error_msg = str(e)
-                print(f"\n{Fore.RED}❌ Error de conexión: {error_msg}{Style.RESET_ALL}")
+                self._revisar_error_autenticacion(e)
+                registro.error(f"\n{Fore.RED}❌ Error de conexión: {error_msg}{Style.RESET_ALL}")
                 
                 # Guardar progreso antes de manejar el error
                 if len(seguidores) > 0:
@@ -801,15 +1040,15 @@ class InstagramMonitor:
                 
                 # Manejar rate limiting específicamente
                 if self._handle_rate_limit_error(error_msg):
-                    print(f"{Fore.CYAN}🔄 Reintentando obtener seguidores...{Style.RESET_ALL}")
+                    registro.info(f"{Fore.CYAN}🔄 Reintentando obtener seguidores...{Style.RESET_ALL}")
                     return seguidores
                 else:
-                    print(f"{Fore.YELLOW}💡 Se obtuvieron {len(seguidores)} seguidores antes del error{Style.RESET_ALL}")
+                    registro.info(f"{Fore.YELLOW}💡 Se obtuvieron {len(seguidores)} seguidores antes del error{Style.RESET_ALL}")
                     return seguidores
                     
             except Exception as e:
                 error_msg = str(e)
-                print(f"\n{Fore.RED}❌ Error durante la obtención: {error_msg}{Style.RESET_ALL}")
+                registro.error(f"\n{Fore.RED}❌ Error durante la obtención: {error_msg}{Style.RESET_ALL}")
                 
                 # Guardar progreso antes de manejar el error
                 if len(seguidores) > 0:
@@ -820,11 +1059,11 @@ class InstagramMonitor:
                     if self._handle_rate_limit_error(error_msg):
                         return seguidores
                 
-                print(f"{Fore.YELLOW}💡 Se obtuvieron {len(seguidores)} seguidores antes del error{Style.RESET_ALL}")
+                registro.info(f"{Fore.YELLOW}💡 Se obtuvieron {len(seguidores)} seguidores antes del error{Style.RESET_ALL}")
                 return seguidores
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error crítico al obtener seguidores: {str(e)}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error crítico al obtener seguidores: {str(e)}{Style.RESET_ALL}")
             return set()
     
     def obtener_seguidos(self, username: str) -> Set[str]:
@@ -835,93 +1074,95 @@ class InstagramMonitor:
             username: Nombre de usuario
             
         Returns:
-            Set[str]: Conjunto de nombres de usuarios seguidos
+            Set[str]: Conjunto de nombres de usuarios seguidos (ConjuntoUsuarios, con el ID de cada uno)
         """
         try:
             # Validar que hay sesión activa O modo público
             if not self.sesion_activa and not self.modo_publico:
-                print(f"{Fore.RED}❌ Necesitas iniciar sesión o activar modo público primero.{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Necesitas iniciar sesión o activar modo público primero.{Style.RESET_ALL}")
                 return set()
             
             # Validar y limpiar el nombre de usuario
             username = limpiar_username(username)
             if not validar_username(username):
-                print(f"{Fore.RED}❌ Nombre de usuario inválido: {username}{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Nombre de usuario inválido: {username}{Style.RESET_ALL}")
                 return set()
             
             # En lugar de verificar acceso general, verificamos directamente al intentar obtener seguidos
             # La nueva lógica de perfiles privados se maneja más abajo
             
-            print(f"{Fore.YELLOW}📤 Obteniendo seguidos de {username}...{Style.RESET_ALL}")
+            registro.info(f"{Fore.YELLOW}📤 Obteniendo seguidos de {username}...{Style.RESET_ALL}")
             if self.modo_publico:
-                print(f"{Fore.CYAN}🌐 Modo público: solo perfiles públicos{Style.RESET_ALL}")
-                print(f"{Fore.YELLOW}⚠️ Advertencia: Instagram requiere autenticación para obtener listas de seguidos{Style.RESET_ALL}")
-                print(f"{Fore.YELLOW}💡 Para obtener seguidos necesitas iniciar sesión (opción 1 del menú principal){Style.RESET_ALL}")
+                registro.info(f"{Fore.CYAN}🌐 Modo público: solo perfiles públicos{Style.RESET_ALL}")
+                registro.warning(f"{Fore.YELLOW}⚠️ Advertencia: Instagram requiere autenticación para obtener listas de seguidos{Style.RESET_ALL}")
+                registro.info(f"{Fore.YELLOW}💡 Para obtener seguidos necesitas iniciar sesión (opción 1 del menú principal){Style.RESET_ALL}")
                 return set()
             
             # Verificar si hay datos parciales para continuar
             datos_parciales = self._recuperar_datos_parciales(username, 'seguidos')
             if datos_parciales:
                 seguidos, timestamp = datos_parciales
-                print(f"{Fore.CYAN}🔄 Continuando desde {len(seguidos)} seguidos guardados...{Style.RESET_ALL}")
+                registro.info(f"{Fore.CYAN}🔄 Continuando desde {len(seguidos)} seguidos guardados...{Style.RESET_ALL}")
             else:
-                seguidos = set()
+                seguidos = ConjuntoUsuarios()
                 timestamp = self.generar_timestamp()
             
             # Obtener perfil con manejo de errores específicos
             try:
-                profile = instaloader.Profile.from_username(self.loader.context, username)
+                profile = self._perfiles.get(username) or instaloader.Profile.from_username(self.loader.context, username)
             except instaloader.exceptions.ProfileNotExistsException:
-                print(f"{Fore.RED}❌ El perfil '{username}' no existe{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ El perfil '{username}' no existe{Style.RESET_ALL}")
                 return set()
-            except instaloader.exceptions.LoginRequiredException:
-                print(f"{Fore.RED}❌ Se requiere iniciar sesión para acceder a este perfil{Style.RESET_ALL}")
+            except instaloader.exceptions.LoginRequiredException as e:
+                self._revisar_error_autenticacion(e)
+                registro.error(f"{Fore.RED}❌ Se requiere iniciar sesión para acceder a este perfil{Style.RESET_ALL}")
                 return set()
             except instaloader.exceptions.PrivateProfileNotFollowedException:
-                print(f"{Fore.RED}❌ El perfil '{username}' es privado y no lo sigues{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ El perfil '{username}' es privado y no lo sigues{Style.RESET_ALL}")
                 return set()
             except Exception as e:
-                print(f"{Fore.RED}❌ Error al obtener el perfil: {str(e)}{Style.RESET_ALL}")
+                registro.error(f"{Fore.RED}❌ Error al obtener el perfil: {str(e)}{Style.RESET_ALL}")
                 return set()
             
             # Verificar si el perfil es privado
             if profile.is_private:
                 if self.modo_publico:
-                    print(f"{Fore.RED}❌ El perfil '{username}' es privado y estás en modo público{Style.RESET_ALL}")
-                    print(f"{Fore.YELLOW}💡 Cambia a modo con sesión para acceder a perfiles privados{Style.RESET_ALL}")
+                    registro.error(f"{Fore.RED}❌ El perfil '{username}' es privado y estás en modo público{Style.RESET_ALL}")
+                    registro.info(f"{Fore.YELLOW}💡 Cambia a modo con sesión para acceder a perfiles privados{Style.RESET_ALL}")
                     return set()
                 else:
                     # Para perfiles privados, intentar acceder a los seguidos directamente
                     # Instagram permite esto si tienes acceso al perfil
-                    print(f"{Fore.YELLOW}🔒 Perfil privado detectado - verificando acceso...{Style.RESET_ALL}")
+                    registro.info(f"{Fore.YELLOW}🔒 Perfil privado detectado - verificando acceso...{Style.RESET_ALL}")
                     try:
                         # Intentar obtener al menos un seguido para verificar acceso
                         test_followees = list(profile.get_followees())
-                        print(f"{Fore.GREEN}✅ Acceso confirmado al perfil privado{Style.RESET_ALL}")
+                        registro.info(f"{Fore.GREEN}✅ Acceso confirmado al perfil privado{Style.RESET_ALL}")
                     except instaloader.exceptions.PrivateProfileNotFollowedException:
-                        print(f"{Fore.RED}❌ El perfil '{username}' es privado y no tienes acceso{Style.RESET_ALL}")
-                        print(f"{Fore.YELLOW}💡 Debes seguir al perfil para acceder a sus seguidos{Style.RESET_ALL}")
+                        registro.error(f"{Fore.RED}❌ El perfil '{username}' es privado y no tienes acceso{Style.RESET_ALL}")
+                        registro.info(f"{Fore.YELLOW}💡 Debes seguir al perfil para acceder a sus seguidos{Style.RESET_ALL}")
                         return set()
                     except Exception as e:
                         if "private" in str(e).lower() or "follow" in str(e).lower():
-                            print(f"{Fore.RED}❌ No tienes acceso al perfil privado '{username}'{Style.RESET_ALL}")
-                            print(f"{Fore.YELLOW}💡 Debes seguir al perfil para acceder a sus seguidos{Style.RESET_ALL}")
+                            registro.error(f"{Fore.RED}❌ No tienes acceso al perfil privado '{username}'{Style.RESET_ALL}")
+                            registro.info(f"{Fore.YELLOW}💡 Debes seguir al perfil para acceder a sus seguidos{Style.RESET_ALL}")
                             return set()
                         else:
-                            print(f"{Fore.YELLOW}⚠️ Error al verificar acceso: {str(e)}{Style.RESET_ALL}")
-                            print(f"{Fore.CYAN}🔄 Continuando con la obtención...{Style.RESET_ALL}")
+                            registro.warning(f"{Fore.YELLOW}⚠️ Error al verificar acceso: {str(e)}{Style.RESET_ALL}")
+                            registro.info(f"{Fore.CYAN}🔄 Continuando con la obtención...{Style.RESET_ALL}")
             
             total_estimado = profile.followees
+            self._contadores.setdefault(username, {})["seguidos"] = profile.followees
             
-            print(f"  Total estimado: {formatear_numero(total_estimado)}")
+            registro.info(f"  Total estimado: {formatear_numero(total_estimado)}")
             if len(seguidos) > 0:
-                print(f"  Ya obtenidos: {formatear_numero(len(seguidos))}")
-                print(f"  Restantes: {formatear_numero(total_estimado - len(seguidos))}")
+                registro.info(f"  Ya obtenidos: {formatear_numero(len(seguidos))}")
+                registro.info(f"  Restantes: {formatear_numero(total_estimado - len(seguidos))}")
             
             # Verificar si la cuenta sigue a demasiados usuarios
             if total_estimado > 7500:
-                if not confirmar_accion(f"El perfil sigue a {formatear_numero(total_estimado)} usuarios. Esto puede tardar mucho tiempo. ¿Continuar?"):
-                    print(f"{Fore.YELLOW}⚠️ Operación cancelada por el usuario{Style.RESET_ALL}")
+                if not self._confirmar("lista_grande", f"El perfil sigue a {formatear_numero(total_estimado)} usuarios. Esto puede tardar mucho tiempo. ¿Continuar?"):
+                    registro.warning(f"{Fore.YELLOW}⚠️ Operación cancelada por el usuario{Style.RESET_ALL}")
                     return set()
             
             try:
@@ -933,7 +1174,7 @@ class InstagramMonitor:
                     if followee.username in seguidos:
                         continue
                         
-                    seguidos.add(followee.username)
+                    seguidos.agregar(followee.username, followee.userid)
                     contador += 1
                     
                     # Guardado parcial cada 250 elementos nuevos
@@ -942,40 +1183,41 @@ class InstagramMonitor:
                         self._guardar_datos_parciales(username, seguidos, 'seguidos', timestamp)
                     
                     # Delay inteligente cada pocos elementos
-                    if elementos_nuevos % 10 == 0:
+                    if elementos_nuevos % config_seguridad.ELEMENTS_BETWEEN_DELAYS == 0:
                         self._wait_if_needed()
                     
                     # Mostrar progreso cada 25 elementos o cada 1% si es más de 2500
                     intervalo = min(25, max(1, total_estimado // 100))
                     if elementos_nuevos % intervalo == 0:
-                        mostrar_barra_progreso(contador, total_estimado)
+                        self._progreso('seguidos', contador, total_estimado)
                     
-                    # Pausa más larga cada 100 elementos
-                    if elementos_nuevos % 100 == 0:
-                        print(f"\n{Fore.CYAN}  📊 Procesados {formatear_numero(contador)} seguidos - Pausa de seguridad...{Style.RESET_ALL}")
-                        time.sleep(random.uniform(3.0, 7.0))
+                    # Pausa más larga cada N elementos
+                    if elementos_nuevos % config_seguridad.ELEMENTS_BEFORE_LONG_PAUSE == 0:
+                        registro.debug(f"{Fore.CYAN}  📊 Procesados {formatear_numero(contador)} seguidos - Pausa de seguridad...{Style.RESET_ALL}")
+                        self._dormir(random.uniform(config_seguridad.LONG_PAUSE_MIN, config_seguridad.LONG_PAUSE_MAX))
                     
                     # Si llevamos mucho tiempo, preguntar si continuar
                     if elementos_nuevos % 500 == 0 and elementos_nuevos > 0:
-                        if not confirmar_accion(f"Se han procesado {contador} seguidos. ¿Continuar? (Instagram puede detectar actividad automatizada)"):
-                            print(f"{Fore.YELLOW}⚠️ Operación detenida por el usuario en {contador} seguidos{Style.RESET_ALL}")
+                        if not self._confirmar("continuar_rastreo", f"Se han procesado {contador} seguidos. ¿Continuar? (Instagram puede detectar actividad automatizada)"):
+                            registro.warning(f"{Fore.YELLOW}⚠️ Operación detenida por el usuario en {contador} seguidos{Style.RESET_ALL}")
                             # Guardar progreso antes de salir
                             self._guardar_datos_parciales(username, seguidos, 'seguidos', timestamp)
                             return seguidos
                 
                 # Completar la barra de progreso
-                mostrar_barra_progreso(len(seguidos), len(seguidos))
-                print()  # Nueva línea después de la barra
+                self._progreso('seguidos', len(seguidos), len(seguidos))
+                terminar_linea()  # Nueva línea después de la barra
                 
                 # Guardar archivo final y eliminar parcial
                 self._finalizar_archivo_parcial(username, seguidos, 'seguidos', timestamp)
                 
-                print(f"{Fore.GREEN}✅ Total de seguidos obtenidos: {formatear_numero(len(seguidos))}{Style.RESET_ALL}")
+                registro.info(f"{Fore.GREEN}✅ Total de seguidos obtenidos: {formatear_numero(len(seguidos))}{Style.RESET_ALL}")
                 return seguidos
                 
             except instaloader.exceptions.ConnectionException as e:
                 error_msg = str(e)
-                print(f"\n{Fore.RED}❌ Error de conexión: {error_msg}{Style.RESET_ALL}")
+                self._revisar_error_autenticacion(e)
+                registro.error(f"\n{Fore.RED}❌ Error de conexión: {error_msg}{Style.RESET_ALL}")
                 
                 # Guardar progreso antes de manejar el error
                 if len(seguidos) > 0:
@@ -983,15 +1225,15 @@ class InstagramMonitor:
                 
                 # Manejar rate limiting específicamente
                 if self._handle_rate_limit_error(error_msg):
-                    print(f"{Fore.CYAN}🔄 Reintentando obtener seguidos...{Style.RESET_ALL}")
+                    registro.info(f"{Fore.CYAN}🔄 Reintentando obtener seguidos...{Style.RESET_ALL}")
                     return seguidos
                 else:
-                    print(f"{Fore.YELLOW}💡 Se obtuvieron {len(seguidos)} seguidos antes del error{Style.RESET_ALL}")
+                    registro.info(f"{Fore.YELLOW}💡 Se obtuvieron {len(seguidos)} seguidos antes del error{Style.RESET_ALL}")
                     return seguidos
                     
             except Exception as e:
                 error_msg = str(e)
-                print(f"\n{Fore.RED}❌ Error durante la obtención: {error_msg}{Style.RESET_ALL}")
+                registro.error(f"\n{Fore.RED}❌ Error durante la obtención: {error_msg}{Style.RESET_ALL}")
                 
                 # Guardar progreso antes de manejar el error
                 if len(seguidos) > 0:
@@ -1002,15 +1244,15 @@ class InstagramMonitor:
                     if self._handle_rate_limit_error(error_msg):
                         return seguidos
                 
-                print(f"{Fore.YELLOW}💡 Se obtuvieron {len(seguidos)} seguidos antes del error{Style.RESET_ALL}")
+                registro.info(f"{Fore.YELLOW}💡 Se obtuvieron {len(seguidos)} seguidos antes del error{Style.RESET_ALL}")
                 return seguidos
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error crítico al obtener seguidos: {str(e)}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error crítico al obtener seguidos: {str(e)}{Style.RESET_ALL}")
             return set()
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al obtener seguidos: {e}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al obtener seguidos: {e}{Style.RESET_ALL}")
             return set()
     
     def cargar_datos_anteriores(self, username: str) -> Dict:
@@ -1046,16 +1288,19 @@ class InstagramMonitor:
                     if datos:
                         datos["seguidos"] = datos_seguidos.get("seguidos", [])
                         datos["total_seguidos"] = datos_seguidos.get("total_seguidos", 0)
+                        datos["ids_seguidos"] = datos_seguidos.get("ids_seguidos")
+                        datos["contador_seguidos"] = datos_seguidos.get("contador_seguidos")
                     else:
                         datos.update(datos_seguidos)
             
             return datos
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al cargar datos anteriores: {e}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al cargar datos anteriores: {e}{Style.RESET_ALL}")
             return {}
     
-    def guardar_datos_actuales(self, username: str, seguidores: Set[str], seguidos: Set[str]) -> None:
+    def guardar_datos_actuales(self, username: str, seguidores: Set[str], seguidos: Set[str],
+                               timestamp: Optional[str] = None) -> None:
         """
         Guarda los datos actuales de monitoreo en archivos separados con timestamp
         
@@ -1063,49 +1308,66 @@ class InstagramMonitor:
             username: Nombre de usuario
             seguidores: Conjunto de seguidores
             seguidos: Conjunto de seguidos
+            timestamp: Timestamp de los archivos (por defecto, el actual)
         """
         try:
             carpetas = self.crear_estructura_usuario(username)
-            timestamp = self.generar_timestamp()
-            fecha_actual = datetime.now().isoformat()
+            if timestamp:
+                fecha_actual = datetime.strptime(timestamp, "%Y-%m-%d_%H-%M-%S").isoformat()
+            else:
+                timestamp = self.generar_timestamp()
+                fecha_actual = datetime.now().isoformat()
             
-            # Guardar seguidores
+            # Guardar seguidores (con sus IDs, alineados con la lista, si se conocen)
+            lista_seguidores = list(seguidores)
             datos_seguidores = {
                 "username": username,
                 "fecha_actualizacion": fecha_actual,
                 "timestamp": timestamp,
-                "seguidores": list(seguidores),
+                "seguidores": lista_seguidores,
                 "total_seguidores": len(seguidores),
                 "tipo": "seguidores"
             }
+            # El contador del perfil no coincide con la lista descargable (cuentas ocultas o
+            # desactivadas); la puerta de conteo compara con él, no con la longitud
+            contadores = self._contadores.pop(username, {})
+            if "seguidores" in contadores:
+                datos_seguidores["contador_seguidores"] = contadores["seguidores"]
+            if getattr(seguidores, "ids", None):
+                datos_seguidores["ids_seguidores"] = seguidores.ids_alineados(lista_seguidores)
             
             archivo_seguidores = os.path.join(carpetas["seguidores"], f"{timestamp}_seguidores.json")
-            with open(archivo_seguidores, 'w', encoding='utf-8') as f:
-                json.dump(datos_seguidores, f, ensure_ascii=False, indent=2)
+            escribir_json_atomico(archivo_seguidores, datos_seguidores, indent=2)
+            solapamiento.guardar_bosquejo(archivo_seguidores, seguidores)
             
             # Guardar seguidos
+            lista_seguidos = list(seguidos)
             datos_seguidos = {
                 "username": username,
                 "fecha_actualizacion": fecha_actual,
                 "timestamp": timestamp,
-                "seguidos": list(seguidos),
+                "seguidos": lista_seguidos,
                 "total_seguidos": len(seguidos),
                 "tipo": "seguidos"
             }
+            if "seguidos" in contadores:
+                datos_seguidos["contador_seguidos"] = contadores["seguidos"]
+            if getattr(seguidos, "ids", None):
+                datos_seguidos["ids_seguidos"] = seguidos.ids_alineados(lista_seguidos)
             
             archivo_seguidos = os.path.join(carpetas["seguidos"], f"{timestamp}_seguidos.json")
-            with open(archivo_seguidos, 'w', encoding='utf-8') as f:
-                json.dump(datos_seguidos, f, ensure_ascii=False, indent=2)
+            escribir_json_atomico(archivo_seguidos, datos_seguidos, indent=2)
             
-            print(f"{Fore.GREEN}✅ Datos guardados correctamente en:")
-            print(f"   📁 Seguidores: {archivo_seguidores}")
-            print(f"   📁 Seguidos: {archivo_seguidos}{Style.RESET_ALL}")
+            registro.info(f"{Fore.GREEN}✅ Datos guardados correctamente en:")
+            registro.info(f"   📁 Seguidores: {archivo_seguidores}")
+            registro.info(f"   📁 Seguidos: {archivo_seguidos}{Style.RESET_ALL}")
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al guardar datos: {e}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al guardar datos: {e}{Style.RESET_ALL}")
     
     def generar_reporte_cambios(self, username: str, datos_anteriores: Dict, 
-                              seguidores_actuales: Set[str], seguidos_actuales: Set[str]) -> Dict:
+                              seguidores_actuales: Set[str], seguidos_actuales: Set[str],
+                              timestamp: Optional[str] = None) -> Dict:
         """
         Genera un reporte de cambios comparando datos anteriores con actuales
         
@@ -1114,54 +1376,13 @@ class InstagramMonitor:
             datos_anteriores: Datos del monitoreo anterior
             seguidores_actuales: Seguidores actuales
             seguidos_actuales: Seguidos actuales
+            timestamp: Timestamp del monitoreo actual (por defecto, el actual)
             
         Returns:
             Dict: Reporte de cambios
         """
-        if not datos_anteriores:
-            return {
-                "es_primer_monitoreo": True,
-                "mensaje": "Primer monitoreo realizado. Los datos han sido guardados para futuras comparaciones."
-            }
-        
-        seguidores_anteriores = set(datos_anteriores.get("seguidores", []))
-        seguidos_anteriores = set(datos_anteriores.get("seguidos", []))
-        
-        # Calcular cambios
-        nuevos_seguidores = seguidores_actuales - seguidores_anteriores
-        seguidores_perdidos = seguidores_anteriores - seguidores_actuales
-        nuevos_seguidos = seguidos_actuales - seguidos_anteriores
-        seguidos_eliminados = seguidos_anteriores - seguidos_actuales
-        
-        reporte = {
-            "es_primer_monitoreo": False,
-            "username": username,
-            "fecha_anterior": datos_anteriores.get("fecha_actualizacion", "Desconocida"),
-            "fecha_actual": datetime.now().isoformat(),
-            "timestamp": self.generar_timestamp(),
-            "cambios_seguidores": {
-                "nuevos": list(nuevos_seguidores),
-                "perdidos": list(seguidores_perdidos),
-                "total_nuevos": len(nuevos_seguidores),
-                "total_perdidos": len(seguidores_perdidos)
-            },
-            "cambios_seguidos": {
-                "nuevos": list(nuevos_seguidos),
-                "eliminados": list(seguidos_eliminados),
-                "total_nuevos": len(nuevos_seguidos),
-                "total_eliminados": len(seguidos_eliminados)
-            },
-            "estadisticas": {
-                "seguidores_anteriores": len(seguidores_anteriores),
-                "seguidores_actuales": len(seguidores_actuales),
-                "seguidos_anteriores": len(seguidos_anteriores),
-                "seguidos_actuales": len(seguidos_actuales),
-                "cambio_neto_seguidores": len(seguidores_actuales) - len(seguidores_anteriores),
-                "cambio_neto_seguidos": len(seguidos_actuales) - len(seguidos_anteriores)
-            }
-        }
-        
-        return reporte
+        return construir_reporte_cambios(username, datos_anteriores, seguidores_actuales,
+                                         seguidos_actuales, timestamp or self.generar_timestamp())
     
     def mostrar_reporte(self, reporte: Dict) -> None:
         """
@@ -1171,63 +1392,82 @@ class InstagramMonitor:
             reporte: Diccionario con el reporte de cambios
         """
         if reporte.get("es_primer_monitoreo"):
-            print(f"\n{Fore.BLUE}🎉 {reporte['mensaje']}{Style.RESET_ALL}")
+            registro.info(f"\n{Fore.BLUE}🎉 {reporte['mensaje']}{Style.RESET_ALL}")
             return
         
-        print(f"\n{Fore.CYAN}{'='*60}")
-        print(f"📊 REPORTE DE MONITOREO - {reporte['username'].upper()}")
-        print(f"{'='*60}{Style.RESET_ALL}")
+        registro.info(f"\n{Fore.CYAN}{'='*60}")
+        registro.info(f"📊 REPORTE DE MONITOREO - {reporte['username'].upper()}")
+        registro.info(f"{'='*60}{Style.RESET_ALL}")
         
         # Estadísticas generales
         stats = reporte["estadisticas"]
-        print(f"\n{Fore.YELLOW}📈 ESTADÍSTICAS:{Style.RESET_ALL}")
-        print(f"  Seguidores: {stats['seguidores_anteriores']} → {stats['seguidores_actuales']} ({stats['cambio_neto_seguidores']:+d})")
-        print(f"  Seguidos: {stats['seguidos_anteriores']} → {stats['seguidos_actuales']} ({stats['cambio_neto_seguidos']:+d})")
-        
-        # Cambios en seguidores
+        registro.info(f"\n{Fore.YELLOW}📈 ESTADÍSTICAS:{Style.RESET_ALL}")
+        registro.info(f"  Seguidores: {stats['seguidores_anteriores']} → {stats['seguidores_actuales']} ({stats['cambio_neto_seguidores']:+d})")
+        registro.info(f"  Seguidos: {stats['seguidos_anteriores']} → {stats['seguidos_actuales']} ({stats['cambio_neto_seguidos']:+d})")
+        if "mutuos" in stats:
+            registro.info(f"  Mutuos: {stats['mutuos']} · Solo me siguen: {stats['solo_me_siguen']} · Solo sigo: {stats['solo_sigo']}")
+        
+        # Cambios en seguidores (con los datos de perfil de los nuevos si se enriquecieron)
+        enriquecidos = reporte.get("enriquecimiento", {})
         cambios_seg = reporte["cambios_seguidores"]
         if cambios_seg["total_nuevos"] > 0 or cambios_seg["total_perdidos"] > 0:
-            print(f"\n{Fore.GREEN}👥 CAMBIOS EN SEGUIDORES:{Style.RESET_ALL}")
+            registro.info(f"\n{Fore.GREEN}👥 CAMBIOS EN SEGUIDORES:{Style.RESET_ALL}")
             
             if cambios_seg["total_nuevos"] > 0:
-                print(f"  {Fore.GREEN}✅ Nuevos seguidores ({cambios_seg['total_nuevos']}):{Style.RESET_ALL}")
-                for seguidor in cambios_seg["nuevos"][:10]:  # Mostrar máximo 10
-                    print(f"    + {seguidor}")
-                if cambios_seg["total_nuevos"] > 10:
-                    print(f"    ... y {cambios_seg['total_nuevos'] - 10} más")
+                registro.info(f"  {Fore.GREEN}✅ Nuevos seguidores ({cambios_seg['total_nuevos']}):{Style.RESET_ALL}")
+                for seguidor in cambios_seg["nuevos"][:config.MAX_USUARIOS_MOSTRAR]:
+                    registro.info(f"    + {seguidor} {etiquetas(enriquecidos[seguidor]) if seguidor in enriquecidos else ''}".rstrip())
+                if cambios_seg["total_nuevos"] > config.MAX_USUARIOS_MOSTRAR:
+                    registro.info(f"    ... y {cambios_seg['total_nuevos'] - config.MAX_USUARIOS_MOSTRAR} más")
             
             if cambios_seg["total_perdidos"] > 0:
-                print(f"  {Fore.RED}❌ Seguidores perdidos ({cambios_seg['total_perdidos']}):{Style.RESET_ALL}")
-                for seguidor in cambios_seg["perdidos"][:10]:  # Mostrar máximo 10
-                    print(f"    - {seguidor}")
-                if cambios_seg["total_perdidos"] > 10:
-                    print(f"    ... y {cambios_seg['total_perdidos'] - 10} más")
+                registro.info(f"  {Fore.RED}❌ Seguidores perdidos ({cambios_seg['total_perdidos']}):{Style.RESET_ALL}")
+                for seguidor in cambios_seg["perdidos"][:config.MAX_USUARIOS_MOSTRAR]:
+                    registro.info(f"    - {seguidor}")
+                if cambios_seg["total_perdidos"] > config.MAX_USUARIOS_MOSTRAR:
+                    registro.info(f"    ... y {cambios_seg['total_perdidos'] - config.MAX_USUARIOS_MOSTRAR} más")
         
         # Cambios en seguidos
         cambios_seg = reporte["cambios_seguidos"]
         if cambios_seg["total_nuevos"] > 0 or cambios_seg["total_eliminados"] > 0:
-            print(f"\n{Fore.BLUE}👤 CAMBIOS EN SEGUIDOS:{Style.RESET_ALL}")
+            registro.info(f"\n{Fore.BLUE}👤 CAMBIOS EN SEGUIDOS:{Style.RESET_ALL}")
             
             if cambios_seg["total_nuevos"] > 0:
-                print(f"  {Fore.GREEN}✅ Nuevos seguidos ({cambios_seg['total_nuevos']}):{Style.RESET_ALL}")
-                for seguido in cambios_seg["nuevos"][:10]:  # Mostrar máximo 10
-                    print(f"    + {seguido}")
-                if cambios_seg["total_nuevos"] > 10:
-                    print(f"    ... y {cambios_seg['total_nuevos'] - 10} más")
+                registro.info(f"  {Fore.GREEN}✅ Nuevos seguidos ({cambios_seg['total_nuevos']}):{Style.RESET_ALL}")
+                for seguido in cambios_seg["nuevos"][:config.MAX_USUARIOS_MOSTRAR]:
+                    registro.info(f"    + {seguido} {etiquetas(enriquecidos[seguido]) if seguido in enriquecidos else ''}".rstrip())
+                if cambios_seg["total_nuevos"] > config.MAX_USUARIOS_MOSTRAR:
+                    registro.info(f"    ... y {cambios_seg['total_nuevos'] - config.MAX_USUARIOS_MOSTRAR} más")
             
             if cambios_seg["total_eliminados"] > 0:
-                print(f"  {Fore.RED}❌ Seguidos eliminados ({cambios_seg['total_eliminados']}):{Style.RESET_ALL}")
-                for seguido in cambios_seg["eliminados"][:10]:  # Mostrar máximo 10
-                    print(f"    - {seguido}")
-                if cambios_seg["total_eliminados"] > 10:
-                    print(f"    ... y {cambios_seg['total_eliminados'] - 10} más")
+                registro.info(f"  {Fore.RED}❌ Seguidos eliminados ({cambios_seg['total_eliminados']}):{Style.RESET_ALL}")
+                for seguido in cambios_seg["eliminados"][:config.MAX_USUARIOS_MOSTRAR]:
+                    registro.info(f"    - {seguido}")
+                if cambios_seg["total_eliminados"] > config.MAX_USUARIOS_MOSTRAR:
+                    registro.info(f"    ... y {cambios_seg['total_eliminados'] - config.MAX_USUARIOS_MOSTRAR} más")
+        
+        # Cambios de nombre (mismo ID de Instagram, no cuentan como altas ni bajas)
+        renombres = [(relacion, r) for relacion, lista in reporte.get("renombres", {}).items() for r in lista]
+        if renombres:
+            registro.info(f"\n{Fore.MAGENTA}✏️ CAMBIOS DE NOMBRE ({len(renombres)}):{Style.RESET_ALL}")
+            for relacion, renombre in renombres[:config.MAX_USUARIOS_MOSTRAR]:
+                registro.info(f"    {renombre['anterior']} → {renombre['actual']} ({relacion})")
+            if len(renombres) > config.MAX_USUARIOS_MOSTRAR:
+                registro.info(f"    ... y {len(renombres) - config.MAX_USUARIOS_MOSTRAR} más")
+        
+        # Anomalías detectadas en este monitoreo
+        if reporte.get("anomalias"):
+            registro.warning(f"\n{Fore.RED}🚨 ANOMALÍAS DETECTADAS:{Style.RESET_ALL}")
+            for anomalia in reporte["anomalias"]:
+                registro.warning(f"  {Fore.RED}⚠️ {anomalia['metrica']}: {anomalia['valor']} "
+                                 f"(habitual {anomalia['media']:.1f} ± {anomalia['desviacion']:.1f}, z = {anomalia['z']:+.1f}){Style.RESET_ALL}")
         
         if (cambios_seg["total_nuevos"] == 0 and cambios_seg["total_eliminados"] == 0 and
             reporte["cambios_seguidores"]["total_nuevos"] == 0 and 
             reporte["cambios_seguidores"]["total_perdidos"] == 0):
-            print(f"\n{Fore.YELLOW}ℹ️ No se detectaron cambios desde el último monitoreo{Style.RESET_ALL}")
+            registro.info(f"\n{Fore.YELLOW}ℹ️ No se detectaron cambios desde el último monitoreo{Style.RESET_ALL}")
         
-        print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        registro.info(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
     
     def guardar_reporte(self, username: str, reporte: Dict) -> None:
         """
@@ -1243,184 +1483,1624 @@ class InstagramMonitor:
             
             archivo_reporte = os.path.join(carpetas["reportes"], f"{timestamp}_reporte.json")
             
-            with open(archivo_reporte, 'w', encoding='utf-8') as f:
-                json.dump(reporte, f, ensure_ascii=False, indent=2)
+            escribir_json_atomico(archivo_reporte, reporte, indent=2)
             
-            print(f"{Fore.GREEN}✅ Reporte guardado: {archivo_reporte}{Style.RESET_ALL}")
+            registro.info(f"{Fore.GREEN}✅ Reporte guardado: {archivo_reporte}{Style.RESET_ALL}")
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al guardar reporte: {e}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al guardar reporte: {e}{Style.RESET_ALL}")
+    
+    def publicar_cambios(self, reporte: Dict) -> None:
+        """
+        Añade los cambios de un reporte al registro de cambios (datos_monitoreo/feed)
+        
+        Args:
+            reporte: Reporte de generar_reporte_cambios
+        """
+        try:
+            publicados = FeedCambios(self.directorio_datos).publicar(reporte)
+            if publicados:
+                registro.debug(f"{Fore.CYAN}📰 {publicados} eventos añadidos al registro de cambios{Style.RESET_ALL}")
+        except Exception as e:
+            registro.error(f"{Fore.RED}❌ Error al publicar cambios: {e}{Style.RESET_ALL}")
+    
+    def _rastrear(self, username: str, tipo: str) -> tuple:
+        """
+        Descarga una lista midiendo cuánto tarda y si quedó a medias
+        
+        Args:
+            username: Cuenta
+            tipo: 'seguidores' o 'seguidos'
+            
+        Returns:
+            Tuple (usuarios, EstadisticasRastreo)
+        """
+        inicio = time.monotonic()
+        usuarios = self.obtener_seguidores(username) if tipo == "seguidores" else self.obtener_seguidos(username)
+        # El guardado parcial lo escribe el hilo escritor: hay que esperarlo antes de buscarlo
+        self._vaciar_escritor()
+        carpeta = os.path.join(self.directorio_datos, username, tipo)
+        pendiente = os.path.exists(carpeta) and any(f.endswith(f"_{tipo}_parcial.json") for f in os.listdir(carpeta))
+        return usuarios, resultados.EstadisticasRastreo(tipo, len(usuarios), not pendiente, round(time.monotonic() - inicio, 3))
     
-    def monitorear_perfil(self, username: str) -> None:
+    def monitorear_perfil(self, username: str, forzar: bool = False) -> "resultados.ResultadoMonitoreo":
         """
         Función principal para monitorear un perfil
         
         Args:
             username: Nombre de usuario a monitorear
+            forzar: Descargar las listas aunque la puerta de conteo no detecte cambios
+            
+        Returns:
+            ResultadoMonitoreo: Estado, snapshot, reporte y estadísticas de cada descarga
         """
         if not self.sesion_activa and not self.modo_publico:
-            print(f"{Fore.RED}❌ Necesitas iniciar sesión o activar modo público primero{Style.RESET_ALL}")
-            return
+            registro.error(f"{Fore.RED}❌ Necesitas iniciar sesión o activar modo público primero{Style.RESET_ALL}")
+            return resultados.ResultadoMonitoreo(username, resultados.FALLIDO, motivo="sin_sesion")
         
         # Validar y limpiar username
         if not validar_username(username):
-            print(f"{Fore.RED}❌ Nombre de usuario inválido: {username}{Style.RESET_ALL}")
-            return
+            registro.error(f"{Fore.RED}❌ Nombre de usuario inválido: {username}{Style.RESET_ALL}")
+            return resultados.ResultadoMonitoreo(username, resultados.FALLIDO, motivo="usuario_invalido")
         
         username = limpiar_username(username)
-        print(f"\n{Fore.CYAN}🔍 Iniciando monitoreo de @{username}...{Style.RESET_ALL}")
+        
+        bloqueo = self._bloquear_cuenta(username)
+        if bloqueo is None:
+            return resultados.ResultadoMonitoreo(username, resultados.FALLIDO, motivo="bloqueada")
+        try:
+            return self._monitorear(username, forzar, bloqueo)
+        finally:
+            # Los guardados parciales pendientes se escriben mientras la cuenta sigue bloqueada
+            self._vaciar_escritor()
+            bloqueo.liberar()
+    
+    def _bloquear_cuenta(self, username: str) -> Optional["bloqueos.Bloqueo"]:
+        """
+        Adquiere el bloqueo de la carpeta de una cuenta, para que un solo proceso
+        (de esta u otra máquina) escriba en ella a la vez
+        
+        Args:
+            username: Cuenta a bloquear
+            
+        Returns:
+            Optional[Bloqueo]: Bloqueo adquirido (hay que liberarlo) o None si otro proceso lo tiene
+        """
+        bloqueo = bloqueos.bloqueo_cuenta(self.directorio_datos, username)
+        if not bloqueo.adquirir():
+            registro.warning(f"{Fore.YELLOW}🔒 @{username} está en uso por otro proceso "
+                             f"({bloqueo.propietario() or 'desconocido'}){Style.RESET_ALL}")
+            return None
+        return bloqueo
+    
+    def _monitorear(self, username: str, forzar: bool, bloqueo: "bloqueos.Bloqueo") -> "resultados.ResultadoMonitoreo":
+        """Cuerpo de monitorear_perfil, con la cuenta ya bloqueada"""
+        registro.info(f"\n{Fore.CYAN}🔍 Iniciando monitoreo de @{username}...{Style.RESET_ALL}")
         
         if self.modo_publico:
-            print(f"{Fore.YELLOW}🌐 Modo público: solo perfiles públicos accesibles{Style.RESET_ALL}")
+            registro.info(f"{Fore.YELLOW}🌐 Modo público: solo perfiles públicos accesibles{Style.RESET_ALL}")
         
         # Cargar datos anteriores
         datos_anteriores = self.cargar_datos_anteriores(username)
         
-        # Obtener datos actuales
-        seguidores_actuales = self.obtener_seguidores(username)
-        if not seguidores_actuales:
-            return
-        
-        seguidos_actuales = self.obtener_seguidos(username)
-        if not seguidos_actuales:
-            return
+        # Comprobar contadores antes de pagar un rastreo completo
+        if datos_anteriores and not forzar and not self.modo_publico:
+            if not self._pasar_puerta_conteo(username, datos_anteriores):
+                return resultados.ResultadoMonitoreo(username, resultados.SIN_CAMBIOS)
         
-        # Generar reporte
+        # Obtener datos actuales
+        try:
+            seguidores_actuales, rastreo = self._rastrear(username, "seguidores")
+            resultado = resultados.ResultadoMonitoreo(username, resultados.FALLIDO, rastreos=[rastreo])
+            if not seguidores_actuales:
+                resultado.motivo = "sin_seguidores"
+                return resultado
+            if not rastreo.completo:
+                return self._rastreo_incompleto(resultado, rastreo)
+            
+            seguidos_actuales, rastreo = self._rastrear(username, "seguidos")
+            resultado.rastreos.append(rastreo)
+            if not seguidos_actuales:
+                resultado.motivo = "sin_seguidos"
+                return resultado
+            if not rastreo.completo:
+                return self._rastreo_incompleto(resultado, rastreo)
+        finally:
+            # El perfil de la puerta sirve a las dos descargas; en el siguiente monitoreo estaría desfasado
+            self._perfiles.pop(username, None)
+        
+        # Tras un rastreo largo, comprobar que nadie tomó la cuenta antes de escribir resultados
+        if not bloqueo.vigente():
+            registro.error(f"{Fore.RED}❌ Se perdió el bloqueo de @{username}; no se guardan los resultados{Style.RESET_ALL}")
+            resultado.motivo = "bloqueo_perdido"
+            return resultado
+        
+        # Generar reporte (snapshot, reporte e índices comparten timestamp)
+        timestamp = self.generar_timestamp()
         reporte = self.generar_reporte_cambios(username, datos_anteriores, 
-                                             seguidores_actuales, seguidos_actuales)
+                                             seguidores_actuales, seguidos_actuales, timestamp)
+        self.actualizar_reciprocidad(username, reporte, timestamp, seguidores_actuales, seguidos_actuales)
+        if not reporte.get("es_primer_monitoreo"):
+            reporte["anomalias"] = self.detectar_anomalias(username, metricas_de_reporte(reporte), timestamp, "reporte")
+            self.enriquecer_reporte(username, reporte)
         
         # Mostrar reporte
         self.mostrar_reporte(reporte)
         
         # Guardar datos actuales y reporte
-        self.guardar_datos_actuales(username, seguidores_actuales, seguidos_actuales)
+        self.guardar_datos_actuales(username, seguidores_actuales, seguidos_actuales, timestamp)
         if not reporte.get("es_primer_monitoreo"):
             self.guardar_reporte(username, reporte)
+            registrar_renombres(self.directorio_datos, username, reporte)
+            self.publicar_cambios(reporte)
+        
+        inicios = self.actualizar_indice_membresia(username, reporte, timestamp,
+                                                   seguidores_actuales, seguidos_actuales)
+        self.actualizar_analitica(username, reporte, timestamp, len(seguidores_actuales), inicios)
+        self.actualizar_indice_invertido(username, reporte, timestamp, seguidores_actuales)
+        
+        resultado.estado = resultados.COMPLETADO
+        resultado.snapshot = resultados.Snapshot(username, timestamp, seguidores_actuales, seguidos_actuales)
+        resultado.reporte = reporte
+        return resultado
     
-    def mostrar_ultimo_reporte(self) -> None:
-        """Muestra el último reporte disponible"""
-        try:
-            usuarios_con_reportes = []
-            
-            if os.path.exists(self.directorio_datos):
-                for usuario in os.listdir(self.directorio_datos):
-                    carpeta_usuario = os.path.join(self.directorio_datos, usuario)
-                    if os.path.isdir(carpeta_usuario):
-                        carpeta_reportes = os.path.join(carpeta_usuario, "reportes")
-                        if os.path.exists(carpeta_reportes):
-                            archivos_reportes = [f for f in os.listdir(carpeta_reportes) if f.endswith('_reporte.json')]
-                            if archivos_reportes:
-                                usuarios_con_reportes.append(usuario)
+    def _rastreo_incompleto(self, resultado: "resultados.ResultadoMonitoreo",
+                            rastreo: "resultados.EstadisticasRastreo") -> "resultados.ResultadoMonitoreo":
+        """
+        Cierra un monitoreo cuya descarga quedó a medias: una lista incompleta daría
+        bajas falsas, así que no se guardan snapshot, reporte, feed ni índices. El
+        guardado parcial queda para continuar en el siguiente intento
+        
+        Args:
+            resultado: Resultado en curso (FALLIDO)
+            rastreo: Estadísticas de la descarga incompleta
             
-            if not usuarios_con_reportes:
-                print(f"{Fore.RED}❌ No se encontraron reportes{Style.RESET_ALL}")
-                return
+        Returns:
+            ResultadoMonitoreo: El mismo resultado con motivo "rastreo_incompleto"
+        """
+        registro.warning(f"{Fore.YELLOW}⚠️ La descarga de {rastreo.tipo} de @{resultado.cuenta} quedó incompleta "
+                         f"({formatear_numero(rastreo.obtenidos)} obtenidos); no se guardan cambios hasta completarla{Style.RESET_ALL}")
+        resultado.motivo = "rastreo_incompleto"
+        return resultado
+    
+    def _pasar_puerta_conteo(self, username: str, datos_anteriores: Dict) -> bool:
+        """
+        Decide con una consulta de perfil si hace falta descargar las listas completas
+        (ver PUERTA_CONTEO en config.py) y registra la decisión
+        
+        Args:
+            username: Cuenta monitoreada
+            datos_anteriores: Último snapshot guardado
             
-            print(f"{Fore.YELLOW}Usuarios con reportes disponibles:{Style.RESET_ALL}")
-            for i, usuario in enumerate(usuarios_con_reportes, 1):
-                print(f"{i}. {usuario}")
+        Returns:
+            bool: True si hay que rastrear las listas
+        """
+        if config.PUERTA_CONTEO == "desactivada":
+            return True
+        
+        profile = self._obtener_perfil(username)
+        if profile is None:
+            return True
+        self._perfiles[username] = profile
+        self.registrar_muestra_contadores(username, profile)
+        
+        decision = puerta_conteo.evaluar_contadores(datos_anteriores, profile.followers, profile.followees)
+        peticiones_muestra = 0
+        if decision["decision"] == puerta_conteo.PARCIAL:
+            # Las listas llegan de más reciente a más antiguo: si los primeros ya estaban, no hay altas nuevas
+            # Cada muestra es una petición más: pasa por el mismo limitador que el rastreo completo
+            try:
+                muestra = config.PUERTA_MUESTRA_PARCIAL
+                self._wait_if_needed()
+                recientes_seguidores = [p.username for p in islice(profile.get_followers(), muestra)]
+                self._wait_if_needed()
+                recientes_seguidos = [p.username for p in islice(profile.get_followees(), muestra)]
+                peticiones_muestra = 2
+                sin_cambios = (puerta_conteo.evaluar_muestra(datos_anteriores.get("seguidores", []), recientes_seguidores) and
+                               puerta_conteo.evaluar_muestra(datos_anteriores.get("seguidos", []), recientes_seguidos))
+                decision = {"decision": puerta_conteo.OMITIR if sin_cambios else puerta_conteo.RASTREAR,
+                            "motivo": "muestra_sin_cambios" if sin_cambios else "muestra_con_cambios"}
+            except Exception as e:
+                registro.debug(f"Comprobación parcial fallida: {e}")
+                decision = {"decision": puerta_conteo.RASTREAR, "motivo": "muestra_fallida"}
+        
+        decision.update({
+            "timestamp": self.generar_timestamp(),
+            "modo": config.PUERTA_CONTEO,
+            "snapshot": datos_anteriores.get("timestamp"),
+            "seguidores_guardados": datos_anteriores.get("contador_seguidores"),
+            "seguidores_actuales": profile.followers,
+            "seguidos_guardados": datos_anteriores.get("contador_seguidos"),
+            "seguidos_actuales": profile.followees,
+            "peticiones_muestra": peticiones_muestra,
+            "peticiones_evitadas": puerta_conteo.peticiones_estimadas(profile.followers, profile.followees)
+        })
+        try:
+            puerta_conteo.registrar_decision(self.directorio_datos, username, decision)
+        except OSError as e:
+            registro.warning(f"{Fore.YELLOW}⚠️ No se pudo registrar la decisión de la puerta: {e}{Style.RESET_ALL}")
+        
+        if decision["decision"] == puerta_conteo.OMITIR:
+            self._perfiles.pop(username, None)
+            registro.info(f"{Fore.BLUE}ℹ️ Sin cambios en los contadores de @{username} desde {datos_anteriores.get('timestamp')}; "
+                          f"se omite el rastreo completo (~{decision['peticiones_evitadas']} peticiones){Style.RESET_ALL}")
+            return False
+        registro.debug(f"Puerta de conteo: rastrear ({decision['motivo']})")
+        return True
+    
+    def registrar_muestra_contadores(self, username: str, profile) -> None:
+        """
+        Añade los contadores actuales de un perfil a su serie temporal
+        
+        Args:
+            username: Cuenta monitoreada
+            profile: Perfil ya consultado
+        """
+        self._guardar_muestra_contadores(username, (time.time(), profile.followers, profile.followees, profile.mediacount))
+    
+    def _guardar_muestra_contadores(self, username: str, muestra) -> int:
+        """
+        Añade una muestra a la serie de contadores y la pasa por el detector de anomalías
+        
+        Args:
+            username: Cuenta
+            muestra: Tupla (momento, seguidores, seguidos, publicaciones)
             
-            seleccion = input(f"{Fore.CYAN}Selecciona un usuario (número): {Style.RESET_ALL}")
+        Returns:
+            int: Muestras guardadas (0 si falló)
+        """
+        try:
+            serie = SerieContadores(self.directorio_datos, username)
+            previa = serie.ultima()
+            guardadas = serie.agregar([muestra])
+        except Exception as e:
+            registro.debug(f"No se pudo guardar la muestra de contadores de @{username}: {e}")
+            return 0
+        if previa is not None:
+            anomalias = self.detectar_anomalias(username, metricas_de_contadores(previa, muestra),
+                                                formatear_momento(muestra[0]), "contadores")
+            for anomalia in anomalias:
+                registro.warning(f"{Fore.YELLOW}⚠️ Anomalía en @{username}: {anomalia['metrica']} = "
+                                 f"{anomalia['valor']:.1f} (z = {anomalia['z']:+.1f}){Style.RESET_ALL}")
+        return guardadas
+    
+    def detectar_anomalias(self, username: str, metricas: Dict[str, float], timestamp: str,
+                           origen: str) -> List[Dict]:
+        """
+        Actualiza el detector de anomalías de una cuenta y registra los eventos
+        
+        Args:
+            username: Cuenta
+            metricas: Métricas observadas
+            timestamp: Momento de la observación
+            origen: 'reporte' o 'contadores'
             
-            try:
-                indice = int(seleccion) - 1
-                if 0 <= indice < len(usuarios_con_reportes):
-                    username = usuarios_con_reportes[indice]
-                    carpetas = self.crear_estructura_usuario(username)
-                    
-                    archivo_reporte = self.obtener_archivo_mas_reciente(carpetas["reportes"], "reporte")
-                    
-                    if archivo_reporte:
-                        with open(archivo_reporte, 'r', encoding='utf-8') as f:
-                            reporte = json.load(f)
-                        
-                        self.mostrar_reporte(reporte)
-                    else:
-                        print(f"{Fore.RED}❌ No hay reportes para este usuario{Style.RESET_ALL}")
-                else:
-                    print(f"{Fore.RED}❌ Selección inválida{Style.RESET_ALL}")
-            except ValueError:
-                print(f"{Fore.RED}❌ Entrada inválida{Style.RESET_ALL}")
-                
+        Returns:
+            List[Dict]: Anomalías detectadas
+        """
+        if not metricas:
+            return []
+        try:
+            detector = DetectorAnomalias(self.directorio_datos, username)
+            anomalias = detector.observar(metricas, timestamp, origen)
+            detector.guardar()
+            registrar_eventos(self.directorio_datos, anomalias)
+            return anomalias
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al cargar reportes: {e}{Style.RESET_ALL}")
+            registro.warning(f"{Fore.YELLOW}⚠️ No se pudo actualizar el detector de anomalías: {e}{Style.RESET_ALL}")
+            return []
     
-    def mostrar_estructura_archivos(self) -> None:
-        """Muestra la estructura de archivos para todos los usuarios monitoreados"""
+    def enriquecer_reporte(self, username: str, reporte: Dict) -> None:
+        """
+        Encola los usuarios nuevos del reporte, consulta la cola dentro del presupuesto
+        por monitoreo (ENRIQUECIMIENTO_PRESUPUESTO) y anota el reporte con lo que haya en caché
+        
+        Args:
+            username: Cuenta monitoreada
+            reporte: Reporte de cambios (se modifica)
+        """
+        nuevos = usuarios_nuevos(reporte)
+        if not nuevos:
+            return
         try:
-            if not os.path.exists(self.directorio_datos):
-                print(f"{Fore.RED}❌ No hay datos de monitoreo{Style.RESET_ALL}")
-                return
-            
-            usuarios = [d for d in os.listdir(self.directorio_datos) 
-                       if os.path.isdir(os.path.join(self.directorio_datos, d))]
-            
-            if not usuarios:
-                print(f"{Fore.RED}❌ No hay usuarios monitoreados{Style.RESET_ALL}")
-                return
-            
-            print(f"\n{Fore.CYAN}{'='*60}")
-            print("📁 ESTRUCTURA DE ARCHIVOS DE MONITOREO")
-            print(f"{'='*60}{Style.RESET_ALL}")
+            cache = CacheEnriquecimiento(self.directorio_datos)
+            cola = ColaEnriquecimiento(self.directorio_datos)
+            if cola.encolar(nuevos, username, cache):
+                cola.guardar()
+            if config.ENRIQUECIMIENTO_PRESUPUESTO > 0 and len(cola):
+                self.procesar_cola_enriquecimiento(config.ENRIQUECIMIENTO_PRESUPUESTO, cache, cola)
+            anotar_reporte(reporte, cache)
+        except Exception as e:
+            registro.warning(f"{Fore.YELLOW}⚠️ No se pudo enriquecer el reporte: {e}{Style.RESET_ALL}")
+    
+    def procesar_cola_enriquecimiento(self, presupuesto: int, cache: Optional[CacheEnriquecimiento] = None,
+                                      cola: Optional[ColaEnriquecimiento] = None) -> Dict[str, int]:
+        """
+        Consulta perfiles de la cola de enriquecimiento por lotes, sin pasar del presupuesto
+        Cada consulta pasa por el limitador compartido (_wait_if_needed); entre lotes se
+        guarda el progreso y se hace una pausa. Un límite de peticiones detiene el proceso
+        y deja el resto en la cola para la siguiente ejecución. Si otro proceso ya está
+        consultando la cola, esta ejecución no consulta nada (lo encolado se combina al guardar)
+        
+        Args:
+            presupuesto: Perfiles a consultar como máximo
+            cache: Caché ya cargada (por defecto, se carga)
+            cola: Cola ya cargada (por defecto, se carga)
             
-            for usuario in usuarios:
-                carpeta_usuario = os.path.join(self.directorio_datos, usuario)
-                
-                print(f"\n{Fore.YELLOW}👤 Usuario: {usuario}{Style.RESET_ALL}")
-                
-                # Mostrar seguidores
+        Returns:
+            Dict[str, int]: Perfiles consultados, fallidos y pendientes
+        """
+        cache = cache or CacheEnriquecimiento(self.directorio_datos)
+        cola = cola or ColaEnriquecimiento(self.directorio_datos)
+        resultado = {"consultados": 0, "fallidos": 0, "pendientes": len(cola)}
+        if not len(cola) or presupuesto <= 0:
+            return resultado
+        consulta = bloqueos.bloqueo_compartido(self.directorio_datos, "enriquecimiento_consulta", espera=0)
+        if not consulta.adquirir():
+            registro.info(f"{Fore.CYAN}🔒 Otro proceso está consultando la cola de enriquecimiento ({consulta.propietario()}){Style.RESET_ALL}")
+            return resultado
+        
+        registro.info(f"{Fore.CYAN}🔎 Enriqueciendo hasta {min(presupuesto, len(cola))} de {len(cola)} usuarios nuevos...{Style.RESET_ALL}")
+        restantes = presupuesto
+        detener = False
+        try:
+            while restantes > 0 and len(cola) and not detener:
+                lote = cola.siguientes(min(config.ENRIQUECIMIENTO_LOTE, restantes))
+                for entrada in lote:
+                    username = entrada["username"]
+                    self._wait_if_needed()
+                    restantes -= 1
+                    try:
+                        profile = instaloader.Profile.from_username(self.loader.context, username)
+                        cache.guardar_datos(username, datos_de_perfil(profile))
+                        cola.completar(username)
+                        resultado["consultados"] += 1
+                    except instaloader.exceptions.ProfileNotExistsException:
+                        cache.guardar_datos(username, {"no_existe": True})
+                        cola.completar(username)
+                        resultado["consultados"] += 1
+                    except instaloader.exceptions.ConnectionException as e:
+                        self._revisar_error_autenticacion(e)
+                        registro.warning(f"{Fore.YELLOW}⚠️ @{username}: {e}{Style.RESET_ALL}")
+                        cola.fallo(username)
+                        resultado["fallidos"] += 1
+                        detener = True
+                        break
+                    except Exception as e:
+                        registro.debug(f"  @{username}: {e}")
+                        cola.fallo(username)
+                        resultado["fallidos"] += 1
+                
+                cache.guardar()
+                cola.guardar()
+                if restantes > 0 and len(cola) and not detener:
+                    self._dormir(config.ENRIQUECIMIENTO_PAUSA_LOTE)
+        except KeyboardInterrupt:
+            registro.warning(f"\n{Fore.YELLOW}⚠️ Enriquecimiento detenido por el usuario{Style.RESET_ALL}")
+        finally:
+            try:
+                cache.guardar()
+                cola.guardar()
+            finally:
+                consulta.liberar()
+        
+        resultado["pendientes"] = len(cola)
+        registro.info(f"  {resultado['consultados']} perfiles consultados, {resultado['fallidos']} fallidos, "
+                      f"{resultado['pendientes']} pendientes")
+        return resultado
+    
+    def anotar_ultimo_reporte(self, cuenta: str, cache: Optional[CacheEnriquecimiento] = None) -> int:
+        """
+        Anota el reporte guardado más reciente de una cuenta con los datos en caché
+        
+        Args:
+            cuenta: Cuenta monitoreada
+            cache: Caché ya cargada (por defecto, se carga)
+            
+        Returns:
+            int: Usuarios anotados
+        """
+        carpeta = os.path.join(self.directorio_datos, cuenta, "reportes")
+        archivo = self.obtener_archivo_mas_reciente(carpeta, "reporte")
+        if not archivo:
+            return 0
+        with open(archivo, 'r', encoding='utf-8') as f:
+            reporte = json.load(f)
+        anotados = anotar_reporte(reporte, cache or CacheEnriquecimiento(self.directorio_datos))
+        if anotados:
+            escribir_json_atomico(archivo, reporte, indent=2)
+        return anotados
+    
+    def enriquecer_pendientes(self, presupuesto: Optional[int] = None) -> bool:
+        """
+        Consulta la cola de enriquecimiento y anota los últimos reportes de las cuentas afectadas
+        
+        Args:
+            presupuesto: Perfiles a consultar (por defecto, ENRIQUECIMIENTO_PRESUPUESTO)
+            
+        Returns:
+            bool: True si no quedó nada por hacer o se consultó algún perfil
+        """
+        cache = CacheEnriquecimiento(self.directorio_datos)
+        cola = ColaEnriquecimiento(self.directorio_datos)
+        if not len(cola):
+            registro.info(f"{Fore.GREEN}✅ No hay usuarios pendientes de enriquecer{Style.RESET_ALL}")
+            return True
+        cuentas = cola.cuentas()
+        resultado = self.procesar_cola_enriquecimiento(
+            config.ENRIQUECIMIENTO_PRESUPUESTO if presupuesto is None else presupuesto, cache, cola)
+        for cuenta in cuentas:
+            anotados = self.anotar_ultimo_reporte(cuenta, cache)
+            if anotados:
+                registro.info(f"  📝 Último reporte de @{cuenta}: {anotados} usuarios anotados")
+        return resultado["consultados"] > 0 or not resultado["fallidos"]
+    
+    def explorar_vecindario(self, raiz: str, profundidad: Optional[int] = None,
+                            presupuesto: Optional[int] = None, reiniciar: bool = False) -> bool:
+        """
+        Explora en anchura los seguidores de una cuenta y los de sus seguidores
+        La frontera y el nodo en curso se guardan en disco, así que cada ejecución
+        gasta como mucho el presupuesto de peticiones y la siguiente continúa
+        
+        Args:
+            raiz: Cuenta desde la que se explora
+            profundidad: Niveles que se expanden (por defecto, GRAFO_PROFUNDIDAD; solo al empezar)
+            presupuesto: Peticiones de esta ejecución (por defecto, GRAFO_PRESUPUESTO)
+            reiniciar: Borrar la exploración guardada y empezar de nuevo
+            
+        Returns:
+            bool: True si la exploración avanzó o ya estaba completa
+        """
+        if not self.sesion_activa:
+            registro.error(f"{Fore.RED}❌ Necesitas iniciar sesión para obtener listas de seguidores{Style.RESET_ALL}")
+            return False
+        raiz = limpiar_username(raiz)
+        if not validar_username(raiz):
+            registro.error(f"{Fore.RED}❌ Nombre de usuario inválido: {raiz}{Style.RESET_ALL}")
+            return False
+        
+        from grafo import CARPETA_GRAFO
+        
+        # El grafo tiene su propio bloqueo (fuera de su carpeta, que --reiniciar borra):
+        # la cuenta raíz puede monitorearse mientras tanto
+        bloqueo = bloqueos.Bloqueo(os.path.join(self.directorio_datos, raiz, f"{bloqueos.ARCHIVO_BLOQUEO}_{CARPETA_GRAFO}"))
+        if not bloqueo.adquirir():
+            registro.warning(f"{Fore.YELLOW}🔒 La exploración de @{raiz} está en curso en otro proceso "
+                             f"({bloqueo.propietario() or 'desconocido'}){Style.RESET_ALL}")
+            return False
+        try:
+            return self._explorar(raiz, profundidad, presupuesto, reiniciar)
+        finally:
+            bloqueo.liberar()
+    
+    def _explorar(self, raiz: str, profundidad: Optional[int], presupuesto: Optional[int], reiniciar: bool) -> bool:
+        """Cuerpo de explorar_vecindario, con el grafo ya bloqueado"""
+        from grafo import Grafo
+        
+        grafo = Grafo(self.directorio_datos, raiz)
+        if reiniciar:
+            grafo.reiniciar()
+        if not grafo.iniciado:
+            grafo.iniciar(profundidad or config.GRAFO_PROFUNDIDAD)
+        elif profundidad and profundidad != grafo.estado["profundidad"]:
+            registro.warning(f"{Fore.YELLOW}⚠️ La exploración guardada usa profundidad {grafo.estado['profundidad']} "
+                             f"(usa --reiniciar para cambiarla){Style.RESET_ALL}")
+        if grafo.terminado:
+            registro.info(f"{Fore.GREEN}✅ La exploración de @{raiz} ya está completa{Style.RESET_ALL}")
+            return True
+        
+        presupuesto = presupuesto or config.GRAFO_PRESUPUESTO
+        registro.info(f"{Fore.CYAN}🕸️ Explorando el vecindario de @{raiz} (presupuesto: {presupuesto} peticiones)...{Style.RESET_ALL}")
+        gastadas = 0
+        try:
+            while gastadas < presupuesto and (grafo.estado["actual"] or grafo.estado["cola"]):
+                if grafo.estado["actual"] is None:
+                    nodo, nivel = grafo.estado["cola"].pop(0)
+                    grafo.estado["actual"] = {"nodo": nodo, "profundidad": nivel, "obtenidos": 0, "iterador": None}
+                peticiones, seguir = self._expandir_nodo(grafo, presupuesto - gastadas)
+                gastadas += peticiones
+                if not seguir:
+                    break
+                escribir_en_linea(f"  {formatear_numero(grafo.estado['expandidos'])} expandidos · "
+                                  f"{formatear_numero(len(grafo.nombres))} nodos · {gastadas}/{presupuesto} peticiones")
+        except KeyboardInterrupt:
+            registro.warning(f"\n{Fore.YELLOW}⚠️ Exploración detenida por el usuario{Style.RESET_ALL}")
+        finally:
+            terminar_linea()
+            grafo.guardar()
+        
+        grafo.compactar()
+        resumen = grafo.resumen()
+        registro.info(f"{Fore.GREEN}✅ {gastadas} peticiones: {formatear_numero(resumen['nodos'])} nodos, "
+                      f"{formatear_numero(resumen['aristas'])} aristas, {resumen['pendientes']} nodos pendientes{Style.RESET_ALL}")
+        if resumen["pendientes"]:
+            registro.info(f"{Fore.YELLOW}💡 Vuelve a ejecutar la exploración para continuar donde se quedó{Style.RESET_ALL}")
+        return True
+    
+    def _expandir_nodo(self, grafo: "Grafo", disponibles: int) -> tuple:
+        """
+        Descarga (o continúa descargando) los seguidores del nodo en curso del grafo
+        Cada página guarda el iterador congelado como punto de reanudación
+        
+        Args:
+            grafo: Grafo con estado["actual"] definido
+            disponibles: Peticiones que quedan en esta ejecución
+            
+        Returns:
+            tuple: (peticiones gastadas, True si se puede seguir explorando)
+        """
+        actual = grafo.estado["actual"]
+        nombre = grafo.nombres[actual["nodo"]]
+        gastadas = 0
+        
+        def gastar():
+            nonlocal gastadas
+            gastadas += 1
+            grafo.estado["peticiones"] += 1
+        
+        try:
+            self._wait_if_needed()
+            gastar()
+            profile = instaloader.Profile.from_username(self.loader.context, nombre)
+            if profile.is_private and not profile.followed_by_viewer and nombre != self.username_actual:
+                registro.debug(f"  @{nombre}: privado, se omite")
+                grafo.estado["omitidos"] += 1
+                grafo.estado["actual"] = None
+                return gastadas, True
+            
+            iterador = profile.get_followers()
+            if actual["iterador"]:
+                iterador.thaw(instaloader.FrozenNodeIterator(**actual["iterador"]))
+            for follower in iterador:
+                seguidor, nuevo = grafo.id_de(follower.username)
+                grafo.agregar_arista(seguidor, actual["nodo"])
+                if nuevo:
+                    grafo.encolar(seguidor, actual["profundidad"] + 1)
+                actual["obtenidos"] += 1
+                if actual["obtenidos"] >= config.GRAFO_MAX_SEGUIDORES_NODO:
+                    break
+                if actual["obtenidos"] % config_seguridad.ELEMENTS_BETWEEN_DELAYS == 0:
+                    self._wait_if_needed()
+                if actual["obtenidos"] % config_seguridad.SIMULATED_PAGE_SIZE == 0:
+                    gastar()
+                    actual["iterador"] = iterador.freeze()._asdict()
+                    grafo.guardar()
+                    if gastadas >= disponibles:
+                        return gastadas, False
+            grafo.estado["expandidos"] += 1
+        except instaloader.exceptions.InvalidArgumentException:
+            # Punto de reanudación caducado o de otra sesión: el nodo se repite desde el principio
+            registro.debug(f"  @{nombre}: no se pudo reanudar, se empieza de nuevo")
+            actual["iterador"] = None
+            return gastadas, True
+        except (instaloader.exceptions.ProfileNotExistsException,
+                instaloader.exceptions.PrivateProfileNotFollowedException,
+                instaloader.exceptions.QueryReturnedNotFoundException) as e:
+            registro.debug(f"  @{nombre}: {e}")
+            grafo.estado["omitidos"] += 1
+        except instaloader.exceptions.ConnectionException as e:
+            self._revisar_error_autenticacion(e)
+            registro.warning(f"\n{Fore.YELLOW}⚠️ @{nombre}: {e} (se continuará en la próxima ejecución){Style.RESET_ALL}")
+            return gastadas, False
+        grafo.estado["actual"] = None
+        return gastadas, True
+    
+    def mostrar_grafo(self, raiz: str, usuario: Optional[str] = None, comparar: Optional[List[str]] = None,
+                      top: int = 10) -> bool:
+        """
+        Muestra el estado de la exploración de una cuenta y consultas sobre su grafo (sin red)
+        
+        Args:
+            raiz: Cuenta explorada
+            usuario: Mostrar grados, seguidores y seguidos de este usuario
+            comparar: Dos usuarios cuyos seguidores comunes se calculan
+            top: Usuarios del vecindario que siguen a más cuentas exploradas
+            
+        Returns:
+            bool: True si había una exploración guardada
+        """
+        from grafo import Grafo
+        
+        raiz = limpiar_username(raiz)
+        grafo = Grafo(self.directorio_datos, raiz)
+        if not grafo.iniciado:
+            registro.error(f"{Fore.RED}❌ No hay exploración guardada de @{raiz}{Style.RESET_ALL}")
+            return False
+        
+        resumen = grafo.resumen()
+        registro.info(f"\n{Fore.CYAN}🕸️ VECINDARIO DE @{raiz}{Style.RESET_ALL}")
+        registro.info(f"  Nodos: {formatear_numero(resumen['nodos'])} · Aristas: {formatear_numero(resumen['aristas'])}")
+        registro.info(f"  Profundidad: {resumen['profundidad']} · Expandidos: {resumen['expandidos']} · "
+                      f"Omitidos: {resumen['omitidos']} · Pendientes: {resumen['pendientes']}")
+        registro.info(f"  Peticiones gastadas: {formatear_numero(resumen['peticiones'])}")
+        
+        if usuario:
+            usuario = limpiar_username(usuario)
+            grado = grafo.grado(usuario)
+            if grado is None:
+                registro.warning(f"{Fore.YELLOW}⚠️ @{usuario} no aparece en el grafo{Style.RESET_ALL}")
+            else:
+                registro.info(f"\n{Fore.YELLOW}👤 @{usuario}: {grado['seguidores']} seguidores y sigue a {grado['sigue']} cuentas del grafo{Style.RESET_ALL}")
+                visibles, restantes = truncar_lista(grafo.seguidos_de(usuario), config.MAX_USUARIOS_MOSTRAR)
+                for nombre in visibles:
+                    registro.info(f"  • sigue a {nombre}")
+                if restantes:
+                    registro.info(f"  ... y {restantes} más")
+        
+        if comparar:
+            a, b = (limpiar_username(u) for u in comparar)
+            resultado = grafo.solapamiento(a, b)
+            registro.info(f"\n{Fore.YELLOW}🔗 @{a} y @{b}: {resultado['comunes']} seguidores comunes "
+                          f"({resultado['a']} y {resultado['b']}, Jaccard {resultado['jaccard']:.3f}){Style.RESET_ALL}")
+            visibles, _ = truncar_lista(resultado["muestra"], config.MAX_USUARIOS_MOSTRAR)
+            for nombre in visibles:
+                registro.info(f"  • {nombre}")
+        
+        mejores = grafo.top(top)
+        if mejores:
+            registro.info(f"\n{Fore.YELLOW}🏆 Siguen a más cuentas exploradas:{Style.RESET_ALL}")
+            for nombre, grado in mejores:
+                registro.info(f"  {nombre}: {grado}")
+        return True
+    
+    def leer_feed(self, consumidor: Optional[str] = None, desde: Optional[int] = None,
+                  maximo: Optional[int] = None, seguir: bool = False) -> bool:
+        """
+        Escribe en la salida estándar los eventos del registro de cambios, uno por línea en JSON
+        Con un consumidor, empieza donde se quedó y guarda el offset alcanzado al terminar
+        
+        Args:
+            consumidor: Nombre del consumidor cuyo offset se usa y se confirma
+            desde: Offset inicial (por defecto, el del consumidor o 0)
+            maximo: Número máximo de eventos
+            seguir: Esperar eventos nuevos hasta Ctrl+C (como tail -f)
+            
+        Returns:
+            bool: True si la lectura terminó sin errores
+        """
+        feed = FeedCambios(self.directorio_datos)
+        if desde is None:
+            desde = feed.offset_consumidor(consumidor) if consumidor else 0
+        eventos = feed.seguir(desde) if seguir else feed.leer(desde, maximo)
+        leidos, siguiente = 0, desde
+        try:
+            for evento in eventos:
+                sys.stdout.write(json.dumps(evento, ensure_ascii=False) + "\n")
+                sys.stdout.flush()
+                siguiente = evento["offset"] + 1
+                leidos += 1
+                if maximo is not None and leidos >= maximo:
+                    break
+        except KeyboardInterrupt:
+            pass
+        except BrokenPipeError:
+            # El lector cerró la tubería (p. ej. "| head"): se termina sin error
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        except (OSError, ValueError) as e:
+            registro.error(f"{Fore.RED}❌ Error al leer el registro de cambios: {e}{Style.RESET_ALL}")
+            return False
+        finally:
+            # Solo se confirma lo ya escrito: si el proceso muere antes, esos eventos se vuelven a entregar
+            if consumidor and leidos:
+                feed.confirmar(consumidor, siguiente)
+        return True
+    
+    def sondear_contadores(self, cuentas: List[str], intervalo_minutos: float = 5,
+                           rondas: Optional[int] = None) -> int:
+        """
+        Modo de sondeo: consulta solo los contadores de varias cuentas cada pocos minutos
+        Cada ronda consulta todas las cuentas respetando el limitador compartido
+        (_wait_if_needed) y escribe sus muestras de una vez. Se detiene con Ctrl+C
+        
+        Args:
+            cuentas: Cuentas a sondear
+            intervalo_minutos: Minutos entre el inicio de dos rondas
+            rondas: Número de rondas (por defecto, hasta Ctrl+C)
+            
+        Returns:
+            int: Muestras guardadas
+        """
+        cuentas = [limpiar_username(c) for c in cuentas]
+        guardadas = 0
+        ronda = 0
+        registro.info(f"{Fore.CYAN}📡 Sondeando {len(cuentas)} cuentas cada {intervalo_minutos:g} minutos (Ctrl+C para parar)...{Style.RESET_ALL}")
+        try:
+            while rondas is None or ronda < rondas:
+                inicio_ronda = time.time()
+                lote = {}
+                detenido = False
+                for cuenta in cuentas:
+                    self._wait_if_needed()
+                    try:
+                        profile = instaloader.Profile.from_username(self.loader.context, cuenta)
+                        lote[cuenta] = (time.time(), profile.followers, profile.followees, profile.mediacount)
+                    except instaloader.exceptions.ConnectionException as e:
+                        self._revisar_error_autenticacion(e)
+                        registro.warning(f"{Fore.YELLOW}⚠️ @{cuenta}: {e}{Style.RESET_ALL}")
+                        if self._handle_rate_limit_error(str(e)):
+                            continue
+                        # Lo ya consultado en esta ronda se guarda antes de parar
+                        detenido = True
+                        break
+                    except Exception as e:
+                        registro.warning(f"{Fore.YELLOW}⚠️ @{cuenta}: {e}{Style.RESET_ALL}")
+                
+                for cuenta, muestra in lote.items():
+                    guardadas += self._guardar_muestra_contadores(cuenta, muestra)
+                ronda += 1
+                registro.info(f"  Ronda {ronda}: {len(lote)}/{len(cuentas)} cuentas ({guardadas} muestras en total)")
+                if detenido:
+                    return guardadas
+                
+                if rondas is None or ronda < rondas:
+                    self._dormir(max(0.0, intervalo_minutos * 60 - (time.time() - inicio_ronda)))
+        except KeyboardInterrupt:
+            registro.warning(f"\n{Fore.YELLOW}⚠️ Sondeo detenido por el usuario{Style.RESET_ALL}")
+        return guardadas
+    
+    def mostrar_contadores(self, cuenta: str, desde: Optional[str] = None, hasta: Optional[str] = None,
+                           agrupar: Optional[str] = None) -> bool:
+        """
+        Muestra la serie de contadores de una cuenta en un rango de fechas (sin red)
+        
+        Args:
+            cuenta: Cuenta monitoreada
+            desde: Fecha u hora inicial (opcional)
+            hasta: Fecha u hora final (opcional)
+            agrupar: 'hora' o 'dia' para mostrar la última muestra de cada intervalo
+            
+        Returns:
+            bool: True si había muestras en el rango
+        """
+        cuenta = limpiar_username(cuenta)
+        try:
+            limites = []
+            for momento in (desde, hasta):
+                if momento:
+                    limites.append(datetime.strptime(normalizar_momento(momento), "%Y-%m-%d_%H-%M-%S").timestamp())
+                else:
+                    limites.append(None)
+            if desde and len(desde.strip()) == 10:
+                limites[0] -= 86399  # Una fecha sola como inicio cuenta desde el principio del día
+            muestras = SerieContadores(self.directorio_datos, cuenta).rango(*limites)
+        except (ValueError, OSError) as e:
+            registro.error(f"{Fore.RED}❌ {e}{Style.RESET_ALL}")
+            return False
+        
+        if not muestras:
+            registro.error(f"{Fore.RED}❌ No hay muestras de contadores para @{cuenta} en ese rango{Style.RESET_ALL}")
+            return False
+        
+        registro.info(f"\n{Fore.CYAN}📈 CONTADORES DE @{cuenta.upper()} ({len(muestras)} muestras){Style.RESET_ALL}")
+        registro.info(f"  {formatear_momento(muestras[0][0])} → {formatear_momento(muestras[-1][0])}")
+        for campo, datos in agregar_muestras(muestras).items():
+            registro.info(f"  {campo.capitalize()}: {datos['primero']} → {datos['ultimo']} ({datos['cambio']:+d}), "
+                          f"mín {datos['min']}, máx {datos['max']}, media {datos['media']:.1f}")
+        
+        if agrupar:
+            filas = agrupar_muestras(muestras, 3600 if agrupar == "hora" else 86400)
+            registro.info(f"\n{Fore.YELLOW}{'Momento':<20} {'Seguidores':>11} {'Seguidos':>9} {'Publicaciones':>14}{Style.RESET_ALL}")
+            for momento, seguidores, seguidos, publicaciones in filas[-config.MAX_USUARIOS_MOSTRAR:]:
+                registro.info(f"{formatear_momento(momento):<20} {seguidores:>11} {seguidos:>9} {publicaciones:>14}")
+            if len(filas) > config.MAX_USUARIOS_MOSTRAR:
+                registro.info(f"... y {len(filas) - config.MAX_USUARIOS_MOSTRAR} intervalos anteriores")
+        return True
+    
+    def mostrar_resumen_puerta(self, cuenta: Optional[str] = None) -> bool:
+        """
+        Muestra cuántos rastreos ha evitado la puerta de conteo
+        
+        Args:
+            cuenta: Cuenta concreta (por defecto, todas)
+            
+        Returns:
+            bool: True si había decisiones registradas
+        """
+        if cuenta:
+            cuentas = [limpiar_username(cuenta)]
+        elif os.path.exists(self.directorio_datos):
+            cuentas = sorted(os.listdir(self.directorio_datos))
+        else:
+            cuentas = []
+        resumen = puerta_conteo.resumen_decisiones(self.directorio_datos, cuentas)
+        if not resumen["evaluaciones"]:
+            registro.error(f"{Fore.RED}❌ No hay decisiones registradas de la puerta de conteo{Style.RESET_ALL}")
+            return False
+        
+        registro.info(f"\n{Fore.CYAN}🚪 PUERTA DE CONTEO (modo actual: {config.PUERTA_CONTEO}){Style.RESET_ALL}")
+        registro.info(f"  Evaluaciones: {resumen['evaluaciones']}")
+        registro.info(f"  Rastreos completos: {resumen['rastreos']}")
+        registro.info(f"  Rastreos omitidos: {resumen['omitidos']} "
+                      f"({resumen['omitidos'] / resumen['evaluaciones']:.0%})")
+        registro.info(f"  Peticiones ahorradas (estimadas): {formatear_numero(resumen['peticiones_ahorradas'])}"
+                      f" - {resumen['peticiones_muestra']} usadas en comprobaciones parciales")
+        for motivo, cantidad in sorted(resumen["motivos"].items(), key=lambda x: -x[1]):
+            registro.info(f"    {motivo}: {cantidad}")
+        return True
+    
+    def importar_descarga(self, ruta: str, cuenta: Optional[str] = None, fecha: Optional[str] = None) -> bool:
+        """
+        Crea un snapshot de una cuenta propia a partir de la descarga de datos de Instagram
+        No hace ninguna petición: el siguiente monitoreo parte de este snapshot y solo
+        muestra los cambios posteriores. Las fechas en que empezó cada relación se usan
+        como inicio en el índice de membresía
+        
+        Args:
+            ruta: Carpeta o .zip de la exportación
+            cuenta: Cuenta a la que pertenece (por defecto, la que indique la exportación)
+            fecha: Momento del snapshot (por defecto, la fecha de la exportación)
+            
+        Returns:
+            bool: True si se importó
+        """
+        from importador_descarga import leer_descarga
+        
+        try:
+            registro.info(f"{Fore.CYAN}📦 Leyendo la exportación {ruta}...{Style.RESET_ALL}")
+            datos = leer_descarga(ruta)
+            cuenta = limpiar_username(cuenta or datos["cuenta"] or "")
+            if not cuenta or not validar_username(cuenta):
+                registro.error(f"{Fore.RED}❌ No se pudo saber de qué cuenta es la exportación (usa --cuenta){Style.RESET_ALL}")
+                return False
+            if not datos["seguidores"] or not datos["seguidos"]:
+                faltan = "seguidores" if not datos["seguidores"] else "seguidos"
+                registro.error(f"{Fore.RED}❌ La exportación no incluye la lista de {faltan}{Style.RESET_ALL}")
+                return False
+            
+            if fecha:
+                timestamp = normalizar_momento(fecha)
+            else:
+                timestamp = datetime.fromtimestamp(datos["fecha"]).strftime("%Y-%m-%d_%H-%M-%S")
+            with bloqueos.bloqueo_cuenta(self.directorio_datos, cuenta):
+                existentes = [os.path.basename(r)[:19] for r in listar_snapshots(self.directorio_datos, cuenta, "seguidores")]
+                if timestamp in existentes:
+                    registro.error(f"{Fore.RED}❌ @{cuenta} ya tiene un snapshot con fecha {timestamp}{Style.RESET_ALL}")
+                    return False
+            
+                self.guardar_datos_actuales(cuenta, set(datos["seguidores"]), set(datos["seguidos"]), timestamp)
+                inicios = {relacion: {username: datetime.fromtimestamp(momento).strftime("%Y-%m-%d_%H-%M-%S")
+                                      for username, momento in datos[relacion].items() if momento}
+                           for relacion in ("seguidores", "seguidos")}
+                guardar_inicios_conocidos(self.directorio_datos, cuenta, inicios)
+            
+                # El snapshot puede quedar en medio del historial: los índices se rehacen enteros
+                reconstruir_indice(self.directorio_datos, cuenta)
+                reconstruir_analitica(self.directorio_datos, cuenta)
+                if not existentes or timestamp > max(existentes):
+                    vistas = VistasReciprocidad(self.directorio_datos, cuenta)
+                    vistas.establecer(datos["seguidores"], datos["seguidos"], timestamp)
+                    vistas.guardar()
+                    with bloqueos.bloqueo_compartido(self.directorio_datos, "indice_invertido"):
+                        indice = IndiceInvertido(self.directorio_datos)
+                        indice.establecer(cuenta, datos["seguidores"], timestamp)
+                        indice.guardar()
+            
+            registro.info(f"{Fore.GREEN}✅ @{cuenta}: {formatear_numero(len(datos['seguidores']))} seguidores y "
+                          f"{formatear_numero(len(datos['seguidos']))} seguidos importados con fecha {timestamp} (0 peticiones){Style.RESET_ALL}")
+            con_fecha = sum(len(fechas) for fechas in inicios.values())
+            if con_fecha:
+                registro.info(f"  {formatear_numero(con_fecha)} relaciones con fecha de inicio conocida")
+            return True
+        except bloqueos.ErrorBloqueo as e:
+            registro.warning(f"{Fore.YELLOW}🔒 {e}{Style.RESET_ALL}")
+            return False
+        except ValueError as e:
+            registro.error(f"{Fore.RED}❌ {e}{Style.RESET_ALL}")
+            return False
+        except Exception as e:
+            registro.error(f"{Fore.RED}❌ Error al importar la exportación: {e}{Style.RESET_ALL}")
+            return False
+    
+    def actualizar_indice_membresia(self, username: str, reporte: Dict, timestamp: str,
+                                    seguidores: Set[str], seguidos: Set[str]) -> Dict:
+        """
+        Actualiza el índice de membresía de la cuenta con el último monitoreo
+        Si el índice aún no existe se reconstruye a partir del historial guardado
+        
+        Args:
+            username: Cuenta monitoreada
+            reporte: Reporte de cambios del monitoreo
+            timestamp: Timestamp del monitoreo
+            seguidores: Seguidores actuales
+            seguidos: Seguidos actuales
+            
+        Returns:
+            Dict: Por relación, usuario eliminado → desde cuándo estaba (vacío si no aplica)
+        """
+        try:
+            indice = IndiceMembresia(self.directorio_datos, username)
+            if not indice.existe:
+                # El índice reconstruido ya incluye este snapshot (y las fechas de inicio_conocidos):
+                # las altas de los eliminados salen de sus intervalos recién cerrados
+                indice = reconstruir_indice(self.directorio_datos, username)
+                if reporte.get("es_primer_monitoreo"):
+                    return {}
+                return indice.inicios_eliminados(reporte)
+            if reporte.get("es_primer_monitoreo"):
+                indice.inicializar(timestamp, seguidores, seguidos)
+                inicios = {}
+            else:
+                inicios = indice.actualizar_desde_reporte(reporte)
+            indice.guardar()
+            return inicios
+        except Exception as e:
+            registro.warning(f"{Fore.YELLOW}⚠️ No se pudo actualizar el índice de membresía: {e}{Style.RESET_ALL}")
+            return {}
+    
+    def actualizar_analitica(self, username: str, reporte: Dict, timestamp: str,
+                             total_seguidores: int, inicios: Dict) -> None:
+        """
+        Suma el último monitoreo a la analítica de abandono y permanencia
+        
+        Args:
+            username: Cuenta monitoreada
+            reporte: Reporte de cambios del monitoreo
+            timestamp: Timestamp del monitoreo
+            total_seguidores: Seguidores actuales
+            inicios: Fechas de alta de los usuarios perdidos (del índice de membresía)
+        """
+        try:
+            analitica = AnaliticaCuenta(self.directorio_datos, username)
+            if not analitica.existe:
+                reconstruir_analitica(self.directorio_datos, username)
+                return
+            if reporte.get("es_primer_monitoreo"):
+                analitica.inicializar(timestamp, total_seguidores)
+            else:
+                analitica.aplicar_reporte(reporte, inicios)
+            analitica.guardar()
+        except Exception as e:
+            registro.warning(f"{Fore.YELLOW}⚠️ No se pudo actualizar la analítica: {e}{Style.RESET_ALL}")
+    
+    def mostrar_analitica(self, cuenta: str, periodo: str = "diaria", dias_baja: int = 30,
+                          exportar: Optional[str] = None, reconstruir: bool = False) -> bool:
+        """
+        Muestra la tasa de abandono y la permanencia de los seguidores de una cuenta
+        
+        Args:
+            cuenta: Cuenta monitoreada
+            periodo: 'diaria' o 'semanal'
+            dias_baja: Ventana en días para contar bajas tempranas
+            exportar: Archivo .csv o .jsonl donde exportar la serie (opcional)
+            reconstruir: Recalcular antes los agregados a partir del historial
+            
+        Returns:
+            bool: True si había datos para la cuenta
+        """
+        cuenta = limpiar_username(cuenta)
+        try:
+            analitica = AnaliticaCuenta(self.directorio_datos, cuenta)
+            if reconstruir or not analitica.existe:
+                analitica = reconstruir_analitica(self.directorio_datos, cuenta)
+            if not analitica.existe:
+                registro.error(f"{Fore.RED}❌ No hay datos de monitoreo para @{cuenta}{Style.RESET_ALL}")
+                return False
+            
+            resumen = analitica.resumen(dias_baja)
+            serie = analitica.serie(periodo)
+            
+            registro.info(f"\n{Fore.CYAN}{'='*60}")
+            registro.info(f"📉 ABANDONO Y PERMANENCIA - {cuenta.upper()}")
+            registro.info(f"{'='*60}{Style.RESET_ALL}")
+            registro.info(f"  Periodo: {resumen['desde']} → {resumen['hasta']}")
+            registro.info(f"  Seguidores: {resumen['seguidores']}")
+            if resumen["permanencia_mediana_dias"] is not None:
+                registro.info(f"  Permanencia mediana de los seguidores actuales: {resumen['permanencia_mediana_dias']:.1f} días")
+            if resumen["permanencia_mediana_bajas_dias"] is not None:
+                registro.info(f"  Permanencia mediana de las bajas: {resumen['permanencia_mediana_bajas_dias']:.1f} días")
+            if resumen["proporcion_bajas_tempranas"] is not None:
+                registro.info(f"  Bajas en los primeros {dias_baja} días: {resumen['bajas_tempranas']} de "
+                              f"{resumen['total_adquiridos']} nuevos ({resumen['proporcion_bajas_tempranas']:.1%})")
+            
+            registro.info(f"\n{Fore.YELLOW}{'Periodo':<12} {'Nuevos':>7} {'Perdidos':>9} {'Seguidores':>11} {'Abandono':>9}{Style.RESET_ALL}")
+            for fila in serie[-config.MAX_USUARIOS_MOSTRAR:]:
+                tasa = f"{fila['tasa_abandono']:.2%}" if fila["tasa_abandono"] is not None else "-"
+                registro.info(f"{fila['periodo']:<12} {fila['nuevos']:>7} {fila['perdidos']:>9} {fila['seguidores']:>11} {tasa:>9}")
+            if len(serie) > config.MAX_USUARIOS_MOSTRAR:
+                registro.info(f"... y {len(serie) - config.MAX_USUARIOS_MOSTRAR} periodos anteriores")
+            
+            if exportar:
+                exportar_serie(serie, exportar)
+                registro.info(f"{Fore.GREEN}✅ Serie exportada a: {exportar}{Style.RESET_ALL}")
+            return True
+        except Exception as e:
+            registro.error(f"{Fore.RED}❌ Error al calcular la analítica: {e}{Style.RESET_ALL}")
+            return False
+    
+    def actualizar_reciprocidad(self, username: str, reporte: Dict, timestamp: str,
+                                seguidores: Set[str], seguidos: Set[str]) -> None:
+        """
+        Actualiza las vistas de reciprocidad y añade sus tamaños a las estadísticas del reporte
+        
+        Args:
+            username: Cuenta monitoreada
+            reporte: Reporte de cambios del monitoreo
+            timestamp: Timestamp del monitoreo
+            seguidores: Seguidores actuales
+            seguidos: Seguidos actuales
+        """
+        try:
+            vistas = VistasReciprocidad(self.directorio_datos, username)
+            if vistas.existe and not reporte.get("es_primer_monitoreo"):
+                vistas.aplicar_reporte(reporte)
+            else:
+                vistas.establecer(seguidores, seguidos, timestamp)
+            vistas.guardar()
+            if "estadisticas" in reporte:
+                reporte["estadisticas"].update(vistas.conteos())
+        except Exception as e:
+            registro.warning(f"{Fore.YELLOW}⚠️ No se pudieron actualizar las vistas de reciprocidad: {e}{Style.RESET_ALL}")
+    
+    def mostrar_reciprocidad(self, cuenta: str, vista: Optional[str] = None, historial: bool = False,
+                             exportar: Optional[str] = None) -> bool:
+        """
+        Muestra las vistas de reciprocidad guardadas de una cuenta (sin red)
+        
+        Args:
+            cuenta: Cuenta monitoreada
+            vista: Mostrar solo una vista ('mutuos', 'solo_me_siguen', 'solo_sigo')
+            historial: Mostrar la evolución de los tamaños en lugar de las listas
+            exportar: Archivo .csv, .jsonl o .txt donde guardar las vistas (opcional)
+            
+        Returns:
+            bool: True si había vistas guardadas
+        """
+        cuenta = limpiar_username(cuenta)
+        vistas = VistasReciprocidad(self.directorio_datos, cuenta)
+        if not vistas.existe:
+            registro.error(f"{Fore.RED}❌ No hay vistas de reciprocidad para @{cuenta}; monitorea el perfil primero{Style.RESET_ALL}")
+            return False
+        
+        conteos = vistas.conteos()
+        total_seguidores = conteos["mutuos"] + conteos["solo_me_siguen"]
+        registro.info(f"\n{Fore.CYAN}{'='*60}")
+        registro.info(f"🔗 RECIPROCIDAD DE @{cuenta.upper()} (datos del {vistas.timestamp})")
+        registro.info(f"{'='*60}{Style.RESET_ALL}")
+        for nombre in VISTAS:
+            registro.info(f"  {DESCRIPCION_VISTAS[nombre]}: {conteos[nombre]}")
+        if total_seguidores:
+            registro.info(f"{Fore.BLUE}📊 Ratio de reciprocidad: {conteos['mutuos'] / total_seguidores * 100:.1f}%{Style.RESET_ALL}")
+        
+        if historial:
+            registro.info(f"\n{Fore.YELLOW}{'Fecha':<20} {'Mutuos':>8} {'Me siguen':>10} {'Sigo':>8}{Style.RESET_ALL}")
+            for entrada in vistas.historial()[-config.MAX_USUARIOS_MOSTRAR:]:
+                registro.info(f"{entrada['timestamp']:<20} {entrada['mutuos']:>8} {entrada['solo_me_siguen']:>10} {entrada['solo_sigo']:>8}")
+        else:
+            ultima = vistas.historial()[-1:]
+            for nombre in ([vista] if vista else VISTAS):
+                registro.info(f"\n{Fore.YELLOW}{DESCRIPCION_VISTAS[nombre]}:{Style.RESET_ALL}")
+                self._mostrar_lista_usuarios(cuenta, nombre, vistas.vistas[nombre])
+                if ultima:
+                    movimientos = ultima[0]["movimientos"][nombre]
+                    if movimientos["entran"] or movimientos["salen"]:
+                        registro.info(f"  Último monitoreo: +{len(movimientos['entran'])} / -{len(movimientos['salen'])}")
+        
+        if exportar:
+            vistas.exportar(exportar, [vista] if vista else None)
+            registro.info(f"{Fore.GREEN}✅ Vistas exportadas a: {exportar}{Style.RESET_ALL}")
+        return True
+    
+    def actualizar_indice_invertido(self, username: str, reporte: Dict, timestamp: str,
+                                    seguidores: Set[str]) -> None:
+        """
+        Actualiza el índice invertido de audiencias con el último monitoreo
+        
+        Args:
+            username: Cuenta monitoreada
+            reporte: Reporte de cambios del monitoreo
+            timestamp: Timestamp del monitoreo
+            seguidores: Seguidores actuales
+        """
+        try:
+            # El índice es común a todas las cuentas: se lee y se reescribe bajo un bloqueo compartido
+            with bloqueos.bloqueo_compartido(self.directorio_datos, "indice_invertido"):
+                indice = IndiceInvertido(self.directorio_datos)
+                if not indice.cuentas:
+                    reconstruir_indice_invertido(self.directorio_datos)
+                    return
+                if reporte.get("es_primer_monitoreo") or username not in indice.cuentas:
+                    indice.establecer(username, seguidores, timestamp)
+                else:
+                    cambios = reporte["cambios_seguidores"]
+                    renombres = reporte.get("renombres", {}).get("seguidores", [])
+                    indice.aplicar_cambios(username, cambios["nuevos"] + [r["actual"] for r in renombres],
+                                           cambios["perdidos"] + [r["anterior"] for r in renombres], timestamp)
+                indice.guardar()
+        except Exception as e:
+            registro.warning(f"{Fore.YELLOW}⚠️ No se pudo actualizar el índice invertido: {e}{Style.RESET_ALL}")
+    
+    def consultar_audiencia(self, todas: Optional[List[str]] = None, alguna: Optional[List[str]] = None,
+                            minimo: Optional[int] = None, top: Optional[int] = None,
+                            usuario: Optional[str] = None, reconstruir: bool = False,
+                            exportar: Optional[str] = None) -> bool:
+        """
+        Consulta qué usuarios siguen a qué cuentas monitoreadas (sin red)
+        
+        Args:
+            todas: Usuarios que siguen a todas estas cuentas
+            alguna: Usuarios que siguen al menos a una de estas cuentas
+            minimo: Usuarios que siguen a este número de cuentas o más
+            top: Mostrar los N usuarios que siguen a más cuentas
+            usuario: Mostrar las cuentas monitoreadas que sigue este usuario
+            reconstruir: Regenerar antes el índice con el último snapshot de cada cuenta
+            exportar: Archivo de texto donde guardar la lista completa (opcional)
+            
+        Returns:
+            bool: True si la consulta se pudo resolver
+        """
+        try:
+            indice = IndiceInvertido(self.directorio_datos)
+            if reconstruir or not indice.cuentas:
+                registro.info(f"{Fore.CYAN}🔄 Construyendo índice invertido de audiencias...{Style.RESET_ALL}")
+                # La reconstrucción borra la carpeta: mismo bloqueo que los monitores que la actualizan
+                with bloqueos.bloqueo_compartido(self.directorio_datos, "indice_invertido"):
+                    indice = reconstruir_indice_invertido(self.directorio_datos)
+            if not indice.cuentas:
+                registro.error(f"{Fore.RED}❌ No hay datos de monitoreo{Style.RESET_ALL}")
+                return False
+            
+            if usuario:
+                usuario = limpiar_username(usuario)
+                cuentas = indice.cuentas_de(usuario)
+                registro.info(f"\n{Fore.CYAN}👤 @{usuario} sigue a {len(cuentas)} de {len(indice.cuentas)} cuentas monitoreadas{Style.RESET_ALL}")
+                for cuenta in cuentas:
+                    registro.info(f"  • @{cuenta}")
+                return True
+            
+            if top:
+                registro.info(f"\n{Fore.CYAN}🏆 Usuarios que siguen a más cuentas monitoreadas{Style.RESET_ALL}")
+                for posicion, (nombre, cantidad) in enumerate(indice.top(top), 1):
+                    registro.info(f"  {posicion}. @{nombre}: {cantidad} cuentas")
+                return True
+            
+            if todas:
+                bits = indice.interseccion([limpiar_username(c) for c in todas])
+                titulo = f"Siguen a todas: {', '.join(todas)}"
+            elif alguna:
+                bits = indice.union([limpiar_username(c) for c in alguna])
+                titulo = f"Siguen a alguna: {', '.join(alguna)}"
+            else:
+                bits = indice.con_al_menos(minimo or 1)
+                titulo = f"Siguen a {minimo or 1} o más cuentas monitoreadas"
+            
+            nombres = sorted(indice.nombres(bits))
+            registro.info(f"\n{Fore.CYAN}👥 {titulo} ({len(nombres)} usuarios){Style.RESET_ALL}")
+            visibles, restantes = truncar_lista(nombres, config.MAX_USUARIOS_MOSTRAR)
+            for nombre in visibles:
+                registro.info(f"  • {nombre}")
+            if restantes:
+                registro.info(f"  ... y {restantes} más")
+            if exportar:
+                with open(exportar, 'w', encoding='utf-8') as f:
+                    f.write("".join(f"{nombre}\n" for nombre in nombres))
+                registro.info(f"{Fore.GREEN}✅ Lista exportada a: {exportar}{Style.RESET_ALL}")
+            return True
+        except bloqueos.ErrorBloqueo as e:
+            registro.warning(f"{Fore.YELLOW}🔒 {e}{Style.RESET_ALL}")
+            return False
+        except (ValueError, OSError) as e:
+            registro.error(f"{Fore.RED}❌ {e}{Style.RESET_ALL}")
+            return False
+    
+    def servir_api(self, host: Optional[str] = None, puerto: Optional[int] = None) -> bool:
+        """
+        Sirve los datos guardados por HTTP (solo lectura, sin red hacia Instagram) hasta Ctrl+C
+        
+        Args:
+            host: Dirección en la que escuchar (por defecto: API_HOST)
+            puerto: Puerto TCP (por defecto: API_PUERTO)
+            
+        Returns:
+            bool: True si el servidor arrancó
+        """
+        from servidor_api import crear_servidor
+        
+        host = host or config.API_HOST
+        puerto = config.API_PUERTO if puerto is None else puerto
+        try:
+            servidor = crear_servidor(self.directorio_datos, host, puerto)
+        except OSError as e:
+            registro.error(f"{Fore.RED}❌ No se pudo abrir {host}:{puerto}: {e}{Style.RESET_ALL}")
+            return False
+        
+        registro.info(f"{Fore.GREEN}🌐 API disponible en http://{host}:{servidor.server_address[1]}/cuentas "
+                      f"(Ctrl+C para detener){Style.RESET_ALL}")
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            registro.info(f"\n{Fore.YELLOW}⏹️ Servidor detenido{Style.RESET_ALL}")
+        finally:
+            servidor.server_close()
+        return True
+    
+    def encolar_trabajos(self, cuentas: List[str], prioridad: int = 0, forzar: bool = False) -> bool:
+        """
+        Añade cuentas a la cola de trabajo compartida (sin red)
+        
+        Args:
+            cuentas: Cuentas a monitorear
+            prioridad: Los trabajos de mayor prioridad se toman antes
+            forzar: Descargar aunque la puerta de conteo no detecte cambios
+            
+        Returns:
+            bool: True si todas las cuentas eran válidas
+        """
+        from cola_trabajo import ColaTrabajo
+        
+        invalidas = [cuenta for cuenta in cuentas if not validar_username(cuenta)]
+        for cuenta in invalidas:
+            registro.error(f"{Fore.RED}❌ Nombre de usuario inválido: {cuenta}{Style.RESET_ALL}")
+        validas = [limpiar_username(cuenta) for cuenta in cuentas if validar_username(cuenta)]
+        cola = ColaTrabajo(self.directorio_datos)
+        nuevos = cola.encolar(validas, prioridad, forzar)
+        registro.info(f"{Fore.GREEN}📥 {nuevos} trabajos nuevos ({len(validas) - nuevos} ya estaban en la cola){Style.RESET_ALL}")
+        return not invalidas
+    
+    def trabajar_cola(self, nombre: Optional[str] = None, maximo: Optional[int] = None,
+                      esperar: bool = False) -> Dict[str, int]:
+        """
+        Toma trabajos de la cola compartida y monitorea sus cuentas hasta vaciarla
+        Cada trabajador usa su propia sesión y su propio limitador; la concesión del
+        trabajo se renueva mientras dura el monitoreo y el resultado vuelve a la cola
+        
+        Args:
+            nombre: Identificador del trabajador (por defecto, máquina:pid)
+            maximo: Trabajos a procesar como máximo (por defecto, sin límite)
+            esperar: Con la cola vacía, seguir esperando trabajos nuevos (hasta Ctrl+C)
+            
+        Returns:
+            Dict[str, int]: Trabajos procesados, terminados y fallidos
+        """
+        from cola_trabajo import ColaTrabajo, LatidoTrabajo, nombre_trabajador
+        
+        conteos = {"procesados": 0, "terminados": 0, "fallidos": 0}
+        if not self.sesion_activa and not self.modo_publico:
+            registro.error(f"{Fore.RED}❌ Necesitas iniciar sesión o activar modo público primero{Style.RESET_ALL}")
+            return conteos
+        
+        nombre = nombre or nombre_trabajador()
+        cola = ColaTrabajo(self.directorio_datos)
+        registro.info(f"{Fore.CYAN}👷 Trabajador {nombre} esperando trabajos...{Style.RESET_ALL}")
+        while maximo is None or conteos["procesados"] < maximo:
+            trabajo = cola.tomar(nombre)
+            if trabajo is None:
+                if not esperar:
+                    break
+                try:
+                    time.sleep(config.COLA_ESPERA_VACIA)
+                except KeyboardInterrupt:
+                    break
+                continue
+            
+            registro.info(f"{Fore.CYAN}📋 Trabajo {trabajo['id']}: @{trabajo['cuenta']} "
+                          f"(intento {trabajo['intentos']}/{trabajo['max_intentos']}){Style.RESET_ALL}")
+            conteos["procesados"] += 1
+            try:
+                with LatidoTrabajo(cola, trabajo) as latido:
+                    resultado = self.monitorear_perfil(trabajo["cuenta"], bool(trabajo["forzar"]))
+            except KeyboardInterrupt:
+                cola.fallar(trabajo, "interrumpido")
+                registro.warning(f"\n{Fore.YELLOW}⚠️ Trabajador detenido; el trabajo {trabajo['id']} vuelve a la cola{Style.RESET_ALL}")
+                break
+            except Exception as e:
+                estado = cola.fallar(trabajo, str(e))
+                conteos["fallidos"] += 1
+                registro.error(f"{Fore.RED}❌ Trabajo {trabajo['id']}: {e} ({estado}){Style.RESET_ALL}")
+                continue
+            
+            estado = cola.terminar(trabajo, resultado)
+            if estado is None or latido.perdido:
+                registro.warning(f"{Fore.YELLOW}⚠️ La concesión del trabajo {trabajo['id']} caducó y lo tomó otro trabajador{Style.RESET_ALL}")
+            if resultado.exito:
+                conteos["terminados"] += 1
+            else:
+                conteos["fallidos"] += 1
+                registro.warning(f"{Fore.YELLOW}⚠️ Trabajo {trabajo['id']}: {resultado.motivo} ({estado}){Style.RESET_ALL}")
+        
+        registro.info(f"{Fore.GREEN}✅ {conteos['procesados']} trabajos procesados: {conteos['terminados']} terminados, "
+                      f"{conteos['fallidos']} fallidos{Style.RESET_ALL}")
+        return conteos
+    
+    def mostrar_cola(self, estado: Optional[str] = None, reintentar: bool = False) -> bool:
+        """
+        Muestra el estado de la cola de trabajo compartida (sin red)
+        
+        Args:
+            estado: Listar solo los trabajos de este estado
+            reintentar: Devolver antes a la cola los trabajos descartados
+            
+        Returns:
+            bool: True si se pudo leer la cola
+        """
+        import sqlite3
+        from cola_trabajo import ColaTrabajo
+        
+        try:
+            cola = ColaTrabajo(self.directorio_datos)
+            if reintentar:
+                registro.info(f"{Fore.CYAN}🔁 {cola.reintentar_descartados()} trabajos descartados vuelven a la cola{Style.RESET_ALL}")
+            conteos = cola.estado()
+            trabajos = cola.trabajos(estado)
+        except sqlite3.Error as e:
+            registro.error(f"{Fore.RED}❌ No se pudo leer la cola de trabajo: {e}{Style.RESET_ALL}")
+            return False
+        
+        registro.info(f"\n{Fore.CYAN}{'='*60}")
+        registro.info("📋 COLA DE TRABAJO")
+        registro.info(f"{'='*60}{Style.RESET_ALL}")
+        registro.info("  " + " · ".join(f"{clave}: {valor}" for clave, valor in conteos.items()))
+        for trabajo in trabajos:
+            fecha = datetime.fromtimestamp(trabajo["actualizado"]).strftime("%Y-%m-%d %H:%M:%S")
+            linea = (f"  #{trabajo['id']} @{trabajo['cuenta']} [{trabajo['estado']}] prioridad {trabajo['prioridad']}, "
+                     f"intentos {trabajo['intentos']}/{trabajo['max_intentos']}, {fecha}")
+            if trabajo["trabajador"]:
+                linea += f", {trabajo['trabajador']}"
+            resultado = trabajo["resultado"]
+            if trabajo["error"]:
+                linea += f" → {trabajo['error']}"
+            elif resultado and "nuevos_seguidores" in resultado:
+                linea += (f" → +{resultado['nuevos_seguidores']}/-{resultado['seguidores_perdidos']} seguidores, "
+                          f"+{resultado['nuevos_seguidos']}/-{resultado['seguidos_eliminados']} seguidos")
+            elif resultado:
+                linea += f" → {resultado['estado']}"
+            registro.info(linea)
+        return True
+    
+    def mostrar_solapamiento(self, cuentas: Optional[List[str]] = None, exacto: bool = False,
+                             exportar: Optional[str] = None) -> bool:
+        """
+        Muestra el solapamiento de audiencias entre cuentas monitoreadas (sin red)
+        
+        Args:
+            cuentas: Cuentas a comparar (por defecto, todas las que tienen datos)
+            exacto: Comparar siempre con las listas completas
+            exportar: Archivo .csv o .jsonl donde guardar todas las parejas (opcional)
+            
+        Returns:
+            bool: True si se pudo calcular
+        """
+        cuentas = [limpiar_username(c) for c in cuentas] if cuentas else None
+        try:
+            filas = solapamiento.matriz_solapamiento(self.directorio_datos, cuentas, exacto)
+        except (ValueError, OSError) as e:
+            registro.error(f"{Fore.RED}❌ {e}{Style.RESET_ALL}")
+            return False
+        
+        if not filas:
+            registro.error(f"{Fore.RED}❌ Se necesitan al menos dos cuentas con datos{Style.RESET_ALL}")
+            return False
+        
+        registro.info(f"\n{Fore.CYAN}{'='*60}")
+        registro.info(f"🔗 SOLAPAMIENTO DE AUDIENCIAS ({len(filas)} parejas)")
+        registro.info(f"{'='*60}{Style.RESET_ALL}")
+        
+        filas_ordenadas = sorted(filas, key=lambda fila: fila["jaccard"], reverse=True)
+        for fila in filas_ordenadas[:config.MAX_USUARIOS_MOSTRAR]:
+            marca = "" if fila["exacto"] else " ≈"
+            registro.info(f"  @{fila['cuenta_a']} ↔ @{fila['cuenta_b']}: {fila['interseccion']}{marca} en común "
+                          f"(Jaccard {fila['jaccard']:.3f})")
+        if len(filas) > config.MAX_USUARIOS_MOSTRAR:
+            registro.info(f"  ... y {len(filas) - config.MAX_USUARIOS_MOSTRAR} parejas más")
+        if any(not fila["exacto"] for fila in filas):
+            registro.info(f"{Fore.YELLOW}ℹ️ ≈ valor estimado con bosquejos MinHash{Style.RESET_ALL}")
+        
+        if exportar:
+            solapamiento.exportar_matriz(filas, exportar)
+            registro.info(f"{Fore.GREEN}✅ Parejas exportadas a: {exportar}{Style.RESET_ALL}")
+        return True
+    
+    def mostrar_ultimo_reporte(self, username: Optional[str] = None) -> None:
+        """
+        Muestra el último reporte disponible
+        
+        Args:
+            username: Usuario cuyo reporte mostrar; si no se indica se pregunta
+        """
+        if username:
+            self._mostrar_reporte_mas_reciente(limpiar_username(username))
+            return
+        
+        try:
+            usuarios_con_reportes = []
+            
+            if os.path.exists(self.directorio_datos):
+                for usuario in os.listdir(self.directorio_datos):
+                    carpeta_usuario = os.path.join(self.directorio_datos, usuario)
+                    if os.path.isdir(carpeta_usuario):
+                        carpeta_reportes = os.path.join(carpeta_usuario, "reportes")
+                        if os.path.exists(carpeta_reportes):
+                            archivos_reportes = [f for f in os.listdir(carpeta_reportes) if f.endswith('_reporte.json')]
+                            if archivos_reportes:
+                                usuarios_con_reportes.append(usuario)
+            
+            if not usuarios_con_reportes:
+                registro.error(f"{Fore.RED}❌ No se encontraron reportes{Style.RESET_ALL}")
+                return
+            
+            print(f"{Fore.YELLOW}Usuarios con reportes disponibles:{Style.RESET_ALL}")
+            for i, usuario in enumerate(usuarios_con_reportes, 1):
+                print(f"{i}. {usuario}")
+            
+            seleccion = input(f"{Fore.CYAN}Selecciona un usuario (número): {Style.RESET_ALL}")
+            
+            try:
+                indice = int(seleccion) - 1
+                if 0 <= indice < len(usuarios_con_reportes):
+                    self._mostrar_reporte_mas_reciente(usuarios_con_reportes[indice])
+                else:
+                    registro.error(f"{Fore.RED}❌ Selección inválida{Style.RESET_ALL}")
+            except ValueError:
+                registro.error(f"{Fore.RED}❌ Entrada inválida{Style.RESET_ALL}")
+                
+        except Exception as e:
+            registro.error(f"{Fore.RED}❌ Error al cargar reportes: {e}{Style.RESET_ALL}")
+    
+    def _mostrar_reporte_mas_reciente(self, username: str) -> None:
+        """
+        Muestra el reporte más reciente de un usuario sin crear carpetas
+        
+        Args:
+            username: Nombre de usuario
+        """
+        try:
+            carpeta_reportes = os.path.join(self.directorio_datos, username, "reportes")
+            archivo_reporte = self.obtener_archivo_mas_reciente(carpeta_reportes, "reporte")
+            
+            if archivo_reporte:
+                with open(archivo_reporte, 'r', encoding='utf-8') as f:
+                    reporte = json.load(f)
+                
+                self.mostrar_reporte(reporte)
+            else:
+                registro.error(f"{Fore.RED}❌ No hay reportes para este usuario{Style.RESET_ALL}")
+        except Exception as e:
+            registro.error(f"{Fore.RED}❌ Error al cargar reportes: {e}{Style.RESET_ALL}")
+    
+    def mostrar_diferencia(self, cuenta: str, desde: str, hasta: str, solo: Optional[str] = None,
+                           guardar: Optional[str] = None) -> bool:
+        """
+        Muestra los cambios de una cuenta entre dos momentos de su historial (sin red)
+        
+        Args:
+            cuenta: Cuenta monitoreada
+            desde: Momento inicial (fecha u hora)
+            hasta: Momento final (fecha u hora)
+            solo: Mostrar solo un tipo de cambio (ver historial.FILTROS)
+            guardar: Ruta donde guardar el reporte en JSON (opcional)
+            
+        Returns:
+            bool: True si se pudo generar el reporte
+        """
+        cuenta = limpiar_username(cuenta)
+        try:
+            reporte = diferencia_entre(self.directorio_datos, cuenta, desde, hasta, solo)
+        except (ValueError, OSError) as e:
+            registro.error(f"{Fore.RED}❌ {e}{Style.RESET_ALL}")
+            return False
+        
+        registro.info(f"{Fore.CYAN}🕒 Snapshots comparados: {reporte['timestamp_anterior']} → {reporte['timestamp']}{Style.RESET_ALL}")
+        self.mostrar_reporte(reporte)
+        
+        if guardar:
+            with open(guardar, 'w', encoding='utf-8') as f:
+                json.dump(reporte, f, ensure_ascii=False, indent=2)
+            registro.info(f"{Fore.GREEN}✅ Reporte guardado en: {guardar}{Style.RESET_ALL}")
+        return True
+    
+    def mostrar_linea_tiempo(self, cuenta: str, usuario: str, reconstruir: bool = False) -> bool:
+        """
+        Muestra cuándo un usuario empezó y dejó de seguir (o ser seguido por) una cuenta
+        
+        Args:
+            cuenta: Cuenta monitoreada
+            usuario: Usuario a consultar
+            reconstruir: Regenerar antes el índice a partir de todo el historial
+            
+        Returns:
+            bool: True si había datos para la cuenta
+        """
+        cuenta = limpiar_username(cuenta)
+        usuario = limpiar_username(usuario)
+        try:
+            indice = IndiceMembresia(self.directorio_datos, cuenta)
+            if reconstruir or not indice.existe:
+                if not os.path.isdir(os.path.join(self.directorio_datos, cuenta)):
+                    registro.error(f"{Fore.RED}❌ No hay datos de monitoreo para @{cuenta}{Style.RESET_ALL}")
+                    return False
+                registro.info(f"{Fore.CYAN}🔄 Reconstruyendo índice de membresía de @{cuenta}...{Style.RESET_ALL}")
+                indice = reconstruir_indice(self.directorio_datos, cuenta)
+            
+            intervalos = indice.consultar(usuario)
+            registro.info(f"\n{Fore.CYAN}📅 @{usuario} en las listas de @{cuenta}{Style.RESET_ALL}")
+            for relacion, titulo in (("seguidores", "Como seguidor"), ("seguidos", "Como seguido")):
+                registro.info(f"{Fore.YELLOW}{titulo}:{Style.RESET_ALL}")
+                if not intervalos[relacion]:
+                    registro.info("   Nunca observado")
+                for intervalo in intervalos[relacion]:
+                    fin = "actualidad" if intervalo["actual"] else intervalo["ultima_vez"]
+                    registro.info(f"   {intervalo['primera_vez']} → {fin}")
+            return True
+        except Exception as e:
+            registro.error(f"{Fore.RED}❌ Error al consultar el índice de membresía: {e}{Style.RESET_ALL}")
+            return False
+    
+    def mostrar_estructura_archivos(self) -> None:
+        """Muestra la estructura de archivos para todos los usuarios monitoreados"""
+        try:
+            if not os.path.exists(self.directorio_datos):
+                registro.error(f"{Fore.RED}❌ No hay datos de monitoreo{Style.RESET_ALL}")
+                return
+            
+            usuarios = [d for d in os.listdir(self.directorio_datos) 
+                       if os.path.isdir(os.path.join(self.directorio_datos, d))
+                       and d not in (CARPETA_INDICE_INVERTIDO, CARPETA_ENRIQUECIMIENTO, CARPETA_FEED)]
+            
+            if not usuarios:
+                registro.error(f"{Fore.RED}❌ No hay usuarios monitoreados{Style.RESET_ALL}")
+                return
+            
+            registro.info(f"\n{Fore.CYAN}{'='*60}")
+            registro.info("📁 ESTRUCTURA DE ARCHIVOS DE MONITOREO")
+            registro.info(f"{'='*60}{Style.RESET_ALL}")
+            
+            for usuario in usuarios:
+                carpeta_usuario = os.path.join(self.directorio_datos, usuario)
+                
+                registro.info(f"\n{Fore.YELLOW}👤 Usuario: {usuario}{Style.RESET_ALL}")
+                
+                # Mostrar seguidores
                 carpeta_seguidores = os.path.join(carpeta_usuario, "seguidores")
                 if os.path.exists(carpeta_seguidores):
                     archivos_seguidores = [f for f in os.listdir(carpeta_seguidores) if f.endswith('_seguidores.json')]
-                    print(f"  📥 Seguidores ({len(archivos_seguidores)} archivos):")
+                    registro.info(f"  📥 Seguidores ({len(archivos_seguidores)} archivos):")
                     for archivo in sorted(archivos_seguidores)[-3:]:  # Mostrar últimos 3
                         # Extraer timestamp del nombre del archivo de forma más robusta
                         partes = archivo.rsplit('_', 1)  # Separar desde el final
                         if len(partes) > 0:
                             timestamp = partes[0].replace('_seguidores', '')
-                            print(f"    📄 {timestamp}")
+                            registro.info(f"    📄 {timestamp}")
                     if len(archivos_seguidores) > 3:
-                        print(f"    ... y {len(archivos_seguidores) - 3} archivos más")
+                        registro.info(f"    ... y {len(archivos_seguidores) - 3} archivos más")
                 
                 # Mostrar seguidos
                 carpeta_seguidos = os.path.join(carpeta_usuario, "seguidos")
                 if os.path.exists(carpeta_seguidos):
                     archivos_seguidos = [f for f in os.listdir(carpeta_seguidos) if f.endswith('_seguidos.json')]
-                    print(f"  📤 Seguidos ({len(archivos_seguidos)} archivos):")
+                    registro.info(f"  📤 Seguidos ({len(archivos_seguidos)} archivos):")
                     for archivo in sorted(archivos_seguidos)[-3:]:  # Mostrar últimos 3
                         # Extraer timestamp del nombre del archivo de forma más robusta
                         partes = archivo.rsplit('_', 1)  # Separar desde el final
                         if len(partes) > 0:
                             timestamp = partes[0].replace('_seguidos', '')
-                            print(f"    📄 {timestamp}")
+                            registro.info(f"    📄 {timestamp}")
                     if len(archivos_seguidos) > 3:
-                        print(f"    ... y {len(archivos_seguidos) - 3} archivos más")
+                        registro.info(f"    ... y {len(archivos_seguidos) - 3} archivos más")
                 
                 # Mostrar reportes
                 carpeta_reportes = os.path.join(carpeta_usuario, "reportes")
                 if os.path.exists(carpeta_reportes):
                     archivos_reportes = [f for f in os.listdir(carpeta_reportes) if f.endswith('_reporte.json')]
-                    print(f"  📊 Reportes ({len(archivos_reportes)} archivos):")
+                    registro.info(f"  📊 Reportes ({len(archivos_reportes)} archivos):")
                     for archivo in sorted(archivos_reportes)[-3:]:  # Mostrar últimos 3
                         # Extraer timestamp del nombre del archivo de forma más robusta
                         partes = archivo.rsplit('_', 1)  # Separar desde el final
                         if len(partes) > 0:
                             timestamp = partes[0].replace('_reporte', '')
-                            print(f"    📄 {timestamp}")
+                            registro.info(f"    📄 {timestamp}")
                     if len(archivos_reportes) > 3:
-                        print(f"    ... y {len(archivos_reportes) - 3} archivos más")
+                        registro.info(f"    ... y {len(archivos_reportes) - 3} archivos más")
                 
                 # Mostrar sesiones
                 carpeta_sesiones = os.path.join(carpeta_usuario, "sesiones")
                 if os.path.exists(carpeta_sesiones):
                     archivos_sesiones = [f for f in os.listdir(carpeta_sesiones) if f.endswith('_session')]
                     if archivos_sesiones:
-                        print(f"  🔐 Sesiones: {len(archivos_sesiones)} archivo(s)")
+                        registro.info(f"  🔐 Sesiones: {len(archivos_sesiones)} archivo(s)")
             
-            print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+            registro.info(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al mostrar estructura: {e}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al mostrar estructura: {e}{Style.RESET_ALL}")
 
     def limpiar_datos_monitoreo(self) -> None:
         """Limpia todos los datos de monitoreo"""
@@ -1430,102 +3110,253 @@ class InstagramMonitor:
             if os.path.exists(self.directorio_datos):
                 shutil.rmtree(self.directorio_datos)
                 os.makedirs(self.directorio_datos)
-                print(f"{Fore.GREEN}✅ Datos de monitoreo limpiados correctamente{Style.RESET_ALL}")
+                self.sesiones = GestorSesiones(self.directorio_datos)
+                registro.info(f"{Fore.GREEN}✅ Datos de monitoreo limpiados correctamente{Style.RESET_ALL}")
             else:
-                print(f"{Fore.YELLOW}⚠️ No hay datos para limpiar{Style.RESET_ALL}")
+                registro.warning(f"{Fore.YELLOW}⚠️ No hay datos para limpiar{Style.RESET_ALL}")
             
         except Exception as e:
-            print(f"{Fore.RED}❌ Error al limpiar datos: {e}{Style.RESET_ALL}")
+            registro.error(f"{Fore.RED}❌ Error al limpiar datos: {e}{Style.RESET_ALL}")
     
-    def encontrar_seguidores_mutuos(self, username1: str, username2: str) -> None:
+    def _mostrar_lista_usuarios(self, username: str, nombre: str, usuarios: Set[str]) -> Optional[str]:
+        """
+        Muestra los primeros usuarios de una lista y guarda la lista completa en un archivo
+        
+        Args:
+            username: Usuario en cuya carpeta de reportes se guarda la lista
+            nombre: Nombre descriptivo de la lista
+            usuarios: Conjunto de usuarios
+            
+        Returns:
+            Optional[str]: Ruta del archivo con la lista completa, si hizo falta crearlo
+        """
+        visibles, restantes = truncar_lista(sorted(usuarios), config.MAX_USUARIOS_MOSTRAR)
+        for usuario in visibles:
+            registro.info(f"  • {usuario}")
+        
+        if not restantes:
+            return None
+        
+        try:
+            carpetas = self.crear_estructura_usuario(limpiar_username(username))
+            ruta_archivo = os.path.join(carpetas["reportes"], f"{self.generar_timestamp()}_{nombre}.txt")
+            escribir_atomico(ruta_archivo, "\n".join(sorted(usuarios)) + "\n")
+            registro.info(f"  ... y {restantes} más (lista completa en {ruta_archivo})")
+            return ruta_archivo
+        except Exception as e:
+            registro.warning(f"{Fore.YELLOW}⚠️ No se pudo guardar la lista completa: {str(e)}{Style.RESET_ALL}")
+            return None
+    
+    def _obtener_perfil(self, username: str):
+        """
+        Obtiene el perfil de un usuario mostrando el motivo si no es accesible
+        
+        Args:
+            username: Nombre de usuario
+            
+        Returns:
+            instaloader.Profile o None si no se pudo obtener
+        """
+        try:
+            return instaloader.Profile.from_username(self.loader.context, username)
+        except instaloader.exceptions.ProfileNotExistsException:
+            registro.error(f"{Fore.RED}❌ El perfil '{username}' no existe{Style.RESET_ALL}")
+        except instaloader.exceptions.LoginRequiredException as e:
+            self._revisar_error_autenticacion(e)
+            registro.error(f"{Fore.RED}❌ Se requiere iniciar sesión para acceder a este perfil{Style.RESET_ALL}")
+        except Exception as e:
+            registro.error(f"{Fore.RED}❌ Error al obtener el perfil: {str(e)}{Style.RESET_ALL}")
+        return None
+    
+    def encontrar_seguidores_mutuos(self, username1: str, username2: str) -> Optional["resultados.ResultadoMutuos"]:
         """
         Encuentra seguidores mutuos entre dos perfiles
         
+        Descarga primero los seguidores del perfil más pequeño y después recorre los
+        del más grande sin guardarlos, quedándose solo con las coincidencias. La
+        memoria depende del perfil pequeño y el recorrido se detiene en cuanto
+        todos sus seguidores han aparecido
+        
         Args:
             username1: Primer perfil
             username2: Segundo perfil
+            
+        Returns:
+            Optional[ResultadoMutuos]: Mutuos encontrados (parcial si el recorrido no terminó) o None si no se pudo empezar
         """
         if not self.sesion_activa and not self.modo_publico:
-            print(f"{Fore.RED}❌ Necesitas iniciar sesión o activar modo público primero{Style.RESET_ALL}")
-            return
+            registro.error(f"{Fore.RED}❌ Necesitas iniciar sesión o activar modo público primero{Style.RESET_ALL}")
+            return None
         
-        print(f"\n{Fore.CYAN}🔍 Analizando seguidores mutuos entre @{username1} y @{username2}...{Style.RESET_ALL}")
+        username1 = limpiar_username(username1)
+        username2 = limpiar_username(username2)
+        registro.info(f"\n{Fore.CYAN}🔍 Analizando seguidores mutuos entre @{username1} y @{username2}...{Style.RESET_ALL}")
         
         if self.modo_publico:
-            print(f"{Fore.YELLOW}🌐 Modo público: verificando que ambos perfiles sean públicos...{Style.RESET_ALL}")
+            registro.info(f"{Fore.YELLOW}🌐 Modo público: verificando que ambos perfiles sean públicos...{Style.RESET_ALL}")
         
-        # Obtener seguidores de ambos perfiles
-        seguidores1 = self.obtener_seguidores(username1)
-        if not seguidores1:
-            return
+        perfil1 = self._obtener_perfil(username1)
+        if perfil1 is None:
+            return None
+        perfil2 = self._obtener_perfil(username2)
+        if perfil2 is None:
+            return None
         
-        seguidores2 = self.obtener_seguidores(username2)
-        if not seguidores2:
-            return
+        # El perfil con menos seguidores se descarga entero; el otro se recorre en streaming
+        if perfil1.followers <= perfil2.followers:
+            pequeno, grande = perfil1, perfil2
+        else:
+            pequeno, grande = perfil2, perfil1
+        registro.info(f"  @{pequeno.username}: {formatear_numero(pequeno.followers)} seguidores (se descargan)")
+        registro.info(f"  @{grande.username}: {formatear_numero(grande.followers)} seguidores (se recorren buscando coincidencias)")
         
-        # Encontrar intersección
-        seguidores_mutuos = seguidores1.intersection(seguidores2)
+        # La descarga deja guardados parciales en la carpeta de la cuenta
+        bloqueo = self._bloquear_cuenta(pequeno.username)
+        if bloqueo is None:
+            return None
+        try:
+            seguidores_pequeno = self.obtener_seguidores(pequeno.username)
+        finally:
+            self._vaciar_escritor()
+            bloqueo.liberar()
+        if not seguidores_pequeno:
+            return None
         
-        print(f"\n{Fore.CYAN}{'='*60}")
-        print("👥 SEGUIDORES MUTUOS")
-        print(f"{'='*60}{Style.RESET_ALL}")
-        print(f"@{username1}: {len(seguidores1)} seguidores")
-        print(f"@{username2}: {len(seguidores2)} seguidores")
-        print(f"{Fore.GREEN}👥 Seguidores mutuos: {len(seguidores_mutuos)}{Style.RESET_ALL}")
+        total_grande = grande.followers
+        if total_grande > 10000:
+            if not self._confirmar("recorrer_grande", f"@{grande.username} tiene {formatear_numero(total_grande)} seguidores. "
+                                   f"Recorrerlos puede tardar mucho tiempo. ¿Continuar?"):
+                registro.warning(f"{Fore.YELLOW}⚠️ Operación cancelada por el usuario{Style.RESET_ALL}")
+                return None
+        
+        carpetas = self.crear_estructura_usuario(username1)
+        ruta_mutuos = os.path.join(carpetas["reportes"],
+                                   f"{self.generar_timestamp()}_mutuos_{username1}_{username2}.txt")
+        seguidores_mutuos = set()
+        procesados = 0
+        completo = False
+        
+        try:
+            with open(ruta_mutuos, 'w', encoding='utf-8') as archivo_mutuos:
+                for follower in grande.get_followers():
+                    procesados += 1
+                    nombre = follower.username
+                    if nombre in seguidores_pequeno and nombre not in seguidores_mutuos:
+                        seguidores_mutuos.add(nombre)
+                        archivo_mutuos.write(f"{nombre}\n")
+                        archivo_mutuos.flush()
+                        
+                        # Ya han aparecido todos los seguidores del perfil pequeño
+                        if len(seguidores_mutuos) == len(seguidores_pequeno):
+                            registro.info(f"\n{Fore.GREEN}✅ Todos los seguidores de @{pequeno.username} encontrados; "
+                                          f"se detiene el recorrido en {formatear_numero(procesados)}{Style.RESET_ALL}")
+                            break
+                    
+                    if procesados % config_seguridad.ELEMENTS_BETWEEN_DELAYS == 0:
+                        self._wait_if_needed()
+                    
+                    if procesados % config_seguridad.ELEMENTS_BEFORE_LONG_PAUSE == 0:
+                        registro.debug(f"{Fore.CYAN}  📊 Recorridos {formatear_numero(procesados)} seguidores - Pausa de seguridad...{Style.RESET_ALL}")
+                        self._dormir(random.uniform(config_seguridad.LONG_PAUSE_MIN, config_seguridad.LONG_PAUSE_MAX))
+                    
+                    self._progreso('mutuos', procesados, max(total_grande, procesados))
+                completo = True
+        except KeyboardInterrupt:
+            registro.warning(f"\n{Fore.YELLOW}⚠️ Recorrido interrumpido por el usuario{Style.RESET_ALL}")
+        except instaloader.exceptions.ConnectionException as e:
+            self._revisar_error_autenticacion(e)
+            registro.error(f"\n{Fore.RED}❌ Error de conexión: {str(e)}{Style.RESET_ALL}")
+            self._handle_rate_limit_error(str(e))
+        except Exception as e:
+            registro.error(f"\n{Fore.RED}❌ Error durante el recorrido: {str(e)}{Style.RESET_ALL}")
+        finally:
+            terminar_linea()
+        
+        registro.info(f"\n{Fore.CYAN}{'='*60}")
+        registro.info("👥 SEGUIDORES MUTUOS")
+        registro.info(f"{'='*60}{Style.RESET_ALL}")
+        registro.info(f"@{pequeno.username}: {len(seguidores_pequeno)} seguidores")
+        registro.info(f"@{grande.username}: {formatear_numero(total_grande)} seguidores "
+                      f"({formatear_numero(procesados)} recorridos)")
+        registro.info(f"{Fore.GREEN}👥 Seguidores mutuos: {len(seguidores_mutuos)}{Style.RESET_ALL}")
+        if not completo:
+            registro.warning(f"{Fore.YELLOW}⚠️ Resultado parcial: el recorrido no terminó{Style.RESET_ALL}")
         
         if seguidores_mutuos:
-            print(f"\n{Fore.YELLOW}Lista de seguidores mutuos:{Style.RESET_ALL}")
-            for seguidor in sorted(seguidores_mutuos):
-                print(f"  • {seguidor}")
+            registro.info(f"\n{Fore.YELLOW}Lista de seguidores mutuos:{Style.RESET_ALL}")
+            visibles, restantes = truncar_lista(sorted(seguidores_mutuos), config.MAX_USUARIOS_MOSTRAR)
+            for usuario in visibles:
+                registro.info(f"  • {usuario}")
+            if restantes:
+                registro.info(f"  ... y {restantes} más")
+            registro.info(f"  Lista completa en {ruta_mutuos}")
         else:
-            print(f"\n{Fore.YELLOW}ℹ️ No se encontraron seguidores mutuos{Style.RESET_ALL}")
+            registro.info(f"\n{Fore.YELLOW}ℹ️ No se encontraron seguidores mutuos{Style.RESET_ALL}")
         
-        print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        registro.info(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        return resultados.ResultadoMutuos(username1, username2, seguidores_mutuos, procesados, completo, ruta_mutuos)
     
-    def analizar_conexiones_seguidores(self, username: str) -> None:
+    def analizar_conexiones_seguidores(self, username: str, actualizar: bool = False) -> Optional["resultados.ResultadoConexiones"]:
         """
         Analiza las conexiones entre los seguidores y seguidos del perfil
+        Si el perfil ya se ha monitoreado se usan las vistas de reciprocidad guardadas
         
         Args:
             username: Perfil a analizar
+            actualizar: Descargar de nuevo las listas aunque haya vistas guardadas
+            
+        Returns:
+            Optional[ResultadoConexiones]: Conexiones mutuas o None si no se pudieron obtener las listas
         """
+        username = limpiar_username(username)
+        vistas = VistasReciprocidad(self.directorio_datos, username)
+        if not actualizar and vistas.existe:
+            self.mostrar_reciprocidad(username)
+            conteos = vistas.conteos()
+            return resultados.ResultadoConexiones(username, conteos["mutuos"] + conteos["solo_me_siguen"],
+                                       conteos["mutuos"] + conteos["solo_sigo"], set(vistas.vistas["mutuos"]), True)
+        
         if not self.sesion_activa and not self.modo_publico:
-            print(f"{Fore.RED}❌ Necesitas iniciar sesión primero{Style.RESET_ALL}")
-            return
+            registro.error(f"{Fore.RED}❌ Necesitas iniciar sesión primero{Style.RESET_ALL}")
+            return None
             
         if self.modo_publico:
-            print(f"{Fore.YELLOW}📖 Analizando en modo público - Solo perfiles públicos disponibles{Style.RESET_ALL}")
+            registro.info(f"{Fore.YELLOW}📖 Analizando en modo público - Solo perfiles públicos disponibles{Style.RESET_ALL}")
         
-        print(f"\n{Fore.CYAN}🔍 Analizando conexiones internas de @{username}...{Style.RESET_ALL}")
+        registro.info(f"\n{Fore.CYAN}🔍 Analizando conexiones internas de @{username}...{Style.RESET_ALL}")
         
-        # Obtener seguidores y seguidos
-        seguidores = self.obtener_seguidores(username)
-        if not seguidores:
-            return
-        
-        seguidos = self.obtener_seguidos(username)
-        if not seguidos:
-            return
+        # Obtener seguidores y seguidos (la descarga deja guardados parciales en la carpeta de la cuenta)
+        bloqueo = self._bloquear_cuenta(username)
+        if bloqueo is None:
+            return None
+        try:
+            seguidores = self.obtener_seguidores(username)
+            seguidos = self.obtener_seguidos(username) if seguidores else set()
+        finally:
+            self._vaciar_escritor()
+            bloqueo.liberar()
+        if not seguidores or not seguidos:
+            return None
         
         # Encontrar intersecciones
         sigue_a_seguidores = seguidores.intersection(seguidos)  # Usuarios que son seguidores Y seguidos
         
-        print(f"\n{Fore.CYAN}{'='*60}")
-        print("🔗 ANÁLISIS DE CONEXIONES INTERNAS")
-        print(f"{'='*60}{Style.RESET_ALL}")
-        print(f"@{username}:")
-        print(f"  📥 Seguidores: {len(seguidores)}")
-        print(f"  📤 Seguidos: {len(seguidos)}")
-        print(f"  {Fore.GREEN}🔄 Conexiones mutuas: {len(sigue_a_seguidores)}{Style.RESET_ALL}")
+        registro.info(f"\n{Fore.CYAN}{'='*60}")
+        registro.info("🔗 ANÁLISIS DE CONEXIONES INTERNAS")
+        registro.info(f"{'='*60}{Style.RESET_ALL}")
+        registro.info(f"@{username}:")
+        registro.info(f"  📥 Seguidores: {len(seguidores)}")
+        registro.info(f"  📤 Seguidos: {len(seguidos)}")
+        registro.info(f"  {Fore.GREEN}🔄 Conexiones mutuas: {len(sigue_a_seguidores)}{Style.RESET_ALL}")
         
         if sigue_a_seguidores:
-            print(f"\n{Fore.YELLOW}👥 Usuarios con conexión mutua (son seguidores Y seguidos):{Style.RESET_ALL}")
-            for usuario in sorted(sigue_a_seguidores):
-                print(f"  • {usuario}")
+            registro.info(f"\n{Fore.YELLOW}👥 Usuarios con conexión mutua (son seguidores Y seguidos):{Style.RESET_ALL}")
+            self._mostrar_lista_usuarios(username, "conexiones_mutuas", sigue_a_seguidores)
         
         # Calcular ratio de reciprocidad
         if len(seguidores) > 0:
             ratio_reciprocidad = (len(sigue_a_seguidores) / len(seguidores)) * 100
-            print(f"\n{Fore.BLUE}📊 Ratio de reciprocidad: {ratio_reciprocidad:.1f}%{Style.RESET_ALL}")
+            registro.info(f"\n{Fore.BLUE}📊 Ratio de reciprocidad: {ratio_reciprocidad:.1f}%{Style.RESET_ALL}")
         
-        print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        registro.info(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        return resultados.ResultadoConexiones(username, len(seguidores), len(seguidos), sigue_a_seguidores, False)
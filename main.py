@@ -8,9 +8,14 @@ Desarrollado para monitorear perfiles de Instagram de forma avanzada
 import os
 import sys
 import getpass
+import argparse
+import importlib.util
 from colorama import init, Fore, Style
 from instagram_monitor import InstagramMonitor
 from utils import confirmar_accion
+from historial import FILTROS
+from reciprocidad import VISTAS
+from cola_trabajo import DESCARTADO, EN_CURSO, PENDIENTE, TERMINADO
 
 # Inicializar colorama para colores en Windows
 init()
@@ -26,10 +31,9 @@ def verificar_dependencias():
     
     dependencias_faltantes = []
     
+    # find_spec comprueba que el módulo existe sin importarlo (instaloader es lento de cargar)
     for nombre, modulo in dependencias_requeridas.items():
-        try:
-            __import__(modulo)
-        except ImportError:
+        if importlib.util.find_spec(modulo) is None:
             dependencias_faltantes.append(nombre)
     
     if dependencias_faltantes:
@@ -65,7 +69,8 @@ def mostrar_menu_principal():
     print(f"{Fore.WHITE}3. {Fore.MAGENTA}Análisis de Conexiones")
     print(f"{Fore.WHITE}4. {Fore.CYAN}Ver Estado de la Sesión")
     print(f"{Fore.WHITE}5. {Fore.YELLOW}🌐 Modo Solo Perfiles Públicos")
-    print(f"{Fore.WHITE}6. {Fore.RED}Salir{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}6. {Fore.MAGENTA}Herramientas de Rendimiento")
+    print(f"{Fore.WHITE}7. {Fore.RED}Salir{Style.RESET_ALL}")
     print("-" * 40)
 
 def mostrar_menu_sesiones():
@@ -96,6 +101,16 @@ def mostrar_menu_conexiones():
     print(f"{Fore.WHITE}3. {Fore.RED}Volver al Menú Principal{Style.RESET_ALL}")
     print("-" * 40)
 
+def mostrar_menu_rendimiento():
+    """Muestra el menú de herramientas de rendimiento"""
+    print(f"\n{Fore.YELLOW}{Style.BRIGHT}HERRAMIENTAS DE RENDIMIENTO:{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}1. {Fore.GREEN}Grabar Respuestas de Instagram")
+    print(f"{Fore.WHITE}2. {Fore.BLUE}Detener Grabación")
+    print(f"{Fore.WHITE}3. {Fore.MAGENTA}Reproducir Grabación (sin red)")
+    print(f"{Fore.WHITE}4. {Fore.CYAN}Simular Políticas de Límites")
+    print(f"{Fore.WHITE}5. {Fore.RED}Volver al Menú Principal{Style.RESET_ALL}")
+    print("-" * 40)
+
 def manejar_sesiones(monitor):
     """Maneja el menú de sesiones"""
     while True:
@@ -169,6 +184,58 @@ def manejar_conexiones(monitor):
         else:
             print(f"{Fore.RED}Opción no válida. Intenta de nuevo.{Style.RESET_ALL}")
 
+def manejar_rendimiento(monitor):
+    """Maneja el menú de herramientas de rendimiento"""
+    from grabacion import listar_grabaciones
+    
+    while True:
+        mostrar_menu_rendimiento()
+        opcion = input(f"{Fore.CYAN}Selecciona una opción: {Style.RESET_ALL}")
+        
+        if opcion == "1":
+            nombre = input(f"{Fore.CYAN}Nombre de la grabación: {Style.RESET_ALL}").strip()
+            if nombre:
+                monitor.activar_grabacion(nombre)
+            else:
+                print(f"{Fore.RED}❌ Debes ingresar un nombre{Style.RESET_ALL}")
+            
+        elif opcion == "2":
+            monitor.detener_grabacion()
+            
+        elif opcion == "3":
+            grabaciones = listar_grabaciones()
+            if not grabaciones:
+                print(f"{Fore.RED}❌ No hay grabaciones disponibles{Style.RESET_ALL}")
+                continue
+            for i, nombre in enumerate(grabaciones, 1):
+                print(f"{i}. {nombre}")
+            seleccion = input(f"{Fore.CYAN}Selecciona una grabación (número): {Style.RESET_ALL}")
+            escala = input(f"{Fore.CYAN}Escala de tiempo (1 = original, 0 = sin esperas) [1]: {Style.RESET_ALL}").strip()
+            try:
+                nombre = grabaciones[int(seleccion) - 1]
+                monitor.activar_reproduccion(nombre, float(escala) if escala else 1.0)
+            except (ValueError, IndexError):
+                print(f"{Fore.RED}❌ Entrada inválida{Style.RESET_ALL}")
+            
+        elif opcion == "4":
+            import simulador_limites
+            cuenta = input(f"{Fore.CYAN}Cuenta con datos guardados (vacío para indicar tamaños): {Style.RESET_ALL}").strip()
+            if cuenta:
+                simulador_limites.main(["--cuenta", cuenta])
+            else:
+                seguidores = input(f"{Fore.CYAN}Seguidores a recorrer: {Style.RESET_ALL}").strip() or "0"
+                seguidos = input(f"{Fore.CYAN}Seguidos a recorrer: {Style.RESET_ALL}").strip() or "0"
+                if seguidores.isdigit() and seguidos.isdigit():
+                    simulador_limites.main(["--seguidores", seguidores, "--seguidos", seguidos])
+                else:
+                    print(f"{Fore.RED}❌ Entrada inválida{Style.RESET_ALL}")
+            
+        elif opcion == "5":
+            break
+            
+        else:
+            print(f"{Fore.RED}Opción no válida. Intenta de nuevo.{Style.RESET_ALL}")
+
 def manejar_modo_publico(monitor):
     """Maneja el modo solo perfiles públicos"""
     print(f"\n{Fore.CYAN}🌐 MODO SOLO PERFILES PÚBLICOS{Style.RESET_ALL}")
@@ -238,6 +305,281 @@ def manejar_modo_publico(monitor):
             # Llamar recursivamente para mostrar las opciones
             manejar_modo_publico(monitor)
 
+def comando_monitorear(args, monitor):
+    """Monitorea varias cuentas sin preguntas (las decisiones siguen api.DECISIONES)"""
+    if not monitor.cargar_sesion(args.sesion):
+        return 1
+    from api import Monitor  # asyncio solo se carga para estos comandos
+    cliente = Monitor(monitor=monitor, decidir={"esperar_limite": not args.sin_esperas})
+    resultados = [cliente.monitorear(cuenta, args.forzar) for cuenta in args.cuentas]
+    return 0 if all(resultado.exito for resultado in resultados) else 1
+
+def comando_reporte(args, monitor):
+    """Muestra el último reporte guardado (sin red)"""
+    monitor.mostrar_ultimo_reporte(args.usuario)
+    return 0
+
+def comando_estructura(args, monitor):
+    """Muestra la estructura de datos guardados (sin red)"""
+    monitor.mostrar_estructura_archivos()
+    return 0
+
+def comando_linea_tiempo(args, monitor):
+    """Muestra los intervalos de membresía de un usuario (sin red)"""
+    return 0 if monitor.mostrar_linea_tiempo(args.cuenta, args.usuario, args.reconstruir) else 1
+
+def comando_diff(args, monitor):
+    """Compara dos momentos del historial de una cuenta (sin red)"""
+    return 0 if monitor.mostrar_diferencia(args.cuenta, args.desde, args.hasta, args.solo, args.guardar) else 1
+
+def comando_analitica(args, monitor):
+    """Muestra la analítica de abandono y permanencia de una cuenta (sin red)"""
+    return 0 if monitor.mostrar_analitica(args.cuenta, args.periodo, args.dias_baja,
+                                          args.exportar, args.reconstruir) else 1
+
+def comando_solapamiento(args, monitor):
+    """Muestra el solapamiento de audiencias entre cuentas monitoreadas (sin red)"""
+    return 0 if monitor.mostrar_solapamiento(args.cuentas, args.exacto, args.exportar) else 1
+
+def comando_audiencia(args, monitor):
+    """Consulta el índice invertido de audiencias (sin red)"""
+    return 0 if monitor.consultar_audiencia(args.todas, args.alguna, args.minimo, args.top,
+                                            args.usuario, args.reconstruir, args.exportar) else 1
+
+def comando_reciprocidad(args, monitor):
+    """Muestra las vistas de reciprocidad guardadas de una cuenta (sin red)"""
+    return 0 if monitor.mostrar_reciprocidad(args.cuenta, args.vista, args.historial, args.exportar) else 1
+
+def comando_puerta(args, monitor):
+    """Resume las decisiones de la puerta de conteo (sin red)"""
+    return 0 if monitor.mostrar_resumen_puerta(args.cuenta) else 1
+
+def comando_sondear(args, monitor):
+    """Sondea los contadores de varias cuentas cada pocos minutos"""
+    if args.sesion and not monitor.cargar_sesion(args.sesion):
+        return 1
+    monitor.sondear_contadores(args.cuentas, args.intervalo, args.rondas)
+    return 0
+
+def comando_contadores(args, monitor):
+    """Muestra la serie de contadores de una cuenta (sin red)"""
+    return 0 if monitor.mostrar_contadores(args.cuenta, args.desde, args.hasta, args.agrupar) else 1
+
+def comando_enriquecer(args, monitor):
+    """Consulta los perfiles pendientes de la cola de enriquecimiento"""
+    if args.sesion and not monitor.cargar_sesion(args.sesion):
+        return 1
+    return 0 if monitor.enriquecer_pendientes(args.presupuesto) else 1
+
+def comando_vecindario(args, monitor):
+    """Explora los seguidores de los seguidores de una cuenta dentro de un presupuesto"""
+    if not monitor.cargar_sesion(args.sesion):
+        return 1
+    return 0 if monitor.explorar_vecindario(args.cuenta, args.profundidad, args.presupuesto, args.reiniciar) else 1
+
+def comando_grafo(args, monitor):
+    """Consulta el grafo del vecindario explorado (sin red)"""
+    return 0 if monitor.mostrar_grafo(args.cuenta, args.usuario, args.comparar, args.top) else 1
+
+def comando_importar(args, monitor):
+    """Importa la descarga de datos de Instagram como snapshot (sin red)"""
+    return 0 if monitor.importar_descarga(args.ruta, args.cuenta, args.fecha) else 1
+
+def comando_feed(args, monitor):
+    """Escribe los eventos del registro de cambios como JSON por líneas (sin red)"""
+    return 0 if monitor.leer_feed(args.consumidor, args.desde, args.maximo, args.seguir) else 1
+
+def comando_servidor(args, monitor):
+    """Sirve los datos guardados por HTTP para paneles y scripts (sin red)"""
+    return 0 if monitor.servir_api(args.host, args.puerto) else 1
+
+def comando_encolar(args, monitor):
+    """Añade cuentas a la cola de trabajo compartida (sin red)"""
+    return 0 if monitor.encolar_trabajos(args.cuentas, args.prioridad, args.forzar) else 1
+
+def comando_trabajador(args, monitor):
+    """Procesa trabajos de la cola compartida sin preguntas (las decisiones siguen api.DECISIONES)"""
+    if not monitor.cargar_sesion(args.sesion):
+        return 1
+    from api import Monitor  # asyncio solo se carga para estos comandos
+    cliente = Monitor(monitor=monitor, decidir={"esperar_limite": not args.sin_esperas})
+    conteos = cliente.trabajar(args.nombre, args.maximo, args.esperar)
+    return 0 if not conteos["fallidos"] else 1
+
+def comando_cola(args, monitor):
+    """Muestra el estado de la cola de trabajo compartida (sin red)"""
+    return 0 if monitor.mostrar_cola(args.estado, args.reintentar) else 1
+
+def crear_parser():
+    """
+    Crea el parser de los comandos de línea
+    
+    Returns:
+        argparse.ArgumentParser: Parser con un subcomando por operación
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="SeeYouInstagram - sin argumentos abre el menú interactivo"
+    )
+    subparsers = parser.add_subparsers(dest="comando")
+    
+    sub = subparsers.add_parser("monitorear", help="Monitorear cuentas sin menú ni preguntas (para cron o scripts)")
+    sub.add_argument("cuentas", nargs="+", help="Cuentas a monitorear")
+    sub.add_argument("--forzar", action="store_true", help="Descargar las listas aunque la puerta de conteo no vea cambios")
+    sub.add_argument("--sin-esperas", action="store_true", help="Si Instagram limita las peticiones, terminar en vez de esperar")
+    sub.add_argument("--sesion", metavar="USUARIO", help="Usar la sesión guardada de este usuario")
+    sub.set_defaults(funcion=comando_monitorear)
+    
+    sub = subparsers.add_parser("reporte", help="Mostrar el último reporte de un usuario")
+    sub.add_argument("usuario", nargs="?", help="Usuario monitoreado (si se omite se pregunta)")
+    sub.set_defaults(funcion=comando_reporte)
+    
+    sub = subparsers.add_parser("estructura", help="Mostrar la estructura de archivos de monitoreo")
+    sub.set_defaults(funcion=comando_estructura)
+    
+    sub = subparsers.add_parser("linea-tiempo", help="Mostrar cuándo un usuario siguió o dejó de seguir una cuenta")
+    sub.add_argument("cuenta", help="Cuenta monitoreada")
+    sub.add_argument("usuario", help="Usuario a consultar")
+    sub.add_argument("--reconstruir", action="store_true",
+                     help="Regenerar el índice a partir de todos los snapshots guardados")
+    sub.set_defaults(funcion=comando_linea_tiempo)
+    
+    sub = subparsers.add_parser("diff", help="Comparar dos momentos del historial de una cuenta")
+    sub.add_argument("cuenta", help="Cuenta monitoreada")
+    sub.add_argument("desde", help="Fecha inicial (YYYY-MM-DD o 'YYYY-MM-DD HH:MM')")
+    sub.add_argument("hasta", help="Fecha final (YYYY-MM-DD o 'YYYY-MM-DD HH:MM')")
+    sub.add_argument("--solo", choices=list(FILTROS), help="Mostrar solo un tipo de cambio")
+    sub.add_argument("--guardar", metavar="ARCHIVO", help="Guardar el reporte en JSON")
+    sub.set_defaults(funcion=comando_diff)
+    
+    sub = subparsers.add_parser("analitica", help="Tasa de abandono y permanencia de los seguidores")
+    sub.add_argument("cuenta", help="Cuenta monitoreada")
+    sub.add_argument("--periodo", choices=["diaria", "semanal"], default="diaria")
+    sub.add_argument("--dias-baja", type=int, default=30,
+                     help="Ventana para contar bajas tempranas (por defecto: 30 días)")
+    sub.add_argument("--exportar", metavar="ARCHIVO", help="Exportar la serie a .csv o .jsonl")
+    sub.add_argument("--reconstruir", action="store_true",
+                     help="Recalcular los agregados a partir de todos los snapshots")
+    sub.set_defaults(funcion=comando_analitica)
+    
+    sub = subparsers.add_parser("solapamiento", help="Seguidores en común entre cuentas monitoreadas")
+    sub.add_argument("cuentas", nargs="*", help="Cuentas a comparar (por defecto, todas)")
+    sub.add_argument("--exacto", action="store_true", help="Comparar listas completas aunque sean grandes")
+    sub.add_argument("--exportar", metavar="ARCHIVO", help="Exportar todas las parejas a .csv o .jsonl")
+    sub.set_defaults(funcion=comando_solapamiento)
+    
+    sub = subparsers.add_parser("audiencia", help="Qué usuarios siguen a qué cuentas monitoreadas")
+    grupo = sub.add_mutually_exclusive_group()
+    grupo.add_argument("--todas", nargs="+", metavar="CUENTA", help="Usuarios que siguen a todas estas cuentas")
+    grupo.add_argument("--alguna", nargs="+", metavar="CUENTA", help="Usuarios que siguen a alguna de estas cuentas")
+    grupo.add_argument("--minimo", type=int, metavar="K", help="Usuarios que siguen a K o más cuentas")
+    grupo.add_argument("--top", type=int, metavar="N", help="Los N usuarios que siguen a más cuentas")
+    grupo.add_argument("--usuario", help="Cuentas monitoreadas que sigue un usuario")
+    sub.add_argument("--exportar", metavar="ARCHIVO", help="Guardar la lista completa en un archivo de texto")
+    sub.add_argument("--reconstruir", action="store_true",
+                     help="Regenerar el índice con el último snapshot de cada cuenta")
+    sub.set_defaults(funcion=comando_audiencia)
+    
+    sub = subparsers.add_parser("reciprocidad", help="Mutuos, quién no me sigue de vuelta y a quién no sigo")
+    sub.add_argument("cuenta", help="Cuenta monitoreada")
+    sub.add_argument("--vista", choices=list(VISTAS), help="Mostrar solo una vista")
+    sub.add_argument("--historial", action="store_true", help="Mostrar la evolución de los tamaños")
+    sub.add_argument("--exportar", metavar="ARCHIVO", help="Exportar las vistas a .csv, .jsonl o .txt")
+    sub.set_defaults(funcion=comando_reciprocidad)
+    
+    sub = subparsers.add_parser("puerta", help="Rastreos evitados por la puerta de conteo")
+    sub.add_argument("cuenta", nargs="?", help="Cuenta monitoreada (por defecto, todas)")
+    sub.set_defaults(funcion=comando_puerta)
+    
+    sub = subparsers.add_parser("sondear", help="Guardar solo los contadores de varias cuentas cada pocos minutos")
+    sub.add_argument("cuentas", nargs="+", help="Cuentas a sondear")
+    sub.add_argument("--intervalo", type=float, default=5, help="Minutos entre rondas (por defecto: 5)")
+    sub.add_argument("--rondas", type=int, help="Número de rondas (por defecto, hasta Ctrl+C)")
+    sub.add_argument("--sesion", metavar="USUARIO", help="Usar la sesión guardada de este usuario")
+    sub.set_defaults(funcion=comando_sondear)
+    
+    sub = subparsers.add_parser("contadores", help="Serie de contadores guardada de una cuenta")
+    sub.add_argument("cuenta", help="Cuenta sondeada")
+    sub.add_argument("--desde", help="Fecha inicial (YYYY-MM-DD o 'YYYY-MM-DD HH:MM')")
+    sub.add_argument("--hasta", help="Fecha final (YYYY-MM-DD o 'YYYY-MM-DD HH:MM')")
+    sub.add_argument("--agrupar", choices=["hora", "dia"], help="Mostrar la última muestra de cada hora o día")
+    sub.set_defaults(funcion=comando_contadores)
+    
+    sub = subparsers.add_parser("enriquecer", help="Consultar los perfiles de los usuarios nuevos pendientes")
+    sub.add_argument("--presupuesto", type=int, help="Perfiles a consultar como máximo (por defecto: ENRIQUECIMIENTO_PRESUPUESTO)")
+    sub.add_argument("--sesion", metavar="USUARIO", help="Usar la sesión guardada de este usuario")
+    sub.set_defaults(funcion=comando_enriquecer)
+    
+    sub = subparsers.add_parser("vecindario", help="Explorar seguidores de seguidores por tandas, continuando la anterior")
+    sub.add_argument("cuenta", help="Cuenta desde la que se explora")
+    sub.add_argument("--profundidad", type=int, help="Niveles que se expanden al empezar (por defecto: GRAFO_PROFUNDIDAD)")
+    sub.add_argument("--presupuesto", type=int, help="Peticiones de esta ejecución (por defecto: GRAFO_PRESUPUESTO)")
+    sub.add_argument("--reiniciar", action="store_true", help="Borrar la exploración guardada y empezar de nuevo")
+    sub.add_argument("--sesion", metavar="USUARIO", help="Usar la sesión guardada de este usuario")
+    sub.set_defaults(funcion=comando_vecindario)
+    
+    sub = subparsers.add_parser("grafo", help="Grados y seguidores comunes en el vecindario explorado")
+    sub.add_argument("cuenta", help="Cuenta explorada")
+    sub.add_argument("--usuario", help="Mostrar grados y seguidos de este usuario")
+    sub.add_argument("--comparar", nargs=2, metavar=("A", "B"), help="Seguidores comunes de dos usuarios")
+    sub.add_argument("--top", type=int, default=10, help="Usuarios que siguen a más cuentas exploradas (por defecto: 10)")
+    sub.set_defaults(funcion=comando_grafo)
+    
+    sub = subparsers.add_parser("importar", help="Crear un snapshot a partir de la descarga de datos de Instagram")
+    sub.add_argument("ruta", help="Carpeta o .zip de la exportación (JSON o HTML)")
+    sub.add_argument("--cuenta", help="Cuenta de la exportación (por defecto, la que indique personal_information.json)")
+    sub.add_argument("--fecha", help="Fecha del snapshot (por defecto, la de la exportación)")
+    sub.set_defaults(funcion=comando_importar)
+    
+    sub = subparsers.add_parser("feed", help="Leer el registro de altas, bajas y cambios de nombre de todas las cuentas")
+    sub.add_argument("--consumidor", help="Continuar desde el offset guardado de este consumidor y guardar el nuevo")
+    sub.add_argument("--desde", type=int, help="Offset inicial (por defecto, el del consumidor o 0)")
+    sub.add_argument("--maximo", type=int, help="Número máximo de eventos")
+    sub.add_argument("--seguir", action="store_true", help="Esperar eventos nuevos hasta Ctrl+C (como tail -f)")
+    sub.set_defaults(funcion=comando_feed)
+    
+    sub = subparsers.add_parser("servidor", help="API HTTP de solo lectura sobre snapshots, reportes y diferencias")
+    sub.add_argument("--host", help="Dirección en la que escuchar (por defecto: API_HOST)")
+    sub.add_argument("--puerto", type=int, help="Puerto (por defecto: API_PUERTO)")
+    sub.set_defaults(funcion=comando_servidor)
+    
+    sub = subparsers.add_parser("encolar", help="Añadir cuentas a la cola de trabajo compartida entre trabajadores")
+    sub.add_argument("cuentas", nargs="+", help="Cuentas a monitorear")
+    sub.add_argument("--prioridad", type=int, default=0, help="Los trabajos de mayor prioridad se toman antes (por defecto: 0)")
+    sub.add_argument("--forzar", action="store_true", help="Descargar las listas aunque la puerta de conteo no vea cambios")
+    sub.set_defaults(funcion=comando_encolar)
+    
+    sub = subparsers.add_parser("trabajador", help="Procesar trabajos de la cola compartida con la sesión de esta máquina")
+    sub.add_argument("--sesion", metavar="USUARIO", help="Usar la sesión guardada de este usuario")
+    sub.add_argument("--nombre", help="Identificador del trabajador (por defecto: máquina:pid)")
+    sub.add_argument("--maximo", type=int, help="Trabajos a procesar como máximo")
+    sub.add_argument("--esperar", action="store_true", help="Con la cola vacía, seguir esperando trabajos nuevos")
+    sub.add_argument("--sin-esperas", action="store_true", help="Si Instagram limita las peticiones, fallar el trabajo en vez de esperar")
+    sub.set_defaults(funcion=comando_trabajador)
+    
+    sub = subparsers.add_parser("cola", help="Mostrar el estado de la cola de trabajo compartida")
+    sub.add_argument("--estado", choices=[PENDIENTE, EN_CURSO, TERMINADO, DESCARTADO], help="Listar solo los trabajos en este estado")
+    sub.add_argument("--reintentar", action="store_true", help="Devolver a la cola los trabajos descartados")
+    sub.set_defaults(funcion=comando_cola)
+    
+    return parser
+
+def ejecutar_comando(argv):
+    """
+    Ejecuta un comando de línea sin abrir el menú interactivo
+    
+    Args:
+        argv: Argumentos de línea de comandos (sin el nombre del programa)
+        
+    Returns:
+        int: Código de salida
+    """
+    args = crear_parser().parse_args(argv)
+    if not getattr(args, "funcion", None):
+        crear_parser().print_help()
+        return 1
+    return args.funcion(args, InstagramMonitor())
+
 def main():
     """Función principal del programa"""
     mostrar_logo()
@@ -271,6 +613,10 @@ def main():
             manejar_modo_publico(monitor)
             
         elif opcion == "6":
+            manejar_rendimiento(monitor)
+            
+        elif opcion == "7":
+            monitor.detener_grabacion()
             print(f"{Fore.GREEN}¡Gracias por usar SeeYouInstagram! 👋{Style.RESET_ALL}")
             break
             
@@ -279,6 +625,10 @@ def main():
 
 if __name__ == "__main__":
     try:
+        # Comandos de línea: ruta rápida sin menú ni comprobaciones de arranque
+        if len(sys.argv) > 1:
+            sys.exit(ejecutar_comando(sys.argv[1:]))
+        
         # Verificar dependencias antes de empezar
         if not verificar_dependencias():
             print(f"{Fore.RED}❌ No se pueden ejecutar el programa sin las dependencias requeridas{Style.RESET_ALL}")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Puerta de conteo para el Monitor de Instagram
+Decide si merece la pena descargar las listas completas de una cuenta comparando
+los contadores del perfil (una sola consulta) con el último snapshot guardado, y
+registra cada decisión para medir cuántos rastreos se han evitado
+"""
+
+import json
+import math
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import config
+import config_seguridad
+from indice_membresia import carpeta_indices
+
+RASTREAR = "rastrear"
+OMITIR = "omitir"
+PARCIAL = "parcial"
+
+
+def evaluar_contadores(datos_anteriores: Dict, seguidores: int, seguidos: int,
+                       ahora: Optional[datetime] = None) -> Dict:
+    """
+    Primera fase de la puerta: compara contadores y antigüedad del snapshot
+
+    Args:
+        datos_anteriores: Último snapshot (cargar_datos_anteriores)
+        seguidores: profile.followers actual
+        seguidos: profile.followees actual
+        ahora: Momento de la evaluación (por defecto, ahora)
+
+    Returns:
+        Dict: {"decision": rastrear|omitir|parcial, "motivo": texto corto}
+    """
+    modo = config.PUERTA_CONTEO
+    if modo == "desactivada":
+        return {"decision": RASTREAR, "motivo": "puerta_desactivada"}
+    if not datos_anteriores or "timestamp" not in datos_anteriores:
+        return {"decision": RASTREAR, "motivo": "sin_snapshot"}
+
+    anterior = datetime.strptime(datos_anteriores["timestamp"], "%Y-%m-%d_%H-%M-%S")
+    horas = ((ahora or datetime.now()) - anterior).total_seconds() / 3600
+    if horas > config.PUERTA_MAX_HORAS_SIN_RASTREO:
+        return {"decision": RASTREAR, "motivo": "snapshot_antiguo"}
+
+    # Se compara con los contadores del perfil guardados en el último rastreo: la longitud
+    # de las listas casi nunca coincide con ellos
+    guardados = (datos_anteriores.get("contador_seguidores"), datos_anteriores.get("contador_seguidos"))
+    if None in guardados:
+        return {"decision": RASTREAR, "motivo": "sin_contadores"}
+    if (seguidores, seguidos) != guardados:
+        return {"decision": RASTREAR, "motivo": "contadores_cambiados"}
+
+    if modo == PARCIAL:
+        return {"decision": PARCIAL, "motivo": "contadores_iguales"}
+    return {"decision": OMITIR, "motivo": "contadores_iguales"}
+
+
+def evaluar_muestra(anteriores: Iterable[str], recientes: List[str]) -> bool:
+    """
+    Segunda fase (modo parcial): comprueba los usuarios más recientes de una lista
+
+    Args:
+        anteriores: Lista guardada en el último snapshot
+        recientes: Primeros usuarios de la lista actual (de más nuevo a más antiguo)
+
+    Returns:
+        bool: True si todos los recientes ya estaban en el snapshot
+    """
+    anteriores = set(anteriores)
+    return all(username in anteriores for username in recientes)
+
+
+def peticiones_estimadas(seguidores: int, seguidos: int) -> int:
+    """Páginas de API que costaría descargar ambas listas"""
+    tamano = config_seguridad.SIMULATED_PAGE_SIZE
+    return math.ceil(seguidores / tamano) + math.ceil(seguidos / tamano)
+
+
+def ruta_registro(directorio_datos: str, cuenta: str) -> str:
+    """Archivo JSONL con las decisiones de la puerta para una cuenta"""
+    return os.path.join(carpeta_indices(directorio_datos, cuenta), "puerta.jsonl")
+
+
+def registrar_decision(directorio_datos: str, cuenta: str, decision: Dict) -> None:
+    """
+    Añade una decisión al registro de la cuenta
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuenta: Cuenta monitoreada
+        decision: Decisión con sus contadores
+    """
+    ruta = ruta_registro(directorio_datos, cuenta)
+    carpeta = os.path.dirname(ruta)
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta)
+    with open(ruta, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(decision, ensure_ascii=False) + "\n")
+
+
+def resumen_decisiones(directorio_datos: str, cuentas: List[str]) -> Dict:
+    """
+    Resume las decisiones registradas de varias cuentas
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuentas: Cuentas a incluir
+
+    Returns:
+        Dict: Evaluaciones, rastreos, omisiones, peticiones ahorradas y motivos
+    """
+    resumen = {"evaluaciones": 0, "rastreos": 0, "omitidos": 0, "peticiones_ahorradas": 0,
+               "peticiones_muestra": 0, "motivos": {}}
+    for cuenta in cuentas:
+        ruta = ruta_registro(directorio_datos, cuenta)
+        if not os.path.exists(ruta):
+            continue
+        with open(ruta, 'r', encoding='utf-8') as f:
+            for linea in f:
+                if not linea.strip():
+                    continue
+                decision = json.loads(linea)
+                resumen["evaluaciones"] += 1
+                resumen["motivos"][decision["motivo"]] = resumen["motivos"].get(decision["motivo"], 0) + 1
+                resumen["peticiones_muestra"] += decision.get("peticiones_muestra", 0)
+                if decision["decision"] == OMITIR:
+                    resumen["omitidos"] += 1
+                    resumen["peticiones_ahorradas"] += decision.get("peticiones_evitadas", 0)
+                else:
+                    resumen["rastreos"] += 1
+    return resumen
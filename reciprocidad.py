@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vistas de reciprocidad para el Monitor de Instagram
+Mantiene, para cada cuenta monitoreada, tres conjuntos derivados de sus
+seguidores y seguidos: mutuos, los que la siguen sin que ella los siga y los que
+ella sigue sin que la sigan. Se actualizan con los cambios de cada monitoreo y
+guardan un historial de sus tamaños y movimientos
+"""
+
+import csv
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+from indice_membresia import carpeta_indices
+from utils import escribir_json_atomico
+
+VISTAS = ("mutuos", "solo_me_siguen", "solo_sigo")
+DESCRIPCION_VISTAS = {
+    "mutuos": "Se siguen mutuamente",
+    "solo_me_siguen": "Me siguen pero no los sigo",
+    "solo_sigo": "Los sigo pero no me siguen",
+}
+
+
+class VistasReciprocidad:
+    """Conjuntos de reciprocidad de una cuenta y su historial"""
+
+    def __init__(self, directorio_datos: str, cuenta: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+            cuenta: Cuenta monitoreada
+        """
+        self.cuenta = cuenta
+        carpeta = carpeta_indices(directorio_datos, cuenta)
+        self.ruta = os.path.join(carpeta, "reciprocidad.json")
+        self.ruta_historial = os.path.join(carpeta, "reciprocidad_historial.jsonl")
+        self.timestamp: Optional[str] = None
+        self.vistas = {vista: set() for vista in VISTAS}
+        self._movimientos = self._sin_movimientos()
+        if os.path.exists(self.ruta):
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            self.timestamp = datos.get("timestamp")
+            self.vistas = {vista: set(datos.get(vista, [])) for vista in VISTAS}
+
+    @property
+    def existe(self) -> bool:
+        """True si ya hay vistas guardadas para la cuenta"""
+        return self.timestamp is not None
+
+    @staticmethod
+    def _sin_movimientos() -> Dict[str, Dict[str, List[str]]]:
+        return {vista: {"entran": [], "salen": []} for vista in VISTAS}
+
+    def _mover(self, username: str, origen: Optional[str], destino: Optional[str]) -> None:
+        """Pasa un usuario de una vista a otra (None = fuera de todas)"""
+        if origen:
+            self.vistas[origen].discard(username)
+            self._movimientos[origen]["salen"].append(username)
+        if destino:
+            self.vistas[destino].add(username)
+            self._movimientos[destino]["entran"].append(username)
+
+    def establecer(self, seguidores: Iterable[str], seguidos: Iterable[str], timestamp: str) -> None:
+        """
+        Calcula las vistas desde cero a partir de las listas completas
+
+        Args:
+            seguidores: Seguidores actuales
+            seguidos: Seguidos actuales
+            timestamp: Timestamp del snapshot
+        """
+        seguidores, seguidos = set(seguidores), set(seguidos)
+        self.vistas = {
+            "mutuos": seguidores & seguidos,
+            "solo_me_siguen": seguidores - seguidos,
+            "solo_sigo": seguidos - seguidores,
+        }
+        self._movimientos = self._sin_movimientos()
+        self.timestamp = timestamp
+
+    def aplicar_reporte(self, reporte: Dict) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Actualiza las vistas con los cambios de un reporte
+
+        Args:
+            reporte: Reporte de generar_reporte_cambios
+
+        Returns:
+            Dict: Por vista, usuarios que entran y salen
+        """
+        self._movimientos = self._sin_movimientos()
+        for renombres in reporte.get("renombres", {}).values():
+            for renombre in renombres:
+                for usuarios in self.vistas.values():
+                    if renombre["anterior"] in usuarios:
+                        usuarios.discard(renombre["anterior"])
+                        usuarios.add(renombre["actual"])
+        for username in reporte["cambios_seguidores"]["nuevos"]:
+            if username in self.vistas["solo_sigo"]:
+                self._mover(username, "solo_sigo", "mutuos")
+            else:
+                self._mover(username, None, "solo_me_siguen")
+        for username in reporte["cambios_seguidores"]["perdidos"]:
+            if username in self.vistas["mutuos"]:
+                self._mover(username, "mutuos", "solo_sigo")
+            else:
+                self._mover(username, "solo_me_siguen", None)
+        for username in reporte["cambios_seguidos"]["nuevos"]:
+            if username in self.vistas["solo_me_siguen"]:
+                self._mover(username, "solo_me_siguen", "mutuos")
+            else:
+                self._mover(username, None, "solo_sigo")
+        for username in reporte["cambios_seguidos"]["eliminados"]:
+            if username in self.vistas["mutuos"]:
+                self._mover(username, "mutuos", "solo_me_siguen")
+            else:
+                self._mover(username, "solo_sigo", None)
+        self.timestamp = reporte["timestamp"]
+        return self._movimientos
+
+    def conteos(self) -> Dict[str, int]:
+        """Tamaño de cada vista"""
+        return {vista: len(usuarios) for vista, usuarios in self.vistas.items()}
+
+    def guardar(self) -> None:
+        """Escribe las vistas y añade una entrada al historial"""
+        carpeta = os.path.dirname(self.ruta)
+        if not os.path.exists(carpeta):
+            os.makedirs(carpeta)
+        datos = {"cuenta": self.cuenta, "timestamp": self.timestamp}
+        datos.update({vista: sorted(usuarios) for vista, usuarios in self.vistas.items()})
+        escribir_json_atomico(self.ruta, datos, indent=2)
+
+        entrada = {"timestamp": self.timestamp}
+        entrada.update(self.conteos())
+        entrada["movimientos"] = self._movimientos
+        with open(self.ruta_historial, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+
+    def historial(self) -> List[Dict]:
+        """
+        Lee el historial de la cuenta
+
+        Returns:
+            List[Dict]: Entradas {timestamp, conteos, movimientos} en orden cronológico
+        """
+        if not os.path.exists(self.ruta_historial):
+            return []
+        with open(self.ruta_historial, 'r', encoding='utf-8') as f:
+            return [json.loads(linea) for linea in f if linea.strip()]
+
+    def exportar(self, ruta: str, vistas: Optional[List[str]] = None) -> None:
+        """
+        Exporta las vistas a CSV (usuario, vista), JSONL o texto plano
+
+        Args:
+            ruta: Archivo de salida; la extensión decide el formato
+            vistas: Vistas a exportar (por defecto, todas)
+        """
+        vistas = vistas or list(VISTAS)
+        with open(ruta, 'w', encoding='utf-8', newline='') as f:
+            if ruta.endswith(".csv"):
+                escritor = csv.writer(f)
+                escritor.writerow(["usuario", "vista"])
+                for vista in vistas:
+                    escritor.writerows((usuario, vista) for usuario in sorted(self.vistas[vista]))
+            elif ruta.endswith(".jsonl"):
+                for vista in vistas:
+                    for usuario in sorted(self.vistas[vista]):
+                        f.write(json.dumps({"usuario": usuario, "vista": vista}, ensure_ascii=False) + "\n")
+            else:
+                for vista in vistas:
+                    f.write("".join(f"{usuario}\n" for usuario in sorted(self.vistas[vista])))
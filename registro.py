@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Capa de registro para el Monitor de Instagram
+Centraliza la salida por consola y el archivo de log según config.py
+(HABILITAR_LOGS, NIVEL_LOG, ARCHIVO_LOG, USAR_COLORES)
+"""
+
+import logging
+import re
+import sys
+
+import config
+
+NOMBRE_REGISTRO = "seeyouinstagram"
+PATRON_ANSI = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+# Indica si la última escritura fue una línea sin terminar (barra de progreso)
+_linea_pendiente = False
+
+
+def quitar_colores(texto: str) -> str:
+    """
+    Elimina los códigos de color ANSI de un texto
+
+    Args:
+        texto: Texto con posibles códigos de color
+
+    Returns:
+        str: Texto limpio
+    """
+    return PATRON_ANSI.sub('', texto)
+
+
+def es_terminal() -> bool:
+    """
+    Indica si la salida estándar es una terminal interactiva
+
+    Returns:
+        bool: False si la salida está redirigida a un archivo o tubería
+    """
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+class FormateadorSinColor(logging.Formatter):
+    """Formateador que descarta los códigos de color"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return quitar_colores(super().format(record))
+
+
+class ManejadorConsola(logging.StreamHandler):
+    """Escribe en la salida estándar actual, cerrando antes cualquier línea de progreso"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        global _linea_pendiente
+        self.stream = sys.stdout
+        if _linea_pendiente:
+            self.stream.write("\n")
+            _linea_pendiente = False
+        super().emit(record)
+
+
+def obtener_registro() -> logging.Logger:
+    """
+    Devuelve el logger del programa, configurándolo la primera vez
+
+    Returns:
+        logging.Logger: Logger compartido
+    """
+    registro = logging.getLogger(NOMBRE_REGISTRO)
+    if registro.handlers:
+        return registro
+
+    registro.setLevel(getattr(logging, str(config.NIVEL_LOG).upper(), logging.INFO))
+    registro.propagate = False
+
+    consola = ManejadorConsola(sys.stdout)
+    if config.USAR_COLORES and es_terminal():
+        consola.setFormatter(logging.Formatter("%(message)s"))
+    else:
+        consola.setFormatter(FormateadorSinColor("%(message)s"))
+    registro.addHandler(consola)
+
+    if config.HABILITAR_LOGS:
+        try:
+            archivo = logging.FileHandler(config.ARCHIVO_LOG, encoding='utf-8')
+            archivo.setFormatter(FormateadorSinColor("%(asctime)s [%(levelname)s] %(message)s"))
+            registro.addHandler(archivo)
+        except OSError as e:
+            registro.warning(f"⚠️ No se pudo abrir el archivo de log {config.ARCHIVO_LOG}: {e}")
+
+    return registro
+
+
+def escribir_en_linea(texto: str) -> None:
+    """
+    Reescribe la línea actual de la terminal (barras de progreso, cuentas atrás)
+    Si la salida no es una terminal no se escribe nada para no inflar los logs
+
+    Args:
+        texto: Texto a mostrar
+    """
+    global _linea_pendiente
+    if not es_terminal():
+        return
+    if not config.USAR_COLORES:
+        texto = quitar_colores(texto)
+    sys.stdout.write(f"\r{texto}")
+    sys.stdout.flush()
+    _linea_pendiente = True
+
+
+def terminar_linea() -> None:
+    """Termina la línea de progreso pendiente, si la hay"""
+    global _linea_pendiente
+    if _linea_pendiente:
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+        _linea_pendiente = False
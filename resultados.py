@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resultados de las operaciones del Monitor de Instagram
+Las operaciones principales devuelven estos objetos además de mostrar su salida
+por consola, para que otros programas puedan usar los datos sin leer la terminal
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+# Estados de ResultadoMonitoreo
+COMPLETADO = "completado"
+SIN_CAMBIOS = "sin_cambios"  # La puerta de conteo evitó el rastreo
+FALLIDO = "fallido"
+
+
+@dataclass
+class EstadisticasRastreo:
+    """Descarga de una lista de seguidores o seguidos"""
+    tipo: str
+    obtenidos: int
+    completo: bool  # False si quedó un guardado parcial pendiente de continuar
+    segundos: float
+
+
+@dataclass
+class Snapshot:
+    """Seguidores y seguidos de una cuenta en un momento"""
+    cuenta: str
+    timestamp: str
+    seguidores: Set[str]
+    seguidos: Set[str]
+
+
+@dataclass
+class ResultadoMonitoreo:
+    """Resultado de monitorear_perfil"""
+    cuenta: str
+    estado: str
+    snapshot: Optional[Snapshot] = None
+    reporte: Optional[Dict] = None  # Misma estructura que los *_reporte.json
+    rastreos: List[EstadisticasRastreo] = field(default_factory=list)
+    motivo: Optional[str] = None  # Causa cuando estado es FALLIDO
+
+    @property
+    def exito(self) -> bool:
+        """True si el monitoreo terminó (con o sin rastreo)"""
+        return self.estado != FALLIDO
+
+    @property
+    def es_primer_monitoreo(self) -> bool:
+        return bool(self.reporte and self.reporte.get("es_primer_monitoreo"))
+
+    def _cambios(self, seccion: str, lista: str) -> List[str]:
+        if not self.reporte or self.es_primer_monitoreo:
+            return []
+        return self.reporte[seccion][lista]
+
+    @property
+    def nuevos_seguidores(self) -> List[str]:
+        return self._cambios("cambios_seguidores", "nuevos")
+
+    @property
+    def seguidores_perdidos(self) -> List[str]:
+        return self._cambios("cambios_seguidores", "perdidos")
+
+    @property
+    def nuevos_seguidos(self) -> List[str]:
+        return self._cambios("cambios_seguidos", "nuevos")
+
+    @property
+    def seguidos_eliminados(self) -> List[str]:
+        return self._cambios("cambios_seguidos", "eliminados")
+
+
+@dataclass
+class ResultadoMutuos:
+    """Resultado de encontrar_seguidores_mutuos"""
+    cuenta_a: str
+    cuenta_b: str
+    mutuos: Set[str]
+    recorridos: int  # Seguidores recorridos del perfil grande
+    completo: bool
+    ruta: Optional[str] = None  # Archivo con la lista completa
+
+
+@dataclass
+class ResultadoConexiones:
+    """Resultado de analizar_conexiones_seguidores"""
+    cuenta: str
+    seguidores: int
+    seguidos: int
+    mutuas: Set[str]
+    desde_vistas: bool  # Calculado con las vistas de reciprocidad guardadas, sin red
+
+    @property
+    def ratio_reciprocidad(self) -> float:
+        """Porcentaje de seguidores a los que la cuenta sigue"""
+        return len(self.mutuas) / self.seguidores * 100 if self.seguidores else 0.0
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Series temporales de contadores de perfil para el Monitor de Instagram
+Guarda muestras de seguidores, seguidos y publicaciones en un archivo binario de
+registros de ancho fijo por cuenta (20 bytes por muestra), en orden cronológico,
+de modo que añadir es una escritura al final y las consultas por rango son una
+búsqueda binaria sobre el archivo
+"""
+
+import bisect
+import os
+import struct
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from indice_membresia import carpeta_indices
+
+# Momento (epoch en segundos), seguidores, seguidos, publicaciones
+FORMATO_MUESTRA = struct.Struct("<dIII")
+CAMPOS = ("momento", "seguidores", "seguidos", "publicaciones")
+ARCHIVO_SERIE = "contadores.bin"
+
+Muestra = Tuple[float, int, int, int]
+
+
+class _VistaMomentos:
+    """Secuencia de solo lectura con el momento de cada registro, para usar con bisect"""
+
+    def __init__(self, archivo, total: int):
+        self.archivo = archivo
+        self.total = total
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, posicion: int) -> float:
+        self.archivo.seek(posicion * FORMATO_MUESTRA.size)
+        return FORMATO_MUESTRA.unpack(self.archivo.read(FORMATO_MUESTRA.size))[0]
+
+
+class SerieContadores:
+    """Serie de contadores de una cuenta en un archivo binario de registros fijos"""
+
+    def __init__(self, directorio_datos: str, cuenta: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+            cuenta: Cuenta monitoreada
+        """
+        self.cuenta = cuenta
+        self.ruta = os.path.join(carpeta_indices(directorio_datos, cuenta), ARCHIVO_SERIE)
+
+    def __len__(self) -> int:
+        if not os.path.exists(self.ruta):
+            return 0
+        return os.path.getsize(self.ruta) // FORMATO_MUESTRA.size
+
+    def agregar(self, muestras: Iterable[Muestra]) -> int:
+        """
+        Añade muestras al final de la serie en una sola escritura
+
+        Args:
+            muestras: Tuplas (momento, seguidores, seguidos, publicaciones) en orden cronológico
+
+        Returns:
+            int: Número de muestras escritas
+        """
+        datos = b"".join(FORMATO_MUESTRA.pack(*muestra) for muestra in muestras)
+        if not datos:
+            return 0
+        carpeta = os.path.dirname(self.ruta)
+        if not os.path.exists(carpeta):
+            os.makedirs(carpeta)
+        with open(self.ruta, 'ab') as f:
+            # Descarta un registro a medias de una escritura interrumpida
+            sobrante = f.tell() % FORMATO_MUESTRA.size
+            if sobrante:
+                f.truncate(f.tell() - sobrante)
+                f.seek(0, os.SEEK_END)
+            f.write(datos)
+        return len(datos) // FORMATO_MUESTRA.size
+
+    def ultima(self) -> Optional[Muestra]:
+        """Devuelve la muestra más reciente o None si la serie está vacía"""
+        total = len(self)
+        if not total:
+            return None
+        with open(self.ruta, 'rb') as f:
+            f.seek((total - 1) * FORMATO_MUESTRA.size)
+            return FORMATO_MUESTRA.unpack(f.read(FORMATO_MUESTRA.size))
+
+    def rango(self, desde: Optional[float] = None, hasta: Optional[float] = None) -> List[Muestra]:
+        """
+        Lee las muestras entre dos momentos (ambos incluidos)
+
+        Args:
+            desde: Epoch inicial (por defecto, el principio)
+            hasta: Epoch final (por defecto, el final)
+
+        Returns:
+            List[Muestra]: Muestras del rango en orden cronológico
+        """
+        total = len(self)
+        if not total:
+            return []
+        with open(self.ruta, 'rb') as f:
+            momentos = _VistaMomentos(f, total)
+            inicio = bisect.bisect_left(momentos, desde) if desde is not None else 0
+            fin = bisect.bisect_right(momentos, hasta) if hasta is not None else total
+            if fin <= inicio:
+                return []
+            f.seek(inicio * FORMATO_MUESTRA.size)
+            datos = f.read((fin - inicio) * FORMATO_MUESTRA.size)
+        return list(FORMATO_MUESTRA.iter_unpack(datos))
+
+
+def agregar_muestras(muestras: List[Muestra]) -> Dict[str, Dict]:
+    """
+    Calcula mínimo, máximo, media y variación de cada contador
+
+    Args:
+        muestras: Muestras en orden cronológico
+
+    Returns:
+        Dict: Por contador, {"min", "max", "media", "primero", "ultimo", "cambio"}
+    """
+    resultado = {}
+    for posicion, campo in enumerate(CAMPOS[1:], 1):
+        valores = [muestra[posicion] for muestra in muestras]
+        if not valores:
+            continue
+        resultado[campo] = {
+            "min": min(valores),
+            "max": max(valores),
+            "media": sum(valores) / len(valores),
+            "primero": valores[0],
+            "ultimo": valores[-1],
+            "cambio": valores[-1] - valores[0]
+        }
+    return resultado
+
+
+def agrupar_muestras(muestras: List[Muestra], segundos: int) -> List[Muestra]:
+    """
+    Reduce la serie a la última muestra de cada intervalo
+
+    Args:
+        muestras: Muestras en orden cronológico
+        segundos: Tamaño del intervalo (3600 = por hora, 86400 = por día)
+
+    Returns:
+        List[Muestra]: Una muestra por intervalo con datos
+    """
+    agrupadas: Dict[int, Muestra] = {}
+    for muestra in muestras:
+        agrupadas[int(muestra[0] // segundos)] = muestra
+    return [agrupadas[clave] for clave in sorted(agrupadas)]
+
+
+def formatear_momento(momento: float) -> str:
+    """Convierte un epoch a texto legible en hora local"""
+    return datetime.fromtimestamp(momento).strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API HTTP de solo lectura sobre los datos guardados del Monitor de Instagram
+Sirve el último snapshot, el historial de reportes, diferencias entre fechas y
+solapamiento de audiencias sin acceso a la red. Los snapshots leídos se guardan
+ya interpretados en una caché LRU y cada respuesta lleva un ETag calculado a
+partir de los nombres, fechas de modificación y tamaños de los archivos, de modo
+que una consulta repetida se responde con 304 sin leer nada del disco
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from colorama import Fore, Style
+
+import config
+from historial import FILTROS, buscar_snapshot, diferencia_entre
+from indice_membresia import listar_snapshots, timestamp_de_archivo
+from registro import obtener_registro
+from solapamiento import cuentas_con_datos, matriz_solapamiento
+
+registro = obtener_registro()
+
+RELACIONES = ("seguidores", "seguidos")
+PATRON_CUENTA = re.compile(r"^[A-Za-z0-9._]+$")
+
+
+class ErrorAPI(Exception):
+    """Error que se devuelve al cliente con un código HTTP"""
+
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class CacheLRU:
+    """Caché con límite de entradas que descarta la usada hace más tiempo (segura entre hilos)"""
+
+    def __init__(self, capacidad: int):
+        """
+        Args:
+            capacidad: Número máximo de entradas
+        """
+        self.capacidad = capacidad
+        self.entradas: "OrderedDict[object, object]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self._cerrojo = threading.Lock()
+
+    def obtener(self, clave, calcular: Callable[[], object]):
+        """
+        Devuelve el valor de una clave, calculándolo si no está
+
+        Args:
+            clave: Clave de la entrada
+            calcular: Función sin argumentos que produce el valor
+
+        Returns:
+            Valor guardado o recién calculado
+        """
+        with self._cerrojo:
+            if clave in self.entradas:
+                self.entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self.entradas[clave]
+            self.fallos += 1
+        # El cálculo (lectura de disco) se hace fuera del cerrojo para no bloquear otras peticiones
+        valor = calcular()
+        with self._cerrojo:
+            self.entradas[clave] = valor
+            self.entradas.move_to_end(clave)
+            while len(self.entradas) > self.capacidad:
+                self.entradas.popitem(last=False)
+        return valor
+
+    def estadisticas(self) -> Dict:
+        """Entradas, aciertos y fallos de la caché"""
+        return {"entradas": len(self.entradas), "capacidad": self.capacidad,
+                "aciertos": self.aciertos, "fallos": self.fallos}
+
+
+def paginar(elementos: List, consulta: Dict[str, str]) -> Dict:
+    """
+    Devuelve una página de una lista según los parámetros pagina y por_pagina
+
+    Args:
+        elementos: Lista completa
+        consulta: Parámetros de la URL
+
+    Returns:
+        Dict: {"pagina", "por_pagina", "total", "paginas", "elementos"}
+    """
+    pagina = _entero(consulta, "pagina", 1, minimo=1)
+    por_pagina = min(_entero(consulta, "por_pagina", config.API_POR_PAGINA, minimo=1), config.API_MAX_POR_PAGINA)
+    inicio = (pagina - 1) * por_pagina
+    return {
+        "pagina": pagina,
+        "por_pagina": por_pagina,
+        "total": len(elementos),
+        "paginas": (len(elementos) + por_pagina - 1) // por_pagina,
+        "elementos": elementos[inicio:inicio + por_pagina]
+    }
+
+
+def _entero(consulta: Dict[str, str], nombre: str, defecto: int, minimo: int = 0) -> int:
+    """Lee un parámetro entero de la URL"""
+    valor = consulta.get(nombre)
+    if valor is None:
+        return defecto
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise ErrorAPI(400, f"El parámetro {nombre} debe ser un número entero")
+    if numero < minimo:
+        raise ErrorAPI(400, f"El parámetro {nombre} debe ser al menos {minimo}")
+    return numero
+
+
+class APIMonitor:
+    """Resuelve las rutas de la API sobre un directorio de datos"""
+
+    def __init__(self, directorio_datos: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+        """
+        self.directorio_datos = directorio_datos
+        self.snapshots = CacheLRU(config.API_CACHE_SNAPSHOTS)
+        self.respuestas = CacheLRU(config.API_CACHE_RESPUESTAS)
+        self.rutas: List[Tuple[re.Pattern, Callable]] = [
+            (re.compile(r"^/cuentas$"), self.listar_cuentas),
+            (re.compile(r"^/cuentas/([^/]+)$"), self.resumen_cuenta),
+            (re.compile(r"^/cuentas/([^/]+)/(seguidores|seguidos)$"), self.lista_snapshot),
+            (re.compile(r"^/cuentas/([^/]+)/reportes$"), self.listar_reportes),
+            (re.compile(r"^/cuentas/([^/]+)/reportes/([0-9_-]+)$"), self.obtener_reporte),
+            (re.compile(r"^/cuentas/([^/]+)/diferencia$"), self.diferencia),
+            (re.compile(r"^/solapamiento$"), self.solapamiento),
+            (re.compile(r"^/estado$"), self.estado),
+        ]
+
+    # ----- Lectura con caché -----
+
+    def leer_json(self, ruta: str) -> Dict:
+        """
+        Carga un archivo JSON a través de la caché de snapshots
+        La clave incluye la fecha de modificación y el tamaño, así un archivo reescrito se vuelve a leer
+        """
+        estado = os.stat(ruta)
+
+        def cargar():
+            with open(ruta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return self.snapshots.obtener((ruta, estado.st_mtime_ns, estado.st_size), cargar)
+
+    def _cuenta(self, cuenta: str) -> str:
+        """Valida una cuenta de la URL (evita rutas fuera del directorio de datos)"""
+        cuenta = cuenta.lower()
+        if not PATRON_CUENTA.match(cuenta) or not cuenta.strip("."):
+            raise ErrorAPI(400, f"Cuenta no válida: {cuenta}")
+        if not listar_snapshots(self.directorio_datos, cuenta, "seguidores"):
+            raise ErrorAPI(404, f"No hay snapshots de @{cuenta}")
+        return cuenta
+
+    def _reportes(self, cuenta: str) -> List[str]:
+        """Rutas de los reportes de una cuenta, del más antiguo al más reciente"""
+        carpeta = os.path.join(self.directorio_datos, cuenta, "reportes")
+        if not os.path.exists(carpeta):
+            return []
+        return [os.path.join(carpeta, f) for f in sorted(os.listdir(carpeta)) if f.endswith("_reporte.json")]
+
+    def version(self, cuentas: List[str]) -> str:
+        """
+        Identifica el estado de los datos de unas cuentas sin leer su contenido: por cada
+        lista de archivos, cuántos hay, el nombre del último y la fecha de modificación más
+        reciente y el tamaño total (un reporte se puede reescribir en su sitio, p. ej. al anotarlo)
+        """
+        partes = []
+        for cuenta in cuentas:
+            listas = [listar_snapshots(self.directorio_datos, cuenta, tipo) for tipo in RELACIONES]
+            listas.append(self._reportes(cuenta))
+            for rutas in listas:
+                estados = [os.stat(ruta) for ruta in rutas]
+                partes.append(f"{len(rutas)}:{os.path.basename(rutas[-1]) if rutas else ''}:"
+                              f"{max((e.st_mtime_ns for e in estados), default=0)}:"
+                              f"{sum(e.st_size for e in estados)}")
+        return "|".join(partes)
+
+    # ----- Rutas -----
+
+    def resolver(self, ruta: str, consulta: Dict[str, str]) -> Tuple[Optional[List[str]], Callable[[], Dict]]:
+        """
+        Busca la función de una ruta
+
+        Returns:
+            Tuple: (cuentas de las que depende la respuesta o None si no se cachea, función que la calcula)
+
+        Raises:
+            ErrorAPI: 404 si la ruta no existe
+        """
+        for patron, funcion in self.rutas:
+            coincidencia = patron.match(ruta.rstrip("/") or "/")
+            if coincidencia:
+                return funcion(consulta, *coincidencia.groups())
+        raise ErrorAPI(404, f"Ruta desconocida: {ruta}")
+
+    def listar_cuentas(self, consulta):
+        cuentas = cuentas_con_datos(self.directorio_datos)
+
+        def calcular():
+            filas = []
+            for cuenta in cuentas:
+                seguidores = listar_snapshots(self.directorio_datos, cuenta, "seguidores")
+                filas.append({"cuenta": cuenta, "ultimo_snapshot": timestamp_de_archivo(seguidores[-1]),
+                              "snapshots": len(seguidores), "reportes": len(self._reportes(cuenta))})
+            return {"cuentas": filas}
+        return cuentas, calcular
+
+    def resumen_cuenta(self, consulta, cuenta):
+        cuenta = self._cuenta(cuenta)
+
+        def calcular():
+            resumen = {"cuenta": cuenta}
+            for tipo in RELACIONES:
+                rutas = listar_snapshots(self.directorio_datos, cuenta, tipo)
+                if rutas:
+                    datos = self.leer_json(rutas[-1])
+                    resumen[tipo] = {"timestamp": timestamp_de_archivo(rutas[-1]),
+                                     "total": datos.get(f"total_{tipo}", len(datos.get(tipo, [])))}
+            reportes = self._reportes(cuenta)
+            if reportes:
+                ultimo = self.leer_json(reportes[-1])
+                resumen["ultimo_reporte"] = {"timestamp": ultimo.get("timestamp"),
+                                             "estadisticas": ultimo.get("estadisticas")}
+            return resumen
+        return [cuenta], calcular
+
+    def lista_snapshot(self, consulta, cuenta, tipo):
+        cuenta = self._cuenta(cuenta)
+        momento = consulta.get("momento")
+
+        def calcular():
+            if momento:
+                try:
+                    ruta = buscar_snapshot(self.directorio_datos, cuenta, tipo, momento)
+                except ValueError as e:
+                    raise ErrorAPI(400, str(e))
+            else:
+                rutas = listar_snapshots(self.directorio_datos, cuenta, tipo)
+                ruta = rutas[-1] if rutas else None
+            if ruta is None:
+                raise ErrorAPI(404, f"No hay snapshots de {tipo} de @{cuenta}")
+            datos = self.leer_json(ruta)
+            return dict(paginar(datos.get(tipo, []), consulta), cuenta=cuenta, tipo=tipo,
+                        timestamp=timestamp_de_archivo(ruta))
+        return [cuenta], calcular
+
+    def listar_reportes(self, consulta, cuenta):
+        cuenta = self._cuenta(cuenta)
+
+        def calcular():
+            # Del más reciente al más antiguo; solo se leen los reportes de la página pedida
+            pagina = paginar(list(reversed(self._reportes(cuenta))), consulta)
+            pagina["elementos"] = [{"timestamp": timestamp_de_archivo(ruta),
+                                    "estadisticas": self.leer_json(ruta).get("estadisticas")}
+                                   for ruta in pagina["elementos"]]
+            return dict(pagina, cuenta=cuenta)
+        return [cuenta], calcular
+
+    def obtener_reporte(self, consulta, cuenta, timestamp):
+        cuenta = self._cuenta(cuenta)
+        ruta = os.path.join(self.directorio_datos, cuenta, "reportes", f"{timestamp}_reporte.json")
+        if not os.path.exists(ruta):
+            raise ErrorAPI(404, f"No hay reporte {timestamp} de @{cuenta}")
+        return [cuenta], lambda: self.leer_json(ruta)
+
+    def diferencia(self, consulta, cuenta):
+        cuenta = self._cuenta(cuenta)
+        desde, hasta, solo = consulta.get("desde"), consulta.get("hasta"), consulta.get("solo")
+        if not desde or not hasta:
+            raise ErrorAPI(400, "Indica los parámetros desde y hasta (YYYY-MM-DD o YYYY-MM-DD HH:MM)")
+        if solo is not None and solo not in FILTROS:
+            raise ErrorAPI(400, f"Filtro no válido: {solo} (opciones: {', '.join(FILTROS)})")
+
+        def calcular():
+            try:
+                return diferencia_entre(self.directorio_datos, cuenta, desde, hasta, solo, self.leer_json)
+            except ValueError as e:
+                raise ErrorAPI(404, str(e))
+        return [cuenta], calcular
+
+    def solapamiento(self, consulta):
+        cuentas = [self._cuenta(c) for c in consulta.get("cuentas", "").split(",") if c] or \
+            cuentas_con_datos(self.directorio_datos)
+        exacto = consulta.get("exacto") in ("1", "true", "si")
+
+        def calcular():
+            try:
+                return {"parejas": matriz_solapamiento(self.directorio_datos, cuentas, exacto)}
+            except ValueError as e:
+                raise ErrorAPI(404, str(e))
+        return cuentas, calcular
+
+    def estado(self, consulta):
+        # Sin ETag: las estadísticas de las cachés cambian con cada petición
+        return None, lambda: {"snapshots": self.snapshots.estadisticas(),
+                              "respuestas": self.respuestas.estadisticas()}
+
+    # ----- Respuesta -----
+
+    def responder(self, url: str, etag_cliente: Optional[str]) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Atiende una petición GET
+
+        Args:
+            url: Ruta y parámetros de la petición
+            etag_cliente: Valor de la cabecera If-None-Match
+
+        Returns:
+            Tuple: (código HTTP, cabeceras, cuerpo)
+        """
+        partes = urlsplit(url)
+        consulta = {clave: valores[-1] for clave, valores in parse_qs(partes.query).items()}
+        try:
+            cuentas, calcular = self.resolver(partes.path, consulta)
+            if cuentas is None:
+                return 200, {}, json.dumps(calcular(), ensure_ascii=False).encode("utf-8")
+
+            version = self.version(cuentas)
+            etag = '"' + hashlib.sha1(f"{url}\n{version}".encode("utf-8")).hexdigest()[:20] + '"'
+            cabeceras = {"ETag": etag, "Cache-Control": "no-cache"}
+            if etag_cliente and etag in (e.strip() for e in etag_cliente.split(",")):
+                return 304, cabeceras, b""
+            cuerpo = self.respuestas.obtener(
+                (url, version), lambda: json.dumps(calcular(), ensure_ascii=False).encode("utf-8"))
+            return 200, cabeceras, cuerpo
+        except ErrorAPI as e:
+            return e.estado, {}, json.dumps({"error": str(e)}, ensure_ascii=False).encode("utf-8")
+
+
+class ManejadorAPI(BaseHTTPRequestHandler):
+    """Traduce las peticiones HTTP a APIMonitor.responder"""
+
+    api: APIMonitor = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        try:
+            estado, cabeceras, cuerpo = self.api.responder(self.path, self.headers.get("If-None-Match"))
+        except Exception as e:
+            registro.error(f"{Fore.RED}❌ Error en la API ({self.path}): {e}{Style.RESET_ALL}")
+            estado, cabeceras = 500, {}
+            cuerpo = json.dumps({"error": "Error interno"}).encode("utf-8")
+        self.send_response(estado)
+        if estado != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        for nombre, valor in cabeceras.items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        registro.debug("🌐 " + formato % args)
+
+
+def crear_servidor(directorio_datos: str, host: str, puerto: int) -> ThreadingHTTPServer:
+    """
+    Crea el servidor HTTP (sin arrancarlo)
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        host: Dirección en la que escuchar
+        puerto: Puerto TCP (0 para uno libre)
+
+    Returns:
+        ThreadingHTTPServer: Servidor listo para serve_forever()
+    """
+    manejador = type("ManejadorAPIMonitor", (ManejadorAPI,), {"api": APIMonitor(directorio_datos)})
+    servidor = ThreadingHTTPServer((host, puerto), manejador)
+    servidor.daemon_threads = True
+    return servidor
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice de sesiones guardadas para el Monitor de Instagram
+Recuerda dónde está cada sesión y cuándo se validó por última vez, para
+reutilizarla sin consultar a Instagram mientras esté dentro de la ventana de
+frescura (VENTANA_FRESCURA_SESION en config.py). Varios procesos comparten el
+índice: cada cambio lo relee y lo guarda bajo un bloqueo común
+"""
+
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+from utils import ModuloDiferido, escribir_json_atomico
+
+# Los bloqueos entre procesos solo hacen falta al escribir el índice
+bloqueos = ModuloDiferido("bloqueos")
+
+ARCHIVO_INDICE_SESIONES = "indice_sesiones.json"
+
+
+class GestorSesiones:
+    """Índice persistente de sesiones: usuario → archivo y última validación"""
+
+    def __init__(self, directorio_datos: str):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos de monitoreo
+        """
+        self.directorio_datos = directorio_datos
+        self.ruta_indice = os.path.join(directorio_datos, ARCHIVO_INDICE_SESIONES)
+        self._indice: Optional[Dict[str, Dict]] = None
+
+    @property
+    def indice(self) -> Dict[str, Dict]:
+        """Contenido del índice, cargado (o reconstruido) en el primer acceso"""
+        if self._indice is None:
+            self._indice = self._leer()
+            if self._indice is None:
+                self.reconstruir()
+        return self._indice
+
+    def _leer(self) -> Optional[Dict[str, Dict]]:
+        """Índice guardado en disco o None si no existe o no se puede leer"""
+        try:
+            with open(self.ruta_indice, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _buscar(self, usuario: str) -> Optional[str]:
+        """Archivo de sesión de un usuario según su carpeta datos_monitoreo/<usuario>/sesiones/"""
+        carpeta_sesiones = os.path.join(self.directorio_datos, usuario, "sesiones")
+        if not os.path.isdir(carpeta_sesiones):
+            return None
+        archivos = sorted(f for f in os.listdir(carpeta_sesiones) if f.endswith('_session'))
+        return os.path.join(carpeta_sesiones, archivos[0]) if archivos else None
+
+    def _escanear(self) -> Dict[str, Dict]:
+        """Recorre datos_monitoreo/*/sesiones/ y devuelve el índice resultante"""
+        indice = {}
+        if os.path.exists(self.directorio_datos):
+            for usuario in os.listdir(self.directorio_datos):
+                ruta = self._buscar(usuario)
+                if ruta is not None:
+                    indice[usuario] = {
+                        "archivo": ruta,
+                        "guardada": os.path.getmtime(ruta),
+                        "ultima_validacion": None
+                    }
+        return indice
+
+    def _modificar(self, cambio: Callable[[Dict[str, Dict]], bool]) -> None:
+        """
+        Aplica un cambio al índice releído del disco bajo un bloqueo común, para no
+        pisar lo que otro proceso haya registrado desde que se cargó. Si el bloqueo
+        no llega a tiempo el cambio queda solo en memoria: el índice es una caché y
+        perder una entrada cuesta como mucho buscarla de nuevo o revalidarla
+
+        Args:
+            cambio: Función que modifica el índice y devuelve True si hay que guardarlo
+        """
+        try:
+            with bloqueos.bloqueo_compartido(self.directorio_datos, "sesiones"):
+                indice = self._leer()
+                self._indice = self._escanear() if indice is None else indice
+                if cambio(self._indice):
+                    self._guardar()
+        except bloqueos.ErrorBloqueo:
+            cambio(self.indice)
+
+    def reconstruir(self) -> None:
+        """Recorre datos_monitoreo/*/sesiones/ una vez para crear el índice"""
+        def sustituir(indice: Dict[str, Dict]) -> bool:
+            indice.clear()
+            indice.update(self._escanear())
+            return True
+        self._indice = {}
+        self._modificar(sustituir)
+
+    def _guardar(self) -> None:
+        """Escribe el índice en disco"""
+        if not os.path.exists(self.directorio_datos):
+            os.makedirs(self.directorio_datos)
+        escribir_json_atomico(self.ruta_indice, self._indice, indent=2)
+
+    def listar(self) -> List[Tuple[str, str]]:
+        """
+        Lista las sesiones cuyo archivo sigue existiendo
+        Si el índice no tiene ninguna se reconstruye recorriendo las carpetas
+
+        Returns:
+            List[Tuple[str, str]]: Pares (usuario, ruta del archivo de sesión)
+        """
+        sesiones = [(usuario, datos["archivo"]) for usuario, datos in sorted(self.indice.items())
+                    if os.path.exists(datos["archivo"])]
+        if not sesiones:
+            self.reconstruir()
+            sesiones = [(usuario, datos["archivo"]) for usuario, datos in sorted(self.indice.items())]
+        return sesiones
+
+    def archivo(self, usuario: str) -> Optional[str]:
+        """
+        Devuelve la ruta del archivo de sesión de un usuario
+        Si el índice no la tiene (p. ej. la guardó otro proceso) se busca en su carpeta
+
+        Args:
+            usuario: Nombre de usuario
+
+        Returns:
+            Optional[str]: Ruta del archivo o None
+        """
+        datos = self.indice.get(usuario)
+        if datos and os.path.exists(datos["archivo"]):
+            return datos["archivo"]
+        ruta = self._buscar(usuario)
+        if ruta is None:
+            return None
+
+        def anadir(indice: Dict[str, Dict]) -> bool:
+            actual = indice.get(usuario)
+            if actual and os.path.exists(actual["archivo"]):
+                return False
+            indice[usuario] = {"archivo": ruta, "guardada": os.path.getmtime(ruta), "ultima_validacion": None}
+            return True
+        self._modificar(anadir)
+        return self.indice[usuario]["archivo"]
+
+    def registrar(self, usuario: str, archivo: str, validada: bool = False) -> None:
+        """
+        Añade o actualiza una sesión en el índice
+
+        Args:
+            usuario: Nombre de usuario
+            archivo: Ruta del archivo de sesión
+            validada: True si la sesión acaba de comprobarse contra Instagram
+        """
+        def actualizar(indice: Dict[str, Dict]) -> bool:
+            anterior = indice.get(usuario, {})
+            indice[usuario] = {
+                "archivo": archivo,
+                "guardada": time.time(),
+                "ultima_validacion": time.time() if validada else anterior.get("ultima_validacion")
+            }
+            return True
+        self._modificar(actualizar)
+
+    def marcar_validada(self, usuario: str) -> None:
+        """Registra que la sesión de un usuario se ha validado ahora"""
+        def marcar(indice: Dict[str, Dict]) -> bool:
+            if usuario not in indice:
+                return False
+            indice[usuario]["ultima_validacion"] = time.time()
+            return True
+        if usuario in self.indice:
+            self._modificar(marcar)
+
+    def invalidar(self, usuario: str) -> None:
+        """Obliga a revalidar la sesión en el próximo uso (tras un error de autenticación)"""
+        def quitar_validacion(indice: Dict[str, Dict]) -> bool:
+            if usuario not in indice or indice[usuario].get("ultima_validacion") is None:
+                return False
+            indice[usuario]["ultima_validacion"] = None
+            return True
+        if self.indice.get(usuario, {}).get("ultima_validacion") is not None:
+            self._modificar(quitar_validacion)
+
+    def esta_fresca(self, usuario: str) -> bool:
+        """
+        Indica si la sesión se validó dentro de la ventana de frescura
+
+        Args:
+            usuario: Nombre de usuario
+
+        Returns:
+            bool: True si se puede usar sin volver a validarla
+        """
+        ultima = self.indice.get(usuario, {}).get("ultima_validacion")
+        return ultima is not None and time.time() - ultima < config.VENTANA_FRESCURA_SESION
+
+    def eliminar(self, usuario: str) -> None:
+        """Quita una sesión del índice"""
+        if usuario in self.indice:
+            self._modificar(lambda indice: indice.pop(usuario, None) is not None)
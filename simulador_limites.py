@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulador de límites de Instagram
+Reproduce en tiempo simulado el calendario de requests del monitor frente a una
+cuota de servidor modelada, para elegir la política de pausas más rápida que no
+provoca bloqueos sin tener que ejecutarla de verdad
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import random
+import statistics
+from collections import deque
+from dataclasses import dataclass, asdict, replace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from colorama import Fore, Style
+import config
+import config_seguridad
+
+
+@dataclass
+class PoliticaLimites:
+    """Parámetros de throttling que aplica el monitor (ver config_seguridad.py)"""
+    nombre: str
+    max_requests_por_minuto: int
+    retardo_min: float
+    retardo_max: float
+    elementos_entre_retardos: int
+    elementos_pausa_larga: int
+    pausa_larga_min: float
+    pausa_larga_max: float
+    espera_bloqueo: float
+
+    @classmethod
+    def desde_config(cls, nombre: str = "actual") -> "PoliticaLimites":
+        """Crea la política con los valores actuales de config_seguridad.py"""
+        return cls(
+            nombre=nombre,
+            max_requests_por_minuto=config_seguridad.MAX_REQUESTS_PER_MINUTE,
+            retardo_min=config_seguridad.MIN_DELAY_BETWEEN_REQUESTS,
+            retardo_max=config_seguridad.MAX_DELAY_BETWEEN_REQUESTS,
+            elementos_entre_retardos=config_seguridad.ELEMENTS_BETWEEN_DELAYS,
+            elementos_pausa_larga=config_seguridad.ELEMENTS_BEFORE_LONG_PAUSE,
+            pausa_larga_min=config_seguridad.LONG_PAUSE_MIN,
+            pausa_larga_max=config_seguridad.LONG_PAUSE_MAX,
+            espera_bloqueo=config_seguridad.RATE_LIMIT_WAIT_TIME,
+        )
+
+
+class CuotaServidor:
+    """Modelo de la cuota del servidor: ventanas deslizantes y castigo por exceso"""
+
+    def __init__(self, ventanas: List[Tuple[float, int]], penalizacion: float):
+        """
+        Args:
+            ventanas: Lista de (duración de la ventana en segundos, máximo de requests)
+            penalizacion: Segundos de bloqueo al superar cualquier ventana
+        """
+        self.ventanas = [(float(duracion), int(maximo)) for duracion, maximo in ventanas]
+        self.penalizacion = penalizacion
+        self.historial = [deque() for _ in self.ventanas]
+        self.bloqueado_hasta = 0.0
+
+    def solicitar(self, ahora: float) -> bool:
+        """
+        Registra una request en el instante dado
+
+        Args:
+            ahora: Tiempo simulado en segundos
+
+        Returns:
+            bool: True si el servidor la acepta, False si responde con bloqueo
+        """
+        if ahora < self.bloqueado_hasta:
+            return False
+
+        for (duracion, maximo), tiempos in zip(self.ventanas, self.historial):
+            while tiempos and tiempos[0] <= ahora - duracion:
+                tiempos.popleft()
+            if len(tiempos) >= maximo:
+                self.bloqueado_hasta = ahora + self.penalizacion
+                return False
+
+        for tiempos in self.historial:
+            tiempos.append(ahora)
+        return True
+
+
+class Simulador:
+    """Bucle de eventos discretos: cada proceso es un generador que cede esperas"""
+
+    def __init__(self):
+        self.ahora = 0.0
+        self._eventos = []
+        self._orden = itertools.count()
+
+    def programar(self, proceso: Iterator[float], retraso: float = 0.0) -> None:
+        """Programa la reanudación de un proceso dentro de `retraso` segundos"""
+        heapq.heappush(self._eventos, (self.ahora + retraso, next(self._orden), proceso))
+
+    def ejecutar(self) -> float:
+        """
+        Ejecuta todos los eventos pendientes
+
+        Returns:
+            float: Tiempo simulado al terminar
+        """
+        while self._eventos:
+            self.ahora, _, proceso = heapq.heappop(self._eventos)
+            try:
+                espera = next(proceso)
+            except StopIteration:
+                continue
+            self.programar(proceso, max(0.0, espera))
+        return self.ahora
+
+
+@dataclass
+class ResultadoSimulacion:
+    """Resultado de simular una política"""
+    politica: str
+    tiempo_total: float = 0.0
+    requests: int = 0
+    eventos_bloqueo: int = 0
+
+
+def _request(sim: Simulador, cuota: CuotaServidor, politica: PoliticaLimites,
+             resultado: ResultadoSimulacion, latencia: float) -> Iterator[float]:
+    """Proceso de una request: reintenta tras la espera de bloqueo como el monitor"""
+    while True:
+        aceptada = cuota.solicitar(sim.ahora)
+        resultado.requests += 1
+        yield latencia
+        if aceptada:
+            return
+        resultado.eventos_bloqueo += 1
+        yield politica.espera_bloqueo
+
+
+def _recorrido(sim: Simulador, cuota: CuotaServidor, politica: PoliticaLimites,
+               calendario: List[Tuple[str, int]], resultado: ResultadoSimulacion,
+               rng: random.Random, tam_pagina: int, latencia: float) -> Iterator[float]:
+    """Reproduce el bucle de obtener_seguidores/obtener_seguidos en tiempo simulado"""
+    # Estado equivalente a requests_count/last_request_time de InstagramMonitor
+    contador = 0
+    ultimo = sim.ahora
+
+    for _, total in calendario:
+        # Consulta del perfil antes de recorrer la lista
+        yield from _request(sim, cuota, politica, resultado, latencia)
+
+        for elemento in range(1, total + 1):
+            if (elemento - 1) % tam_pagina == 0:
+                yield from _request(sim, cuota, politica, resultado, latencia)
+
+            if elemento % politica.elementos_entre_retardos == 0:
+                # Mismo algoritmo que InstagramMonitor._wait_if_needed
+                desde_ultimo = sim.ahora - ultimo
+                if desde_ultimo > 60:
+                    contador = 0
+                if contador >= politica.max_requests_por_minuto:
+                    espera = 60 - desde_ultimo
+                    if espera > 0:
+                        yield espera
+                        contador = 0
+                yield rng.uniform(politica.retardo_min, politica.retardo_max)
+                contador += 1
+                ultimo = sim.ahora
+
+            if elemento % politica.elementos_pausa_larga == 0:
+                yield rng.uniform(politica.pausa_larga_min, politica.pausa_larga_max)
+
+
+def simular(politica: PoliticaLimites, calendario: List[Tuple[str, int]],
+            ventanas: Optional[List[Tuple[float, int]]] = None,
+            penalizacion: Optional[float] = None, semilla: int = 0,
+            tam_pagina: Optional[int] = None,
+            latencia: Optional[float] = None) -> ResultadoSimulacion:
+    """
+    Simula un monitoreo completo con una política dada
+
+    Args:
+        politica: Política de throttling del cliente
+        calendario: Lista de (tipo, total de elementos) a recorrer en orden
+        ventanas: Cuota del servidor (por defecto SIMULATED_SERVER_WINDOWS)
+        penalizacion: Bloqueo del servidor (por defecto SIMULATED_PENALTY_TIME)
+        semilla: Semilla para los retardos aleatorios
+        tam_pagina: Elementos por página (por defecto SIMULATED_PAGE_SIZE)
+        latencia: Latencia por request (por defecto SIMULATED_RESPONSE_LATENCY)
+
+    Returns:
+        ResultadoSimulacion: Tiempo total, requests y bloqueos
+    """
+    cuota = CuotaServidor(
+        ventanas if ventanas is not None else config_seguridad.SIMULATED_SERVER_WINDOWS,
+        penalizacion if penalizacion is not None else config_seguridad.SIMULATED_PENALTY_TIME,
+    )
+    resultado = ResultadoSimulacion(politica=politica.nombre)
+    sim = Simulador()
+    sim.programar(_recorrido(
+        sim, cuota, politica, calendario, resultado, random.Random(semilla),
+        tam_pagina or config_seguridad.SIMULATED_PAGE_SIZE,
+        latencia if latencia is not None else config_seguridad.SIMULATED_RESPONSE_LATENCY,
+    ))
+    resultado.tiempo_total = sim.ejecutar()
+    return resultado
+
+
+def politicas_candidatas() -> List[PoliticaLimites]:
+    """
+    Genera variaciones de la política actual para comparar
+
+    Returns:
+        List[PoliticaLimites]: Política actual seguida de las variaciones
+    """
+    base = PoliticaLimites.desde_config()
+    candidatas = [base]
+    for factor in (0.25, 0.5, 0.75, 1.5):
+        for por_minuto in (10, 15, 20, 30):
+            candidatas.append(replace(
+                base,
+                nombre=f"retardos x{factor}, {por_minuto}/min",
+                max_requests_por_minuto=por_minuto,
+                retardo_min=base.retardo_min * factor,
+                retardo_max=base.retardo_max * factor,
+                pausa_larga_min=base.pausa_larga_min * factor,
+                pausa_larga_max=base.pausa_larga_max * factor,
+            ))
+    return candidatas
+
+
+def comparar_politicas(politicas: List[PoliticaLimites], calendario: List[Tuple[str, int]],
+                       repeticiones: int = 5, **kwargs) -> List[Dict]:
+    """
+    Simula cada política varias veces y resume los resultados
+
+    Args:
+        politicas: Políticas a comparar
+        calendario: Lista de (tipo, total de elementos)
+        repeticiones: Simulaciones por política (con semillas distintas)
+        **kwargs: Parámetros adicionales para simular()
+
+    Returns:
+        List[Dict]: Resumen por política ordenado por tiempo medio
+    """
+    resumen = []
+    for politica in politicas:
+        resultados = [simular(politica, calendario, semilla=semilla, **kwargs)
+                      for semilla in range(repeticiones)]
+        resumen.append({
+            "politica": politica.nombre,
+            "parametros": asdict(politica),
+            "tiempo_medio": statistics.mean(r.tiempo_total for r in resultados),
+            "tiempo_maximo": max(r.tiempo_total for r in resultados),
+            "requests": statistics.mean(r.requests for r in resultados),
+            "eventos_bloqueo": max(r.eventos_bloqueo for r in resultados),
+        })
+    resumen.sort(key=lambda r: r["tiempo_medio"])
+    return resumen
+
+
+def latencia_de_grabacion(nombre: str) -> Optional[float]:
+    """
+    Obtiene la latencia mediana de una grabación de respuestas
+
+    Args:
+        nombre: Nombre de la grabación (ver grabacion.py)
+
+    Returns:
+        Optional[float]: Latencia mediana en segundos o None si no hay datos
+    """
+    from grabacion import cargar_entradas
+
+    duraciones = [e.get("duracion", 0) for e in cargar_entradas(nombre)]
+    return statistics.median(duraciones) if duraciones else None
+
+
+def calendario_de_cuenta(username: str) -> List[Tuple[str, int]]:
+    """
+    Construye el calendario a partir del último snapshot guardado de una cuenta
+
+    Args:
+        username: Cuenta monitoreada
+
+    Returns:
+        List[Tuple[str, int]]: Calendario (vacío si no hay datos)
+    """
+    calendario = []
+    for tipo in ("seguidores", "seguidos"):
+        carpeta = os.path.join(config.DIRECTORIO_DATOS, username, tipo)
+        if not os.path.exists(carpeta):
+            continue
+        archivos = sorted(f for f in os.listdir(carpeta) if f.endswith(f"_{tipo}.json"))
+        if archivos:
+            with open(os.path.join(carpeta, archivos[-1]), 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            calendario.append((tipo, datos.get(f"total_{tipo}", len(datos.get(tipo, [])))))
+    return calendario
+
+
+def formatear_duracion(segundos: float) -> str:
+    """Formatea una duración en horas y minutos"""
+    horas, resto = divmod(int(segundos), 3600)
+    minutos, segs = divmod(resto, 60)
+    if horas:
+        return f"{horas}h {minutos:02d}m"
+    return f"{minutos}m {segs:02d}s"
+
+
+def mostrar_comparacion(resumen: List[Dict]) -> None:
+    """Muestra la tabla de resultados y la política recomendada"""
+    print(f"\n{Fore.CYAN}{'='*72}")
+    print("⏱️ SIMULACIÓN DE POLÍTICAS DE LÍMITES")
+    print(f"{'='*72}{Style.RESET_ALL}")
+    print(f"{'Política':<32}{'Tiempo medio':>14}{'Requests':>10}{'Bloqueos':>10}")
+    for fila in resumen:
+        color = Fore.GREEN if fila["eventos_bloqueo"] == 0 else Fore.RED
+        print(f"{color}{fila['politica']:<32}{formatear_duracion(fila['tiempo_medio']):>14}"
+              f"{fila['requests']:>10.0f}{fila['eventos_bloqueo']:>10}{Style.RESET_ALL}")
+
+    seguras = [f for f in resumen if f["eventos_bloqueo"] == 0]
+    if seguras:
+        mejor = seguras[0]
+        print(f"\n{Fore.GREEN}✅ Recomendada: {mejor['politica']} ({formatear_duracion(mejor['tiempo_medio'])}){Style.RESET_ALL}")
+        for clave, valor in mejor["parametros"].items():
+            if clave != "nombre":
+                print(f"  • {clave}: {valor}")
+    else:
+        print(f"\n{Fore.RED}❌ Ninguna política evita los bloqueos con la cuota simulada{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*72}{Style.RESET_ALL}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Simula políticas de límites sin acceder a Instagram")
+    parser.add_argument("--seguidores", type=int, default=0, help="Seguidores a recorrer")
+    parser.add_argument("--seguidos", type=int, default=0, help="Seguidos a recorrer")
+    parser.add_argument("--cuenta", help="Tomar los tamaños del último snapshot de esta cuenta")
+    parser.add_argument("--grabacion", help="Tomar la latencia de esta grabación")
+    parser.add_argument("--politicas", help="Archivo JSON con una lista de políticas a comparar")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    calendario = calendario_de_cuenta(args.cuenta) if args.cuenta else []
+    if not calendario:
+        calendario = [(t, n) for t, n in (("seguidores", args.seguidores), ("seguidos", args.seguidos)) if n > 0]
+    if not calendario:
+        print(f"{Fore.RED}❌ Indica --seguidores/--seguidos o una --cuenta con datos guardados{Style.RESET_ALL}")
+        return 1
+
+    if args.politicas:
+        with open(args.politicas, 'r', encoding='utf-8') as f:
+            base = asdict(PoliticaLimites.desde_config())
+            politicas = [PoliticaLimites(**{**base, **p}) for p in json.load(f)]
+    else:
+        politicas = politicas_candidatas()
+
+    kwargs = {}
+    if args.grabacion:
+        latencia = latencia_de_grabacion(args.grabacion)
+        if latencia is not None:
+            kwargs["latencia"] = latencia
+
+    mostrar_comparacion(comparar_politicas(politicas, calendario, args.repeticiones, **kwargs))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Solapamiento de audiencias entre cuentas monitoreadas
+Calcula la intersección y el índice de Jaccard de los seguidores de N cuentas a
+partir de los snapshots guardados, sin ninguna consulta a Instagram. Las cuentas
+pequeñas se comparan de forma exacta; las grandes con bosquejos MinHash de tipo
+bottom-k que se guardan junto a cada snapshot
+"""
+
+import csv
+import hashlib
+import heapq
+import json
+import os
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set
+
+import config
+from indice_membresia import listar_snapshots
+from utils import escribir_json_atomico
+
+SUFIJO_BOSQUEJO = "_seguidores_minhash.json"
+
+
+def hash_usuario(username: str) -> int:
+    """Hash estable de 64 bits de un nombre de usuario"""
+    return int.from_bytes(hashlib.blake2b(username.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def calcular_bosquejo(usuarios: Iterable[str], tamano: Optional[int] = None) -> Dict:
+    """
+    Calcula el bosquejo bottom-k de un conjunto de usuarios
+
+    Args:
+        usuarios: Usuarios del conjunto
+        tamano: Número de hashes a conservar (por defecto, config.TAMANO_BOSQUEJO)
+
+    Returns:
+        Dict: {"total": tamaño exacto del conjunto, "k": tamaño, "hashes": menores hashes ordenados}
+    """
+    tamano = tamano or config.TAMANO_BOSQUEJO
+    usuarios = set(usuarios)
+    return {
+        "total": len(usuarios),
+        "k": tamano,
+        "hashes": heapq.nsmallest(tamano, (hash_usuario(u) for u in usuarios))
+    }
+
+
+def ruta_bosquejo(ruta_snapshot: str) -> str:
+    """Ruta del bosquejo que acompaña a un snapshot de seguidores"""
+    return ruta_snapshot[:-len("_seguidores.json")] + SUFIJO_BOSQUEJO
+
+
+def guardar_bosquejo(ruta_snapshot: str, usuarios: Iterable[str]) -> Dict:
+    """
+    Calcula y guarda el bosquejo de un snapshot de seguidores
+
+    Args:
+        ruta_snapshot: Ruta del archivo <ts>_seguidores.json
+        usuarios: Seguidores del snapshot
+
+    Returns:
+        Dict: Bosquejo guardado
+    """
+    bosquejo = calcular_bosquejo(usuarios)
+    escribir_json_atomico(ruta_bosquejo(ruta_snapshot), bosquejo)
+    return bosquejo
+
+
+def estimar_jaccard(hashes_a: Set[int], hashes_b: Set[int], k: int) -> float:
+    """
+    Estima el índice de Jaccard a partir de dos bosquejos bottom-k
+
+    Args:
+        hashes_a: Hashes del primer bosquejo
+        hashes_b: Hashes del segundo bosquejo
+        k: Tamaño de los bosquejos
+
+    Returns:
+        float: Jaccard estimado
+    """
+    union = sorted(hashes_a | hashes_b)[:k]
+    if not union:
+        return 0.0
+    limite = union[-1]
+    comunes = sum(1 for h in hashes_a & hashes_b if h <= limite)
+    return comunes / len(union)
+
+
+class AudienciaCuenta:
+    """Seguidores de una cuenta en su último snapshot, exactos o como bosquejo"""
+
+    def __init__(self, directorio_datos: str, cuenta: str, exacto: bool = False):
+        """
+        Args:
+            directorio_datos: Directorio raíz de datos
+            cuenta: Cuenta monitoreada
+            exacto: Cargar siempre la lista completa aunque la cuenta sea grande
+
+        Raises:
+            ValueError: Si la cuenta no tiene snapshots de seguidores
+        """
+        snapshots = listar_snapshots(directorio_datos, cuenta, "seguidores")
+        if not snapshots:
+            raise ValueError(f"No hay snapshots de seguidores de @{cuenta}")
+        self.cuenta = cuenta
+        self.ruta = snapshots[-1]
+        self.seguidores: Optional[Set[str]] = None
+        self.hashes: Optional[Set[int]] = None
+
+        bosquejo = None
+        if not exacto and os.path.exists(ruta_bosquejo(self.ruta)):
+            with open(ruta_bosquejo(self.ruta), 'r', encoding='utf-8') as f:
+                bosquejo = json.load(f)
+        if bosquejo is not None and bosquejo["total"] > config.UMBRAL_SOLAPAMIENTO_EXACTO:
+            self.total = bosquejo["total"]
+            self.hashes = set(bosquejo["hashes"])
+            return
+
+        with open(self.ruta, 'r', encoding='utf-8') as f:
+            self.seguidores = set(json.load(f).get("seguidores", []))
+        self.total = len(self.seguidores)
+        if bosquejo is None and not exacto:
+            bosquejo = guardar_bosquejo(self.ruta, self.seguidores)
+        if bosquejo is not None:
+            self.hashes = set(bosquejo["hashes"])
+
+    @property
+    def es_exacta(self) -> bool:
+        """True si se dispone de la lista completa de seguidores"""
+        return self.seguidores is not None
+
+
+def comparar(a: AudienciaCuenta, b: AudienciaCuenta) -> Dict:
+    """
+    Compara las audiencias de dos cuentas
+
+    Args:
+        a: Primera cuenta
+        b: Segunda cuenta
+
+    Returns:
+        Dict: Tamaños, intersección, Jaccard y si el resultado es exacto
+    """
+    if a.es_exacta and b.es_exacta:
+        interseccion = len(a.seguidores & b.seguidores)
+        union = a.total + b.total - interseccion
+        jaccard = interseccion / union if union else 0.0
+        exacto = True
+    else:
+        jaccard = estimar_jaccard(a.hashes, b.hashes, config.TAMANO_BOSQUEJO)
+        # |A ∩ B| = J · |A ∪ B| y |A ∪ B| = |A| + |B| − |A ∩ B|
+        interseccion = round(jaccard * (a.total + b.total) / (1 + jaccard))
+        exacto = False
+    return {
+        "cuenta_a": a.cuenta,
+        "cuenta_b": b.cuenta,
+        "seguidores_a": a.total,
+        "seguidores_b": b.total,
+        "interseccion": interseccion,
+        "jaccard": round(jaccard, 6),
+        "exacto": exacto
+    }
+
+
+def cuentas_con_datos(directorio_datos: str) -> List[str]:
+    """Lista las cuentas que tienen al menos un snapshot de seguidores"""
+    if not os.path.exists(directorio_datos):
+        return []
+    return [cuenta for cuenta in sorted(os.listdir(directorio_datos))
+            if listar_snapshots(directorio_datos, cuenta, "seguidores")]
+
+
+def matriz_solapamiento(directorio_datos: str, cuentas: Optional[List[str]] = None,
+                        exacto: bool = False) -> List[Dict]:
+    """
+    Calcula el solapamiento de todas las parejas de cuentas
+
+    Args:
+        directorio_datos: Directorio raíz de datos
+        cuentas: Cuentas a comparar (por defecto, todas las que tienen datos)
+        exacto: Comparar siempre con las listas completas
+
+    Returns:
+        List[Dict]: Una fila por pareja (ver comparar)
+
+    Raises:
+        ValueError: Si alguna cuenta no tiene datos
+    """
+    cuentas = cuentas or cuentas_con_datos(directorio_datos)
+    audiencias = [AudienciaCuenta(directorio_datos, cuenta, exacto) for cuenta in cuentas]
+    return [comparar(a, b) for a, b in combinations(audiencias, 2)]
+
+
+def exportar_matriz(filas: List[Dict], ruta: str) -> None:
+    """
+    Exporta las parejas a CSV o JSONL según la extensión del archivo
+
+    Args:
+        filas: Resultado de matriz_solapamiento
+        ruta: Archivo de salida (.csv o .jsonl)
+    """
+    campos = ["cuenta_a", "cuenta_b", "seguidores_a", "seguidores_b", "interseccion", "jaccard", "exacto"]
+    if ruta.endswith(".csv"):
+        with open(ruta, 'w', encoding='utf-8', newline='') as f:
+            escritor = csv.DictWriter(f, fieldnames=campos)
+            escritor.writeheader()
+            escritor.writerows(filas)
+    else:
+        with open(ruta, 'w', encoding='utf-8') as f:
+            for fila in filas:
+                f.write(json.dumps(fila, ensure_ascii=False) + "\n")
@@ -0,0 +1,80 @@
+"""
+Pruebas de la analítica de abandono cuando el índice de membresía se reconstruye
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+
+import pytest
+
+from analitica import AnaliticaCuenta
+from indice_membresia import carpeta_indices
+from instagram_monitor import InstagramMonitor
+
+CUENTA = "cuenta"
+
+
+def _monitoreo(monitor, timestamp, seguidores):
+    """Guarda un snapshot y actualiza índice y analítica como _monitorear"""
+    anteriores = monitor.cargar_datos_anteriores(CUENTA)
+    reporte = monitor.generar_reporte_cambios(CUENTA, anteriores, set(seguidores), {"x"}, timestamp)
+    monitor.guardar_datos_actuales(CUENTA, set(seguidores), {"x"}, timestamp)
+    inicios = monitor.actualizar_indice_membresia(CUENTA, reporte, timestamp, set(seguidores), {"x"})
+    monitor.actualizar_analitica(CUENTA, reporte, timestamp, len(seguidores), inicios)
+    return inicios
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    return InstagramMonitor(str(tmp_path / "datos_monitoreo"))
+
+
+def test_fechas_de_alta_tras_reconstruir_indice(monitor):
+    _monitoreo(monitor, "2026-01-01_10-00-00", ["a", "b"])
+    _monitoreo(monitor, "2026-01-05_10-00-00", ["a", "b", "c"])
+    shutil.rmtree(os.path.join(carpeta_indices(monitor.directorio_datos, CUENTA), "membresia"))
+
+    inicios = _monitoreo(monitor, "2026-01-20_10-00-00", ["a"])
+
+    assert inicios["seguidores"] == {"b": "2026-01-01_10-00-00", "c": "2026-01-05_10-00-00"}
+    estado = AnaliticaCuenta(monitor.directorio_datos, CUENTA).estado
+    assert estado["seguidores"] == 1
+    assert {dia: n for dia, n in estado["altas_activas"].items() if n} == {"2026-01-01": 1}
+    assert estado["permanencia_bajas"] == {"15": 1}
+
+
+def test_bajas_sin_fecha_de_alta_no_tocan_las_altas_activas(tmp_path):
+    analitica = AnaliticaCuenta(str(tmp_path), CUENTA)
+    analitica.inicializar("2026-01-01_10-00-00", 2)
+    analitica.aplicar("2026-01-02_10-00-00", 1, [None])
+
+    assert analitica.estado["altas_activas"] == {"2026-01-01": 2, "2026-01-02": 1}
+    assert analitica.estado["permanencia_bajas"] == {}
+
+
+def _exportacion(carpeta, seguidores):
+    """Descarga de datos de Instagram en JSON con fechas de inicio (epoch o None)"""
+    relaciones = carpeta / "connections" / "followers_and_following"
+    relaciones.mkdir(parents=True)
+    entradas = [{"string_list_data": [{"value": username, "timestamp": momento}]}
+                for username, momento in seguidores.items()]
+    (relaciones / "followers_1.json").write_text(json.dumps(entradas), encoding="utf-8")
+    (relaciones / "following.json").write_text(json.dumps(
+        {"relationships_following": [{"string_list_data": [{"value": "x", "timestamp": None}]}]}), encoding="utf-8")
+    return str(carpeta)
+
+
+def test_bajas_con_fecha_importada_salen_de_la_cohorte_inicial(monitor, tmp_path):
+    desde_2020 = datetime(2020, 3, 1).timestamp()
+    desde_2021 = datetime(2021, 6, 1).timestamp()
+    exportacion = _exportacion(tmp_path / "exportacion", {"a": desde_2020, "b": desde_2021, "c": None})
+    assert monitor.importar_descarga(exportacion, cuenta=CUENTA, fecha="2026-01-01 10:00")
+
+    _monitoreo(monitor, "2026-01-10_10-00-00", ["c"])
+
+    analitica = AnaliticaCuenta(monitor.directorio_datos, CUENTA)
+    assert analitica.estado["seguidores"] == 1
+    assert {dia: n for dia, n in analitica.estado["altas_activas"].items() if n} == {"2026-01-01": 1}
+    assert analitica.resumen()["permanencia_mediana_dias"] == 9
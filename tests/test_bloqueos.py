@@ -0,0 +1,88 @@
+"""
+Pruebas de las concesiones entre procesos
+"""
+
+import os
+import time
+
+import pytest
+
+import bloqueos
+from bloqueos import Bloqueo
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / "cuenta" / ".bloqueo")
+
+
+def test_windows_no_sondea_el_pid(ruta, monkeypatch):
+    otro = Bloqueo(ruta)
+    concesion = dict(otro._datos(), pid=999999)
+
+    def kill(*args):
+        raise AssertionError("os.kill no es una sonda de procesos en Windows")
+    monkeypatch.setattr(bloqueos.os, "kill", kill)
+    monkeypatch.setattr(bloqueos.os, "name", "nt")
+
+    assert not Bloqueo(ruta)._caducada(concesion)
+    assert Bloqueo(ruta)._caducada(dict(concesion, expira=time.time() - 1))
+
+
+def _congelar(bloqueo):
+    """Detiene el latido, como un proceso de otra máquina que dejó de responder"""
+    bloqueo._parar.set()
+    bloqueo._latido.join()
+
+
+def test_concesion_caducada_la_toma_otro(ruta):
+    primero = Bloqueo(ruta, duracion=0.3, espera=0)
+    assert primero.adquirir()
+    _congelar(primero)
+    segundo = Bloqueo(ruta, duracion=5, espera=0)
+    assert not segundo.adquirir()
+
+    time.sleep(0.4)
+
+    assert segundo.adquirir()
+    assert segundo.vigente()
+    assert not primero.vigente()
+    assert not primero.renovar()
+    assert primero.perdido
+    assert segundo.propietario() == segundo.token
+    primero.liberar()
+    assert os.path.exists(ruta)
+    segundo.liberar()
+    assert not os.path.exists(ruta)
+
+
+def test_renovar_no_pisa_una_concesion_tomada_entretanto(ruta, monkeypatch):
+    primero = Bloqueo(ruta, duracion=0.3, espera=0)
+    assert primero.adquirir()
+    _congelar(primero)
+    leida = primero._leer()
+    time.sleep(0.4)
+    segundo = Bloqueo(ruta, duracion=5, espera=0)
+    assert segundo.adquirir()
+
+    # primero leyó su concesión justo antes de que segundo la tomara
+    monkeypatch.setattr(primero, "_leer", lambda: dict(leida))
+
+    assert not primero.renovar()
+    assert primero.perdido
+    assert segundo.vigente()
+    assert sorted(os.listdir(os.path.dirname(ruta))) == [".bloqueo", ".bloqueo.lock"]
+    segundo.liberar()
+
+
+def test_renovar_alarga_la_concesion_propia(ruta):
+    bloqueo = Bloqueo(ruta, duracion=0.3, espera=0)
+    assert bloqueo.adquirir()
+    _congelar(bloqueo)
+    antes = bloqueo._leer()["expira"]
+
+    assert bloqueo.renovar()
+
+    assert bloqueo._leer()["expira"] > antes
+    assert bloqueo.vigente()
+    bloqueo.liberar()
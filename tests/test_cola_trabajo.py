@@ -0,0 +1,119 @@
+"""
+Pruebas de la cola de trabajo compartida con varios procesos trabajadores
+"""
+
+import multiprocessing
+import os
+import time
+
+import pytest
+
+import config
+from cola_trabajo import DESCARTADO, PENDIENTE, TERMINADO, ColaTrabajo
+from resultados import COMPLETADO, ResultadoMonitoreo
+
+VISIBILIDAD = 1.0
+REINTENTO_BASE = 0.05
+TRABAJADORES = 4
+
+
+def _trabajador(directorio, nombre, modo, tomados, limite):
+    """
+    Procesa la cola hasta que no queden trabajos activos
+
+    modo: "terminar" cierra cada trabajo con éxito, "fallar" lo cierra con error y
+    "abandonar" toma uno y muere sin cerrarlo (como un trabajador caído)
+    """
+    config.COLA_REINTENTO_BASE = REINTENTO_BASE
+    cola = ColaTrabajo(directorio, visibilidad=VISIBILIDAD)
+    while time.time() < limite:
+        trabajo = cola.tomar(nombre)
+        if trabajo is None:
+            activos = cola.estado()
+            if not activos[PENDIENTE] and not activos["en_curso"]:
+                return
+            time.sleep(0.01)
+            continue
+        tomados.put((nombre, trabajo["id"], trabajo["intentos"]))
+        if modo == "abandonar":
+            os._exit(0)
+        if modo == "terminar":
+            time.sleep(0.01)
+            cola.terminar(trabajo, ResultadoMonitoreo(cuenta=trabajo["cuenta"], estado=COMPLETADO))
+        else:
+            cola.fallar(trabajo, "error de prueba")
+
+
+def _lanzar(directorio, modo, tomados, cantidad=TRABAJADORES, espera=30):
+    limite = time.time() + espera
+    procesos = [multiprocessing.Process(target=_trabajador, args=(directorio, f"t{i}", modo, tomados, limite))
+                for i in range(cantidad)]
+    for proceso in procesos:
+        proceso.start()
+    for proceso in procesos:
+        proceso.join(espera)
+        assert proceso.exitcode == 0
+    registros = []
+    while not tomados.empty():
+        registros.append(tomados.get())
+    return registros
+
+
+@pytest.fixture
+def directorio(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "COLA_REINTENTO_BASE", REINTENTO_BASE)
+    return str(tmp_path / "datos_monitoreo")
+
+
+@pytest.fixture
+def tomados():
+    return multiprocessing.Manager().Queue()
+
+
+def test_cada_trabajo_se_toma_una_vez(directorio, tomados):
+    cola = ColaTrabajo(directorio, visibilidad=VISIBILIDAD)
+    cuentas = [f"cuenta{i}" for i in range(40)]
+    assert cola.encolar(cuentas) == len(cuentas)
+
+    registros = _lanzar(directorio, "terminar", tomados)
+
+    ids = [trabajo for _, trabajo, _ in registros]
+    assert len(ids) == len(cuentas)
+    assert len(set(ids)) == len(cuentas)
+    assert len({nombre for nombre, _, _ in registros}) > 1
+    assert cola.estado()[TERMINADO] == len(cuentas)
+    for trabajo in cola.trabajos(limite=len(cuentas)):
+        assert trabajo["intentos"] == 1
+        assert len(cola.ejecuciones(trabajo["id"])) == 1
+
+
+def test_concesion_caducada_se_vuelve_a_tomar(directorio, tomados):
+    cola = ColaTrabajo(directorio, visibilidad=VISIBILIDAD)
+    cola.encolar(["cuenta"])
+
+    [(_, trabajo, _)] = _lanzar(directorio, "abandonar", tomados, cantidad=1)
+    # Mientras la concesión sigue viva nadie más puede tomarlo
+    assert cola.tomar("otro") is None
+
+    time.sleep(VISIBILIDAD + 0.2)
+    registros = _lanzar(directorio, "terminar", tomados)
+
+    assert [(id_, intentos) for _, id_, intentos in registros] == [(trabajo, 2)]
+    assert cola.estado()[TERMINADO] == 1
+    assert [e["trabajador"] for e in cola.ejecuciones(trabajo)][0] == "t0"
+
+
+def test_fallos_se_descartan_al_agotar_intentos(directorio, tomados):
+    cola = ColaTrabajo(directorio, visibilidad=VISIBILIDAD)
+    cuentas = [f"cuenta{i}" for i in range(6)]
+    cola.encolar(cuentas, max_intentos=3)
+
+    registros = _lanzar(directorio, "fallar", tomados)
+
+    assert len(registros) == len(cuentas) * 3
+    assert cola.estado()[DESCARTADO] == len(cuentas)
+    for trabajo in cola.trabajos(limite=len(cuentas)):
+        assert trabajo["intentos"] == 3
+        assert trabajo["error"] == "error de prueba"
+        assert [e["estado"] for e in cola.ejecuciones(trabajo["id"])] == ["fallido"] * 3
+    assert cola.tomar("otro") is None
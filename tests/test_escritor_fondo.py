@@ -0,0 +1,81 @@
+"""
+Pruebas del escritor en segundo plano: agrupación por ruta, descartar y vaciar
+"""
+
+import json
+import threading
+
+import pytest
+
+import escritor_fondo
+from escritor_fondo import EscritorFondo
+
+
+@pytest.fixture
+def escrituras(monkeypatch):
+    """Sustituye la escritura por una lista; la primera se queda esperando hasta soltar()"""
+    hechas = []
+    empezada, soltar = threading.Event(), threading.Event()
+
+    def escribir(ruta, datos, **opciones):
+        empezada.set()
+        soltar.wait(5)
+        hechas.append((ruta, datos))
+
+    monkeypatch.setattr(escritor_fondo, "escribir_json_atomico", escribir)
+    return hechas, empezada, soltar
+
+
+def test_escrituras_de_una_ruta_se_agrupan_en_la_ultima(escrituras):
+    hechas, empezada, soltar = escrituras
+    escritor = EscritorFondo()
+    escritor.encolar("a", 1)
+    assert empezada.wait(5)
+
+    escritor.encolar("b", 1)
+    escritor.encolar("c", 1)
+    escritor.encolar("b", 2)
+    escritor.encolar("a", 2)
+    assert escritor.pendientes() == 4
+
+    soltar.set()
+    assert escritor.vaciar(5) == []
+    # "a" vuelve a escribirse porque su primera escritura ya estaba en curso
+    assert hechas == [("a", 1), ("c", 1), ("b", 2), ("a", 2)]
+    assert escritor.pendientes() == 0
+
+
+def test_descartar_anula_lo_pendiente_y_vaciar_lo_escribe(escrituras):
+    hechas, empezada, soltar = escrituras
+    escritor = EscritorFondo()
+    escritor.encolar("a", 1)
+    assert empezada.wait(5)
+    escritor.encolar("b", 1)
+    escritor.encolar("c", 1)
+
+    # La escritura en curso no se puede anular
+    assert not escritor.descartar("a")
+    assert escritor.descartar("b")
+    assert not escritor.descartar("b")
+
+    soltar.set()
+    escritor.vaciar(5)
+    assert hechas == [("a", 1), ("c", 1)]
+
+
+def test_vaciar_devuelve_los_errores_y_avisa_a_al_terminar(tmp_path):
+    avisos = []
+    escritor = EscritorFondo(al_terminar=lambda ruta, contexto, error: avisos.append((contexto, error)))
+    buena = tmp_path / "buena.json"
+    escritor.encolar(str(buena), {"x": 1}, contexto="buena")
+    # Un conjunto no se puede serializar como JSON
+    escritor.encolar(str(tmp_path / "mala.json"), {"x": {2}}, contexto="mala")
+
+    errores = escritor.vaciar(5)
+
+    assert json.loads(buena.read_text(encoding='utf-8')) == {"x": 1}
+    assert [ruta for ruta, _ in errores] == [str(tmp_path / "mala.json")]
+    assert isinstance(errores[0][1], TypeError)
+    assert [(contexto, error is None) for contexto, error in avisos] == [("buena", True), ("mala", False)]
+    # Los errores se entregan una sola vez
+    assert escritor.vaciar(5) == []
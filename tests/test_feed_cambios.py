@@ -0,0 +1,65 @@
+"""
+Pruebas del registro de cambios: offsets, segmentos y líneas cortadas
+"""
+
+import config
+from feed_cambios import FeedCambios
+
+
+def _reporte(timestamp, nuevos=(), perdidos=(), cuenta="cuenta"):
+    return {
+        "username": cuenta,
+        "timestamp": timestamp,
+        "cambios_seguidores": {"nuevos": list(nuevos), "perdidos": list(perdidos)},
+        "cambios_seguidos": {"nuevos": [], "eliminados": []},
+    }
+
+
+def test_offsets_consecutivos_y_lectura_desde_offset(tmp_path):
+    feed = FeedCambios(str(tmp_path))
+    assert feed.publicar(_reporte("2026-01-01_10-00-00", nuevos=["a", "b"])) == 2
+    assert feed.publicar(_reporte("2026-01-01_11-00-00", perdidos=["a"], nuevos=["c"])) == 2
+    # Un reporte ya publicado no se repite
+    assert feed.publicar(_reporte("2026-01-01_11-00-00", nuevos=["c"])) == 0
+
+    eventos = list(feed.leer())
+    assert [e["offset"] for e in eventos] == [0, 1, 2, 3]
+    assert [(e["usuario"], e["tipo"]) for e in eventos] == [("a", "alta"), ("b", "alta"), ("c", "alta"), ("a", "baja")]
+    assert [e["offset"] for e in feed.leer(2)] == [2, 3]
+    assert [e["offset"] for e in feed.leer(1, maximo=2)] == [1, 2]
+
+    feed.confirmar("lector", 3)
+    assert FeedCambios(str(tmp_path)).consumidores() == {"lector": 3}
+
+
+def test_rotacion_de_segmentos(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "FEED_TAMANO_SEGMENTO", 200)
+    feed = FeedCambios(str(tmp_path))
+    for hora in range(6):
+        feed.publicar(_reporte(f"2026-01-01_{10 + hora:02d}-00-00", nuevos=[f"u{hora}a", f"u{hora}b"]))
+
+    segmentos = feed.segmentos()
+    assert len(segmentos) > 1
+    assert segmentos[0] == 0
+    # Cada segmento se llama como su primer evento
+    for inicio in segmentos:
+        assert next(feed.leer(inicio))["offset"] == inicio
+    assert [e["offset"] for e in feed.leer()] == list(range(12))
+    assert [e["offset"] for e in feed.leer(segmentos[-1] + 1)] == list(range(segmentos[-1] + 1, 12))
+    assert feed.siguiente_offset() == 12
+
+
+def test_linea_cortada_se_descarta_y_no_rompe_el_offset(tmp_path):
+    feed = FeedCambios(str(tmp_path))
+    feed.publicar(_reporte("2026-01-01_10-00-00", nuevos=["a", "b"]))
+    ruta = feed._ruta_segmento(0)
+    with open(ruta, 'a', encoding='utf-8') as f:
+        f.write('{"offset": 2, "usu')
+
+    # La lectura no entrega la línea a medias
+    assert [e["offset"] for e in feed.leer()] == [0, 1]
+
+    feed.publicar(_reporte("2026-01-01_11-00-00", nuevos=["c"]))
+    assert [(e["offset"], e["usuario"]) for e in feed.leer()] == [(0, "a"), (1, "b"), (2, "c")]
+    with open(ruta, encoding='utf-8') as f:
+        assert all(linea.endswith("}\n") for linea in f)
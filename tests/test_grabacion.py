@@ -0,0 +1,82 @@
+"""
+Pruebas de la grabación y reproducción de respuestas
+"""
+
+import gzip
+import json
+import socket
+
+import instaloader
+import pytest
+
+import config
+from grabacion import (ARCHIVO_META, ARCHIVO_RESPUESTAS, VALOR_OCULTO, ReproductorRespuestas, generar_clave,
+                       sanitizar)
+
+DOC_ID = "17851374694183129"
+VARIABLES = {"id": "123", "first": 50}
+
+
+@pytest.fixture
+def grabacion(tmp_path, monkeypatch):
+    """Grabación con la respuesta de una consulta doc_id"""
+    monkeypatch.setattr(config, "DIRECTORIO_GRABACIONES", str(tmp_path))
+    carpeta = tmp_path / "prueba"
+    carpeta.mkdir()
+    params = {"variables": json.dumps(VARIABLES, separators=(",", ":")),
+              "doc_id": DOC_ID, "server_timestamps": "true"}
+    entrada = {"clave": generar_clave("graphql/query", params, "www.instagram.com"),
+               "inicio": 0, "duracion": 0, "error": None,
+               "respuesta": {"status": "ok", "data": {"user": {"id": "123"}}}}
+    with gzip.open(carpeta / ARCHIVO_RESPUESTAS, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(entrada) + "\n")
+    (carpeta / ARCHIVO_META).write_text(json.dumps({"usuario_sesion": "grabador"}), encoding="utf-8")
+    return "prueba"
+
+
+@pytest.fixture
+def sin_red(monkeypatch):
+    """Cualquier conexión de red hace fallar la prueba"""
+    def conectar(*args, **kwargs):
+        raise AssertionError("la reproducción intentó acceder a la red")
+    monkeypatch.setattr(socket.socket, "connect", conectar)
+    monkeypatch.setattr(socket, "create_connection", conectar)
+
+
+def test_reproduccion_doc_id_sin_red(grabacion, sin_red):
+    contexto = instaloader.Instaloader(quiet=True).context
+    reproductor = ReproductorRespuestas(grabacion, escala=0)
+    reproductor.instalar(contexto)
+
+    respuesta = contexto.doc_id_graphql_query(DOC_ID, VARIABLES)
+
+    assert respuesta["data"]["user"]["id"] == "123"
+    assert reproductor.servidas == 1
+    assert reproductor.faltantes == 0
+
+
+def test_reproduccion_bloquea_peticiones_directas(grabacion, sin_red):
+    contexto = instaloader.Instaloader(quiet=True).context
+    reproductor = ReproductorRespuestas(grabacion, escala=0)
+    reproductor.instalar(contexto)
+
+    with pytest.raises(instaloader.exceptions.ConnectionException):
+        contexto._session.get("https://www.instagram.com/")
+    assert reproductor.faltantes == 1
+
+
+def test_sanitizar_conserva_la_estructura():
+    respuesta = {"data": {"viewer": {"user": {"id": "1", "edge_follow": {"count": 3}}},
+                          "user": {"fbid": 99, "email": "a@b.c", "is_private": False, "viewer_id": None}},
+                 "csrf_token": "abc"}
+
+    limpia = sanitizar(respuesta)
+
+    assert limpia["data"]["viewer"] == respuesta["data"]["viewer"]
+    assert limpia["data"]["user"] == {"fbid": 0, "email": VALOR_OCULTO, "is_private": False, "viewer_id": None}
+    assert limpia["csrf_token"] == VALOR_OCULTO
+
+
+def test_generar_clave_ignora_tokens():
+    assert generar_clave("graphql/query", {"doc_id": "1", "csrftoken": "x"}, "h") == \
+        generar_clave("graphql/query", {"doc_id": "1"}, "h")
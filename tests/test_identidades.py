@@ -0,0 +1,50 @@
+"""
+Pruebas de la comparación de usuarios por ID numérico
+"""
+
+from identidades import ConjuntoUsuarios, comparar_usuarios, usuarios_de_snapshot
+
+
+def _conjunto(**ids):
+    return ConjuntoUsuarios(ids, ids)
+
+
+def test_cambio_de_nombre_no_cuenta_como_baja_y_alta():
+    anteriores = _conjunto(ana=1, beto=2, carla=3)
+    actuales = _conjunto(ana=1, beto_nuevo=2, dani=4)
+
+    nuevos, perdidos, renombres = comparar_usuarios(anteriores, actuales)
+
+    assert nuevos == {"dani"}
+    assert perdidos == {"carla"}
+    assert renombres == [{"id": 2, "anterior": "beto", "actual": "beto_nuevo"}]
+
+
+def test_nombre_reutilizado_por_otra_cuenta_es_baja_y_alta():
+    # "beto" cambió de nombre y otra persona ocupó el suyo
+    anteriores = _conjunto(beto=2)
+    actuales = _conjunto(beto=9, beto_nuevo=2)
+
+    nuevos, perdidos, renombres = comparar_usuarios(anteriores, actuales)
+
+    assert nuevos == {"beto"}
+    assert perdidos == set()
+    assert renombres == [{"id": 2, "anterior": "beto", "actual": "beto_nuevo"}]
+
+
+def test_ids_parciales_comparan_por_nombre_y_corrigen_renombres():
+    anteriores = ConjuntoUsuarios(["ana", "beto", "carla"], {"beto": 2})
+    actuales = ConjuntoUsuarios(["ana", "beto_nuevo", "dani"], {"beto_nuevo": 2})
+
+    nuevos, perdidos, renombres = comparar_usuarios(anteriores, actuales)
+
+    assert nuevos == {"dani"}
+    assert perdidos == {"carla"}
+    assert renombres == [{"id": 2, "anterior": "beto", "actual": "beto_nuevo"}]
+
+
+def test_snapshot_antiguo_sin_ids_compara_por_nombre():
+    anteriores = usuarios_de_snapshot({"seguidores": ["ana", "beto"]}, "seguidores")
+    actuales = _conjunto(ana=1, beto_nuevo=2)
+
+    assert comparar_usuarios(anteriores, actuales) == ({"beto_nuevo"}, {"beto"}, [])
@@ -0,0 +1,97 @@
+"""
+Pruebas del índice invertido de audiencias
+"""
+
+import os
+import random
+from collections import Counter
+
+import pytest
+
+from indice_invertido import IndiceInvertido
+
+TIMESTAMP = "2026-01-01_10-00-00"
+
+
+@pytest.fixture
+def directorio(tmp_path):
+    return str(tmp_path)
+
+
+def test_linea_cortada_de_usuarios_no_desplaza_los_ids(directorio):
+    indice = IndiceInvertido(directorio)
+    indice.establecer("a", ["u0", "u1"], TIMESTAMP)
+    indice.guardar()
+    # Un guardado interrumpido dejó medio nombre sin salto de línea
+    with open(indice.ruta_usuarios, 'a', encoding='utf-8') as f:
+        f.write("cort")
+
+    indice = IndiceInvertido(directorio)
+    assert indice.nombres(indice.bits("a")) == ["u0", "u1"]
+    indice.establecer("b", ["u1", "u2"], TIMESTAMP)
+    indice.guardar()
+
+    indice = IndiceInvertido(directorio)
+    assert indice.usuarios == ["u0", "u1", "u2"]
+    assert indice.nombres(indice.bits("a")) == ["u0", "u1"]
+    assert indice.nombres(indice.bits("b")) == ["u1", "u2"]
+    with open(os.path.join(directorio, "indice_invertido", "usuarios.txt"), encoding='utf-8') as f:
+        assert f.read() == "u0\nu1\nu2\n"
+
+
+@pytest.fixture
+def audiencias(directorio):
+    """Nueve cuentas con seguidores aleatorios (contadores de 0 a 9: cuatro rebanadas)"""
+    azar = random.Random(7)
+    usuarios = [f"u{i}" for i in range(300)]
+    seguidores = {f"c{c}": {u for u in usuarios if azar.random() < 0.15 + 0.09 * c} for c in range(9)}
+    seguidores["c8"].update(usuarios[:3])
+    for c in range(8):
+        seguidores[f"c{c}"].add("u0")
+    indice = IndiceInvertido(directorio)
+    for cuenta, conjunto in seguidores.items():
+        indice.establecer(cuenta, sorted(conjunto), TIMESTAMP)
+    indice.guardar()
+    return IndiceInvertido(directorio), seguidores
+
+
+def _cuentas_por_usuario(seguidores, cuentas):
+    recuento = Counter()
+    for cuenta in cuentas:
+        recuento.update(seguidores[cuenta])
+    return recuento
+
+
+@pytest.mark.parametrize("cuentas", [None, ["c1", "c4", "c7"], ["c8"]])
+def test_con_al_menos_coincide_con_el_recuento_directo(audiencias, cuentas):
+    indice, seguidores = audiencias
+    recuento = _cuentas_por_usuario(seguidores, cuentas or sorted(seguidores))
+    for k in range(1, 11):
+        esperado = {u for u, n in recuento.items() if n >= k}
+        assert set(indice.nombres(indice.con_al_menos(k, cuentas))) == esperado, k
+
+
+def test_top_coincide_con_el_recuento_directo(audiencias):
+    indice, seguidores = audiencias
+    recuento = _cuentas_por_usuario(seguidores, sorted(seguidores))
+    top = indice.top(25)
+    assert len(top) == 25
+    assert top[0] == ("u0", 9)
+    assert all(recuento[u] == n for u, n in top)
+    assert [n for _, n in top] == sorted((n for _, n in top), reverse=True)
+    # Nadie fuera del top sigue a más cuentas que el último del top
+    fuera = set(recuento) - {u for u, _ in top}
+    assert max(recuento[u] for u in fuera) <= top[-1][1]
+
+
+def test_aplicar_cambios_equivale_a_establecer(audiencias, directorio):
+    indice, seguidores = audiencias
+    perdidos = sorted(seguidores["c3"])[:20]
+    nuevos = ["nuevo1", "nuevo2", "u299"]
+    indice.aplicar_cambios("c3", nuevos, perdidos, TIMESTAMP)
+    indice.guardar()
+
+    indice = IndiceInvertido(directorio)
+    esperado = (seguidores["c3"] - set(perdidos)) | set(nuevos)
+    assert set(indice.nombres(indice.bits("c3"))) == esperado
+    assert indice.cuentas_de("nuevo1") == ["c3"]
@@ -0,0 +1,43 @@
+"""
+Pruebas del perfil que la puerta de conteo comparte con las descargas
+"""
+
+from types import SimpleNamespace
+
+import instaloader
+
+import config
+from instagram_monitor import InstagramMonitor
+
+CUENTA = "cuenta"
+
+
+def _usuarios(*nombres):
+    return [SimpleNamespace(username=n, userid=i + 1) for i, n in enumerate(nombres)]
+
+
+def test_puerta_consulta_el_perfil_una_vez_por_monitoreo(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PUERTA_CONTEO", "omitir")
+    monitor = InstagramMonitor(str(tmp_path / "datos_monitoreo"))
+    monitor.sesion_activa = True
+    monkeypatch.setattr(monitor, "_wait_if_needed", lambda: None)
+    monkeypatch.setattr(monitor, "_dormir", lambda segundos: None)
+    monitor.guardar_datos_actuales(CUENTA, {"a"}, {"x"}, "2026-01-01_10-00-00")
+
+    consultas = []
+
+    def perfil(contexto, cuenta):
+        consultas.append(cuenta)
+        return SimpleNamespace(followers=2, followees=1, mediacount=0, is_private=False,
+                               get_followers=lambda: iter(_usuarios("a", "b")),
+                               get_followees=lambda: iter(_usuarios("x")))
+
+    monkeypatch.setattr(instaloader.Profile, "from_username", perfil)
+
+    resultado = monitor.monitorear_perfil(CUENTA)
+    assert resultado.snapshot is not None
+    assert set(resultado.snapshot.seguidores) == {"a", "b"}
+    # Las demás consultas son del enriquecimiento de las altas
+    assert consultas.count(CUENTA) == 1
+    # El siguiente monitoreo vuelve a consultar el perfil
+    assert monitor._perfiles == {}
@@ -0,0 +1,59 @@
+"""
+Pruebas de los ETag y la caché de respuestas de la API HTTP
+"""
+
+import json
+
+import pytest
+
+from servidor_api import APIMonitor
+from utils import escribir_json_atomico
+
+TIMESTAMP = "2026-01-02_10-00-00"
+URL_REPORTE = f"/cuentas/acc/reportes/{TIMESTAMP}"
+
+
+@pytest.fixture
+def api(tmp_path):
+    for tipo, usuarios in (("seguidores", ["a", "b"]), ("seguidos", ["c"])):
+        escribir_json_atomico(str(tmp_path / "acc" / tipo / f"{TIMESTAMP}_{tipo}.json"),
+                              {"timestamp": TIMESTAMP, tipo: usuarios, f"total_{tipo}": len(usuarios)})
+    escribir_json_atomico(str(tmp_path / "acc" / "reportes" / f"{TIMESTAMP}_reporte.json"),
+                          {"timestamp": TIMESTAMP, "estadisticas": {"nuevos": 1}})
+    return APIMonitor(str(tmp_path))
+
+
+def test_etag_repetido_responde_304(api):
+    estado, cabeceras, cuerpo = api.responder("/cuentas/acc/seguidores", None)
+    assert estado == 200
+    assert json.loads(cuerpo)["elementos"] == ["a", "b"]
+
+    estado, repetidas, cuerpo = api.responder("/cuentas/acc/seguidores", cabeceras["ETag"])
+    assert (estado, cuerpo) == (304, b"")
+    assert repetidas["ETag"] == cabeceras["ETag"]
+    assert api.responder("/cuentas/acc/seguidores", '"otro"')[0] == 200
+
+
+def test_snapshot_nuevo_cambia_el_etag(api, tmp_path):
+    _, cabeceras, _ = api.responder("/cuentas/acc", None)
+    escribir_json_atomico(str(tmp_path / "acc" / "seguidores" / "2026-01-03_10-00-00_seguidores.json"),
+                          {"seguidores": ["a"], "total_seguidores": 1})
+
+    estado, nuevas, cuerpo = api.responder("/cuentas/acc", cabeceras["ETag"])
+
+    assert estado == 200
+    assert nuevas["ETag"] != cabeceras["ETag"]
+    assert json.loads(cuerpo)["seguidores"]["total"] == 1
+
+
+def test_reporte_reescrito_se_vuelve_a_servir(api, tmp_path):
+    _, cabeceras, _ = api.responder(URL_REPORTE, None)
+    # Como anotar_ultimo_reporte: el reporte más reciente se reescribe en su sitio
+    escribir_json_atomico(str(tmp_path / "acc" / "reportes" / f"{TIMESTAMP}_reporte.json"),
+                          {"timestamp": TIMESTAMP, "estadisticas": {"nuevos": 1}, "anotaciones": {"a": {}}})
+
+    estado, nuevas, cuerpo = api.responder(URL_REPORTE, cabeceras["ETag"])
+    assert estado == 200
+    assert nuevas["ETag"] != cabeceras["ETag"]
+    assert "anotaciones" in json.loads(cuerpo)
+    assert "anotaciones" in json.loads(api.responder(URL_REPORTE, None)[2])
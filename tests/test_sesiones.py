@@ -0,0 +1,55 @@
+"""
+Pruebas del índice de sesiones compartido entre procesos
+"""
+
+import json
+import os
+
+from sesiones import ARCHIVO_INDICE_SESIONES, GestorSesiones
+
+
+def _sesion(directorio, usuario):
+    carpeta = os.path.join(directorio, usuario, "sesiones")
+    os.makedirs(carpeta, exist_ok=True)
+    ruta = os.path.join(carpeta, f"{usuario}_session")
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write("sesion")
+    return ruta
+
+
+def test_registros_de_dos_procesos_no_se_pisan(tmp_path):
+    directorio = str(tmp_path)
+    primero, segundo = GestorSesiones(directorio), GestorSesiones(directorio)
+    # Ambos cargan el índice (vacío) antes de que el otro escriba
+    assert primero.indice == {} and segundo.indice == {}
+
+    primero.registrar("ana", _sesion(directorio, "ana"), validada=True)
+    segundo.registrar("beto", _sesion(directorio, "beto"))
+    segundo.invalidar("ana")
+
+    with open(os.path.join(directorio, ARCHIVO_INDICE_SESIONES), encoding='utf-8') as f:
+        indice = json.load(f)
+    assert sorted(indice) == ["ana", "beto"]
+    assert indice["ana"]["ultima_validacion"] is None
+
+
+def test_sesion_guardada_por_otro_proceso_se_encuentra_en_su_carpeta(tmp_path):
+    directorio = str(tmp_path)
+    gestor = GestorSesiones(directorio)
+    assert gestor.listar() == []
+
+    ruta = _sesion(directorio, "ana")
+
+    assert gestor.archivo("ana") == ruta
+    assert gestor.archivo("beto") is None
+    assert GestorSesiones(directorio).indice["ana"]["archivo"] == ruta
+
+
+def test_listar_vacio_recorre_las_carpetas(tmp_path):
+    directorio = str(tmp_path)
+    gestor = GestorSesiones(directorio)
+    assert gestor.listar() == []
+
+    ruta = _sesion(directorio, "ana")
+
+    assert gestor.listar() == [("ana", ruta)]
@@ -0,0 +1,29 @@
+"""
+Pruebas del modo de sondeo de contadores
+"""
+
+from types import SimpleNamespace
+
+import instaloader
+
+from instagram_monitor import InstagramMonitor
+from series_contadores import SerieContadores
+
+
+def test_error_de_conexion_guarda_lo_consultado_en_la_ronda(tmp_path, monkeypatch):
+    monitor = InstagramMonitor(str(tmp_path / "datos_monitoreo"))
+    monkeypatch.setattr(monitor, "_wait_if_needed", lambda: None)
+    monkeypatch.setattr(monitor, "_handle_rate_limit_error", lambda mensaje: False)
+
+    def perfil(contexto, cuenta):
+        if cuenta == "caida":
+            raise instaloader.exceptions.ConnectionException("Conexión rechazada")
+        return SimpleNamespace(followers=10, followees=5, mediacount=1)
+
+    monkeypatch.setattr(instaloader.Profile, "from_username", perfil)
+
+    guardadas = monitor.sondear_contadores(["primera", "caida", "ultima"], rondas=3)
+
+    assert guardadas == 1
+    assert SerieContadores(monitor.directorio_datos, "primera").ultima()[1:] == (10, 5, 1)
+    assert SerieContadores(monitor.directorio_datos, "ultima").ultima() is None
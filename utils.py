@@ -7,9 +7,28 @@ Funciones de ayuda y utilidades varias
 
 import os
 import json
+import time
+import importlib
 from datetime import datetime
 from typing import List, Dict, Any
 from colorama import Fore, Style
+import config
+from registro import escribir_en_linea
+
+class ModuloDiferido:
+    """
+    Sustituto de un módulo que solo lo importa al acceder a uno de sus atributos
+    Permite que los comandos que no usan la red no carguen instaloader/requests
+    """
+    
+    def __init__(self, nombre: str):
+        self._nombre = nombre
+        self._modulo = None
+    
+    def __getattr__(self, atributo: str):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nombre)
+        return getattr(self._modulo, atributo)
 
 def formatear_fecha(fecha_iso: str) -> str:
     """
@@ -62,6 +81,44 @@ def limpiar_username(username: str) -> str:
     """
     return username.strip().lstrip('@').lower()
 
+def escribir_atomico(ruta: str, contenido) -> None:
+    """
+    Escribe un archivo completo de forma atómica: primero en un temporal de la misma
+    carpeta y después lo renombra. Un lector (u otro proceso) ve el archivo anterior
+    o el nuevo, nunca uno a medias, aunque el proceso muera durante la escritura
+    
+    Args:
+        ruta: Archivo de destino
+        contenido: Texto (se guarda en UTF-8) o bytes
+    """
+    carpeta = os.path.dirname(ruta) or "."
+    if not os.path.exists(carpeta):
+        os.makedirs(carpeta, exist_ok=True)
+    temporal = os.path.join(carpeta, f".{os.path.basename(ruta)}.{os.getpid()}.{time.monotonic_ns()}.tmp")
+    datos = contenido.encode('utf-8') if isinstance(contenido, str) else contenido
+    try:
+        with open(temporal, 'wb') as f:
+            f.write(datos)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+def escribir_json_atomico(ruta: str, datos: Any, **opciones) -> None:
+    """
+    Guarda un objeto como JSON con escribir_atomico
+    
+    Args:
+        ruta: Archivo de destino
+        datos: Objeto serializable
+        **opciones: Opciones de json.dumps (indent, separators...); ensure_ascii es False por defecto
+    """
+    opciones.setdefault("ensure_ascii", False)
+    escribir_atomico(ruta, json.dumps(datos, **opciones))
+
 def crear_directorio_si_no_existe(directorio: str) -> bool:
     """
     Crea un directorio si no existe
@@ -140,15 +197,26 @@ def obtener_estadisticas_archivo(archivo: str) -> Dict[str, Any]:
     
     return stats
 
+_ultimo_repintado_barra = 0.0
+
 def mostrar_barra_progreso(actual: int, total: int, ancho: int = 50) -> None:
     """
     Muestra una barra de progreso en la consola
+    Se repinta como mucho cada INTERVALO_BARRA_PROGRESO segundos y no se
+    escribe nada si la salida está redirigida a un archivo
     
     Args:
         actual: Valor actual
         total: Valor total
         ancho: Ancho de la barra
     """
+    global _ultimo_repintado_barra
+    
+    ahora = time.monotonic()
+    if actual < total and ahora - _ultimo_repintado_barra < config.INTERVALO_BARRA_PROGRESO:
+        return
+    _ultimo_repintado_barra = ahora
+    
     if total == 0:
         porcentaje = 100
     else:
@@ -158,7 +226,7 @@ def mostrar_barra_progreso(actual: int, total: int, ancho: int = 50) -> None:
     vacio = ancho - lleno
     
     barra = f"{Fore.GREEN}{'█' * lleno}{Fore.WHITE}{'░' * vacio}{Style.RESET_ALL}"
-    print(f"\r  Progreso: [{barra}] {porcentaje:.1f}% ({actual}/{total})", end='', flush=True)
+    escribir_en_linea(f"  Progreso: [{barra}] {porcentaje:.1f}% ({actual}/{total})")
 
 def calcular_diferencia_tiempo(fecha1: str, fecha2: str) -> str:
     """